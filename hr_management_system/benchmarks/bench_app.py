@@ -0,0 +1,270 @@
+"""
+Application Benchmark Suite
+
+Measures the application's own overhead (routing, template rendering, prompt
+building, JSON parsing and validation) with the deterministic fake LLM backend,
+so results are reproducible on a plain Linux box without network access.
+
+Usage (from the hr_management_system directory; requires httpx):
+
+    python -m benchmarks.bench_app --mode inprocess --requests 2000 --concurrency 32
+    python -m benchmarks.bench_app --mode socket --json results.json
+    python -m benchmarks.bench_app --baseline results.json --tolerance 0.25
+    python -m benchmarks.bench_app --components
+
+``inprocess`` drives the ASGI app directly through httpx's ASGI transport;
+``socket`` starts a real uvicorn server in a subprocess and drives it over TCP.
+Fake backend behaviour is configured with the FAKE_LLM_* environment variables.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - benchmark-only dependency
+    sys.exit("The benchmark suite requires httpx: pip install httpx")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Benchmarks always run against the local fake backend
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+_counter = itertools.count()
+
+
+def _job_description_body(unique: bool) -> Dict[str, Any]:
+    suffix = f" {next(_counter)}" if unique else ""
+    return {
+        "title": f"Backend Engineer{suffix}",
+        "department": "Engineering",
+        "seniority": "Senior",
+        "location": "Remote",
+        "custom_requirements": ["Python", "Distributed systems"],
+    }
+
+
+# name -> (method, path, body factory taking the `unique` flag)
+ROUTES: Dict[str, Tuple[str, str, Optional[Callable[[bool], Dict[str, Any]]]]] = {
+    "health": ("GET", "/api/health", None),
+    "dashboard": ("GET", "/", None),
+    "recruitment": ("GET", "/recruitment", None),
+    "generate": ("POST", "/api/generate-job-description", _job_description_body),
+    "generate_stream": ("POST", "/api/generate-job-description/stream", _job_description_body),
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": len(ordered) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+    }
+
+
+async def drive(client: "httpx.AsyncClient", route: str, requests: int, concurrency: int,
+                unique: bool) -> Dict[str, float]:
+    """Issue ``requests`` calls to one route from ``concurrency`` closed-loop workers."""
+    method, path, body_factory = ROUTES[route]
+    latencies: List[float] = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker() -> None:
+        nonlocal errors
+        while next(remaining) < requests:
+            body = body_factory(unique) if body_factory else None
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            await response.aread()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_inprocess(routes: List[str], requests: int, concurrency: int, unique: bool) -> Dict[str, Any]:
+    from src.main import app
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for route in routes:
+                await drive(client, route, min(requests, 50), concurrency, unique)  # warm-up
+                results[route] = await drive(client, route, requests, concurrency, unique)
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_socket(routes: List[str], requests: int, concurrency: int, unique: bool) -> Dict[str, Any]:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR,
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get("/api/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not become ready within 30s")
+                await asyncio.sleep(0.05)
+
+            results = {}
+            for route in routes:
+                await drive(client, route, min(requests, 50), concurrency, unique)  # warm-up
+                results[route] = await drive(client, route, requests, concurrency, unique)
+            return results
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def run_components(iterations: int) -> Dict[str, Any]:
+    """Time the in-process stages of a generation without HTTP or the LLM."""
+    from src.modules.gemini.backends import fake_job_description_responder
+    from src.modules.gemini.client import GeminiService
+    from src.modules.recruitment.job_description_generator import (
+        JobDescriptionGenerator,
+        JobDescriptionRequest,
+    )
+
+    generator = JobDescriptionGenerator()
+    request = JobDescriptionRequest(**_job_description_body(unique=False))
+    prompt = generator._build_prompt(request)
+    response_text = fake_job_description_responder(prompt.text)
+    parsed = GeminiService.parse_json_response(response_text)
+
+    stages = {
+        "industry_context": lambda: generator._get_industry_context(request.department),
+        "build_prompt": lambda: generator._build_prompt(request),
+        "parse_json_response": lambda: GeminiService.parse_json_response(response_text),
+        "finalize_payload": lambda: generator._finalize_payload(request, dict(parsed)),
+        "cache_key": lambda: generator._cache_key(request),
+    }
+
+    results = {}
+    for name, stage in stages.items():
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            stage()
+            latencies.append(time.perf_counter() - t0)
+        results[name] = summarize(latencies, 0, time.perf_counter() - started)
+    return results
+
+
+def print_table(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    print(f"{'route':<22}{'requests':>10}{'errors':>8}{'rps':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in results.items():
+        print(f"{name:<22}{row['requests']:>10}{row['errors']:>8}{row['throughput_rps']:>12.1f}"
+              f"{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['p99_ms']:>10.3f}")
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return regressions where p95 latency grew or throughput dropped beyond ``tolerance``."""
+    regressions = []
+    for mode, routes in results.items():
+        for route, row in routes.items():
+            base = baseline.get(mode, {}).get(route)
+            if not base:
+                continue
+            if row["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{mode}/{route}: p95 {base['p95_ms']:.3f}ms -> {row['p95_ms']:.3f}ms")
+            if row["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{mode}/{route}: throughput {base['throughput_rps']:.1f} -> {row['throughput_rps']:.1f} rps"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=["inprocess", "socket", "both"], default="inprocess")
+    parser.add_argument("--routes", default=",".join(ROUTES), help="Comma-separated route names")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cache-hits", action="store_true",
+                        help="Reuse identical generation bodies so the response cache serves them")
+    parser.add_argument("--components", action="store_true", help="Also time in-process generation stages")
+    parser.add_argument("--iterations", type=int, default=5000, help="Iterations per component stage")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --json result")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    routes = [route for route in args.routes.split(",") if route]
+    unknown = set(routes) - set(ROUTES)
+    if unknown:
+        parser.error(f"Unknown routes: {', '.join(sorted(unknown))}")
+
+    unique = not args.cache_hits
+    results: Dict[str, Any] = {}
+    if args.mode in ("inprocess", "both"):
+        results["inprocess"] = asyncio.run(run_inprocess(routes, args.requests, args.concurrency, unique))
+        print_table("In-process (ASGI transport)", results["inprocess"])
+    if args.mode in ("socket", "both"):
+        results["socket"] = asyncio.run(run_socket(routes, args.requests, args.concurrency, unique))
+        print_table("Socket (uvicorn)", results["socket"])
+    if args.components:
+        results["components"] = run_components(args.iterations)
+        print_table("Components", results["components"])
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
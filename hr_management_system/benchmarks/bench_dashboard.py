@@ -0,0 +1,170 @@
+"""
+Dashboard Metrics Benchmark
+
+Measures the dashboard aggregates at growing data sizes: the first
+(cold) refresh, a refresh with nothing new, a refresh folding in a small
+batch of new writes, and serving the snapshot (full body and 304), to show
+that serving and incremental refreshes stay flat as the stores grow.
+
+Usage (from the hr_management_system directory):
+
+    python -m benchmarks.bench_dashboard --scales 1000,10000,100000
+    python -m benchmarks.bench_dashboard --json dashboard.json
+
+At scale N the stores hold N/10 job descriptions, N resumes, N performance
+reviews and N/1000 completed feedback analyses.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+DEPARTMENTS = ("Engineering", "Sales", "Marketing", "Operations", "Finance", "People", "Support", "Product")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def timed(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started)
+    ordered = sorted(latencies)
+    return {"p50_ms": round(percentile(ordered, 0.50) * 1000, 3), "p95_ms": round(percentile(ordered, 0.95) * 1000, 3)}
+
+
+def populate(directory: str, scale: int, rng: random.Random):
+    from src.modules.feedback.feedback_analysis import COMPLETED, FeedbackAnalyzer
+    from src.modules.performance.performance_tracker import PerformanceTracker
+    from src.modules.recruitment.job_description_store import JobDescriptionStore
+    from src.modules.recruitment.resume_store import ResumeStore
+
+    job_descriptions = JobDescriptionStore(os.path.join(directory, "jd.db"))
+    for number in range(max(1, scale // 10)):
+        department = rng.choice(DEPARTMENTS)
+        job_descriptions.save(f"key-{number}", {"department": department, "seniority": "Mid"},
+                              {"title": f"Role {number}", "overview": "Synthetic role"})
+
+    resumes = ResumeStore(os.path.join(directory, "resumes.db"))
+    job_description_count = max(1, scale // 10)
+    batch = []
+    for number in range(scale):
+        batch.append({"candidate_id": f"c{number}", "text": "synthetic resume"})
+        if len(batch) == 5000 or number == scale - 1:
+            resumes.add_many(rng.randrange(1, job_description_count + 1), batch)
+            batch = []
+
+    performance = PerformanceTracker(os.path.join(directory, "performance"))
+    reviews = [{
+        "employee_id": f"emp-{number:07d}",
+        "cycle": f"2024-H{1 + number % 2}",
+        "department": rng.choice(DEPARTMENTS),
+        "team": f"Team {rng.randrange(20):02d}",
+        "score": round(rng.gauss(70, 12), 1),
+        "rating": 3.5,
+        "goals_met": 2,
+        "goals_total": 4,
+        "submitted_at": time.time(),
+    } for number in range(scale)]
+    for start in range(0, len(reviews), 20000):
+        performance.analytics.add_reviews(reviews[start:start + 20000])
+
+    feedback = FeedbackAnalyzer(os.path.join(directory, "feedback"))
+    for number in range(max(1, scale // 1000)):
+        analysis_id = f"{number:032x}"
+        os.makedirs(os.path.join(feedback.directory, analysis_id))
+        feedback._save({
+            "id": analysis_id,
+            "stage": COMPLETED,
+            "summary": {"comments": 1000, "sentiment": {"positive": 400, "neutral": 400, "negative": 150, "mixed": 50}},
+        })
+    return job_descriptions, resumes, performance, feedback
+
+
+def run_scale(scale: int, repeat: int, seed: int) -> Dict[str, Any]:
+    from starlette.requests import Request
+
+    from src.modules.dashboard.dashboard_metrics import DashboardMetrics
+
+    rng = random.Random(seed)
+    results: Dict[str, Any] = {"scale": scale}
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        job_descriptions, resumes, performance, feedback = populate(directory, scale, rng)
+        results["populate_seconds"] = round(time.perf_counter() - started, 3)
+
+        # A fresh worker (new tracker instance) builds everything on its first refresh
+        cold_performance = type(performance)(performance.directory)
+        dashboard = DashboardMetrics(job_descriptions, resumes, cold_performance, feedback, ttl=0)
+        started = time.perf_counter()
+        dashboard.refresh()
+        results["cold_refresh_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        results["unchanged_refresh"] = timed(dashboard.refresh, repeat)
+
+        # 100 new resumes and 100 new reviews between refreshes
+        latencies = []
+        for round_number in range(20):
+            resumes.add_many(1, [{"candidate_id": f"new-{round_number}-{number}", "text": "x"} for number in range(100)])
+            performance.analytics.add_reviews([{
+                "employee_id": f"new-{round_number}-{number}", "cycle": "2024-H2", "department": "Sales",
+                "team": "Team 01", "score": 80.0, "rating": 4.0, "goals_met": 3, "goals_total": 4,
+                "submitted_at": time.time(),
+            } for number in range(100)])
+            started = time.perf_counter()
+            dashboard.refresh()
+            latencies.append(time.perf_counter() - started)
+        ordered = sorted(latencies)
+        results["incremental_refresh"] = {"p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+                                          "max_ms": round(ordered[-1] * 1000, 3)}
+
+        # Serving: the snapshot is current, so no request touches the stores
+        dashboard.ttl = 3600
+        loop = asyncio.new_event_loop()
+        etag = dashboard.refresh().etag
+        plain = Request({"type": "http", "headers": []})
+        conditional = Request({"type": "http", "headers": [(b"if-none-match", etag.encode("latin-1"))]})
+        results["serve"] = timed(lambda: loop.run_until_complete(dashboard.response(plain)), repeat * 10)
+        results["serve_not_modified"] = timed(lambda: loop.run_until_complete(dashboard.response(conditional)),
+                                              repeat * 10)
+        loop.close()
+        results["body_bytes"] = len(dashboard.refresh().body)
+        job_descriptions.close()
+        resumes.close()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", default="1000,10000,100000", help="Comma-separated data sizes")
+    parser.add_argument("--repeat", type=int, default=50, help="Runs of each refresh measurement")
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    results = [run_scale(int(scale), args.repeat, args.seed) for scale in args.scales.split(",")]
+    print(json.dumps(results, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
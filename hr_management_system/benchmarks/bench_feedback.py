@@ -0,0 +1,171 @@
+"""
+Feedback Analysis Benchmark
+
+Measures each stage of a feedback analysis (local clustering, batched LLM
+labeling against the fake backend, mapping labels back to every comment)
+on a synthetic survey export, and how many comments each LLM call covers.
+
+Usage (from the hr_management_system directory):
+
+    python -m benchmarks.bench_feedback --comments 200000
+    python -m benchmarks.bench_feedback --comments 200000 --latency 0.5 --json feedback.json
+
+Comments are built from per-theme phrases with random openers, qualifiers
+and word drops, plus a share of short stock answers repeated verbatim, with a
+fixed seed so runs are comparable.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+THEME_PHRASES = {
+    "workload": ("the workload is too high", "we are understaffed and overworked", "deadlines are unrealistic",
+                 "too many projects at once", "constant overtime to keep up"),
+    "pay": ("salary is below market", "pay raises do not keep up with inflation", "bonus structure is unclear",
+            "compensation is fair for the role", "benefits package is great"),
+    "management": ("my manager is supportive", "leadership communication is unclear",
+                   "managers do not listen to feedback", "my manager gives helpful feedback",
+                   "senior leadership lacks transparency"),
+    "career": ("no clear path for promotion", "great learning and development budget",
+               "career growth is slow", "mentoring program is helpful", "training opportunities are limited"),
+    "flexibility": ("remote work policy is flexible", "love the hybrid schedule", "office attendance rules are unfair",
+                    "flexible hours help my family", "commute to the office is stressful"),
+    "tools": ("laptops are slow and outdated", "internal tools are frustrating", "vpn drops constantly",
+              "new collaboration software is good", "it support response is slow"),
+    "culture": ("team culture is friendly", "colleagues are supportive and kind", "silos between departments",
+                "recognition for good work is lacking", "inclusive and welcoming environment"),
+    "meetings": ("too many meetings every day", "meetings without agendas waste time",
+                 "stand ups run too long", "fewer meetings would help focus", "all hands meetings are useful"),
+}
+OPENERS = ("", "", "honestly ", "i think ", "overall ", "in my opinion ", "to be honest ", "mostly ")
+QUALIFIERS = ("", "", "", " lately", " this year", " in our team", " for a while now", " again")
+STOCK_ANSWERS = ("N/A", "No comment", "Nothing to add", "All good", "Great place to work", "None", "-", "Thanks")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def synthetic_comment(rng: random.Random) -> str:
+    if rng.random() < 0.15:
+        return rng.choice(STOCK_ANSWERS)
+    phrases = [rng.choice(THEME_PHRASES[rng.choice(list(THEME_PHRASES))])]
+    if rng.random() < 0.3:
+        phrases.append(rng.choice(THEME_PHRASES[rng.choice(list(THEME_PHRASES))]))
+    words = []
+    for phrase in phrases:
+        words += [word for word in phrase.split() if rng.random() > 0.08]
+    text = rng.choice(OPENERS) + " ".join(words) + rng.choice(QUALIFIERS)
+    return text.capitalize() + rng.choice((".", "", "!"))
+
+
+def write_export(path: str, comments: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["response_id", "department", "comment"])
+        for number in range(comments):
+            writer.writerow([f"r{number:07d}", rng.choice(("Sales", "Engineering", "Support")),
+                             synthetic_comment(rng)])
+
+
+async def file_chunks(path: str, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def run(comments: int, latency: float, concurrency: int, max_llm_clusters: int, seed: int) -> Dict[str, Any]:
+    from src.modules.feedback.feedback_analysis import FeedbackAnalyzer
+    from src.modules.gemini.backends import FakeLLMBackend
+    from src.modules.gemini.client import GeminiService
+
+    latencies: List[float] = []
+
+    class TimedBackend(FakeLLMBackend):
+        async def generate_content(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await super().generate_content(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - started)
+
+    await GeminiService.startup(TimedBackend(latency=latency))
+    results: Dict[str, Any] = {"comments": comments, "llm_latency_seconds": latency}
+    with tempfile.TemporaryDirectory() as directory:
+        export_path = os.path.join(directory, "export.csv")
+        started = time.perf_counter()
+        write_export(export_path, comments, seed)
+        results["export"] = {"bytes": os.path.getsize(export_path),
+                             "generate_seconds": round(time.perf_counter() - started, 3)}
+
+        analyzer = FeedbackAnalyzer(os.path.join(directory, "analyses"), concurrency=concurrency,
+                                    max_llm_clusters=max_llm_clusters)
+        started = time.perf_counter()
+        analysis = await analyzer.create_analysis(file_chunks(export_path), "csv")
+        results["upload_seconds"] = round(time.perf_counter() - started, 3)
+
+        stages = {}
+        for name, run_stage in (("cluster", analyzer._cluster), ("label", analyzer._label), ("map", analyzer._map)):
+            started = time.perf_counter()
+            await run_stage(analysis)
+            stages[name] = round(time.perf_counter() - started, 3)
+        results["stage_seconds"] = stages
+        results["total_seconds"] = round(sum(stages.values()), 3)
+
+        summary = analysis["summary"]
+        ordered = sorted(latencies)
+        results["llm"] = {
+            "calls": summary["llm_calls"],
+            "comments_per_call": summary["comments_per_llm_call"],
+            "call_p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        }
+        results["clustering"] = {key: summary[key] for key in ("unique_texts", "clusters")}
+        results["labeled"] = summary["labeled"]
+        results["sentiment"] = summary["sentiment"]
+        results["top_themes"] = [(theme["theme"], theme["comments"]) for theme in summary["themes"][:8]]
+    await GeminiService.shutdown()
+    results["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--comments", type=int, default=200000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per LLM call")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent labeling calls")
+    parser.add_argument("--max-llm-clusters", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.comments, args.latency, args.concurrency, args.max_llm_clusters, args.seed))
+    print(json.dumps(results, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Performance Analytics Benchmark
+
+Measures review ingestion into the columnar store, the aggregate build a new
+worker does on its first query, incremental updates as reviews arrive, and
+the latency of each analytics query, on a synthetic organization.
+
+Usage (from the hr_management_system directory):
+
+    python -m benchmarks.bench_performance --employees 50000 --cycles 10
+    python -m benchmarks.bench_performance --json performance.json
+
+Every employee is reviewed in every cycle (half-yearly cycles from 2021),
+and a small share of reviews is submitted again to exercise supersession.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+DEPARTMENTS = ("Engineering", "Sales", "Marketing", "Operations", "Finance", "People", "Support", "Product")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Organization:
+    """Deterministic synthetic employees, each in a fixed department and team."""
+
+    def __init__(self, employees: int, teams_per_department: int = 25, seed: int = 11):
+        self.rng = random.Random(seed)
+        self.assignments = [
+            (f"emp-{number:06d}", self.rng.choice(DEPARTMENTS), f"Team {self.rng.randrange(teams_per_department):02d}")
+            for number in range(employees)
+        ]
+
+    def reviews(self, cycle: str) -> List[Dict[str, Any]]:
+        reviews = []
+        for employee_id, department, team in self.assignments:
+            score = min(100.0, max(0.0, self.rng.gauss(70, 12)))
+            goals_total = self.rng.randint(3, 8)
+            reviews.append({
+                "employee_id": employee_id,
+                "cycle": cycle,
+                "department": department,
+                "team": team,
+                "score": round(score, 1),
+                "rating": round(1 + score / 25, 1),
+                "goals_met": self.rng.randint(0, goals_total),
+                "goals_total": goals_total,
+                "submitted_at": time.time(),
+            })
+        return reviews
+
+
+def timed(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started)
+    ordered = sorted(latencies)
+    return {"p50_ms": round(percentile(ordered, 0.50) * 1000, 3), "p95_ms": round(percentile(ordered, 0.95) * 1000, 3)}
+
+
+def run(employees: int, cycles: int, batch_size: int, repeat: int) -> Dict[str, Any]:
+    from src.modules.performance.review_analytics import ReviewAnalytics
+
+    organization = Organization(employees)
+    labels = [f"{2021 + number // 2}-H{number % 2 + 1}" for number in range(cycles)]
+    results: Dict[str, Any] = {"employees": employees, "cycles": cycles}
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = ReviewAnalytics.open(directory)
+        append_seconds = 0.0
+        reviews = 0
+        for label in labels:
+            cycle_reviews = organization.reviews(label)
+            # Roughly 2% of reviews are corrected after submission
+            cycle_reviews += [dict(review, score=review["score"] - 5) for review in cycle_reviews[::50]]
+            for start in range(0, len(cycle_reviews), batch_size):
+                batch = cycle_reviews[start:start + batch_size]
+                started = time.perf_counter()
+                writer.add_reviews(batch)
+                append_seconds += time.perf_counter() - started
+            reviews += len(cycle_reviews)
+        results["ingest"] = {
+            "reviews": reviews,
+            "seconds": round(append_seconds, 3),
+            "reviews_per_second": round(reviews / append_seconds),
+            **writer.store.stats(),
+        }
+
+        # A fresh worker aggregates the whole store on its first query
+        reader = ReviewAnalytics.open(directory)
+        started = time.perf_counter()
+        reader.catch_up()
+        results["cold_aggregate_seconds"] = round(time.perf_counter() - started, 3)
+
+        # New reviews arriving: append a small batch, then the next query folds it in
+        extra = organization.reviews(labels[-1])[:1000]
+        latencies = []
+        for start in range(0, len(extra), 100):
+            writer.add_reviews(extra[start:start + 100])
+            started = time.perf_counter()
+            reader.summary()
+            latencies.append(time.perf_counter() - started)
+        ordered = sorted(latencies)
+        results["incremental_update"] = {
+            "batch": 100,
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        }
+
+        results["queries"] = {
+            "summary": timed(lambda: reader.summary(), repeat),
+            "departments": timed(lambda: reader.groups("department"), repeat),
+            "teams": timed(lambda: reader.groups("team"), repeat),
+            "teams_in_department": timed(lambda: reader.groups("team", department="Engineering"), repeat),
+            "company_trend": timed(lambda: reader.trend(), repeat),
+            "team_trend": timed(lambda: reader.trend("team", "Engineering", "Team 03"), repeat),
+            "distribution": timed(lambda: reader.distribution(), repeat),
+            "department_distribution": timed(lambda: reader.distribution(department="Sales"), repeat),
+            "employee_history": timed(lambda: reader.employee_history("emp-001234"), repeat),
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--employees", type=int, default=50000)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50, help="Runs of each query")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.employees, args.cycles, args.batch_size, args.repeat)
+    print(json.dumps(results, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+LLM Resilience Benchmark
+
+Measures end-to-end LLM call latency against the fake backend with a slow
+tail (a share of calls taking much longer, like a degraded replica), with
+hedging off and on, and how fast calls are rejected once the circuit
+breaker has opened on a failing upstream.
+
+Usage (from the hr_management_system directory):
+
+    python -m benchmarks.bench_resilience --calls 2000
+    python -m benchmarks.bench_resilience --latency 0.05 --tail-rate 0.05 --tail-latency 0.5 --json resilience.json
+
+Every call uses a distinct prompt; which calls land in the tail is fixed
+by the seed, so hedged and unhedged runs see the same slow calls.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+async def run_calls(caller, backend, calls: int, concurrency: int) -> Dict[str, Any]:
+    """Issue ``calls`` distinct prompts through ``caller`` and time each one."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(number: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await caller.call(lambda: backend.generate_content(f"prompt {number}"))
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(number) for number in range(calls)))
+    return {
+        "calls": calls,
+        "errors": errors,
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "backend_calls": backend.stats()["calls"],
+        **summarize(latencies),
+    }
+
+
+async def run(calls: int, concurrency: int, latency: float, jitter: float, tail_rate: float,
+              tail_latency: float, hedge_budget: float, seed: int) -> Dict[str, Any]:
+    from src.modules.gemini.backends import FakeLLMBackend
+    from src.modules.gemini.resilience import CircuitBreaker, CircuitOpenError, ResilientCaller
+
+    results: Dict[str, Any] = {
+        "backend": {"latency": latency, "jitter": jitter, "tail_rate": tail_rate, "tail_latency": tail_latency},
+    }
+    for hedging in (False, True):
+        backend = FakeLLMBackend(latency=latency, jitter=jitter, tail_rate=tail_rate,
+                                 tail_latency=tail_latency, seed=seed)
+        caller = ResilientCaller(call_timeout=60.0, hedging=hedging, hedge_min_delay=0.0,
+                                 hedge_budget=hedge_budget, breaker=CircuitBreaker(min_calls=calls + 1))
+        run_results = await run_calls(caller, backend, calls, concurrency)
+        stats = caller.stats()
+        run_results["hedge"] = {key: stats[key] for key in ("hedged", "hedge_won", "primary_won",
+                                                             "hedges_skipped_budget", "hedge_delay_ms")}
+        results["hedging_on" if hedging else "hedging_off"] = run_results
+
+    # Failing upstream: the breaker opens after min_calls failures, then rejects without calling it
+    backend = FakeLLMBackend(latency=latency, failure_rate=1.0, seed=seed)
+    breaker = CircuitBreaker(window=20, failure_rate=0.5, min_calls=10, cooldown=60.0)
+    caller = ResilientCaller(hedging=False, breaker=breaker)
+    failed: List[float] = []
+    rejected: List[float] = []
+    for number in range(200):
+        started = time.perf_counter()
+        try:
+            await caller.call(lambda: backend.generate_content(f"failing {number}"))
+        except CircuitOpenError:
+            rejected.append(time.perf_counter() - started)
+        except Exception:
+            failed.append(time.perf_counter() - started)
+    results["circuit_breaker"] = {
+        "calls": 200,
+        "reached_upstream": backend.stats()["calls"],
+        "failed": {"count": len(failed), **summarize(failed)},
+        "rejected": {"count": len(rejected), **summarize(rejected)},
+        "breaker": breaker.stats(),
+    }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Typical seconds per LLM call")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Uniform +/- seconds around --latency")
+    parser.add_argument("--tail-rate", type=float, default=0.05, help="Share of calls in the slow tail")
+    parser.add_argument("--tail-latency", type=float, default=0.5, help="Extra seconds for tail calls")
+    parser.add_argument("--hedge-budget", type=float, default=0.1, help="Hedges allowed per call")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.calls, args.concurrency, args.latency, args.jitter, args.tail_rate,
+                              args.tail_latency, args.hedge_budget, args.seed))
+    print(json.dumps(results, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
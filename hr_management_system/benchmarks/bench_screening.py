@@ -0,0 +1,169 @@
+"""
+Resume Screening Benchmark
+
+Measures resume ingestion (tokenizing and indexing, optionally through the
+SQLite resume store) and BM25 ranking throughput on a synthetic applicant
+pool, so the local pre-ranking stage can be sized without an LLM.
+
+Usage (from the hr_management_system directory):
+
+    python -m benchmarks.bench_screening --resumes 100000
+    python -m benchmarks.bench_screening --resumes 100000 --store --json screening.json
+
+Resumes are drawn from a Zipf-distributed synthetic vocabulary mixed with
+real skill words, with a fixed seed so runs are comparable.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+SKILLS = (
+    "python java javascript typescript golang rust sql postgresql kubernetes docker terraform aws azure gcp "
+    "react django fastapi spark kafka airflow tableau excel salesforce hubspot seo recruiting onboarding "
+    "payroll compliance negotiation budgeting forecasting leadership mentoring stakeholder communication "
+    "agile scrum testing security networking linux analytics statistics nursing accounting auditing"
+).split()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class ResumeGenerator:
+    """Deterministic synthetic resumes: filler words follow Zipf's law, skills are sprinkled in."""
+
+    def __init__(self, seed: int = 7, vocabulary: int = 30000, words_per_resume: int = 350):
+        self.rng = random.Random(seed)
+        self.words_per_resume = words_per_resume
+        self.filler = [self._word(index) for index in range(vocabulary)]
+        self.cumulative_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(vocabulary)))
+
+    def _word(self, index: int) -> str:
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        word = ""
+        index += 26 * 26
+        while index:
+            index, remainder = divmod(index, 26)
+            word += letters[remainder]
+        return word
+
+    def resume(self) -> str:
+        words = self.rng.choices(self.filler, cum_weights=self.cumulative_weights, k=self.words_per_resume)
+        words += self.rng.sample(SKILLS, k=self.rng.randint(3, 15))
+        self.rng.shuffle(words)
+        return " ".join(words)
+
+    def job_description(self) -> Dict[str, Any]:
+        skills = self.rng.sample(SKILLS, k=12)
+        return {
+            "title": f"Senior {skills[0].title()} Engineer",
+            "required_qualifications": [f"Experience with {skill}" for skill in skills[:6]],
+            "preferred_qualifications": [f"Familiarity with {skill}" for skill in skills[6:9]],
+            "key_responsibilities": [f"Own {skill} delivery" for skill in skills[9:]],
+        }
+
+
+def run(resumes: int, queries: int, top_k: int, batch_size: int, use_store: bool) -> Dict[str, Any]:
+    from src.modules.recruitment.job_description_store import JobDescriptionStore
+    from src.modules.recruitment.resume_screening import ResumeScreener
+    from src.modules.recruitment.resume_store import ResumeStore
+    from src.utils.bm25_index import BM25Index
+
+    generator = ResumeGenerator()
+    results: Dict[str, Any] = {"resumes": resumes, "top_k": top_k}
+
+    with tempfile.TemporaryDirectory() as directory:
+        screener = ResumeScreener(
+            store=ResumeStore(os.path.join(directory, "resumes.db")),
+            job_descriptions=JobDescriptionStore(os.path.join(directory, "job_descriptions.db")),
+            ingest_batch_size=batch_size,
+        )
+        index = BM25Index(normalize=screener.analyzer.normalize, token_pattern=screener.analyzer.token_pattern)
+        texts: List[str] = []
+        add_seconds = 0.0
+        for start in range(0, resumes, batch_size):
+            batch = [generator.resume() for _ in range(min(batch_size, resumes - start))]
+            texts.extend(batch)
+            started = time.perf_counter()
+            index.add_texts(batch)
+            add_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        index.optimize()
+        optimize_seconds = time.perf_counter() - started
+        total_seconds = add_seconds + optimize_seconds
+        results["index"] = {
+            "seconds": round(total_seconds, 3),
+            "resumes_per_second": round(resumes / total_seconds),
+            "add_texts_seconds": round(add_seconds, 3),
+            "optimize_seconds": round(optimize_seconds, 3),
+            **index.stats(),
+        }
+
+        latencies = []
+        for _ in range(queries):
+            query = screener.build_query(generator.job_description())
+            started = time.perf_counter()
+            index.top_k(query, top_k)
+            latencies.append(time.perf_counter() - started)
+        ordered = sorted(latencies)
+        results["query"] = {
+            "queries": queries,
+            "queries_per_second": round(queries / sum(latencies), 1),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        }
+
+        if use_store:
+            # The path the API takes: insert into SQLite, then index from the store
+            rows = [{"candidate_id": f"c{number}", "text": text} for number, text in enumerate(texts)]
+            started = time.perf_counter()
+            for start in range(0, len(rows), batch_size):
+                screener.store.add_many(1, rows[start:start + batch_size])
+            stored = time.perf_counter()
+            screener.catch_up(1)
+            finished = time.perf_counter()
+            results["store"] = {
+                "insert_seconds": round(stored - started, 3),
+                "catch_up_seconds": round(finished - stored, 3),
+                "resumes_per_second": round(resumes / (finished - started)),
+            }
+        screener.store.close()
+        screener.job_descriptions.close()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resumes", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--store", action="store_true", help="Also time ingestion through the SQLite resume store")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.resumes, args.queries, args.top_k, args.batch_size, args.store)
+    print(json.dumps(results, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Job Description Tier Benchmark
+
+Measures the template writer on its own over a spread of departments,
+seniorities, tones and employment types, then end-to-end generation
+latency per tier (template, refine, llm) against the fake backend, with
+the LLM output tokens each tier needs.
+
+Usage (from the hr_management_system directory):
+
+    python -m benchmarks.bench_templates --requests 2000
+    python -m benchmarks.bench_templates --latency 1.5 --json tiers.json
+
+Output tokens are estimated from the sections each tier asks the LLM to
+write (none for template, the overview and responsibilities for refine,
+everything for llm), since the fake backend always answers in full.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+TITLES = ("Data Engineer", "Backend Developer", "Product Designer", "Growth Marketer", "Support Specialist",
+          "Office Manager", "Financial Analyst", "Recruiter", "Site Reliability Engineer", "UX Researcher")
+DEPARTMENTS = ("Engineering", "Design", "Marketing", "Customer Support", "Operations", "Finance", "People")
+SENIORITIES = ("Intern", "Junior", "Mid-level", "Senior", "Lead", "Principal", "Director")
+TONES = ("professional", "friendly", "enthusiastic", "formal")
+EMPLOYMENT_TYPES = ("Full-time", "Full-time", "Part-time", "Contract")
+SECTIONS = ("title", "overview", "key_responsibilities", "required_qualifications",
+            "preferred_qualifications", "benefits")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], scale: float = 1000) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    unit = "us" if scale == 1e6 else "ms"
+    return {f"p50_{unit}": round(percentile(ordered, 0.50) * scale, 2),
+            f"p99_{unit}": round(percentile(ordered, 0.99) * scale, 2)}
+
+
+def synthetic_requests(count: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    requests = []
+    for number in range(count):
+        request = {
+            "title": rng.choice(TITLES),
+            "department": rng.choice(DEPARTMENTS),
+            "seniority": rng.choice(SENIORITIES),
+            "tone": rng.choice(TONES),
+            "employment_type": rng.choice(EMPLOYMENT_TYPES),
+            "location": rng.choice((None, "Remote", "Berlin", "New York (hybrid)")),
+            # Distinct salary ranges keep every request a cache miss
+            "salary_range": f"${60 + number % 90}k-${80 + number % 90}k",
+        }
+        if rng.random() < 0.3:
+            request["custom_requirements"] = ["Fluent English and German", "Willing to travel quarterly"]
+        requests.append(request)
+    return requests
+
+
+def bench_writer(requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from src.modules.recruitment.job_description_generator import JobDescriptionResponse
+    from src.modules.recruitment.knowledge_base import IndustryKnowledgeBase
+    from src.modules.recruitment.template_writer import TemplateJobDescriptionWriter
+
+    writer = TemplateJobDescriptionWriter(IndustryKnowledgeBase())
+    latencies = []
+    sizes = {name: [] for name in SECTIONS[2:]}
+    for request in requests:
+        started = time.perf_counter()
+        sections = writer.write(request)
+        latencies.append(time.perf_counter() - started)
+        JobDescriptionResponse(**sections)
+        for name in sizes:
+            sizes[name].append(len(sections[name]))
+    deterministic = all(writer.write(request) == writer.write(request) for request in requests[:100])
+    return {
+        "requests": len(requests),
+        **summarize(latencies, 1e6),
+        "deterministic": deterministic,
+        "section_items": {name: [min(values), max(values)] for name, values in sizes.items()},
+    }
+
+
+async def bench_tiers(requests: List[Dict[str, Any]], latency: float) -> Dict[str, Any]:
+    from src.modules.gemini.backends import FakeLLMBackend, estimate_tokens
+    from src.modules.gemini.client import GeminiService
+    from src.modules.recruitment.job_description_generator import (
+        REFINED_SECTIONS,
+        JobDescriptionGenerator,
+        JobDescriptionRequest,
+    )
+
+    await GeminiService.startup(FakeLLMBackend(latency=latency))
+    generator = JobDescriptionGenerator()
+    results: Dict[str, Any] = {"llm_latency_seconds": latency}
+    written_by_llm = {"template": (), "refine": REFINED_SECTIONS, "llm": SECTIONS}
+    for tier in ("template", "refine", "llm"):
+        backend_calls = GeminiService.stats()["calls"]
+        latencies = []
+        output_tokens = 0
+        for number, parameters in enumerate(requests):
+            request = JobDescriptionRequest(**parameters, tier=tier)
+            started = time.perf_counter()
+            job_description = await generator.generate_job_description(request)
+            latencies.append(time.perf_counter() - started)
+            document = job_description.model_dump()
+            output_tokens += sum(estimate_tokens(json.dumps(document[name])) for name in written_by_llm[tier])
+        results[tier] = {
+            "requests": len(requests),
+            **summarize(latencies),
+            "llm_calls": GeminiService.stats()["calls"] - backend_calls,
+            "llm_output_tokens_per_request": round(output_tokens / len(requests)),
+        }
+    await GeminiService.shutdown()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests for the writer benchmark")
+    parser.add_argument("--tier-requests", type=int, default=20, help="Requests per tier end to end")
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated seconds per LLM call")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep the generator's store, cache and similarity index out of the working tree
+        os.environ["JD_STORE_PATH"] = os.path.join(directory, "jd.db")
+        os.environ.pop("JD_CACHE_DIR", None)
+        os.environ["JD_GENERATION_STRATEGY"] = "single"
+        os.environ["JD_REUSE_THRESHOLD"] = "2"
+        os.environ["JD_SEED_THRESHOLD"] = "2"
+        results = {
+            "writer": bench_writer(synthetic_requests(args.requests, args.seed)),
+            "tiers": asyncio.run(bench_tiers(synthetic_requests(args.tier_requests, args.seed + 1), args.latency)),
+        }
+    print(json.dumps(results, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
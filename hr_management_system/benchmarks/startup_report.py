@@ -0,0 +1,180 @@
+"""
+Startup Time Report
+
+Measures what a fresh worker pays before it can serve traffic: the import
+cost of ``src.main`` broken down by module, whether heavy optional modules
+leaked onto the import path, and the wall time from process start to the
+first ``/api/health`` 200 under uvicorn.
+
+Usage (from the hr_management_system directory):
+
+    python -m benchmarks.startup_report
+    python -m benchmarks.startup_report --runs 5 --json startup.json
+    python -m benchmarks.startup_report --import-budget-ms 800 --ready-budget-ms 2500
+    python -m benchmarks.startup_report --baseline startup.json --tolerance 0.25
+
+Exits non-zero when a budget is exceeded, a lazily loaded module is imported
+eagerly, or a metric regressed beyond ``--tolerance`` against ``--baseline``.
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only load on first use or in the lifespan hook
+LAZY_MODULES = ("google.generativeai", "grpc", "langgraph", "numpy")
+
+_IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _environment() -> Dict[str, str]:
+    env = os.environ.copy()
+    env.setdefault("LLM_BACKEND", "fake")
+    env.setdefault("GEMINI_API_KEY", "startup-report")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, env.get("PYTHONPATH")]))
+    return env
+
+
+def import_profile(top: int) -> Dict[str, Any]:
+    """Import ``src.main`` in a fresh interpreter under ``-X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT_DIR, env=_environment(), capture_output=True, text=True, check=True,
+    )
+    modules = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), len(match[3]), match[4]
+        modules.append({"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000,
+                        "depth": (indent - 1) // 2})
+        if name == "src.main":
+            total_us = cumulative_us
+    heaviest = sorted(modules, key=lambda row: row["cumulative_ms"], reverse=True)
+    return {"total_ms": total_us / 1000, "modules": len(modules), "heaviest": heaviest[:top]}
+
+
+def eager_modules() -> List[str]:
+    """Return the LAZY_MODULES loaded by importing ``src.main`` and building the app."""
+    probe = (
+        "import json, sys\n"
+        "import src.main\n"
+        "src.main.create_app()\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT_DIR, env=_environment(),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_health(timeout: float = 60.0) -> float:
+    """Seconds from launching uvicorn to the first 200 from ``/api/health``."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/api/health"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR, env=_environment(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode} before becoming ready")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError(f"uvicorn did not become ready within {timeout:.0f}s")
+            time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def build_report(runs: int, top: int) -> Dict[str, Any]:
+    imports = [import_profile(top) for _ in range(runs)]
+    ready = [time_to_health() for _ in range(runs)]
+    return {
+        "import_ms": statistics.median(profile["total_ms"] for profile in imports),
+        "ready_ms": statistics.median(ready) * 1000,
+        "heaviest_imports": imports[-1]["heaviest"],
+        "modules_imported": imports[-1]["modules"],
+        "eager_lazy_modules": eager_modules(),
+    }
+
+
+def check(report: Dict[str, Any], import_budget_ms: Optional[float], ready_budget_ms: Optional[float],
+          baseline: Optional[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Return budget violations and regressions."""
+    problems = [f"{module} is imported eagerly" for module in report["eager_lazy_modules"]]
+    if import_budget_ms is not None and report["import_ms"] > import_budget_ms:
+        problems.append(f"import of src.main took {report['import_ms']:.1f}ms (budget {import_budget_ms:.0f}ms)")
+    if ready_budget_ms is not None and report["ready_ms"] > ready_budget_ms:
+        problems.append(f"first /api/health took {report['ready_ms']:.1f}ms (budget {ready_budget_ms:.0f}ms)")
+    if baseline:
+        for metric in ("import_ms", "ready_ms"):
+            if metric in baseline and report[metric] > baseline[metric] * (1 + tolerance):
+                problems.append(f"{metric} regressed: {baseline[metric]:.1f}ms -> {report[metric]:.1f}ms")
+    return problems
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"import src.main       {report['import_ms']:>10.1f} ms ({report['modules_imported']} modules)")
+    print(f"first /api/health 200 {report['ready_ms']:>10.1f} ms")
+    print(f"\n{'module':<50}{'cumulative ms':>15}{'self ms':>10}")
+    for row in report["heaviest_imports"]:
+        print(f"{'  ' * row['depth'] + row['module']:<50}{row['cumulative_ms']:>15.1f}{row['self_ms']:>10.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3, help="Measurements per metric (median is reported)")
+    parser.add_argument("--top", type=int, default=20, help="Heaviest imports to list")
+    parser.add_argument("--import-budget-ms", type=float, help="Fail if importing src.main takes longer")
+    parser.add_argument("--ready-budget-ms", type=float, help="Fail if the first health check takes longer")
+    parser.add_argument("--json", dest="json_path", help="Write the report to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --json report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    report = build_report(max(1, args.runs), args.top)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    problems = check(report, args.import_budget_ms, args.ready_budget_ms, baseline, args.tolerance)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
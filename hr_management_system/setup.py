@@ -3,16 +3,28 @@ from setuptools import setup, find_packages
 setup(
     name="hr_management_system",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
+    package_data={"src.modules.recruitment": ["data/*.json"]},
     install_requires=[
-        "google-generativeai>=0.3.0",
-        "langgraph>=0.0.15",
-        "fastapi>=0.103.1",
-        "uvicorn>=0.23.2",
+        "google-generativeai>=0.8.0,<0.9.0",
+        "langgraph>=0.3.0",
+        "fastapi>=0.108.0",
+        "uvicorn>=0.24.0",
+        "websockets>=11.0",
         "python-dotenv>=1.0.0",
         "pydantic>=2.3.0",
         "jinja2>=3.1.2",
         "tenacity>=8.2.3",
+        "numpy>=1.24.0",
         "setuptools>=42.0.0",
     ],
+    extras_require={
+        # uvloop and httptools for the production serving profile
+        "server": ["uvicorn[standard]>=0.24.0"],
+        # pytest suite under tests/ (TestClient needs httpx)
+        "test": ["pytest>=7.0", "httpx>=0.24"],
+    },
+    entry_points={
+        "console_scripts": ["hr-serve=src.serve:main"],
+    },
 )
\ No newline at end of file
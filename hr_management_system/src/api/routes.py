@@ -1,33 +1,658 @@
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+import os
+import json
+import threading
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import AsyncIterator, Dict, Any, List, Literal, Optional
 
 # Import core functionality
-from modules.recruitment.job_description_generator import JobDescriptionGenerator
+from src.modules.assistant.assistant import AssistantService
+from src.modules.dashboard.dashboard_metrics import DashboardMetrics
+from src.modules.feedback.feedback_analysis import COMPLETED, FEEDBACK_JOB_KIND, FeedbackAnalyzer
+from src.modules.gemini.client import GeminiService
+from src.modules.gemini.resilience import CircuitOpenError, DeadlineExceeded
+from src.modules.jobs.job_queue import JobQueue
+from src.modules.performance.performance_tracker import PerformanceReview, PerformanceTracker
+from src.modules.recruitment.job_description_generator import (
+    GENERATION_JOB_KIND,
+    JobDescriptionGenerator,
+    JobDescriptionRequest,
+)
+from src.modules.recruitment.job_description_store import InvalidCursor
+from src.modules.recruitment.resume_screening import ResumeScreener, ResumeSubmission
+from src.utils.profiler import PROFILER
 
 # Define API router
 router = APIRouter()
 
+# Batch generation limits
+BATCH_MAX_ITEMS = int(os.getenv("JD_BATCH_MAX_ITEMS", 500))
+BATCH_MAX_CONCURRENCY = int(os.getenv("JD_BATCH_MAX_CONCURRENCY", 8))
+
+# Stored job description paging limit
+PAGE_MAX_LIMIT = 100
+
+# Candidates sent to the LLM for assessment per screening
+SCREENING_MAX_TOP_K = int(os.getenv("SCREENING_MAX_TOP_K", 100))
+
+# How generation results are delivered when the caller does not choose
+GenerationMode = Literal["sync", "stream", "queued"]
+JobPriority = Literal["high", "normal", "low"]
+DEFAULT_GENERATION_MODE = os.getenv("JD_GENERATION_MODE", "sync")
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+
+# The sampling profiler endpoints exist only when explicitly enabled
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "False").lower() in ("true", "1", "t")
+
 # Data models
-class JobDescriptionRequest(BaseModel):
-    title: str
-    department: str
-    seniority: str
-    employment_type: Optional[str] = "Full-time"
-    location: Optional[str] = None
-    salary_range: Optional[str] = None
+class AssistantMessage(BaseModel):
+    text: str = Field(..., min_length=1)
+    session_id: Optional[str] = Field(default=None, description="Omit to start a new conversation")
+
+class ScreeningRequest(BaseModel):
+    top_k: int = Field(default=20, ge=1, le=SCREENING_MAX_TOP_K, description="Candidates to shortlist")
+    assess: bool = Field(default=True, description="Ask the LLM to assess the shortlisted candidates")
+
+class BatchJobDescriptionRequest(BaseModel):
+    items: List[JobDescriptionRequest] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+    concurrency: Optional[int] = Field(default=None, ge=1, description="Parallel generations, capped by the server limit")
+
+# Dependencies
+def get_job_description_generator(http_request: Request) -> JobDescriptionGenerator:
+    """Return the generator created at startup, falling back to the shared singleton"""
+    generator = getattr(http_request.app.state, "job_description_generator", None)
+    return generator or JobDescriptionGenerator()
+
+def get_job_queue(http_request: Request) -> JobQueue:
+    """Return the job queue started with the application"""
+    job_queue = getattr(http_request.app.state, "job_queue", None)
+    if job_queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+    return job_queue
+
+def get_assistant(http_request: Request) -> AssistantService:
+    """Return the assistant service started with the application"""
+    assistant = getattr(http_request.app.state, "assistant", None)
+    if assistant is None:
+        raise HTTPException(status_code=503, detail="Assistant is not running")
+    return assistant
+
+def get_resume_screener(http_request: Request) -> ResumeScreener:
+    """Return the resume screener created at startup"""
+    screener = getattr(http_request.app.state, "resume_screener", None)
+    if screener is None:
+        raise HTTPException(status_code=503, detail="Resume screening is not available")
+    return screener
+
+def get_performance_tracker(http_request: Request) -> PerformanceTracker:
+    """Return the performance tracker created at startup"""
+    tracker = getattr(http_request.app.state, "performance_tracker", None)
+    if tracker is None:
+        raise HTTPException(status_code=503, detail="Performance tracking is not available")
+    return tracker
+
+def get_feedback_analyzer(http_request: Request) -> FeedbackAnalyzer:
+    """Return the feedback analyzer created at startup"""
+    analyzer = getattr(http_request.app.state, "feedback_analyzer", None)
+    if analyzer is None:
+        raise HTTPException(status_code=503, detail="Feedback analysis is not available")
+    return analyzer
+
+def get_dashboard(http_request: Request) -> DashboardMetrics:
+    """Return the dashboard aggregates created at startup"""
+    dashboard = getattr(http_request.app.state, "dashboard", None)
+    if dashboard is None:
+        raise HTTPException(status_code=503, detail="Dashboard metrics are not available")
+    return dashboard
+
+def require_profiler() -> None:
+    """Hide the profiler endpoints unless PROFILER_ENABLED is set"""
+    if not PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+def job_accepted_response(job: Dict[str, Any], **extra: Any) -> JSONResponse:
+    """202 response pointing the client at the job's status and event stream"""
+    location = f"/api/jobs/{job['id']}"
+    links = {"self": location, "events": f"{location}/events", **extra.pop("links", {})}
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job["id"],
+            "status": job["status"],
+            "priority": job["priority"],
+            **extra,
+            "links": links,
+        },
+        headers={"Location": location},
+    )
+
+def event_stream_response(events: AsyncIterator[Dict[str, Any]], http_request: Request) -> StreamingResponse:
+    """Stream events as SSE when the client accepts it, NDJSON otherwise"""
+    use_sse = "text/event-stream" in http_request.headers.get("accept", "")
+
+    async def encode():
+        async for event in events:
+            data = json.dumps(event)
+            yield f"event: {event.get('type', 'message')}\ndata: {data}\n\n" if use_sse else f"{data}\n"
+
+    return StreamingResponse(
+        encode(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+class JSONLinesBody:
+    """
+    Records of a JSON Lines request body, validated against a model as the body streams in.
+
+    Iterating yields each valid record as a dict; invalid lines are counted in
+    ``invalid`` and the first few are described in ``errors``.
+    """
+    MAX_ERRORS = 20
+
+    def __init__(self, http_request: Request, model: type):
+        self.http_request = http_request
+        self.model = model
+        self.invalid = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    async def _lines(self) -> AsyncIterator[bytes]:
+        buffer = b""
+        async for chunk in self.http_request.stream():
+            buffer += chunk
+            *complete, buffer = buffer.split(b"\n")
+            for line in complete:
+                yield line
+        yield buffer
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        number = 0
+        async for line in self._lines():
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield self.model.model_validate_json(line).model_dump()
+            except ValidationError as e:
+                if len(self.errors) < self.MAX_ERRORS:
+                    error = e.errors()[0]
+                    location = ".".join(str(part) for part in error["loc"])
+                    self.errors.append({"line": number, "detail": f"{location}: {error['msg']}" if location else error["msg"]})
+                self.invalid += 1
 
 # Endpoints
 @router.post("/generate-job-description")
-async def generate_job_description(request: JobDescriptionRequest):
-    """Generate a job description based on parameters"""
+async def generate_job_description(request: JobDescriptionRequest, http_request: Request,
+                                   mode: Optional[GenerationMode] = None,
+                                   priority: JobPriority = "normal",
+                                   generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """
+    Generate a job description based on parameters.
+
+    ``mode`` selects delivery: ``sync`` waits for the description, ``stream``
+    sends it section by section (as ``/generate-job-description/stream``) and
+    ``queued`` answers 202 with a job ID at once; poll ``/api/jobs/{id}`` or
+    subscribe to ``/api/jobs/{id}/events`` for the result. Without ``mode``, a
+    ``Prefer: respond-async`` header selects ``queued``.
+
+    The body's ``tier`` selects how it is written: ``llm`` in full, ``refine``
+    (a template draft of which the LLM rewrites only the overview and
+    responsibilities) or ``template`` (from the phrase library, no LLM call).
+    """
+    if mode is None:
+        mode = "queued" if "respond-async" in http_request.headers.get("prefer", "") else DEFAULT_GENERATION_MODE
+    if mode == "stream":
+        return event_stream_response(generator.stream_job_description(request), http_request)
+    if mode == "queued":
+        job = await get_job_queue(http_request).submit(
+            GENERATION_JOB_KIND, request.model_dump(), priority=priority, max_attempts=JOB_MAX_ATTEMPTS
+        )
+        return job_accepted_response(job)
     try:
-        generator = JobDescriptionGenerator()
         result = await generator.generate_job_description(request)
         return result
+    except (CircuitOpenError, DeadlineExceeded):
+        raise  # 503 / 504 from the app's exception handlers
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate-job-description/stream")
+async def stream_job_description(request: JobDescriptionRequest, http_request: Request,
+                                 generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """
+    Stream a job description section by section.
+
+    Responds with Server-Sent Events when the client accepts ``text/event-stream``
+    and with newline-delimited JSON otherwise.
+    """
+    return event_stream_response(generator.stream_job_description(request), http_request)
+
+@router.post("/generate-job-descriptions/batch")
+async def generate_job_descriptions_batch(batch: BatchJobDescriptionRequest, http_request: Request,
+                                          stream: bool = False,
+                                          generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """
+    Generate job descriptions for many roles at once.
+
+    Identical entries are generated once. Each item reports its own result or
+    error, so one failure never fails the batch. With ``stream=true`` results are
+    sent as each item finishes instead of in one response.
+    """
+    concurrency = min(batch.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    results = generator.generate_batch(batch.items, concurrency=concurrency)
+
+    if stream:
+        async def events():
+            async for result in results:
+                yield {"type": "result", **result}
+        return event_stream_response(events(), http_request)
+
+    ordered = sorted([result async for result in results], key=lambda result: result["index"])
+    failed = sum(1 for result in ordered if result["status"] == "error")
+    return {
+        "results": ordered,
+        "summary": {"total": len(ordered), "succeeded": len(ordered) - failed, "failed": failed},
+    }
+
+@router.get("/job-descriptions")
+async def list_job_descriptions(limit: int = Query(20, ge=1, le=PAGE_MAX_LIMIT),
+                                cursor: Optional[str] = None,
+                                department: Optional[str] = None,
+                                generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """List stored job descriptions, newest first; pass ``next_cursor`` back to page"""
+    try:
+        return await asyncio.to_thread(generator.store.list, limit, cursor, department)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/job-descriptions/search")
+async def search_job_descriptions(q: str = Query(..., min_length=1, max_length=200),
+                                  limit: int = Query(20, ge=1, le=PAGE_MAX_LIMIT),
+                                  cursor: Optional[str] = None,
+                                  generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """Full-text search over stored job descriptions, best matches first"""
+    try:
+        return await asyncio.to_thread(generator.store.search, q, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/job-descriptions/similarity/stats")
+async def similarity_stats(generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """Near-duplicate index size and how often stored descriptions were reused or used as seeds"""
+    return generator.similar_requests.stats()
+
+@router.get("/job-descriptions/templates/stats")
+async def template_writer_stats(generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """Phrase library version and coverage, the default tier and how many template descriptions were written"""
+    return {
+        "default_tier": generator.default_tier,
+        "template_fallback": generator.template_fallback,
+        **generator.template_writer.stats(),
+    }
+
+@router.get("/job-descriptions/{job_description_id}")
+async def get_job_description(job_description_id: int,
+                              generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """Return a stored job description with the parameters it was generated from"""
+    record = await asyncio.to_thread(generator.store.get, job_description_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return record
+
+@router.post("/job-descriptions/{job_description_id}/resumes")
+async def upload_resumes(job_description_id: int, http_request: Request,
+                         candidate_id: Optional[str] = Query(None, max_length=200),
+                         screener: ResumeScreener = Depends(get_resume_screener)):
+    """
+    Add applicants' resumes to a job description.
+
+    Accepts JSON Lines (one ``{"candidate_id", "text", "name", "metadata"}``
+    object per line), read as it streams in, or a single plain-text resume with
+    ``candidate_id`` in the query string. Candidates already on file are skipped.
+    """
+    if not await asyncio.to_thread(screener.job_descriptions.exists, job_description_id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    if http_request.headers.get("content-type", "").startswith("text/plain"):
+        if not candidate_id:
+            raise HTTPException(status_code=422, detail="candidate_id is required for a plain-text resume")
+        text = (await http_request.body()).decode("utf-8", errors="replace")
+        if not text.strip():
+            raise HTTPException(status_code=422, detail="Resume is empty")
+
+        async def single_resume():
+            yield {"candidate_id": candidate_id, "text": text}
+
+        result = await screener.ingest(job_description_id, single_resume())
+        return {"job_description_id": job_description_id, **result, "invalid": 0, "errors": []}
+
+    resumes = JSONLinesBody(http_request, ResumeSubmission)
+    result = await screener.ingest(job_description_id, resumes)
+    return {"job_description_id": job_description_id, **result, "invalid": resumes.invalid, "errors": resumes.errors}
+
+@router.post("/job-descriptions/{job_description_id}/screen")
+async def screen_candidates(job_description_id: int, request: Optional[ScreeningRequest] = None,
+                            screener: ResumeScreener = Depends(get_resume_screener)):
+    """
+    Rank every applicant against the job description's qualifications and assess the best.
+
+    All resumes are scored locally with BM25; only the ``top_k`` highest-ranked
+    candidates are sent to the LLM for a detailed assessment.
+    """
+    request = request or ScreeningRequest()
+    result = await screener.screen(job_description_id, top_k=request.top_k, assess=request.assess)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return result
+
+@router.get("/job-descriptions/{job_description_id}/resumes/stats")
+async def resume_index_stats(job_description_id: int, screener: ResumeScreener = Depends(get_resume_screener)):
+    """Size of the resume index for a job description in this worker"""
+    stats = await asyncio.to_thread(screener.stats, job_description_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return stats
+
+@router.post("/performance/reviews")
+async def upload_reviews(http_request: Request, tracker: PerformanceTracker = Depends(get_performance_tracker)):
+    """
+    Add performance reviews as JSON Lines, one review object per line, read as it streams in.
+
+    A review for an employee and cycle that already has one replaces it.
+    """
+    reviews = JSONLinesBody(http_request, PerformanceReview)
+    result = await tracker.ingest(reviews)
+    return {**result, "invalid": reviews.invalid, "errors": reviews.errors}
+
+@router.get("/performance/summary")
+async def performance_summary(cycle: Optional[str] = Query(None, max_length=40),
+                              tracker: PerformanceTracker = Depends(get_performance_tracker)):
+    """Company-wide review figures for a cycle (the latest by default) with the change from the previous cycle"""
+    result = await asyncio.to_thread(tracker.analytics.summary, cycle)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No reviews for this cycle")
+    return result
+
+@router.get("/performance/departments")
+async def performance_departments(cycle: Optional[str] = Query(None, max_length=40),
+                                  tracker: PerformanceTracker = Depends(get_performance_tracker)):
+    """Departments ranked by average review score for a cycle"""
+    result = await asyncio.to_thread(tracker.analytics.groups, "department", cycle)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No reviews for this cycle")
+    return result
+
+@router.get("/performance/teams")
+async def performance_teams(cycle: Optional[str] = Query(None, max_length=40),
+                            department: Optional[str] = Query(None, max_length=100),
+                            tracker: PerformanceTracker = Depends(get_performance_tracker)):
+    """Teams ranked by average review score for a cycle, optionally within one department"""
+    result = await asyncio.to_thread(tracker.analytics.groups, "team", cycle, department)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No reviews for this cycle")
+    return result
+
+@router.get("/performance/trend")
+async def performance_trend(department: Optional[str] = Query(None, max_length=100),
+                            team: Optional[str] = Query(None, max_length=100),
+                            tracker: PerformanceTracker = Depends(get_performance_tracker)):
+    """Review figures per cycle for the company, a department, or a team (which requires its department)"""
+    if team is not None and department is None:
+        raise HTTPException(status_code=422, detail="department is required with team")
+    dimension = "team" if team is not None else "department" if department is not None else None
+    result = await asyncio.to_thread(tracker.analytics.trend, dimension, department, team)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Department or team not found")
+    return result
+
+@router.get("/performance/distribution")
+async def performance_distribution(cycle: Optional[str] = Query(None, max_length=40),
+                                   department: Optional[str] = Query(None, max_length=100),
+                                   team: Optional[str] = Query(None, max_length=100),
+                                   bins: int = Query(10, ge=1, le=100),
+                                   tracker: PerformanceTracker = Depends(get_performance_tracker)):
+    """Review score histogram and percentiles for a cycle, optionally within a department or team"""
+    if team is not None and department is None:
+        raise HTTPException(status_code=422, detail="department is required with team")
+    result = await asyncio.to_thread(tracker.analytics.distribution, cycle, department, team, bins)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No reviews for this cycle, department or team")
+    return result
+
+@router.get("/performance/employees/{employee_id}")
+async def employee_reviews(employee_id: str, tracker: PerformanceTracker = Depends(get_performance_tracker)):
+    """An employee's reviews across cycles"""
+    result = await asyncio.to_thread(tracker.analytics.employee_history, employee_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return result
+
+@router.get("/performance/stats")
+async def performance_stats(tracker: PerformanceTracker = Depends(get_performance_tracker)):
+    """Size of the review store and this worker's aggregates"""
+    return await asyncio.to_thread(tracker.analytics.stats)
+
+@router.get("/dashboard")
+async def dashboard_metrics(http_request: Request, dashboard: DashboardMetrics = Depends(get_dashboard)):
+    """
+    Figures for the dashboard's metric cards.
+
+    Served from an in-memory snapshot of incrementally maintained aggregates,
+    at most ``DASHBOARD_TTL_SECONDS`` old, with an ETag for conditional requests.
+    """
+    return await dashboard.response(http_request)
+
+@router.get("/dashboard/stats")
+async def dashboard_stats(dashboard: DashboardMetrics = Depends(get_dashboard)):
+    """Refresh activity and source positions of the dashboard aggregates"""
+    return dashboard.stats()
+
+@router.post("/feedback/analyses")
+async def create_feedback_analysis(http_request: Request,
+                                   format: Optional[Literal["csv", "jsonl"]] = None,
+                                   text_field: Optional[str] = Query(None, max_length=100),
+                                   id_field: Optional[str] = Query(None, max_length=100),
+                                   priority: JobPriority = "low",
+                                   analyzer: FeedbackAnalyzer = Depends(get_feedback_analyzer)):
+    """
+    Analyze a survey export's free-text comments for sentiment and themes.
+
+    The body is a CSV or JSON Lines export, stored as it streams in; the
+    format defaults to CSV for ``text/csv`` bodies and JSON Lines otherwise.
+    The analysis runs as a background job whose progress is reported at
+    ``/api/jobs/{job_id}``; a retried job resumes from its last checkpoint.
+    """
+    job_queue = get_job_queue(http_request)
+    if format is None:
+        content_type = http_request.headers.get("content-type", "")
+        format = "csv" if content_type.startswith(("text/csv", "application/csv")) else "jsonl"
+    try:
+        analysis = await analyzer.create_analysis(http_request.stream(), format, text_field, id_field)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    job = await job_queue.submit(FEEDBACK_JOB_KIND, {"analysis_id": analysis["id"]},
+                                 priority=priority, max_attempts=JOB_MAX_ATTEMPTS)
+    await asyncio.to_thread(analyzer.attach_job, analysis, job["id"])
+    location = f"/api/feedback/analyses/{analysis['id']}"
+    return job_accepted_response(job, analysis_id=analysis["id"],
+                                 links={"analysis": location, "comments": f"{location}/comments"})
+
+@router.get("/feedback/analyses/{analysis_id}")
+async def get_feedback_analysis(analysis_id: str, analyzer: FeedbackAnalyzer = Depends(get_feedback_analyzer)):
+    """An analysis's stage and counts, with its summary once it has completed"""
+    analysis = await asyncio.to_thread(analyzer.get, analysis_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail="Feedback analysis not found")
+    return analysis
+
+@router.get("/feedback/analyses/{analysis_id}/comments")
+async def feedback_analysis_comments(analysis_id: str, analyzer: FeedbackAnalyzer = Depends(get_feedback_analyzer)):
+    """Every comment with its cluster, sentiment and theme, as JSON Lines"""
+    analysis = await asyncio.to_thread(analyzer.get, analysis_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail="Feedback analysis not found")
+    if analysis["stage"] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Feedback analysis is still {analysis['stage']}")
+    return FileResponse(analyzer.results_path(analysis_id), media_type="application/x-ndjson",
+                        filename=f"feedback-{analysis_id}.jsonl")
+
+@router.get("/jobs/stats")
+async def job_stats(job_queue: JobQueue = Depends(get_job_queue)):
+    """Jobs by status plus this process's worker activity"""
+    return await job_queue.stats()
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, job_queue: JobQueue = Depends(get_job_queue)):
+    """Status of a queued job, with its result once it has succeeded"""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, http_request: Request, job_queue: JobQueue = Depends(get_job_queue)):
+    """
+    Subscribe to a job's status changes.
+
+    Emits the job record on every change until it succeeds, fails or is
+    cancelled, as SSE events named after the status or as NDJSON.
+    """
+    if await job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        async for job in job_queue.watch(job_id):
+            yield {"type": job["status"], "job": job}
+
+    return event_stream_response(events(), http_request)
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str, job_queue: JobQueue = Depends(get_job_queue)):
+    """Cancel a job that has not started yet"""
+    if await job_queue.cancel(job_id):
+        return {"job_id": job_id, "status": "cancelled"}
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    raise HTTPException(status_code=409, detail=f"Job is already {job['status']}")
+
+@router.websocket("/assistant/ws")
+async def assistant_socket(websocket: WebSocket, session_id: Optional[str] = None):
+    """
+    Chat with the AI assistant over a WebSocket.
+
+    The server first sends ``{"type": "session", "session_id": ...}``; pass that
+    ID back as ``?session_id=`` when reconnecting to resume the conversation.
+    Each ``{"type": "message", "text": ...}`` from the client is answered with
+    ``start``, a stream of ``token`` events and ``end`` (or ``error``).
+    """
+    assistant = getattr(websocket.app.state, "assistant", None)
+    if assistant is None:
+        await websocket.close(code=1013, reason="Assistant is not running")
+        return
+    await websocket.accept()
+    session = await assistant.open_session(session_id)
+    await websocket.send_json({"type": "session", "session_id": session.id, "resumed": session.id == session_id})
+    try:
+        while True:
+            try:
+                data = await websocket.receive_json()
+            except (ValueError, KeyError):
+                await websocket.send_json({"type": "error", "error": "Messages must be JSON objects"})
+                continue
+            if not isinstance(data, dict) or data.get("type") != "message" or not isinstance(data.get("text"), str):
+                await websocket.send_json({"type": "error", "error": 'Expected {"type": "message", "text": ...}'})
+                continue
+            async for event in assistant.reply(session, data["text"]):
+                await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+
+@router.post("/assistant/messages")
+async def assistant_message(message: AssistantMessage, http_request: Request,
+                            assistant: AssistantService = Depends(get_assistant)):
+    """
+    Send one assistant message without a WebSocket.
+
+    Streams the same events as the WebSocket as SSE or NDJSON; the ``start``
+    event carries the session ID to send with the next message.
+    """
+    session = await assistant.open_session(message.session_id)
+    return event_stream_response(assistant.reply(session, message.text), http_request)
+
+@router.delete("/assistant/sessions/{session_id}")
+async def end_assistant_session(session_id: str, assistant: AssistantService = Depends(get_assistant)):
+    """Forget a conversation"""
+    if not await assistant.end_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": session_id, "deleted": True}
+
+@router.get("/assistant/stats")
+async def assistant_stats(assistant: AssistantService = Depends(get_assistant)):
+    """Session counts, evictions and pending summaries for this worker"""
+    return assistant.stats()
+
+@router.post("/knowledge-base/reload")
+async def reload_knowledge_base(force: bool = False,
+                                generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """Re-index the industry knowledge base if its source changed (or unconditionally with ``force``)"""
+    knowledge_base = generator.knowledge_base
+    # Reading and indexing the source is blocking work
+    reloaded = await asyncio.to_thread(knowledge_base.reload, force)
+    return {
+        "reloaded": reloaded,
+        "version": knowledge_base.version,
+        "departments": len(knowledge_base.departments),
+    }
+
+@router.get("/prompt-templates/stats")
+async def prompt_template_stats(generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """Token counts for the shared prompt prefix and each compiled template"""
+    return generator.prompt_templates.stats()
+
+@router.get("/section-pipeline/stats")
+async def section_pipeline_stats(generator: JobDescriptionGenerator = Depends(get_job_description_generator)):
+    """Parallel section generation runs, resumed branches and the branch layout"""
+    return {"strategy": generator.generation_strategy, **generator.section_pipeline.stats()}
+
+@router.get("/gemini/stats")
+async def gemini_stats():
+    """LLM backend statistics: queue depth, wait times, quota usage, hedging and the circuit breaker"""
+    return GeminiService.stats()
+
+@router.post("/debug/profiler/start", dependencies=[Depends(require_profiler)])
+async def start_profiler(interval_ms: float = Query(10.0, ge=1.0, le=1000.0),
+                         duration_s: float = Query(30.0, gt=0, le=600.0),
+                         all_threads: bool = False):
+    """
+    Start sampling this worker's stacks.
+
+    Samples the event loop thread unless ``all_threads`` is set, and stops on
+    its own after ``duration_s``. Each worker process profiles independently.
+    """
+    try:
+        PROFILER.start(interval=interval_ms / 1000, duration=duration_s,
+                       thread_id=None if all_threads else threading.get_ident())
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PROFILER.summary(top=0)
+
+@router.post("/debug/profiler/stop", dependencies=[Depends(require_profiler)])
+async def stop_profiler():
+    """Stop sampling and return the hottest functions"""
+    PROFILER.stop()
+    return PROFILER.summary()
+
+@router.get("/debug/profiler", dependencies=[Depends(require_profiler)])
+async def profiler_report(format: Literal["summary", "folded"] = "summary", top: int = Query(30, ge=1, le=500)):
+    """Current profile: hottest functions, or folded stacks for flame graph tools"""
+    if format == "folded":
+        return PlainTextResponse(PROFILER.folded())
+    return PROFILER.summary(top=top)
+
 @router.get("/health")
 async def health_check():
     """System health check endpoint"""
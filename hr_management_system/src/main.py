@@ -1,23 +1,16 @@
 import os
 import sys
-import logging
 import asyncio
-import uvicorn
+import logging
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi import APIRouter, FastAPI, Request, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 
-# Establish consistent logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
 # Path resolution with runtime validation
@@ -26,150 +19,32 @@ STATIC_DIR = os.path.join(BASE_DIR, "ui", "static")
 TEMPLATES_DIR = os.path.join(BASE_DIR, "ui", "templates")
 ROOT_DIR = os.path.dirname(BASE_DIR)
 
-# Ensure static asset directories exist
-os.makedirs(os.path.join(STATIC_DIR, "css"), exist_ok=True)
-os.makedirs(os.path.join(STATIC_DIR, "js"), exist_ok=True)
-os.makedirs(os.path.join(STATIC_DIR, "img"), exist_ok=True)
-
-# Create minimal CSS file if it doesn't exist
-css_file_path = os.path.join(STATIC_DIR, "css", "main.css")
-if not os.path.exists(css_file_path):
-    with open(css_file_path, "w") as f:
-        f.write("""
-:root {
-    --primary-color: #4285F4;
-    --primary-dark: #3367D6;
-    --secondary-color: #34A853;
-    --warning-color: #FBBC05;
-    --error-color: #EA4335;
-    --background-color: #F8F9FA;
-    --card-color: #FFFFFF;
-    --text-primary: #202124;
-    --text-secondary: #5F6368;
-    --border-color: #DADCE0;
-    --sidebar-width: 250px;
-    --header-height: 64px;
-    --shadow-sm: 0 1px 2px 0 rgba(60, 64, 67, 0.3), 0 1px 3px 1px rgba(60, 64, 67, 0.15);
-    --shadow-md: 0 2px 6px 2px rgba(60, 64, 67, 0.15), 0 1px 2px 0 rgba(60, 64, 67, 0.3);
-    --border-radius: 8px;
-}
-
-* {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}
-
-body {
-    font-family: 'Roboto', sans-serif;
-    background-color: var(--background-color);
-    color: var(--text-primary);
-    line-height: 1.5;
-}
-
-/* Layout */
-.app-container {
-    display: flex;
-    min-height: 100vh;
-}
-
-.sidebar {
-    width: var(--sidebar-width);
-    background-color: var(--card-color);
-    box-shadow: var(--shadow-sm);
-    padding: 20px 0;
-    position: fixed;
-    height: 100vh;
-    z-index: 10;
-}
-
-.sidebar-header {
-    padding: 0 20px 20px;
-    border-bottom: 1px solid var(--border-color);
-}
-
-.sidebar-header h1 {
-    font-size: 1.5rem;
-    font-weight: 500;
-    color: var(--primary-color);
-}
-
-.sidebar-header p {
-    font-size: 0.875rem;
-    color: var(--text-secondary);
-}
-
-.sidebar-nav {
-    margin-top: 20px;
-}
-
-.nav-item {
-    display: flex;
-    align-items: center;
-    padding: 12px 20px;
-    color: var(--text-secondary);
-    text-decoration: none;
-    transition: background-color 0.2s;
-}
-
-.nav-item:hover {
-    background-color: rgba(66, 133, 244, 0.08);
-}
-
-.nav-item.active {
-    background-color: rgba(66, 133, 244, 0.12);
-    color: var(--primary-color);
-    font-weight: 500;
-}
-
-.nav-item span {
-    margin-right: 12px;
-}
-
-.main-content {
-    flex: 1;
-    margin-left: var(--sidebar-width);
-}
-
-.main-header {
-    height: var(--header-height);
-    background-color: var(--card-color);
-    box-shadow: var(--shadow-sm);
-    display: flex;
-    align-items: center;
-    justify-content: space-between;
-    padding: 0 24px;
-    position: sticky;
-    top: 0;
-    z-index: 5;
-}
-
-/* Basic responsive styles */
-@media (max-width: 768px) {
-    .sidebar {
-        width: 60px;
-    }
-    .main-content {
-        margin-left: 60px;
-    }
-    .sidebar-header h1, .sidebar-header p, .nav-item span:not(.material-icons) {
-        display: none;
-    }
-}
-        """)
-    logger.info(f"Created minimal CSS file at {css_file_path}")
-
-# Create minimal JavaScript file if it doesn't exist
-js_file_path = os.path.join(STATIC_DIR, "js", "main.js")
-if not os.path.exists(js_file_path):
-    with open(js_file_path, "w") as f:
-        f.write("""
-// Core JavaScript functionality
-document.addEventListener('DOMContentLoaded', function() {
-    console.log('HR Management System initialized');
-});
-        """)
-    logger.info(f"Created minimal JavaScript file at {js_file_path}")
+# Make the `src` package importable when launched from within src/
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Application services (the LLM SDK itself is imported when the backend starts)
+from src.api.routes import router as api_router
+from src.modules.assistant.assistant import AssistantService
+from src.modules.dashboard.dashboard_metrics import DashboardMetrics
+from src.modules.feedback.feedback_analysis import FEEDBACK_JOB_KIND, FeedbackAnalyzer
+from src.modules.gemini.client import GeminiService
+from src.modules.gemini.resilience import CircuitOpenError, DeadlineExceeded, DeadlineMiddleware
+from src.modules.jobs.job_queue import JobQueue
+from src.modules.performance.performance_tracker import PerformanceTracker
+from src.modules.recruitment.job_description_generator import GENERATION_JOB_KIND, JobDescriptionGenerator
+from src.modules.recruitment.resume_screening import ResumeScreener
+from src.ui.assets import AssetManifest, PrecompressedStaticFiles
+from src.ui.render_cache import PageRenderCache
+from src.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, MetricsMiddleware
+
+def configure_logging() -> None:
+    """Establish consistent logging configuration"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
 
 # Configure application lifecycle
 @asynccontextmanager
@@ -186,7 +61,47 @@ async def lifespan(app: FastAPI):
         else:
             logger.warning(f"No .env file found at {env_path}")
             
-        # Future integration point: Initialize AI services
+        # Fingerprint static assets (a no-op when the build is current)
+        app.state.asset_manifest.refresh(wait=True)
+            
+        # Initialize AI services: one pooled Gemini client and shared generator per process.
+        # The backend (and its SDK import) loads in the background so the app is ready at once.
+        app.state.job_description_generator = JobDescriptionGenerator()
+        GeminiService.start_in_background()
+
+        # Resume screening shares the generator's job description store
+        app.state.resume_screener = ResumeScreener(job_descriptions=app.state.job_description_generator.store)
+
+        # Performance reviews live in a columnar store shared by every worker
+        app.state.performance_tracker = PerformanceTracker()
+
+        # Survey feedback analyses run as checkpointed background jobs
+        app.state.feedback_analyzer = FeedbackAnalyzer()
+
+        # Dashboard cards are aggregated incrementally from the stores above
+        app.state.dashboard = DashboardMetrics(
+            job_descriptions=app.state.job_description_generator.store,
+            resumes=app.state.resume_screener.store,
+            performance=app.state.performance_tracker,
+            feedback=app.state.feedback_analyzer,
+        )
+
+        # Workers for queued generations and analyses; every process drains the shared job store
+        job_queue = JobQueue()
+        job_queue.register(GENERATION_JOB_KIND, app.state.job_description_generator.generate_for_job)
+        job_queue.register(FEEDBACK_JOB_KIND, app.state.feedback_analyzer.analyze,
+                           timeout=app.state.feedback_analyzer.job_timeout)
+        await job_queue.start()
+        app.state.job_queue = job_queue
+
+        # AI assistant chat sessions, with a background sweep of idle ones
+        assistant = AssistantService()
+        await assistant.start()
+        app.state.assistant = assistant
+
+        # Worker processes publish their metrics for whichever worker serves /metrics
+        if REGISTRY.multiprocess_dir:
+            app.state.metrics_flusher = asyncio.ensure_future(REGISTRY.run_flusher())
     except Exception as e:
         logger.error(f"Startup error: {str(e)}")
     
@@ -195,41 +110,22 @@ async def lifespan(app: FastAPI):
     # Shutdown phase
     logger.info("Application shutting down")
     try:
-        # Future integration point: Clean up resources
-        pass
+        # Let running jobs finish (or requeue them) while the LLM backend is still up
+        job_queue = getattr(app.state, "job_queue", None)
+        if job_queue is not None:
+            await job_queue.stop()
+        assistant = getattr(app.state, "assistant", None)
+        if assistant is not None:
+            await assistant.stop()
+        await GeminiService.shutdown()
+        flusher = getattr(app.state, "metrics_flusher", None)
+        if flusher is not None:
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
     except Exception as e:
         logger.error(f"Shutdown error: {str(e)}")
 
-# Initialize FastAPI application with metadata
-app = FastAPI(
-    title="HR Management System",
-    description="AI-powered human resources management system with Gemini integration",
-    version="1.0.0",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json",
-    lifespan=lifespan
-)
-
-# Mount static assets with explicit directory
-from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
-templates = Jinja2Templates(directory=TEMPLATES_DIR)
-templates.env.globals.update(url_for=lambda name, filename: f"/{name}/{filename}")
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
-
-
-# CORS configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 # Exception handlers
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with structured response"""
     return JSONResponse(
@@ -237,16 +133,29 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={"detail": exc.errors(), "body": exc.body},
     )
 
-@app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Custom HTTP exception handler with logging"""
     logger.error(f"HTTP Exception: {exc.detail}")
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None),
     )
 
-@app.exception_handler(500)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """LLM upstream degraded and nothing stored to serve: fail fast with a retry hint"""
+    logger.warning(f"Rejected {request.url.path}: {str(exc)}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, int(exc.retry_after + 0.5)))},
+    )
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    """The client's deadline (or the LLM call timeout) passed before an answer"""
+    logger.warning(f"Deadline exceeded for {request.url.path}: {str(exc)}")
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
 async def internal_exception_handler(request: Request, exc: Exception):
     """Fallback error handler with graceful degradation"""
     logger.error(f"Internal server error: {str(exc)}")
@@ -270,8 +179,10 @@ async def internal_exception_handler(request: Request, exc: Exception):
     </html>
     """, status_code=500)
 
-# Health check endpoint
-@app.get("/api/health")
+# Health check and UI routes
+ui_router = APIRouter()
+
+@ui_router.get("/api/health")
 async def health_check():
     """System health verification endpoint"""
     return {
@@ -280,71 +191,124 @@ async def health_check():
         "environment": os.getenv("ENVIRONMENT", "development")
     }
 
-# UI routes
-@app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
-    """Render dashboard homepage"""
+@ui_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics, summed over all worker processes"""
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+def render_page(request: Request, active_page: str, page_title: str):
+    """Serve a UI page from the application's render cache"""
     try:
-        return templates.TemplateResponse(
-            "base.html", 
-            {"request": request, "active_page": "dashboard", "page_title": "Dashboard"}
+        return request.app.state.page_cache.response(
+            request,
+            "base.html",
+            {"active_page": active_page, "page_title": page_title}
         )
     except Exception as e:
         logger.error(f"Template rendering error: {str(e)}")
         raise HTTPException(status_code=500, detail="Template rendering failed")
 
-@app.get("/recruitment", response_class=HTMLResponse)
+@ui_router.get("/", response_class=HTMLResponse)
+async def dashboard(request: Request):
+    """Render dashboard homepage"""
+    return render_page(request, "dashboard", "Dashboard")
+
+@ui_router.get("/recruitment", response_class=HTMLResponse)
 async def recruitment(request: Request):
     """Render recruitment management page"""
-    try:
-        return templates.TemplateResponse(
-            "base.html", 
-            {"request": request, "active_page": "recruitment", "page_title": "Recruitment"}
-        )
-    except Exception as e:
-        logger.error(f"Template rendering error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Template rendering failed")
+    return render_page(request, "recruitment", "Recruitment")
 
-@app.get("/performance", response_class=HTMLResponse)
+@ui_router.get("/performance", response_class=HTMLResponse)
 async def performance(request: Request):
     """Render performance tracking page"""
-    try:
-        return templates.TemplateResponse(
-            "base.html", 
-            {"request": request, "active_page": "performance", "page_title": "Performance"}
-        )
-    except Exception as e:
-        logger.error(f"Template rendering error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Template rendering failed")
+    return render_page(request, "performance", "Performance")
 
-@app.get("/feedback", response_class=HTMLResponse)
+@ui_router.get("/feedback", response_class=HTMLResponse)
 async def feedback(request: Request):
     """Render feedback analysis page"""
-    try:
-        return templates.TemplateResponse(
-            "base.html", 
-            {"request": request, "active_page": "feedback", "page_title": "Feedback"}
-        )
-    except Exception as e:
-        logger.error(f"Template rendering error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Template rendering failed")
+    return render_page(request, "feedback", "Feedback")
+
+def create_app() -> FastAPI:
+    """
+    Build a fully configured application instance.
+
+    Importing this module has no side effects; servers call this factory
+    (``uvicorn --factory src.main:create_app``) or use the module-level ``app``,
+    which is created on first access.
+    """
+    configure_logging()
+
+    # Initialize FastAPI application with metadata
+    app = FastAPI(
+        title="HR Management System",
+        description="AI-powered human resources management system with Gemini integration",
+        version="1.0.0",
+        docs_url="/api/docs",
+        redoc_url="/api/redoc",
+        openapi_url="/api/openapi.json",
+        lifespan=lifespan
+    )
+
+    # Templates resolve static assets to their fingerprinted build URLs
+    templates = Jinja2Templates(directory=TEMPLATES_DIR)
+    asset_manifest = AssetManifest(STATIC_DIR)
+
+    def url_for(name: str, filename: str = None, path: str = None) -> str:
+        filename = filename or path or ""
+        if name == "static":
+            return asset_manifest.url(filename)
+        return f"/{name}/{filename.lstrip('/')}"
+
+    templates.env.globals.update(url_for=url_for)
+    app.state.templates = templates
+    app.state.asset_manifest = asset_manifest
+    # UI pages depend only on their template, assets and a few constants, so each variant is rendered once
+    app.state.page_cache = PageRenderCache(templates, TEMPLATES_DIR, extra_version=asset_manifest.version)
+
+    # Fingerprinted builds are cached for a year; unfingerprinted sources remain available under /static
+    app.mount("/assets", PrecompressedStaticFiles(directory=asset_manifest.build_dir, check_dir=False), name="assets")
+    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+    # CORS configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Restrict in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Client deadlines (X-Request-Timeout) bound every LLM call the request makes
+    app.add_middleware(DeadlineMiddleware)
+
+    # Outermost, so request timing covers every other middleware
+    app.add_middleware(MetricsMiddleware)
+
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_exception_handler(CircuitOpenError, circuit_open_handler)
+    app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+    app.add_exception_handler(500, internal_exception_handler)
+
+    # Health check first, then API and UI routes
+    app.include_router(ui_router)
+    app.include_router(api_router, prefix="/api")
+    return app
+
+_app = None
+
+def __getattr__(name: str):
+    # `src.main:app` keeps working for servers and scripts: build the app on first access
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Application execution entry point
 if __name__ == "__main__":
-    logger.info("Initializing HR Management System")
-    
-    # Capture runtime configuration with fallback defaults
-    host = os.getenv("HOST", "127.0.0.1")
-    port = int(os.getenv("PORT", 8000))
-    debug = os.getenv("DEBUG", "True").lower() in ("true", "1", "t")
-    
-    logger.info(f"Server configuration: host={host}, port={port}, debug={debug}")
-    
-    # Launch application server with hot reload for development workflows
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=debug,
-        log_level="info"
-    )
\ No newline at end of file
+    # Profiles, worker processes and graceful shutdown are handled by src.serve
+    from src.serve import main
+
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+AI Assistant Module
+
+Chat service behind the UI's AI assistant: streams Gemini replies token by
+token and keeps each session's context within a fixed token budget.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from src.modules.assistant.session_store import Session, SessionStore
+from src.modules.gemini.backends import estimate_tokens
+from src.modules.gemini.client import GeminiService
+from src.utils.metrics import REGISTRY, stage
+
+logger = logging.getLogger(__name__)
+
+ASSISTANT_TURNS = REGISTRY.counter("hr_assistant_turns_total", "Assistant replies by outcome", ("outcome",))
+ASSISTANT_SUMMARIES = REGISTRY.counter("hr_assistant_summaries_total", "Conversation summaries folded in")
+
+# Invariant instructions, sent as the cached prefix of every assistant call
+ASSISTANT_PREFIX = """You are the AI assistant of an HR management system. You help HR professionals with recruitment, job descriptions, interviews, onboarding, performance reviews, employee relations and HR policy.
+
+Answer concisely and practically. Use short paragraphs or bullet points. If a question needs company-specific facts you were not given, say what you would need to know. Do not invent legal requirements; recommend checking local employment law where it matters.
+
+"""
+
+
+class AssistantService:
+    """
+    Streams assistant replies for sessions held in a ``SessionStore``.
+
+    Each prompt carries the session's rolling summary and recent turns, so its
+    size is bounded by the memory budgets rather than the conversation length.
+    Turns pushed out of the window are summarized in the background after the
+    reply has been sent, keeping the extra LLM call off the latency path.
+    """
+
+    def __init__(self, store: Optional[SessionStore] = None, max_reply_tokens: Optional[int] = None,
+                 temperature: float = 0.5, sweep_interval: Optional[float] = None):
+        self.store = store or SessionStore()
+        self.max_reply_tokens = max_reply_tokens or int(os.getenv("ASSISTANT_MAX_REPLY_TOKENS", 800))
+        self.max_message_chars = int(os.getenv("ASSISTANT_MAX_MESSAGE_CHARS", 4000))
+        self.temperature = temperature
+        self.sweep_interval = sweep_interval or float(os.getenv("ASSISTANT_SWEEP_INTERVAL", 60))
+        self._summaries: Dict[str, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the idle-session sweeper; called from the lifespan hook."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.ensure_future(self._sweep())
+
+    async def stop(self) -> None:
+        """Stop the sweeper and let pending summaries finish so they reach the disk tier."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        if self._summaries:
+            await asyncio.wait(list(self._summaries.values()), timeout=10)
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                evicted = self.store.evict_idle()
+                pruned = await asyncio.to_thread(self.store.prune_disk)
+                if evicted or pruned:
+                    logger.info(f"Evicted {evicted} idle assistant sessions, pruned {pruned} session files")
+            except Exception as e:
+                logger.error(f"Assistant session sweep failed: {str(e)}")
+
+    async def open_session(self, session_id: Optional[str] = None) -> Session:
+        return await self.store.get_or_create(session_id)
+
+    async def reply(self, session: Session, message: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the reply to ``message`` as events.
+
+        Yields a ``start`` event, one ``token`` event per chunk from the model and
+        an ``end`` event with usage figures, or an ``error`` event if generation
+        fails. Messages in the same session are answered one at a time.
+        """
+        message = message.strip()
+        if not message:
+            yield {"type": "error", "error": "Message is empty"}
+            return
+        if len(message) > self.max_message_chars:
+            yield {"type": "error", "error": f"Message exceeds {self.max_message_chars} characters"}
+            return
+
+        async with session.lock:
+            session.touch()
+            memory = session.memory
+            context = memory.context()
+            prompt = f"{context}\n\nUser: {message}\nAssistant:" if context else f"User: {message}\nAssistant:"
+            yield {"type": "start", "session_id": session.id}
+
+            started = time.perf_counter()
+            parts = []
+            try:
+                with stage("assistant_llm"):
+                    async for chunk in GeminiService.generate_content_stream(
+                        prompt, temperature=self.temperature, max_tokens=self.max_reply_tokens,
+                        prefix=ASSISTANT_PREFIX,
+                    ):
+                        parts.append(chunk)
+                        yield {"type": "token", "text": chunk}
+            except Exception as e:
+                ASSISTANT_TURNS.labels("error").inc()
+                logger.error(f"Assistant reply failed for session {session.id}: {str(e)}")
+                yield {"type": "error", "error": "The assistant is unavailable, please try again"}
+                return
+
+            reply = "".join(parts).strip()
+            memory.add("user", message)
+            memory.add("assistant", reply)
+            session.touch()
+            ASSISTANT_TURNS.labels("ok").inc()
+            yield {
+                "type": "end",
+                "session_id": session.id,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "usage": {
+                    "prompt_tokens": estimate_tokens(ASSISTANT_PREFIX) + estimate_tokens(prompt),
+                    "reply_tokens": estimate_tokens(reply),
+                    "memory": memory.stats(),
+                },
+            }
+
+        if memory.needs_summary:
+            self._schedule_summary(session)
+        else:
+            await self.store.save(session)
+
+    def _schedule_summary(self, session: Session) -> None:
+        # One summary per session at a time; turns evicted meanwhile wait for the next reply
+        if session.id in self._summaries:
+            return
+        task = asyncio.ensure_future(self._summarize(session))
+        self._summaries[session.id] = task
+        task.add_done_callback(lambda _: self._summaries.pop(session.id, None))
+
+    async def _summarize(self, session: Session) -> None:
+        # Runs without the session lock so the next message is not held up by it
+        with stage("assistant_summary"):
+            await session.memory.summarize(self._generate_summary)
+        ASSISTANT_SUMMARIES.inc()
+        await self.store.save(session)
+
+    async def _generate_summary(self, prompt: str, max_tokens: int) -> str:
+        return await GeminiService.generate_content(prompt, temperature=0.2, max_tokens=max_tokens)
+
+    async def end_session(self, session_id: str) -> bool:
+        return await self.store.delete(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.store.stats(), "pending_summaries": len(self._summaries)}
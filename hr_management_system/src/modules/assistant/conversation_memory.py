@@ -0,0 +1,139 @@
+"""
+Conversation Memory Module
+
+Token-budgeted memory for assistant conversations: a sliding window of the
+most recent turns plus a rolling summary of everything older, so the prompt
+stays the same size however long a conversation runs.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.modules.gemini.backends import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between an HR professional and an assistant.
+
+CURRENT SUMMARY:
+{summary}
+
+NEW TURNS TO FOLD IN:
+{turns}
+
+Write the updated summary in at most {max_words} words. Keep names, numbers, decisions, open questions and the user's goals; drop pleasantries. Return only the summary text."""
+
+
+@dataclass
+class Turn:
+    """One message in a conversation."""
+    role: str
+    text: str
+    tokens: int
+
+    @classmethod
+    def create(cls, role: str, text: str) -> "Turn":
+        return cls(role, text, estimate_tokens(text))
+
+    def render(self) -> str:
+        return f"{'User' if self.role == 'user' else 'Assistant'}: {self.text}"
+
+
+@dataclass
+class ConversationMemory:
+    """
+    Recent turns within ``window_tokens`` plus a summary of at most ``summary_tokens``.
+
+    Turns pushed out of the window wait in ``evicted`` until ``summarize`` folds
+    them into the summary. Until then they are dropped from prompts rather than
+    letting the prompt grow, so a slow or failed summary costs context, never
+    latency.
+    """
+    window_tokens: int = 1500
+    summary_tokens: int = 300
+    summary: str = ""
+    turns: List[Turn] = field(default_factory=list)
+    evicted: List[Turn] = field(default_factory=list)
+    summarized_turns: int = 0
+
+    @property
+    def window_size(self) -> int:
+        return sum(turn.tokens for turn in self.turns)
+
+    @property
+    def needs_summary(self) -> bool:
+        return bool(self.evicted)
+
+    def add(self, role: str, text: str) -> None:
+        """Append a turn, evicting the oldest ones beyond the window budget (the newest always stays)."""
+        self.turns.append(Turn.create(role, text))
+        while len(self.turns) > 1 and self.window_size > self.window_tokens:
+            self.evicted.append(self.turns.pop(0))
+
+    def context(self) -> str:
+        """The summary and recent turns, formatted for the next prompt."""
+        sections = []
+        if self.summary:
+            sections.append(f"SUMMARY OF EARLIER CONVERSATION:\n{self.summary}")
+        if self.turns:
+            sections.append("RECENT CONVERSATION:\n" + "\n".join(turn.render() for turn in self.turns))
+        return "\n\n".join(sections)
+
+    async def summarize(self, generate: Callable[..., Awaitable[str]]) -> None:
+        """
+        Fold evicted turns into the summary with one short LLM call.
+
+        ``generate(prompt, max_tokens=...)`` produces the text. On failure the
+        summary is extended with the truncated turns instead, so nothing is
+        retried on the next message.
+        """
+        if not self.evicted:
+            return
+        pending, self.evicted = self.evicted, []
+        turns_text = "\n".join(turn.render() for turn in pending)
+        prompt = SUMMARY_PROMPT.format(
+            summary=self.summary or "(none yet)",
+            turns=turns_text,
+            max_words=int(self.summary_tokens * 0.75),
+        )
+        try:
+            summary = (await generate(prompt, max_tokens=self.summary_tokens)).strip()
+        except Exception as e:
+            logger.warning(f"Conversation summary failed, truncating instead: {str(e)}")
+            summary = f"{self.summary}\n{turns_text}".strip()
+        self.summary = self._truncate(summary)
+        self.summarized_turns += len(pending)
+
+    def _truncate(self, text: str) -> str:
+        """Keep the most recent part of ``text`` within the summary budget."""
+        max_chars = self.summary_tokens * 4
+        return text if len(text) <= max_chars else "…" + text[-max_chars:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "summary": self.summary,
+            "turns": [[turn.role, turn.text] for turn in self.turns],
+            "evicted": [[turn.role, turn.text] for turn in self.evicted],
+            "summarized_turns": self.summarized_turns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], window_tokens: int, summary_tokens: int) -> "ConversationMemory":
+        return cls(
+            window_tokens=window_tokens,
+            summary_tokens=summary_tokens,
+            summary=data.get("summary", ""),
+            turns=[Turn.create(role, text) for role, text in data.get("turns", [])],
+            evicted=[Turn.create(role, text) for role, text in data.get("evicted", [])],
+            summarized_turns=data.get("summarized_turns", 0),
+        )
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        return {
+            "turns": len(self.turns),
+            "window_tokens": self.window_size,
+            "summary_tokens": estimate_tokens(self.summary) if self.summary else 0,
+            "pending_summary_turns": len(self.evicted),
+            "summarized_turns": self.summarized_turns,
+        }
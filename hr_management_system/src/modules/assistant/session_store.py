@@ -0,0 +1,192 @@
+"""
+Assistant Session Store
+
+Keeps assistant conversations in a bounded in-memory LRU with idle eviction
+and, when a directory is configured, in JSON files so a conversation survives
+restarts and can continue on any worker process.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from src.modules.assistant.conversation_memory import ConversationMemory
+
+logger = logging.getLogger(__name__)
+
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass
+class Session:
+    """One conversation and its bookkeeping."""
+    id: str
+    memory: ConversationMemory
+    created_at: float = field(default_factory=time.time)
+    last_active: float = field(default_factory=time.time)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def touch(self) -> None:
+        self.last_active = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "created_at": self.created_at,
+            "last_active": self.last_active,
+            "memory": self.memory.to_dict(),
+        }
+
+
+class SessionStore:
+    """
+    Two-tier session store.
+
+    The memory tier holds at most ``max_sessions`` sessions and drops those
+    idle for ``idle_seconds``. With ``disk_dir`` set, sessions are written
+    through after every turn and reloaded on a memory miss until they have
+    been idle for ``disk_ttl_seconds``; without it an evicted session is gone.
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, idle_seconds: Optional[float] = None,
+                 disk_dir: Optional[str] = None, disk_ttl_seconds: Optional[float] = None,
+                 window_tokens: Optional[int] = None, summary_tokens: Optional[int] = None):
+        self.max_sessions = max(1, max_sessions or int(os.getenv("ASSISTANT_MAX_SESSIONS", 10000)))
+        self.idle_seconds = idle_seconds or float(os.getenv("ASSISTANT_SESSION_IDLE_SECONDS", 1800))
+        self.disk_dir = disk_dir if disk_dir is not None else os.getenv("ASSISTANT_SESSION_DIR") or None
+        self.disk_ttl_seconds = disk_ttl_seconds or float(os.getenv("ASSISTANT_SESSION_TTL_SECONDS", 7 * 24 * 3600))
+        self.window_tokens = window_tokens or int(os.getenv("ASSISTANT_WINDOW_TOKENS", 1500))
+        self.summary_tokens = summary_tokens or int(os.getenv("ASSISTANT_SUMMARY_TOKENS", 300))
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._stats = {"created": 0, "resumed_from_disk": 0, "evicted_idle": 0, "evicted_capacity": 0}
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _new_memory(self) -> ConversationMemory:
+        return ConversationMemory(window_tokens=self.window_tokens, summary_tokens=self.summary_tokens)
+
+    def _disk_path(self, session_id: str) -> str:
+        return os.path.join(self.disk_dir, f"{session_id}.json")
+
+    def _read_disk(self, session_id: str) -> Optional[Session]:
+        path = self._disk_path(session_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable session file {path}: {str(e)}")
+            self._remove_disk(session_id)
+            return None
+
+        if time.time() - record["last_active"] > self.disk_ttl_seconds:
+            self._remove_disk(session_id)
+            return None
+        memory = ConversationMemory.from_dict(record["memory"], self.window_tokens, self.summary_tokens)
+        return Session(session_id, memory, created_at=record["created_at"], last_active=record["last_active"])
+
+    def _write_disk(self, session: Session) -> None:
+        """Atomically persist a session."""
+        path = self._disk_path(session.id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(session.to_dict(), f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to write session file {path}: {str(e)}")
+
+    def _remove_disk(self, session_id: str) -> None:
+        try:
+            os.remove(self._disk_path(session_id))
+        except OSError:
+            pass
+
+    def _store_memory(self, session: Session) -> None:
+        self._sessions[session.id] = session
+        self._sessions.move_to_end(session.id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self._stats["evicted_capacity"] += 1
+
+    async def get_or_create(self, session_id: Optional[str] = None) -> Session:
+        """
+        Return the session for ``session_id``, loading it from disk if needed.
+
+        Unknown, expired or malformed IDs start a new session with a fresh ID.
+        """
+        if session_id and SESSION_ID_PATTERN.match(session_id):
+            session = self._sessions.get(session_id)
+            if session is not None and time.time() - session.last_active <= self.idle_seconds:
+                self._sessions.move_to_end(session_id)
+                session.touch()
+                return session
+            if self.disk_dir:
+                session = await asyncio.to_thread(self._read_disk, session_id)
+                if session is not None:
+                    session.touch()
+                    self._store_memory(session)
+                    self._stats["resumed_from_disk"] += 1
+                    return session
+
+        session = Session(uuid.uuid4().hex, self._new_memory())
+        self._store_memory(session)
+        self._stats["created"] += 1
+        return session
+
+    async def save(self, session: Session) -> None:
+        """Write a session through to disk after a turn (no-op without a disk tier)."""
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, session)
+
+    async def delete(self, session_id: str) -> bool:
+        removed = self._sessions.pop(session_id, None) is not None
+        if self.disk_dir and SESSION_ID_PATTERN.match(session_id):
+            path = self._disk_path(session_id)
+            removed = await asyncio.to_thread(os.path.exists, path) or removed
+            await asyncio.to_thread(self._remove_disk, session_id)
+        return removed
+
+    def evict_idle(self) -> int:
+        """Drop sessions idle longer than ``idle_seconds`` from memory (their disk copy stays)."""
+        cutoff = time.time() - self.idle_seconds
+        idle = [session_id for session_id, session in self._sessions.items()
+                if session.last_active < cutoff and not session.lock.locked()]
+        for session_id in idle:
+            del self._sessions[session_id]
+        self._stats["evicted_idle"] += len(idle)
+        return len(idle)
+
+    def prune_disk(self) -> int:
+        """Delete session files idle longer than ``disk_ttl_seconds``."""
+        if not self.disk_dir:
+            return 0
+        cutoff = time.time() - self.disk_ttl_seconds
+        removed = 0
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "idle_seconds": self.idle_seconds,
+            "disk_dir": self.disk_dir,
+        }
@@ -0,0 +1,258 @@
+"""
+Dashboard Metrics Module
+
+Materialized aggregates behind the dashboard's metric cards. Recruitment,
+performance and feedback rollups are folded forward from whatever was
+written since the last refresh, never recomputed from scratch, and the
+dashboard is served from one pre-serialized in-memory snapshot with a
+strong ETag, so its latency does not grow with the underlying data.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Set
+
+from fastapi import Request, Response
+
+from src.modules.feedback.feedback_analysis import COMPLETED, SENTIMENTS, FeedbackAnalyzer
+from src.modules.performance.performance_tracker import PerformanceTracker
+from src.modules.recruitment.job_description_store import JobDescriptionStore
+from src.modules.recruitment.resume_store import ResumeStore
+from src.ui.render_cache import etag_matches
+
+logger = logging.getLogger(__name__)
+
+TOP_DEPARTMENTS = 5
+
+
+@dataclass
+class DashboardSnapshot:
+    """The serialized dashboard at one version of the aggregates."""
+    body: bytes
+    etag: str
+    version: int
+
+
+class DashboardMetrics:
+    """
+    Incrementally maintained dashboard aggregates.
+
+    ``refresh`` folds in job descriptions and resumes stored since the last
+    seen row ID (as grouped counts computed by SQLite), the latest cycle of the
+    already incremental review analytics, and feedback analyses that completed
+    since the last refresh. The snapshot is rebuilt only when one of them
+    changed. Requests within ``ttl`` seconds of the last refresh are served
+    as is; a stale snapshot is still served while one background refresh
+    brings it up to date, so no request waits on the stores.
+    """
+
+    def __init__(self, job_descriptions: Optional[JobDescriptionStore] = None,
+                 resumes: Optional[ResumeStore] = None, performance: Optional[PerformanceTracker] = None,
+                 feedback: Optional[FeedbackAnalyzer] = None, ttl: Optional[float] = None):
+        self.job_descriptions = job_descriptions
+        self.resumes = resumes
+        self.performance = performance
+        self.feedback = feedback
+        self.ttl = ttl if ttl is not None else float(os.getenv("DASHBOARD_TTL_SECONDS", 5))
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # Recruitment rollups, keyed by month (YYYY-MM)
+        self._job_description_id = 0
+        self._job_descriptions_by_month: Counter = Counter()
+        self._job_descriptions_by_department: Counter = Counter()
+        self._resume_id = 0
+        self._applicants_by_month: Counter = Counter()
+        self._latest_application: Dict[int, str] = {}
+        self._recruiting_by_month: Counter = Counter()  # Job descriptions by month of their latest applicant
+
+        # Feedback rollups over completed analyses
+        self._feedback_folded: Set[str] = set()
+        self._feedback_comments = 0
+        self._feedback_sentiment: Counter = Counter()
+        self._latest_feedback: Optional[Dict[str, Any]] = None
+
+        self._performance: Optional[Dict[str, Any]] = None
+        self._month = ""
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._checked_at = float("-inf")
+        self._stats = {"refreshes": 0, "rebuilds": 0, "refresh_errors": 0, "served": 0, "not_modified": 0}
+        self._last_refresh_ms = 0.0
+
+    # Incremental folds; each returns whether anything changed
+
+    def _fold_job_descriptions(self) -> bool:
+        last_id, rows = self.job_descriptions.counts_after(self._job_description_id)
+        for department, month, count in rows:
+            self._job_descriptions_by_month[month] += count
+            self._job_descriptions_by_department[department or "Unspecified"] += count
+        self._job_description_id = last_id
+        return bool(rows)
+
+    def _fold_resumes(self) -> bool:
+        last_id, rows = self.resumes.counts_after(self._resume_id)
+        for job_description_id, month, count in rows:
+            self._applicants_by_month[month] += count
+            latest = self._latest_application.get(job_description_id)
+            if latest is None or month > latest:
+                if latest is not None:
+                    self._recruiting_by_month[latest] -= 1
+                self._recruiting_by_month[month] += 1
+                self._latest_application[job_description_id] = month
+        self._resume_id = last_id
+        return bool(rows)
+
+    def _fold_performance(self) -> bool:
+        summary = self.performance.analytics.summary()
+        if summary == self._performance:
+            return False
+        self._performance = summary
+        return True
+
+    def _fold_feedback(self) -> bool:
+        changed = False
+        for analysis_id in self.feedback.analysis_ids():
+            if analysis_id in self._feedback_folded:
+                continue
+            analysis = self.feedback.get(analysis_id)
+            if analysis is None or analysis["stage"] != COMPLETED:
+                continue
+            summary = analysis["summary"]
+            self._feedback_folded.add(analysis_id)
+            self._feedback_comments += summary["comments"]
+            self._feedback_sentiment.update(summary["sentiment"])
+            if self._latest_feedback is None or analysis["updated_at"] > self._latest_feedback["completed_at"]:
+                self._latest_feedback = {
+                    "id": analysis_id,
+                    "completed_at": analysis["updated_at"],
+                    "comments": summary["comments"],
+                    "net_sentiment": _net_sentiment(summary["sentiment"]),
+                }
+            changed = True
+        return changed
+
+    def refresh(self) -> DashboardSnapshot:
+        """Fold in new data from every source and rebuild the snapshot if anything changed."""
+        started = time.perf_counter()
+        with self._lock:
+            changed = self._snapshot is None
+            sources = (
+                ("job_descriptions", self.job_descriptions, self._fold_job_descriptions),
+                ("resumes", self.resumes, self._fold_resumes),
+                ("performance", self.performance, self._fold_performance),
+                ("feedback", self.feedback, self._fold_feedback),
+            )
+            for name, source, fold in sources:
+                if source is None:
+                    continue
+                try:
+                    changed = fold() or changed
+                except Exception as e:
+                    # The other cards stay current; this one is retried on the next refresh
+                    self._stats["refresh_errors"] += 1
+                    logger.warning(f"Dashboard refresh of {name} failed: {str(e)}")
+            month = date.today().strftime("%Y-%m")
+            if month != self._month:
+                # "This month" figures roll over even without new data
+                self._month = month
+                changed = True
+            if changed:
+                self._rebuild()
+            self._checked_at = time.monotonic()
+            self._stats["refreshes"] += 1
+            self._last_refresh_ms = (time.perf_counter() - started) * 1000
+            return self._snapshot
+
+    def _rebuild(self) -> None:
+        this_month = self._month
+        previous_month = (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+        performance = self._performance
+        labeled = sum(self._feedback_sentiment[name] for name in SENTIMENTS)
+        document = {
+            "recruitment": {
+                "job_descriptions": sum(self._job_descriptions_by_month.values()),
+                "job_descriptions_this_month": self._job_descriptions_by_month[this_month],
+                "applicants": sum(self._applicants_by_month.values()),
+                "applicants_this_month": self._applicants_by_month[this_month],
+                "applicants_last_month": self._applicants_by_month[previous_month],
+                # Job descriptions that received applicants this month or last
+                "active_recruitments": self._recruiting_by_month[this_month] + self._recruiting_by_month[previous_month],
+                "top_departments": [
+                    {"department": department, "job_descriptions": count}
+                    for department, count in self._job_descriptions_by_department.most_common(TOP_DEPARTMENTS)
+                ],
+            },
+            "performance": None if performance is None else {
+                "cycle": performance["cycle"],
+                "reviews": performance["reviews"],
+                "average_score": performance["average_score"],
+                "goal_attainment": performance["goal_attainment"],
+                "previous_cycle": performance["previous_cycle"],
+                "change": performance["change"],
+            },
+            "feedback": {
+                "analyses": len(self._feedback_folded),
+                "comments": self._feedback_comments,
+                "sentiment": {name: self._feedback_sentiment[name] for name in SENTIMENTS},
+                "net_sentiment": _net_sentiment(self._feedback_sentiment) if labeled else None,
+                "latest": self._latest_feedback,
+            },
+            "month": this_month,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        version = self._snapshot.version + 1 if self._snapshot is not None else 1
+        # updated_at is left out of the validator so an unchanged rebuild keeps its ETag
+        digest = hashlib.sha256(json.dumps({**document, "updated_at": None}, sort_keys=True).encode("utf-8"))
+        self._snapshot = DashboardSnapshot(
+            body=json.dumps(document).encode("utf-8"),
+            etag=f'"{digest.hexdigest()[:32]}"',
+            version=version,
+        )
+        self._stats["rebuilds"] += 1
+
+    async def current(self) -> DashboardSnapshot:
+        """The latest snapshot, refreshed in the background once it is older than ``ttl``."""
+        if self._snapshot is None:
+            return await asyncio.to_thread(self.refresh)
+        if time.monotonic() - self._checked_at >= self.ttl:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.ensure_future(asyncio.to_thread(self.refresh))
+        return self._snapshot
+
+    async def response(self, request: Request) -> Response:
+        """Serve the dashboard snapshot, answering 304 when the client's copy is current."""
+        snapshot = await self.current()
+        headers = {"ETag": snapshot.etag, "Cache-Control": f"private, max-age={int(self.ttl)}"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, [snapshot.etag]):
+            self._stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        self._stats["served"] += 1
+        return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "version": self._snapshot.version if self._snapshot is not None else 0,
+            "last_refresh_ms": round(self._last_refresh_ms, 3),
+            "ttl_seconds": self.ttl,
+            "job_description_id": self._job_description_id,
+            "resume_id": self._resume_id,
+            "feedback_analyses": len(self._feedback_folded),
+        }
+
+
+def _net_sentiment(sentiment: Dict[str, int]) -> Optional[int]:
+    """Positive minus negative comments, as a percentage of labeled comments (-100 to 100)."""
+    labeled = sum(sentiment.get(name, 0) for name in SENTIMENTS)
+    if not labeled:
+        return None
+    return round(100 * (sentiment.get("positive", 0) - sentiment.get("negative", 0)) / labeled)
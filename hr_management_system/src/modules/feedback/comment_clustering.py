@@ -0,0 +1,249 @@
+"""
+Comment Clustering Module
+
+Local grouping of survey comments before any LLM call: exact duplicates
+collapse onto one text, and texts whose content words overlap strongly are
+grouped around the most repeated texts with MinHash locality-sensitive
+hashing. Labels given to cluster representatives are then spread back to
+every comment, and to clusters that were not sent to the LLM through their
+most similar labeled representative.
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.modules.feedback.comment_reader import FeedbackComment
+from src.modules.recruitment.canonicalization import stem
+from src.utils.minhash import MinHasher, leader_clusters, nearest_neighbors
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Function words and survey filler that say nothing about a comment's topic
+FEEDBACK_STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be because been being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his
+how i i'm if in into is it it's its just me more most my of off on once only or other our ours out
+over own same she should so some such than that the their them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your yours
+really lot lots much many get got make made think feel felt like would could please etc
+honestly overall mostly generally opinion personally
+""".split())
+
+# Negations are folded into the next content word ("not happy" -> "not_happi") so that
+# comments of opposite sentiment do not share a token set
+NEGATIONS = frozenset({"no", "not", "nor", "never", "cannot", "without", "hardly"})
+
+# Signature size and banding: 32 hashes in 8 bands of 4 find pairs above ~0.6 Jaccard, and a
+# text joins a cluster when its estimated similarity to the cluster's leader reaches
+# CLUSTER_SIMILARITY; 16 bands of 2 find a similar labeled cluster above ~0.25
+NUM_PERM = 32
+CLUSTER_BANDS = 8
+CLUSTER_SIMILARITY = 0.6
+NEIGHBOR_BANDS = 16
+
+LABEL_NONE, LABEL_LLM, LABEL_SIMILAR = 0, 1, 2
+LABEL_SOURCES = {LABEL_NONE: None, LABEL_LLM: "llm", LABEL_SIMILAR: "similar"}
+
+
+@dataclass
+class CommentClusters:
+    """Cluster assignments of a comment export; clusters are numbered largest first."""
+    comment_cluster: np.ndarray  # int32 cluster of each comment row
+    cluster_size: np.ndarray  # int64 comments per cluster
+    cluster_texts: np.ndarray  # int64 distinct texts per cluster
+    representative_row: np.ndarray  # int64 comment row of each cluster's representative
+    signatures: np.ndarray  # uint32 MinHash signature of each representative
+    unique_texts: int
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, comment_cluster=self.comment_cluster, cluster_size=self.cluster_size,
+                     cluster_texts=self.cluster_texts, representative_row=self.representative_row,
+                     signatures=self.signatures, unique_texts=np.array(self.unique_texts))
+
+    @classmethod
+    def load(cls, path: str) -> "CommentClusters":
+        with np.load(path) as data:
+            return cls(data["comment_cluster"], data["cluster_size"], data["cluster_texts"],
+                       data["representative_row"], data["signatures"], int(data["unique_texts"]))
+
+    @property
+    def comments(self) -> int:
+        return len(self.comment_cluster)
+
+    def __len__(self) -> int:
+        return len(self.cluster_size)
+
+
+class CommentClusterer:
+    """
+    Incremental deduplication and clustering of a comment stream.
+
+    Comments are added in chunks as they are read; only one signature per
+    distinct text is kept in memory, never the texts themselves. ``finish``
+    runs the LSH grouping over all distinct texts.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = CLUSTER_BANDS,
+                 min_similarity: float = CLUSTER_SIMILARITY, stop_words: frozenset = FEEDBACK_STOP_WORDS):
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.min_similarity = min_similarity
+        self.stop_words = stop_words
+        self._vocabulary: Dict[str, int] = {}
+        self._terms: Dict[str, int] = {}
+        self._negated_terms: Dict[int, int] = {}
+        self._text_ids: Dict[bytes, int] = {}
+        self._comment_texts: List[np.ndarray] = []
+        self._text_counts: List[int] = []
+        self._text_rows: List[int] = []
+        self._signatures: List[np.ndarray] = []
+
+    def _term_id(self, word: str) -> int:
+        """Term ID of a word, -1 for stop words; each distinct word is stemmed once."""
+        term_id = self._terms.get(word)
+        if term_id is None:
+            if word in self.stop_words or len(word) < 2:
+                term_id = -1
+            else:
+                term_id = self._vocabulary.setdefault(stem(word.strip("'")), len(self._vocabulary))
+            self._terms[word] = term_id
+        return term_id
+
+    def _negated_term_id(self, term_id: int) -> int:
+        """Term ID of a content word under a negation, distinct from the word's own."""
+        negated = self._negated_terms.get(term_id)
+        if negated is None:
+            negated = self._negated_terms[term_id] = self._vocabulary.setdefault(f"not_{term_id}",
+                                                                                len(self._vocabulary))
+        return negated
+
+    def _token_set(self, normalized: str) -> List[int]:
+        terms = set()
+        negated = False
+        for word in _WORD_PATTERN.findall(normalized):
+            if word in NEGATIONS or word.endswith("n't"):
+                negated = True
+                continue
+            term_id = self._term_id(word)
+            if term_id < 0:
+                continue
+            terms.add(self._negated_term_id(term_id) if negated else term_id)
+            negated = False
+        return sorted(terms)
+
+    def add(self, comments: Iterable[FeedbackComment]) -> int:
+        """Deduplicate and sign a chunk of comments (in row order); returns the number added."""
+        text_ids = self._text_ids
+        chunk_texts: List[int] = []
+        new_token_sets: List[List[int]] = []
+        for comment in comments:
+            normalized = " ".join(comment.text.lower().split())
+            # A 128-bit digest: distinct comments never merge in practice, without keeping the texts
+            key = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+            text_id = text_ids.get(key)
+            if text_id is None:
+                text_id = text_ids[key] = len(self._text_counts)
+                self._text_counts.append(0)
+                self._text_rows.append(comment.row)
+                new_token_sets.append(self._token_set(normalized))
+            self._text_counts[text_id] += 1
+            chunk_texts.append(text_id)
+        if new_token_sets:
+            self._signatures.append(self.hasher.signatures(new_token_sets))
+        self._comment_texts.append(np.array(chunk_texts, dtype=np.int32))
+        return len(chunk_texts)
+
+    def finish(self) -> CommentClusters:
+        comment_texts = np.concatenate(self._comment_texts) if self._comment_texts else np.zeros(0, np.int32)
+        signatures = (np.concatenate(self._signatures) if self._signatures
+                      else np.zeros((0, self.hasher.num_perm), np.uint32))
+        text_counts = np.array(self._text_counts, dtype=np.int64)
+        text_rows = np.array(self._text_rows, dtype=np.int64)
+
+        # The most repeated texts lead clusters
+        leading_first = np.lexsort((np.arange(len(text_counts)), -text_counts))
+        components = leader_clusters(signatures, self.bands, self.min_similarity, leading_first)
+        roots, text_component = np.unique(components, return_inverse=True)
+        component_size = np.bincount(text_component, weights=text_counts, minlength=len(roots)).astype(np.int64)
+        # Largest clusters first; ties keep first-seen order
+        ranking = np.lexsort((roots, -component_size))
+        cluster_of_component = np.empty(len(roots), dtype=np.int32)
+        cluster_of_component[ranking] = np.arange(len(roots), dtype=np.int32)
+        text_cluster = cluster_of_component[text_component]
+
+        # The most repeated text of a cluster represents it
+        by_cluster = np.lexsort((np.arange(len(text_counts)), -text_counts, text_cluster))
+        first = np.concatenate(([True], text_cluster[by_cluster][1:] != text_cluster[by_cluster][:-1])) \
+            if len(by_cluster) else np.zeros(0, bool)
+        representatives = by_cluster[first]
+
+        clusters = CommentClusters(
+            comment_cluster=text_cluster[comment_texts].astype(np.int32),
+            cluster_size=component_size[ranking],
+            cluster_texts=np.bincount(text_cluster, minlength=len(roots)).astype(np.int64),
+            representative_row=text_rows[representatives],
+            signatures=signatures[representatives],
+            unique_texts=len(text_counts),
+        )
+        logger.info(f"Clustered {clusters.comments} comments ({clusters.unique_texts} distinct) "
+                    f"into {len(clusters)} clusters")
+        return clusters
+
+
+@dataclass
+class ClusterLabels:
+    """Sentiment and theme of every cluster, and how each was obtained."""
+    sentiment: np.ndarray  # int16 index into ``sentiments``, -1 when unlabeled
+    theme: np.ndarray  # int32 index into ``themes``, -1 when unlabeled
+    source: np.ndarray  # int8 LABEL_NONE, LABEL_LLM or LABEL_SIMILAR
+    sentiments: Tuple[str, ...]
+    themes: List[str]
+
+
+def spread_labels(clusters: CommentClusters, labeled: Dict[int, Tuple[Optional[str], Optional[str]]],
+                  sentiments: Tuple[str, ...], min_similarity: float = 0.25,
+                  bands: int = NEIGHBOR_BANDS) -> ClusterLabels:
+    """
+    Label every cluster from the LLM labels of some of them.
+
+    A cluster without its own label takes the label of the labeled
+    representative most similar to its own, if the estimated Jaccard
+    similarity reaches ``min_similarity``.
+    """
+    count = len(clusters)
+    sentiment = np.full(count, -1, dtype=np.int16)
+    theme = np.full(count, -1, dtype=np.int32)
+    source = np.full(count, LABEL_NONE, dtype=np.int8)
+    themes: List[str] = []
+    theme_ids: Dict[str, int] = {}
+    sentiment_ids = {name: index for index, name in enumerate(sentiments)}
+    for cluster, (sentiment_name, theme_name) in labeled.items():
+        if sentiment_name is None or theme_name is None:
+            continue
+        key = theme_name.lower()
+        if key not in theme_ids:
+            theme_ids[key] = len(themes)
+            themes.append(theme_name)
+        sentiment[cluster] = sentiment_ids[sentiment_name]
+        theme[cluster] = theme_ids[key]
+        source[cluster] = LABEL_LLM
+
+    with_label = np.flatnonzero(source == LABEL_LLM)
+    without_label = np.flatnonzero(source == LABEL_NONE)
+    neighbors, similarity = nearest_neighbors(
+        clusters.signatures[without_label], clusters.signatures[with_label], bands
+    )
+    accepted = (neighbors >= 0) & (similarity >= min_similarity)
+    targets, sources = without_label[accepted], with_label[neighbors[accepted]]
+    sentiment[targets] = sentiment[sources]
+    theme[targets] = theme[sources]
+    source[targets] = LABEL_SIMILAR
+    return ClusterLabels(sentiment, theme, source, sentiments, themes)
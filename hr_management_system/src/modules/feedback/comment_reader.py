@@ -0,0 +1,125 @@
+"""
+Comment Reader Module
+
+Streams free-text comments out of survey exports (CSV or JSON Lines) one
+record at a time, so exports of any size are processed in constant memory.
+The comment and ID columns are detected from common export headers unless
+named explicitly.
+"""
+
+import csv
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FILE_FORMATS = ("csv", "jsonl")
+
+# Checked in order, case-insensitively, when no field is named
+TEXT_FIELD_CANDIDATES = ("comment", "comments", "text", "response", "feedback", "answer", "free_text")
+ID_FIELD_CANDIDATES = ("id", "comment_id", "response_id", "respondent_id")
+
+
+@dataclass
+class FeedbackComment:
+    """One non-empty comment; ``row`` numbers comments densely from 0 in file order."""
+    row: int
+    comment_id: str
+    text: str
+
+
+def _pick_field(fields: List[str], requested: Optional[str], candidates: Tuple[str, ...]) -> Optional[str]:
+    if requested is not None:
+        return requested if requested in fields else None
+    by_name = {field.strip().lower(): field for field in fields}
+    for candidate in candidates:
+        if candidate in by_name:
+            return by_name[candidate]
+    return None
+
+
+class CommentReader:
+    """
+    Generator-based reader over an export file.
+
+    Records without comment text, and JSON Lines that do not parse, are
+    skipped and counted in ``skipped``. A comment's ID is taken from the ID
+    column when there is one, otherwise it is the record's line number.
+    """
+
+    def __init__(self, path: str, file_format: str, text_field: Optional[str] = None,
+                 id_field: Optional[str] = None):
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Unsupported format '{file_format}', expected one of {', '.join(FILE_FORMATS)}")
+        self.path = path
+        self.file_format = file_format
+        self.text_field = text_field
+        self.id_field = id_field
+        self.skipped = 0
+
+    def resolve_fields(self) -> Dict[str, Optional[str]]:
+        """
+        Detect the comment and ID fields from the CSV header or the first JSON record.
+
+        Raises:
+            ValueError: If no comment field can be found
+        """
+        fields: List[str] = []
+        if self.file_format == "csv":
+            with open(self.path, "r", newline="", encoding="utf-8-sig") as f:
+                fields = next(csv.reader(f), [])
+        else:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict):
+                        fields = list(record)
+                        break
+        text_field = _pick_field(fields, self.text_field, TEXT_FIELD_CANDIDATES)
+        if text_field is None:
+            wanted = self.text_field or " or ".join(TEXT_FIELD_CANDIDATES)
+            raise ValueError(f"No comment field ({wanted}) found in the export")
+        self.text_field = text_field
+        self.id_field = _pick_field(fields, self.id_field, ID_FIELD_CANDIDATES)
+        return {"text_field": self.text_field, "id_field": self.id_field}
+
+    def _records(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        if self.file_format == "csv":
+            with open(self.path, "r", newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                for record in reader:
+                    yield reader.line_num, record
+        else:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        self.skipped += 1
+                        continue
+                    if isinstance(record, dict):
+                        yield line_number, record
+                    else:
+                        self.skipped += 1
+
+    def __iter__(self) -> Iterator[FeedbackComment]:
+        if self.text_field is None:
+            self.resolve_fields()
+        self.skipped = 0
+        row = 0
+        for line_number, record in self._records():
+            text = record.get(self.text_field)
+            text = text.strip() if isinstance(text, str) else ""
+            if not text:
+                self.skipped += 1
+                continue
+            comment_id = record.get(self.id_field) if self.id_field else None
+            yield FeedbackComment(row, str(comment_id) if comment_id not in (None, "") else str(line_number), text)
+            row += 1
@@ -0,0 +1,465 @@
+"""
+Feedback Analysis Module
+
+Sentiment and theme analysis of large survey exports at a small fraction of
+one LLM call per comment. An uploaded export is analyzed as a background
+job in checkpointed stages: comments are streamed from disk, deduplicated
+and clustered locally, cluster representatives are labeled by the LLM in
+batched prompts, and the labels are mapped back onto every comment.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from collections import Counter
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError
+
+from src.modules.feedback.comment_reader import CommentReader
+from src.modules.gemini.client import GeminiService
+from src.modules.jobs.job_queue import PermanentJobError, report_progress
+from src.utils.json_repair import repair_json
+from src.utils.metrics import REGISTRY, stage
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_JOB_KIND = "feedback.analyze"
+
+FEEDBACK_COMMENTS = REGISTRY.counter(
+    "hr_feedback_comments_total", "Survey comments analyzed, by how their label was obtained", ("source",)
+)
+FEEDBACK_LABEL_CALLS = REGISTRY.counter("hr_feedback_label_calls_total", "Batched LLM labeling calls")
+
+DEFAULT_FEEDBACK_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "data",
+    "feedback",
+)
+
+SENTIMENTS = ("positive", "neutral", "negative", "mixed")
+
+# Analysis stages, in order; each one's output is checkpointed in the analysis directory
+UPLOADED, CLUSTERED, LABELED, COMPLETED = "uploaded", "clustered", "labeled", "completed"
+
+# Themes already in use that are suggested to later batches
+SUGGESTED_THEMES = 30
+TOP_THEMES = 20
+
+# Invariant instructions, sent as the cached prefix of every labeling call
+FEEDBACK_LABEL_PREFIX = """You are an HR analyst labeling free-text comments from an employee survey.
+
+For every comment, give:
+- "sentiment": one of "positive", "neutral", "negative" or "mixed"
+- "theme": the main topic in 1-4 words, e.g. "Workload", "Career growth", "Management communication". Reuse an existing theme when one fits.
+
+Each comment stands for a group of similar comments; the group size is shown in parentheses.
+
+Return the response in JSON format:
+{
+    "labels": [{"id": comment id, "sentiment": "...", "theme": "..."}, ...]
+}
+Return only the JSON object, with one entry per comment."""
+
+
+class CommentLabel(BaseModel):
+    """LLM label of one cluster representative."""
+    id: int
+    sentiment: Literal["positive", "neutral", "negative", "mixed"]
+    theme: str = Field(..., min_length=1, max_length=60)
+
+
+def normalize_theme(theme: str) -> str:
+    theme = " ".join(theme.split()).strip(" .;:-")
+    return theme[:1].upper() + theme[1:]
+
+
+class FeedbackAnalyzer:
+    """
+    Checkpointed feedback analyses, one directory each under ``directory``.
+
+    ``create_analysis`` stores an upload; ``analyze`` is the job queue handler
+    that runs (or resumes) the stages. A stage's output is written before the
+    analysis moves on, and labels are appended batch by batch, so a retried
+    or reclaimed job continues where the previous attempt stopped. Only the
+    ``max_llm_clusters`` largest clusters are sent to the LLM; smaller ones
+    take the label of their most similar labeled cluster.
+    """
+
+    def __init__(self, directory: Optional[str] = None, batch_size: Optional[int] = None,
+                 concurrency: Optional[int] = None, max_llm_clusters: Optional[int] = None,
+                 max_upload_bytes: Optional[int] = None, read_chunk_size: int = 20000,
+                 max_comment_chars: int = 500):
+        self.directory = directory or os.getenv("FEEDBACK_DATA_DIR") or DEFAULT_FEEDBACK_DATA_DIR
+        self.batch_size = batch_size or int(os.getenv("FEEDBACK_LABEL_BATCH", 25))
+        self.concurrency = concurrency or int(os.getenv("FEEDBACK_LLM_CONCURRENCY", 4))
+        self.max_llm_clusters = max_llm_clusters or int(os.getenv("FEEDBACK_MAX_LLM_CLUSTERS", 2000))
+        self.max_upload_bytes = max_upload_bytes or int(os.getenv("FEEDBACK_MAX_UPLOAD_BYTES", 512 * 1024 * 1024))
+        self.job_timeout = float(os.getenv("FEEDBACK_JOB_TIMEOUT", 3600))
+        self.read_chunk_size = read_chunk_size
+        self.max_comment_chars = max_comment_chars
+        os.makedirs(self.directory, exist_ok=True)
+
+    # Analysis directory layout
+
+    def _path(self, analysis_id: str, name: str = "") -> str:
+        return os.path.join(self.directory, analysis_id, name)
+
+    def _input_path(self, analysis: Dict[str, Any]) -> str:
+        return self._path(analysis["id"], f"input.{analysis['format']}")
+
+    def _reader(self, analysis: Dict[str, Any]) -> CommentReader:
+        return CommentReader(self._input_path(analysis), analysis["format"],
+                             analysis["text_field"], analysis["id_field"])
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """An analysis's checkpoint: its stage, counts and, once completed, its summary."""
+        if not re.fullmatch(r"[0-9a-f]{32}", analysis_id):
+            return None
+        try:
+            with open(self._path(analysis_id, "checkpoint.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def analysis_ids(self) -> List[str]:
+        """IDs of every stored analysis, in no particular order."""
+        return [name for name in os.listdir(self.directory) if re.fullmatch(r"[0-9a-f]{32}", name)]
+
+    def _save(self, analysis: Dict[str, Any]) -> None:
+        """Atomically replace an analysis's checkpoint."""
+        path = self._path(analysis["id"], "checkpoint.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        analysis["updated_at"] = time.time()
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(analysis, f)
+        os.replace(tmp_path, path)
+
+    def results_path(self, analysis_id: str) -> str:
+        """JSON Lines file with every comment's label, present once the analysis has completed."""
+        return self._path(analysis_id, "results.jsonl")
+
+    # Upload
+
+    async def create_analysis(self, chunks: AsyncIterator[bytes], file_format: str,
+                              text_field: Optional[str] = None, id_field: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Store an uploaded export and check that it has a comment field.
+
+        Raises:
+            ValueError: If the format is unsupported, the upload exceeds
+                ``max_upload_bytes`` or no comment field can be found
+        """
+        analysis_id = uuid.uuid4().hex
+        analysis = {
+            "id": analysis_id,
+            "stage": UPLOADED,
+            "format": file_format,
+            "text_field": text_field,
+            "id_field": id_field,
+            "created_at": time.time(),
+            "job_id": None,
+            "counts": {},
+            "summary": None,
+        }
+        os.makedirs(self._path(analysis_id))
+        try:
+            CommentReader(self._input_path(analysis), file_format)  # Validates the format
+            size = 0
+            with open(self._input_path(analysis), "wb") as f:
+                buffer = bytearray()
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_upload_bytes:
+                        raise ValueError(f"Export exceeds {self.max_upload_bytes} bytes")
+                    buffer += chunk
+                    if len(buffer) >= 1 << 20:
+                        await asyncio.to_thread(f.write, bytes(buffer))
+                        buffer.clear()
+                await asyncio.to_thread(f.write, bytes(buffer))
+            reader = self._reader(analysis)
+            analysis.update(await asyncio.to_thread(reader.resolve_fields))
+            analysis["counts"]["upload_bytes"] = size
+            self._save(analysis)
+        except BaseException:
+            shutil.rmtree(self._path(analysis_id), ignore_errors=True)
+            raise
+        return analysis
+
+    def attach_job(self, analysis: Dict[str, Any], job_id: str) -> None:
+        analysis["job_id"] = job_id
+        self._save(analysis)
+
+    # Job handler
+
+    async def analyze(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Job queue handler: run the analysis's remaining stages and return its summary."""
+        analysis = self.get(str(payload.get("analysis_id", "")))
+        if analysis is None:
+            raise PermanentJobError("Feedback analysis not found")
+        if analysis["stage"] == UPLOADED:
+            with stage("feedback_cluster"):
+                await self._cluster(analysis)
+        if analysis["stage"] == CLUSTERED:
+            with stage("feedback_label"):
+                await self._label(analysis)
+        if analysis["stage"] == LABELED:
+            with stage("feedback_map"):
+                await self._map(analysis)
+        return analysis["summary"]
+
+    async def _cluster(self, analysis: Dict[str, Any]) -> None:
+        """Stream the export once to deduplicate and cluster it, then once more for representative texts."""
+        from src.modules.feedback.comment_clustering import CommentClusterer
+
+        reader = self._reader(analysis)
+        comments = iter(reader)
+        clusterer = CommentClusterer()
+
+        def read_chunk() -> int:
+            return clusterer.add(islice(comments, self.read_chunk_size))
+
+        read = 0
+        while True:
+            added = await asyncio.to_thread(read_chunk)
+            if not added:
+                break
+            read += added
+            await report_progress({"stage": "clustering", "comments_read": read})
+        if not read:
+            raise PermanentJobError("The export contains no comments")
+        clusters = await asyncio.to_thread(clusterer.finish)
+        await asyncio.to_thread(clusters.save, self._path(analysis["id"], "clusters.npz"))
+        await asyncio.to_thread(self._write_representatives, analysis, clusters.representative_row.tolist())
+
+        analysis["counts"].update({
+            "comments": clusters.comments,
+            "skipped": reader.skipped,
+            "unique_texts": clusters.unique_texts,
+            "clusters": len(clusters),
+            "clusters_to_label": min(len(clusters), self.max_llm_clusters),
+            "llm_calls": 0,
+        })
+        analysis["stage"] = CLUSTERED
+        self._save(analysis)
+
+    def _write_representatives(self, analysis: Dict[str, Any], representative_rows: List[int]) -> None:
+        cluster_of_row = {row: cluster for cluster, row in enumerate(representative_rows)}
+        texts: Dict[int, str] = {}
+        for comment in self._reader(analysis):
+            cluster = cluster_of_row.get(comment.row)
+            if cluster is not None:
+                texts[cluster] = comment.text[:self.max_comment_chars]
+        with open(self._path(analysis["id"], "representatives.jsonl"), "w", encoding="utf-8") as f:
+            for cluster in range(len(representative_rows)):
+                f.write(json.dumps({"cluster": cluster, "text": texts.get(cluster, "")}) + "\n")
+
+    def _read_representatives(self, analysis: Dict[str, Any], limit: int) -> Dict[int, str]:
+        texts = {}
+        with open(self._path(analysis["id"], "representatives.jsonl"), "r", encoding="utf-8") as f:
+            for line in islice(f, limit):
+                record = json.loads(line)
+                texts[record["cluster"]] = record["text"]
+        return texts
+
+    def _read_labels(self, analysis: Dict[str, Any]) -> Dict[int, Tuple[Optional[str], Optional[str]]]:
+        """Labels recorded so far; a line cut short by a crash is ignored and its cluster relabeled."""
+        labels = {}
+        try:
+            with open(self._path(analysis["id"], "labels.jsonl"), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    labels[record["cluster"]] = (record["sentiment"], record["theme"])
+        except FileNotFoundError:
+            pass
+        return labels
+
+    async def _label(self, analysis: Dict[str, Any]) -> None:
+        """Label the largest clusters' representatives in concurrent batches, appending results as they arrive."""
+        from src.modules.feedback.comment_clustering import CommentClusters
+
+        clusters = await asyncio.to_thread(CommentClusters.load, self._path(analysis["id"], "clusters.npz"))
+        counts = analysis["counts"]
+        limit = counts["clusters_to_label"]
+        texts = await asyncio.to_thread(self._read_representatives, analysis, limit)
+        labels = await asyncio.to_thread(self._read_labels, analysis)
+        pending = [cluster for cluster in range(limit) if cluster not in labels]
+        if len(pending) < limit:
+            logger.info(f"Resuming feedback analysis {analysis['id']}: {limit - len(pending)} clusters already labeled")
+
+        themes: Counter = Counter()
+        for cluster, (_, theme) in labels.items():
+            if theme is not None:
+                themes[theme] += int(clusters.cluster_size[cluster])
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        labels_path = self._path(analysis["id"], "labels.jsonl")
+
+        async def label_batch(batch: List[int]) -> None:
+            async with semaphore:
+                suggested = [theme for theme, _ in themes.most_common(SUGGESTED_THEMES)]
+                results = await self._request_labels(batch, texts, clusters.cluster_size, suggested, counts)
+                missing = [cluster for cluster in batch if cluster not in results]
+                if missing:
+                    # One more try for comments the model skipped
+                    results.update(await self._request_labels(missing, texts, clusters.cluster_size, suggested, counts))
+            # Appended without awaiting in between, so lines from concurrent batches never interleave
+            with open(labels_path, "a", encoding="utf-8") as f:
+                for cluster in batch:
+                    sentiment, theme = results.get(cluster, (None, None))
+                    labels[cluster] = (sentiment, theme)
+                    if theme is not None:
+                        themes[theme] += int(clusters.cluster_size[cluster])
+                    f.write(json.dumps({"cluster": cluster, "sentiment": sentiment, "theme": theme}) + "\n")
+            self._save(analysis)
+            await report_progress({
+                "stage": "labeling",
+                "clusters_labeled": sum(1 for cluster in range(limit) if cluster in labels),
+                "clusters_to_label": limit,
+                "llm_calls": counts["llm_calls"],
+            })
+
+        batches = [pending[start:start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+        tasks = [asyncio.ensure_future(label_batch(batch)) for batch in batches]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Completed batches are on disk; the retried job picks up the rest
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._save(analysis)
+            raise
+        analysis["stage"] = LABELED
+        self._save(analysis)
+
+    async def _request_labels(self, batch: List[int], texts: Dict[int, str], cluster_size,
+                              suggested_themes: List[str], counts: Dict[str, Any]) -> Dict[int, Tuple[str, str]]:
+        """One labeling call; returns the valid labels it produced, by cluster."""
+        lines = []
+        for cluster in batch:
+            size = int(cluster_size[cluster])
+            similar = f" ({size} similar)" if size > 1 else ""
+            lines.append(f"[{cluster}]{similar} {' '.join(texts.get(cluster, '').split())}")
+        prompt = (
+            f"EXISTING THEMES: {'; '.join(suggested_themes) or '(none yet)'}\n\n"
+            "COMMENTS:\n" + "\n".join(lines)
+        )
+        response_text = await GeminiService.generate_content(
+            prompt, temperature=0.2, max_tokens=40 * len(batch) + 100, prefix=FEEDBACK_LABEL_PREFIX
+        )
+        FEEDBACK_LABEL_CALLS.inc()
+        # Counted on the analysis so the total survives resumed attempts
+        counts["llm_calls"] += 1
+
+        wanted = set(batch)
+        results: Dict[int, Tuple[str, str]] = {}
+        try:
+            document = repair_json(response_text)[0]
+        except ValueError:
+            logger.warning("Feedback labeling response contained no JSON")
+            return results
+        entries = document.get("labels") if isinstance(document, dict) else None
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                label = CommentLabel.model_validate(entry)
+            except ValidationError:
+                continue
+            theme = normalize_theme(label.theme)
+            if label.id in wanted and theme:
+                results[label.id] = (label.sentiment, theme)
+        return results
+
+    async def _map(self, analysis: Dict[str, Any]) -> None:
+        await report_progress({"stage": "mapping", "comments": analysis["counts"]["comments"]})
+        summary = await asyncio.to_thread(self._map_labels, analysis)
+        analysis["summary"] = summary
+        analysis["stage"] = COMPLETED
+        self._save(analysis)
+
+    def _map_labels(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Spread labels to unlabeled clusters and every comment; write the results file and summarize."""
+        import numpy as np
+        from src.modules.feedback.comment_clustering import (
+            LABEL_LLM,
+            LABEL_SIMILAR,
+            LABEL_SOURCES,
+            CommentClusters,
+            spread_labels,
+        )
+
+        clusters = CommentClusters.load(self._path(analysis["id"], "clusters.npz"))
+        labels = spread_labels(clusters, self._read_labels(analysis), SENTIMENTS)
+        comment_cluster = clusters.comment_cluster
+        comment_sentiment = labels.sentiment[comment_cluster]
+        comment_theme = labels.theme[comment_cluster]
+        comment_source = labels.source[comment_cluster]
+
+        results_path = self.results_path(analysis["id"])
+        tmp_path = f"{results_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for comment in self._reader(analysis):
+                row = comment.row
+                sentiment, theme = int(comment_sentiment[row]), int(comment_theme[row])
+                f.write(json.dumps({
+                    "row": row,
+                    "comment_id": comment.comment_id,
+                    "text": comment.text,
+                    "cluster": int(comment_cluster[row]),
+                    "sentiment": SENTIMENTS[sentiment] if sentiment >= 0 else None,
+                    "theme": labels.themes[theme] if theme >= 0 else None,
+                    "label_source": LABEL_SOURCES[int(comment_source[row])],
+                }) + "\n")
+        os.replace(tmp_path, results_path)
+
+        total = clusters.comments
+        labeled = comment_theme >= 0
+        sentiment_counts = np.bincount(comment_sentiment[labeled], minlength=len(SENTIMENTS))
+        theme_counts = np.bincount(comment_theme[labeled], minlength=len(labels.themes))
+        theme_sentiments = np.bincount(
+            comment_theme[labeled].astype(np.int64) * len(SENTIMENTS) + comment_sentiment[labeled],
+            minlength=len(labels.themes) * len(SENTIMENTS),
+        ).reshape(len(labels.themes), len(SENTIMENTS))
+        # Each theme's example is the representative of its largest LLM-labeled cluster
+        examples = {}
+        texts = self._read_representatives(analysis, analysis["counts"]["clusters_to_label"])
+        for cluster in np.flatnonzero(labels.source == LABEL_LLM).tolist():
+            examples.setdefault(int(labels.theme[cluster]), texts.get(cluster))
+
+        by_llm = int((comment_source == LABEL_LLM).sum())
+        by_similarity = int((comment_source == LABEL_SIMILAR).sum())
+        FEEDBACK_COMMENTS.labels("llm_cluster").inc(by_llm)
+        FEEDBACK_COMMENTS.labels("similar_cluster").inc(by_similarity)
+        FEEDBACK_COMMENTS.labels("unlabeled").inc(total - by_llm - by_similarity)
+        counts = analysis["counts"]
+        return {
+            "comments": total,
+            "unique_texts": clusters.unique_texts,
+            "clusters": len(clusters),
+            "llm_calls": counts["llm_calls"],
+            "comments_per_llm_call": round(total / counts["llm_calls"], 1) if counts["llm_calls"] else None,
+            "labeled": {
+                "by_llm_cluster": by_llm,
+                "by_similar_cluster": by_similarity,
+                "unlabeled": total - by_llm - by_similarity,
+            },
+            "sentiment": {name: int(count) for name, count in zip(SENTIMENTS, sentiment_counts)},
+            "themes": [
+                {
+                    "theme": labels.themes[theme],
+                    "comments": int(theme_counts[theme]),
+                    "share": round(float(theme_counts[theme]) / total, 4),
+                    "sentiment": {name: int(count) for name, count in zip(SENTIMENTS, theme_sentiments[theme])},
+                    "example": examples.get(theme),
+                }
+                for theme in np.argsort(-theme_counts, kind="stable")[:TOP_THEMES].tolist()
+            ],
+        }
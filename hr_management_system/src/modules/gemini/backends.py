@@ -0,0 +1,282 @@
+"""
+LLM Backend Interface
+
+Defines the contract shared by every text-generation backend and provides a
+deterministic local fake used for development, load tests and benchmarks.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from src.utils.metrics import REGISTRY
+
+LLM_TOKENS = REGISTRY.counter(
+    "hr_llm_tokens_total", "LLM tokens by backend and direction (input, output, cached_input)", ("backend", "direction")
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token) used for quota and prompt accounting."""
+    return max(1, len(text) // 4)
+
+
+def record_token_usage(backend: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> None:
+    """Count the tokens of one call; backends report provider usage when available, estimates otherwise."""
+    LLM_TOKENS.labels(backend, "input").inc(input_tokens)
+    LLM_TOKENS.labels(backend, "output").inc(output_tokens)
+    if cached_tokens:
+        LLM_TOKENS.labels(backend, "cached_input").inc(cached_tokens)
+
+
+class LLMBackendUnavailable(RuntimeError):
+    """Raised by a backend when the upstream model could not serve a call."""
+
+
+class LLMBackend(ABC):
+    """
+    Text-generation backend used by ``GeminiService``.
+
+    ``prefix`` carries stable instructions shared across many calls. Backends that
+    support prompt caching keep it cached server-side; others simply prepend it.
+    """
+
+    name = "abstract"
+
+    @abstractmethod
+    async def generate_content(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                               prefix: Optional[str] = None) -> str:
+        """Generate the full response text for a prompt."""
+
+    @abstractmethod
+    def generate_content_stream(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                                prefix: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield response text fragments for a prompt as they are produced."""
+
+    async def close(self) -> None:
+        """Release connections or other resources held by the backend."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Return backend-specific operational statistics."""
+        return {}
+
+
+def fake_job_description_responder(prompt: str) -> str:
+    """Build a schema-valid job description JSON document from a generation prompt."""
+    title_match = re.search(r"- Title: (.+)", prompt)
+    title = title_match.group(1).strip() if title_match else "Team Member"
+    department_match = re.search(r"- Department: (.+)", prompt)
+    department = department_match.group(1).strip() if department_match else "the team"
+
+    return json.dumps({
+        "title": title,
+        "overview": (
+            f"As a {title} in {department}, you will own meaningful outcomes, partner with "
+            f"cross-functional teams and help shape how {department} delivers value."
+        ),
+        "key_responsibilities": [
+            f"Deliver high-quality work that advances {department} priorities",
+            "Collaborate with stakeholders to define scope and success criteria",
+            "Communicate progress, risks and trade-offs clearly",
+            "Continuously improve team processes and tooling",
+            "Mentor colleagues and share knowledge across the organization",
+            "Measure outcomes and iterate based on data",
+            "Uphold quality, security and compliance standards",
+        ],
+        "required_qualifications": [
+            f"Proven experience relevant to the {title} role",
+            "Strong written and verbal communication skills",
+            "Ability to prioritize and manage multiple workstreams",
+            "Track record of delivering results in a team environment",
+            "Sound judgment and problem-solving skills",
+        ],
+        "preferred_qualifications": [
+            "Experience in a fast-growing organization",
+            "Familiarity with modern collaboration tools",
+            "Prior experience mentoring others",
+        ],
+        "benefits": [
+            "Competitive salary and equity",
+            "Comprehensive health coverage",
+            "Flexible working arrangements",
+            "Learning and development budget",
+            "Generous paid time off",
+        ],
+    }, indent=2)
+
+
+def fake_assessment_responder(prompt: str) -> str:
+    """Build a schema-valid candidate assessment from a screening prompt, scored by word overlap."""
+    qualifications, _, resume = prompt.partition("RESUME:")
+    qualifications = qualifications.partition("QUALIFICATIONS:")[2]
+    wanted = set(re.findall(r"[a-z]{4,}", qualifications.lower()))
+    found = wanted & set(re.findall(r"[a-z]{4,}", resume.lower()))
+    score = round(100 * len(found) / len(wanted)) if wanted else 0
+    return json.dumps({
+        "fit_score": score,
+        "strengths": sorted(found)[:5],
+        "gaps": sorted(wanted - found)[:5],
+        "recommendation": "advance" if score >= 60 else "consider" if score >= 30 else "reject",
+        "summary": f"The resume covers {len(found)} of {len(wanted)} qualification keywords.",
+    })
+
+
+_FAKE_POSITIVE_WORDS = frozenset("great good love enjoy helpful supportive flexible happy excellent appreciate".split())
+_FAKE_NEGATIVE_WORDS = frozenset("bad poor lack slow stress unclear unfair low overworked frustrating".split())
+
+
+def fake_feedback_responder(prompt: str) -> str:
+    """Label every ``[id] comment`` line of a feedback prompt from a small sentiment lexicon and its longest word."""
+    labels = []
+    for match in re.finditer(r"^\[(\d+)\](?: \(\d+ similar\))? (.*)$", prompt, re.MULTILINE):
+        words = re.findall(r"[a-z]{3,}", match.group(2).lower())
+        positive = sum(word in _FAKE_POSITIVE_WORDS for word in words)
+        negative = sum(word in _FAKE_NEGATIVE_WORDS for word in words)
+        sentiment = ("mixed" if positive and negative else "positive" if positive
+                     else "negative" if negative else "neutral")
+        theme = max(words, key=len).capitalize() if words else "General"
+        labels.append({"id": int(match.group(1)), "sentiment": sentiment, "theme": theme})
+    return json.dumps({"labels": labels})
+
+
+def default_fake_responder(prompt: str) -> str:
+    """Answer job description, screening and feedback prompts with valid JSON and anything else with a short echo."""
+    if "key_responsibilities" in prompt:
+        return fake_job_description_responder(prompt)
+    if "fit_score" in prompt:
+        return fake_assessment_responder(prompt)
+    if '"sentiment"' in prompt:
+        return fake_feedback_responder(prompt)
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    return f"This is a simulated response ({digest}) to: {prompt.strip()[:200]}"
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Deterministic local stand-in for Gemini.
+
+    Latency, jitter and failures are drawn from a random generator seeded with
+    ``seed`` and the prompt, so a given prompt always behaves the same way across
+    runs. A ``tail_rate`` share of calls, drawn per call rather than per prompt
+    (like a slow upstream replica), takes ``tail_latency`` seconds longer.
+    Streaming splits the response into ``chunk_size`` character chunks
+    separated by ``chunk_delay`` seconds.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 chunk_size: int = 64, chunk_delay: float = 0.0, seed: int = 0,
+                 responder: Optional[Callable[[str], str]] = None, tail_rate: float = 0.0,
+                 tail_latency: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_delay = chunk_delay
+        self.seed = seed
+        self.responder = responder or default_fake_responder
+        self._calls = 0
+        self._failures = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeLLMBackend":
+        """Build a fake backend from FAKE_LLM_* environment settings."""
+        return cls(
+            latency=float(os.getenv("FAKE_LLM_LATENCY", 0.0)),
+            jitter=float(os.getenv("FAKE_LLM_JITTER", 0.0)),
+            failure_rate=float(os.getenv("FAKE_LLM_FAILURE_RATE", 0.0)),
+            chunk_size=int(os.getenv("FAKE_LLM_CHUNK_SIZE", 64)),
+            chunk_delay=float(os.getenv("FAKE_LLM_CHUNK_DELAY", 0.0)),
+            seed=int(os.getenv("FAKE_LLM_SEED", 0)),
+            tail_rate=float(os.getenv("FAKE_LLM_TAIL_RATE", 0.0)),
+            tail_latency=float(os.getenv("FAKE_LLM_TAIL_LATENCY", 0.0)),
+        )
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    async def _simulate_call(self, prompt: str) -> None:
+        """Sleep for the simulated latency and raise on a simulated failure."""
+        rng = self._rng(prompt)
+        self._calls += 1
+        delay = max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+        if self.tail_rate and random.Random(f"{self.seed}:call:{self._calls}").random() < self.tail_rate:
+            delay += self.tail_latency
+        if delay:
+            await asyncio.sleep(delay)
+        if rng.random() < self.failure_rate:
+            self._failures += 1
+            raise LLMBackendUnavailable("Simulated upstream failure")
+
+    @staticmethod
+    def _full_prompt(prompt: str, prefix: Optional[str]) -> str:
+        return f"{prefix}\n\n{prompt}" if prefix else prompt
+
+    async def generate_content(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                               prefix: Optional[str] = None) -> str:
+        prompt = self._full_prompt(prompt, prefix)
+        await self._simulate_call(prompt)
+        text = self.responder(prompt)
+        record_token_usage(self.name, estimate_tokens(prompt), estimate_tokens(text))
+        return text
+
+    async def generate_content_stream(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                                      prefix: Optional[str] = None) -> AsyncIterator[str]:
+        prompt = self._full_prompt(prompt, prefix)
+        await self._simulate_call(prompt)
+        text = self.responder(prompt)
+        record_token_usage(self.name, estimate_tokens(prompt), estimate_tokens(text))
+        for start in range(0, len(text), self.chunk_size):
+            if start and self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            yield text[start:start + self.chunk_size]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self._calls,
+            "failures": self._failures,
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "failure_rate": self.failure_rate,
+            "tail_rate": self.tail_rate,
+            "tail_latency": self.tail_latency,
+        }
+
+
+def _backend_name(name: Optional[str]) -> str:
+    return (name or os.getenv("LLM_BACKEND", "gemini")).lower()
+
+
+def preload_backend(name: Optional[str] = None) -> None:
+    """
+    Import the modules a backend needs without instantiating it.
+
+    Safe to call from a worker thread, which keeps the Gemini SDK import off
+    the event loop; the backend itself must then be created on the loop.
+    """
+    if _backend_name(name) == "gemini":
+        import src.modules.gemini.gemini_backend  # noqa: F401
+
+
+def create_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    Instantiate the backend selected by ``name`` or the LLM_BACKEND setting.
+
+    Supported values are ``gemini`` (default) and ``fake``.
+    """
+    name = _backend_name(name)
+    if name == "fake":
+        return FakeLLMBackend.from_env()
+    if name == "gemini":
+        from src.modules.gemini.gemini_backend import GeminiClient
+        return GeminiClient.from_env()
+    raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,210 @@
+"""
+Gemini Client Module
+
+Async facade over the configured LLM backend used by the HR modules for
+content generation and structured (JSON) response handling. The Google SDK
+is only imported when the Gemini backend is created, keeping it off the
+cold-start path of processes that never generate text.
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Dict, Any, Optional
+
+from src.modules.gemini.backends import LLMBackend, create_backend, preload_backend
+from src.modules.gemini.resilience import ResilientCaller
+from src.utils.json_repair import repair_json
+from src.utils.metrics import REGISTRY, timed
+
+logger = logging.getLogger(__name__)
+
+LLM_REQUESTS = REGISTRY.counter(
+    "hr_llm_requests_total", "LLM calls by backend, operation and outcome", ("backend", "operation", "outcome")
+)
+LLM_SECONDS = REGISTRY.histogram(
+    "hr_llm_request_duration_seconds", "LLM call latency (full stream for streaming calls)", ("backend", "operation")
+)
+LLM_FIRST_CHUNK_SECONDS = REGISTRY.histogram(
+    "hr_llm_first_chunk_seconds", "Time until a streaming LLM call produced its first chunk", ("backend",)
+)
+
+
+def __getattr__(name: str):
+    # GeminiClient and its retry policy used to live here; import them on demand
+    if name in ("GeminiClient", "TRANSIENT_ERRORS", "DEFAULT_MODEL"):
+        from src.modules.gemini import gemini_backend
+        return getattr(gemini_backend, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class GeminiService:
+    """
+    Shared access point for Gemini text generation.
+
+    Delegates to the process-wide ``LLMBackend`` installed by the application
+    lifespan hook (a ``GeminiClient`` unless LLM_BACKEND selects another one).
+    Outside the application (scripts, notebooks) a backend is created from the
+    environment on first use.
+    """
+
+    _client: Optional[LLMBackend] = None
+    _startup_task: Optional[asyncio.Task] = None
+    _resilience: Optional[ResilientCaller] = None
+
+    @classmethod
+    async def startup(cls, backend: Optional[LLMBackend] = None) -> None:
+        """Install the shared backend; called once from the lifespan hook."""
+        if backend is not None:
+            cls._client = backend
+        elif cls._client is None:
+            # Import the SDK in a worker thread; the client's channel is then bound to this loop
+            await asyncio.to_thread(preload_backend)
+            if cls._client is None:
+                cls._client = create_backend()
+        logger.info(f"LLM backend initialized: {cls._client.name}")
+
+    @classmethod
+    def start_in_background(cls) -> asyncio.Task:
+        """
+        Begin ``startup`` without waiting for it.
+
+        The application can report ready while the backend loads; generation
+        calls made in the meantime wait for it to finish.
+        """
+        if cls._startup_task is None or cls._startup_task.done():
+            cls._startup_task = asyncio.ensure_future(cls.startup())
+            cls._startup_task.add_done_callback(cls._log_startup_failure)
+        return cls._startup_task
+
+    @staticmethod
+    def _log_startup_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"LLM backend startup failed: {str(task.exception())}")
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close the shared client; called once from the lifespan hook."""
+        task, cls._startup_task = cls._startup_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if cls._client is not None:
+            client, cls._client = cls._client, None
+            await client.close()
+
+    @classmethod
+    def get_client(cls) -> LLMBackend:
+        """Return the shared backend, creating it from the environment if needed."""
+        if cls._client is None:
+            cls._client = create_backend()
+        return cls._client
+
+    @classmethod
+    async def ready_client(cls) -> LLMBackend:
+        """Return the shared backend, waiting for a background startup in progress."""
+        task = cls._startup_task
+        if cls._client is None and task is not None and not task.done():
+            try:
+                await asyncio.shield(task)
+            except Exception:
+                pass  # logged by the task's callback; get_client retries below
+        return cls.get_client()
+
+    @classmethod
+    def resilience(cls) -> ResilientCaller:
+        """Deadline, hedging and circuit breaker policy shared by every call, configured on first use."""
+        if cls._resilience is None:
+            cls._resilience = ResilientCaller.from_env()
+        return cls._resilience
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Return operational statistics for the shared backend and its hedging and circuit breaker."""
+        if cls._client is None:
+            return {"initialized": False}
+        return {"initialized": True, "backend": cls._client.name, **cls._client.stats(),
+                "resilience": cls.resilience().stats()}
+
+    @classmethod
+    async def generate_content(cls, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                               prefix: Optional[str] = None) -> str:
+        """
+        Generate text for a prompt.
+
+        Args:
+            prompt: Prompt text (the per-request part when ``prefix`` is given)
+            temperature: Sampling temperature
+            max_tokens: Maximum number of output tokens
+            prefix: Stable instructions shared across calls, cached when supported
+
+        Returns:
+            Generated response text
+
+        Raises:
+            DeadlineExceeded: If the request's deadline or the call timeout passes first
+            CircuitOpenError: While the upstream is failing, without calling it
+        """
+        client = await cls.ready_client()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            text = await cls.resilience().call(lambda: client.generate_content(
+                prompt, temperature=temperature, max_tokens=max_tokens, prefix=prefix
+            ))
+            outcome = "ok"
+            return text
+        finally:
+            LLM_SECONDS.labels(client.name, "generate").observe(time.perf_counter() - started)
+            LLM_REQUESTS.labels(client.name, "generate", outcome).inc()
+
+    @classmethod
+    async def generate_content_stream(cls, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                                      prefix: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Generate text for a prompt, yielding text chunks as the model produces them.
+
+        Args:
+            prompt: Prompt text (the per-request part when ``prefix`` is given)
+            temperature: Sampling temperature
+            max_tokens: Maximum number of output tokens
+            prefix: Stable instructions shared across calls, cached when supported
+
+        Yields:
+            Successive fragments of the response text
+        """
+        client = await cls.ready_client()
+        started = time.perf_counter()
+        first_chunk = True
+        outcome = "error"
+        try:
+            async for chunk in cls.resilience().stream(lambda: client.generate_content_stream(
+                prompt, temperature=temperature, max_tokens=max_tokens, prefix=prefix
+            )):
+                if first_chunk:
+                    LLM_FIRST_CHUNK_SECONDS.labels(client.name).observe(time.perf_counter() - started)
+                    first_chunk = False
+                yield chunk
+            outcome = "ok"
+        finally:
+            LLM_SECONDS.labels(client.name, "stream").observe(time.perf_counter() - started)
+            LLM_REQUESTS.labels(client.name, "stream", outcome).inc()
+
+    @staticmethod
+    @timed("parse_json")
+    def parse_json_response(response_text: str) -> Dict[str, Any]:
+        """
+        Extract a JSON object from model output.
+
+        Handles markdown code fences, surrounding prose and common damage such as
+        trailing commas or truncation (see ``src.utils.json_repair``).
+        """
+        document, repairs, _, _ = repair_json(response_text)
+        if not isinstance(document, dict):
+            raise ValueError("Model response JSON is not an object")
+        if repairs:
+            logger.info(f"Repaired model JSON: {', '.join(repairs)}")
+        return document
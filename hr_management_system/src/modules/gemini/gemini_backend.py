@@ -0,0 +1,210 @@
+"""
+Gemini Backend Module
+
+Long-lived async Gemini client built on the Google Generative AI SDK. Importing
+this module loads the SDK (protobuf and gRPC included), so it is only imported
+when the Gemini backend is actually created.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from datetime import timedelta
+from typing import AsyncIterator, Dict, Any, Optional
+
+import google.generativeai as genai
+import google.ai.generativelanguage as glm
+from google.api_core import exceptions as google_exceptions
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+from src.modules.gemini.backends import LLMBackend, estimate_tokens, record_token_usage
+from src.modules.gemini.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+# Upstream errors worth retrying after backing off
+TRANSIENT_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+
+
+class GeminiClient(LLMBackend):
+    """
+    Long-lived async Gemini client.
+
+    Owns a single gRPC channel reused by every call and a process-wide
+    ``RateLimiter`` that bounds concurrency and keeps traffic within the
+    requests-per-minute and tokens-per-minute quota.
+
+    Shared prompt prefixes are sent as the model's system instruction through a
+    model handle built once per prefix, so every call starts with a
+    byte-identical prefix that the API can reuse. With ``context_cache`` enabled
+    the prefix is also registered as explicit cached content; if the API rejects
+    it (for example because the prefix is below the minimum cacheable size), the
+    system-instruction handle is used instead.
+    """
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model_name: str = DEFAULT_MODEL,
+                 limiter: Optional[RateLimiter] = None, context_cache: bool = False,
+                 context_cache_ttl: float = 3600):
+        self.model_name = model_name
+        self.limiter = limiter or RateLimiter()
+        self.context_cache = context_cache
+        self.context_cache_ttl = context_cache_ttl
+        self._prefix_models: Dict[str, Any] = {}
+        self._cached_contents = []
+        self._prefix_stats = {"prefixes": 0, "explicit_cache": 0, "prefix_calls": 0}
+        self._async_client = glm.GenerativeServiceAsyncClient(
+            transport="grpc_asyncio",
+            client_options={"api_key": api_key},
+        )
+        self._model = self._bind_client(genai.GenerativeModel(model_name))
+
+    @classmethod
+    def from_env(cls) -> "GeminiClient":
+        """Build a client from GEMINI_* environment settings."""
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("GEMINI_API_KEY is not configured")
+        limiter = RateLimiter(
+            requests_per_minute=float(os.getenv("GEMINI_RPM", 60)),
+            tokens_per_minute=float(os.getenv("GEMINI_TPM", 1_000_000)),
+            max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", 16)),
+            max_queue_wait=float(os.getenv("GEMINI_MAX_QUEUE_WAIT", 30)),
+        )
+        return cls(
+            api_key,
+            os.getenv("GEMINI_MODEL", DEFAULT_MODEL),
+            limiter,
+            context_cache=os.getenv("GEMINI_CONTEXT_CACHE", "False").lower() in ("true", "1", "t"),
+            context_cache_ttl=float(os.getenv("GEMINI_CONTEXT_CACHE_TTL", 3600)),
+        )
+
+    async def close(self) -> None:
+        """Delete registered cached contents and close the underlying channel."""
+        for cached in self._cached_contents:
+            try:
+                await asyncio.to_thread(cached.delete)
+            except Exception as e:
+                logger.warning(f"Failed to delete cached content: {str(e)}")
+        self._cached_contents.clear()
+        await self._async_client.transport.close()
+        logger.info("Gemini client closed")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the model name, prefix reuse and rate limiter statistics."""
+        return {"model": self.model_name, "prefix_cache": dict(self._prefix_stats), **self.limiter.stats()}
+
+    def _bind_client(self, model):
+        """
+        Route a model through our channel instead of the SDK's implicit default client.
+
+        ``GenerativeModel`` has no public way to pass an async client, so this sets
+        its private ``_async_client``; requirements.txt pins the SDK to the minor
+        version this was checked against. Should the attribute disappear, the
+        model keeps the SDK's default client rather than failing.
+        """
+        if not hasattr(model, "_async_client"):
+            logger.warning("GenerativeModel has no _async_client; using the SDK's default async client")
+            return model
+        model._async_client = self._async_client
+        return model
+
+    async def _model_for(self, prefix: Optional[str]):
+        """Return the model handle carrying ``prefix``, creating it on first use."""
+        if not prefix:
+            return self._model
+        key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        entry = self._prefix_models.get(key)
+        if entry is None or entry[1] <= time.time():
+            entry = await self._create_prefix_model(prefix)
+            self._prefix_models[key] = entry
+            self._prefix_stats["prefixes"] += 1
+        self._prefix_stats["prefix_calls"] += 1
+        return entry[0]
+
+    async def _create_prefix_model(self, prefix: str):
+        """Build a model handle for a prefix, as explicit cached content when enabled."""
+        if self.context_cache:
+            try:
+                cached = await asyncio.to_thread(
+                    genai.caching.CachedContent.create,
+                    model=self.model_name,
+                    system_instruction=prefix,
+                    ttl=timedelta(seconds=self.context_cache_ttl),
+                )
+                model = self._bind_client(genai.GenerativeModel.from_cached_content(cached))
+                self._cached_contents.append(cached)
+                self._prefix_stats["explicit_cache"] += 1
+                # Recreate slightly before the server-side entry expires
+                return model, time.time() + self.context_cache_ttl - 60
+            except Exception as e:
+                logger.warning(f"Context cache registration failed, using system instruction: {str(e)}")
+
+        model = self._bind_client(genai.GenerativeModel(self.model_name, system_instruction=prefix))
+        return model, float("inf")
+
+    @staticmethod
+    def _generation_config(temperature: float, max_tokens: int) -> genai.GenerationConfig:
+        return genai.GenerationConfig(temperature=temperature, max_output_tokens=max_tokens)
+
+    @staticmethod
+    def _total_tokens(response) -> Optional[int]:
+        usage = getattr(response, "usage_metadata", None)
+        return getattr(usage, "total_token_count", None) if usage else None
+
+    def _record_usage(self, response, estimated_input: int, text_length: int) -> None:
+        """Count reported token usage, falling back to estimates when the response has none."""
+        usage = getattr(response, "usage_metadata", None)
+        input_tokens = getattr(usage, "prompt_token_count", 0) if usage else 0
+        output_tokens = getattr(usage, "candidates_token_count", 0) if usage else 0
+        cached_tokens = getattr(usage, "cached_content_token_count", 0) if usage else 0
+        record_token_usage(
+            self.name,
+            input_tokens or estimated_input,
+            output_tokens or max(1, text_length // 4),
+            cached_tokens or 0,
+        )
+
+    @retry(retry=retry_if_exception_type(TRANSIENT_ERRORS), stop=stop_after_attempt(3),
+           wait=wait_random_exponential(multiplier=1, max=8), reraise=True)
+    async def generate_content(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                               prefix: Optional[str] = None) -> str:
+        """Generate text for a prompt within the shared quota."""
+        model = await self._model_for(prefix)
+        estimated = estimate_tokens(prefix or "") + estimate_tokens(prompt) + max_tokens
+        async with self.limiter.acquire(estimated):
+            response = await model.generate_content_async(
+                prompt, generation_config=self._generation_config(temperature, max_tokens),
+            )
+        self.limiter.record_usage(estimated, self._total_tokens(response))
+        self._record_usage(response, estimated - max_tokens, len(response.text))
+        return response.text
+
+    async def generate_content_stream(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                                      prefix: Optional[str] = None) -> AsyncIterator[str]:
+        """Generate text for a prompt, yielding chunks while holding one quota slot."""
+        model = await self._model_for(prefix)
+        estimated = estimate_tokens(prefix or "") + estimate_tokens(prompt) + max_tokens
+        async with self.limiter.acquire(estimated):
+            response = await model.generate_content_async(
+                prompt, generation_config=self._generation_config(temperature, max_tokens), stream=True,
+            )
+            last_chunk = None
+            text_length = 0
+            async for chunk in response:
+                last_chunk = chunk
+                if chunk.parts:
+                    text_length += len(chunk.text)
+                    yield chunk.text
+        self.limiter.record_usage(estimated, self._total_tokens(last_chunk))
+        self._record_usage(last_chunk, estimated - max_tokens, text_length)
@@ -0,0 +1,163 @@
+"""
+Gemini Rate Limiting
+
+Process-wide admission control for Gemini calls: a concurrency semaphore plus
+token buckets for requests-per-minute and tokens-per-minute quotas, so bursts
+queue briefly instead of producing 429 responses.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call would have to queue longer than the configured maximum."""
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate_per_minute``.
+
+    Reservations may drive the balance negative; the caller then sleeps for the
+    time needed to pay the debt back. This keeps admission FIFO-fair without a
+    polling loop.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return how long the caller must wait before using them."""
+        self._refill()
+        self._tokens -= amount
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate_per_second
+
+    def adjust(self, amount: float) -> None:
+        """Return (positive) or charge (negative) tokens after the actual cost is known."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class RateLimiter:
+    """
+    Admission controller shared by every Gemini call in the process.
+
+    Callers enter ``acquire`` with an estimate of the tokens they will consume;
+    they first wait for a concurrency slot, then for request and token budget.
+    Queue depth and wait times are tracked for tuning.
+    """
+
+    def __init__(self, requests_per_minute: float = 60, tokens_per_minute: float = 1_000_000,
+                 max_concurrency: int = 16, max_queue_wait: float = 30.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_queue_wait = max_queue_wait
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recent_waits: deque = deque(maxlen=1000)
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot and quota for the duration of one call.
+
+        Args:
+            estimated_tokens: Expected input plus output tokens for the call
+
+        Raises:
+            RateLimitExceeded: If the quota wait would exceed ``max_queue_wait``
+        """
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            wait = max(self._requests.reserve(1), self._tokens.reserve(estimated_tokens))
+            if time.monotonic() - started + wait > self.max_queue_wait:
+                self._requests.adjust(1)
+                self._tokens.adjust(estimated_tokens)
+                self._rejected += 1
+                raise RateLimitExceeded(f"Gemini quota wait of {wait:.1f}s exceeds {self.max_queue_wait:.1f}s")
+            if wait > 0:
+                self._waiting += 1
+                try:
+                    await asyncio.sleep(wait)
+                finally:
+                    self._waiting -= 1
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        waited = time.monotonic() - started
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        self._recent_waits.append(waited)
+        if waited > 1.0:
+            logger.info(f"Gemini call queued for {waited:.2f}s")
+
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Reconcile the token bucket with the usage reported by the API."""
+        if actual_tokens is not None:
+            self._tokens.adjust(estimated_tokens - actual_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait-time and quota statistics."""
+        waits = sorted(self._recent_waits)
+        p95 = waits[int(0.95 * (len(waits) - 1))] if waits else 0.0
+        return {
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "avg_wait_seconds": self._total_wait / self._admitted if self._admitted else 0.0,
+            "p95_wait_seconds": p95,
+            "max_wait_seconds": self._max_wait,
+            "available_requests": self._requests.available,
+            "available_tokens": self._tokens.available,
+            "limits": {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "max_concurrency": self.max_concurrency,
+                "max_queue_wait_seconds": self.max_queue_wait,
+            },
+        }
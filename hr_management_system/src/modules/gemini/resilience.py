@@ -0,0 +1,406 @@
+"""
+LLM Call Resilience
+
+Tail-latency and failure handling around every LLM call: a per-request
+deadline propagated from client headers through a context variable, hedged
+duplicate calls sent once the primary is slower than the recent p95 (the
+slower one is cancelled), and a circuit breaker that fails fast while the
+upstream is degraded so callers can fall back to cached or stored results.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.modules.gemini.backends import LLMBackendUnavailable
+from src.modules.gemini.rate_limiter import RateLimitExceeded
+from src.utils.deadline import DeadlineExceeded, deadline_scope, remaining_time
+from src.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+LLM_HEDGES = REGISTRY.counter("hr_llm_hedges_total", "Hedged LLM calls by which attempt answered first", ("winner",))
+LLM_CIRCUIT_REJECTIONS = REGISTRY.counter("hr_llm_circuit_rejections_total", "LLM calls rejected by an open circuit")
+LLM_DEADLINE_EXCEEDED = REGISTRY.counter("hr_llm_deadline_exceeded_total", "LLM calls cut off by their deadline")
+LLM_CIRCUIT_STATE = REGISTRY.gauge("hr_llm_circuit_open", "1 while the LLM circuit breaker is open or half-open")
+
+# Headers carrying the client's time budget for a request, in seconds
+DEADLINE_HEADERS = (b"x-request-timeout", b"request-timeout")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Exceptions raised by these packages come from the upstream API or the network on the way to it
+UPSTREAM_ERROR_MODULES = ("google.api_core", "google.auth", "grpc", "httpx", "httpcore", "aiohttp")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the LLM while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM upstream is degraded; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def is_upstream_error(error: BaseException) -> bool:
+    """
+    Whether a failed call says something about the upstream's health.
+
+    Backend-reported outages, transport errors and API errors count. Local
+    failures do not: our own quota queue refusing a call (``RateLimitExceeded``)
+    or a bug in request building must not open the circuit on a healthy upstream.
+    """
+    if isinstance(error, RateLimitExceeded):
+        return False
+    if isinstance(error, (LLMBackendUnavailable, ConnectionError)):
+        return True
+    return type(error).__module__.startswith(UPSTREAM_ERROR_MODULES)
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware turning an ``X-Request-Timeout`` (or ``Request-Timeout``)
+    header, in seconds, into the deadline for every LLM call the request makes.
+    Values above ``max_timeout`` are capped; invalid values are ignored.
+    """
+
+    def __init__(self, app, max_timeout: Optional[float] = None):
+        self.app = app
+        self.max_timeout = max_timeout or float(os.getenv("LLM_MAX_REQUEST_TIMEOUT", 300))
+
+    def _timeout(self, scope) -> Optional[float]:
+        for name, value in scope.get("headers", ()):
+            if name in DEADLINE_HEADERS:
+                try:
+                    timeout = float(value.decode("latin-1"))
+                except ValueError:
+                    return None
+                return min(timeout, self.max_timeout) if timeout > 0 else None
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline_scope(self._timeout(scope)):
+            await self.app(scope, receive, send)
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over the last ``window`` calls.
+
+    Opens when at least ``min_calls`` of them were recorded and the share of
+    failures reaches ``failure_rate``. After ``cooldown`` seconds one probe call
+    is let through (half-open): its success closes the circuit, its failure
+    opens it for another cooldown.
+    """
+
+    def __init__(self, window: int = 20, failure_rate: float = 0.5, min_calls: int = 10, cooldown: float = 30.0):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._outcomes: deque = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._stats = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            return HALF_OPEN
+        return self._state
+
+    def before_call(self) -> None:
+        """Admit a call or raise ``CircuitOpenError``."""
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and not self._probing:
+            self._state = HALF_OPEN
+            self._probing = True
+            return
+        self._stats["rejected"] += 1
+        LLM_CIRCUIT_REJECTIONS.inc()
+        raise CircuitOpenError(max(0.0, self.cooldown - (time.monotonic() - self._opened_at)))
+
+    def record(self, success: bool) -> None:
+        """Record an admitted call's outcome."""
+        if self._state == HALF_OPEN:
+            self._probing = False
+            if success:
+                logger.info("LLM circuit closed after a successful probe")
+                self._state = CLOSED
+                self._outcomes.clear()
+                LLM_CIRCUIT_STATE.set(0)
+            else:
+                self._open()
+            return
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if (self._state == CLOSED and len(self._outcomes) >= self.min_calls
+                and failures >= self.failure_rate * len(self._outcomes)):
+            self._open()
+
+    def release(self) -> None:
+        """Forget an admitted call that ended without an outcome (e.g. cancelled)."""
+        if self._state == HALF_OPEN:
+            self._probing = False
+
+    def _open(self) -> None:
+        logger.warning(f"LLM circuit opened for {self.cooldown:.0f}s")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._stats["opened"] += 1
+        LLM_CIRCUIT_STATE.set(1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "recent_failures": self._outcomes.count(False),
+        }
+
+
+class LatencyWindow:
+    """Latencies of the last ``size`` successful calls, with a cached quantile."""
+
+    def __init__(self, size: int = 200):
+        self._values: deque = deque(maxlen=size)
+        self._added = 0
+        self._cache: Dict[float, Tuple[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, seconds: float) -> None:
+        self._values.append(seconds)
+        self._added += 1
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        if not self._values:
+            return None
+        cached = self._cache.get(fraction)
+        # Recomputed every few samples; the tail moves slowly
+        if cached is None or self._added - cached[0] >= 10:
+            ordered = sorted(self._values)
+            cached = self._added, ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+            self._cache[fraction] = cached
+        return cached[1]
+
+
+class ResilientCaller:
+    """
+    Deadline, hedging and circuit breaking for LLM calls.
+
+    A call's timeout is the tighter of ``call_timeout`` and the request's
+    remaining deadline. Once ``hedge_min_samples`` latencies are known, a call
+    still running after the ``hedge_quantile`` latency (at least
+    ``hedge_min_delay``) is duplicated and the first answer wins; hedges are
+    limited to ``hedge_budget`` of all calls. Upstream errors and timeouts at
+    the full ``call_timeout`` count as failures for the breaker; a deadline set
+    by the client being too short and local errors (see ``is_upstream_error``)
+    do not.
+    """
+
+    def __init__(self, call_timeout: float = 60.0, hedging: bool = True, hedge_quantile: float = 0.95,
+                 hedge_min_samples: int = 20, hedge_min_delay: float = 0.2, hedge_budget: float = 0.1,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.call_timeout = call_timeout
+        self.hedging = hedging
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_budget = hedge_budget
+        self.breaker = breaker or CircuitBreaker()
+        self.latencies = LatencyWindow()
+        self._hedge_tokens = 1.0
+        self._stats = {
+            "calls": 0, "succeeded": 0, "failed": 0, "local_failures": 0, "deadline_exceeded": 0,
+            "hedged": 0, "hedge_won": 0, "primary_won": 0, "hedges_skipped_budget": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "ResilientCaller":
+        """Build a caller from LLM_* environment settings."""
+        return cls(
+            call_timeout=float(os.getenv("LLM_CALL_TIMEOUT", 60)),
+            hedging=os.getenv("LLM_HEDGING", "True").lower() in ("true", "1", "t"),
+            hedge_quantile=float(os.getenv("LLM_HEDGE_QUANTILE", 0.95)),
+            hedge_min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20)),
+            hedge_min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", 0.2)),
+            hedge_budget=float(os.getenv("LLM_HEDGE_BUDGET", 0.1)),
+            breaker=CircuitBreaker(
+                window=int(os.getenv("LLM_BREAKER_WINDOW", 20)),
+                failure_rate=float(os.getenv("LLM_BREAKER_FAILURE_RATE", 0.5)),
+                min_calls=int(os.getenv("LLM_BREAKER_MIN_CALLS", 10)),
+                cooldown=float(os.getenv("LLM_BREAKER_COOLDOWN", 30)),
+            ),
+        )
+
+    def _timeout(self) -> Tuple[float, bool]:
+        """The call's timeout and whether the client's deadline (not ``call_timeout``) sets it."""
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            self._stats["deadline_exceeded"] += 1
+            LLM_DEADLINE_EXCEEDED.inc()
+            raise DeadlineExceeded("Request deadline passed before the LLM call")
+        if remaining is not None and remaining < self.call_timeout:
+            return remaining, True
+        return self.call_timeout, False
+
+    def hedge_delay(self) -> Optional[float]:
+        """How long to wait before hedging, or None while too few latencies are known."""
+        if not self.hedging or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, self.latencies.quantile(self.hedge_quantile))
+
+    async def _attempt(self, operation: Callable[[], Awaitable[str]]) -> str:
+        started = time.monotonic()
+        result = await operation()
+        self.latencies.add(time.monotonic() - started)
+        return result
+
+    async def call(self, operation: Callable[[], Awaitable[str]]) -> str:
+        """Run ``operation`` (a factory for one LLM call) under the deadline, hedging and the breaker."""
+        timeout, client_bound = self._timeout()
+        self.breaker.before_call()
+        self._stats["calls"] += 1
+        self._hedge_tokens = min(10.0, self._hedge_tokens + self.hedge_budget)
+        try:
+            result = await self._hedged(operation, timeout)
+        except asyncio.TimeoutError:
+            self._stats["deadline_exceeded"] += 1
+            LLM_DEADLINE_EXCEEDED.inc()
+            if client_bound:
+                self.breaker.release()
+            else:
+                self.breaker.record(False)
+            raise DeadlineExceeded(f"LLM call did not finish within {timeout:.2f}s") from None
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            self._stats["failed"] += 1
+            if is_upstream_error(e):
+                self.breaker.record(False)
+            else:
+                self._stats["local_failures"] += 1
+                self.breaker.release()
+            raise
+        self._stats["succeeded"] += 1
+        self.breaker.record(True)
+        return result
+
+    async def _hedged(self, operation: Callable[[], Awaitable[str]], timeout: float) -> str:
+        end = time.monotonic() + timeout
+        primary = asyncio.ensure_future(self._attempt(operation))
+        hedge = None
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            delay = self.hedge_delay()
+            if delay is not None and delay < timeout:
+                await asyncio.wait(pending, timeout=delay)
+                if not primary.done():
+                    if self._hedge_tokens >= 1:
+                        self._hedge_tokens -= 1
+                        self._stats["hedged"] += 1
+                        hedge = asyncio.ensure_future(self._attempt(operation))
+                        pending.add(hedge)
+                    else:
+                        self._stats["hedges_skipped_budget"] += 1
+            while pending:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    if task.exception() is None:
+                        if hedge is not None:
+                            winner = "hedge" if task is hedge else "primary"
+                            self._stats[f"{winner}_won"] += 1
+                            LLM_HEDGES.labels(winner).inc()
+                        return task.result()
+                    # The other attempt may still succeed
+                    error = task.exception()
+            raise error
+        finally:
+            # The slower attempt (or both, on timeout or cancellation) is abandoned
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(_consume_result)
+
+    async def stream(self, open_stream: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """
+        Relay a streaming call under the deadline and the breaker (streams are not hedged).
+
+        The deadline bounds the wait for each chunk; the breaker records the
+        stream's outcome once it ends.
+        """
+        timeout, client_bound = self._timeout()
+        self.breaker.before_call()
+        self._stats["calls"] += 1
+        end = time.monotonic() + timeout
+        chunks = open_stream().__aiter__()
+        outcome: Optional[bool] = None
+        try:
+            while True:
+                remaining = end - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    self._stats["deadline_exceeded"] += 1
+                    LLM_DEADLINE_EXCEEDED.inc()
+                    outcome = None if client_bound else False
+                    raise DeadlineExceeded(f"LLM stream did not finish within {timeout:.2f}s") from None
+                yield chunk
+            outcome = True
+            self._stats["succeeded"] += 1
+        except (DeadlineExceeded, GeneratorExit, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            self._stats["failed"] += 1
+            if is_upstream_error(e):
+                outcome = False
+            else:
+                self._stats["local_failures"] += 1
+            raise
+        finally:
+            if outcome is None:
+                self.breaker.release()
+            else:
+                self.breaker.record(outcome)
+            close = getattr(chunks, "aclose", None)
+            if close is not None:
+                await close()
+
+    def stats(self) -> Dict[str, Any]:
+        hedge_delay = self.hedge_delay()
+        p50 = self.latencies.quantile(0.5)
+        return {
+            **self._stats,
+            "call_timeout": self.call_timeout,
+            "hedging": self.hedging,
+            "hedge_delay_ms": round(hedge_delay * 1000, 1) if hedge_delay is not None else None,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_samples": len(self.latencies),
+            "breaker": self.breaker.stats(),
+        }
+
+
+def _consume_result(task: asyncio.Task) -> None:
+    # Retrieve an abandoned attempt's outcome so it is not logged as never retrieved
+    if not task.cancelled():
+        task.exception()
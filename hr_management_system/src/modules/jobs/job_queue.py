@@ -0,0 +1,277 @@
+"""
+Job Queue Module
+
+Runs long generations in the background: submitting returns a job ID at once,
+a pool of async workers executes registered handlers by priority with retries,
+and callers poll the job or subscribe to its status changes.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.modules.jobs.job_store import PRIORITIES, TERMINAL_STATUSES, JobStore
+from src.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+JOBS = REGISTRY.counter("hr_jobs_total", "Job attempts by kind and outcome", ("kind", "outcome"))
+JOB_SECONDS = REGISTRY.histogram("hr_job_duration_seconds", "Job handler run time by kind", ("kind",))
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# The queue and ID of the job whose handler is running in this context
+_running_job: ContextVar[Optional[Tuple["JobQueue", str]]] = ContextVar("running_job", default=None)
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot succeed (e.g. an invalid payload)."""
+
+
+class JobQueue:
+    """
+    Pool of async workers over a durable ``JobStore``.
+
+    Every application process runs its own pool against the shared store, so
+    work spreads across processes and a job outlives the process that accepted
+    it. Workers wake at once for jobs submitted in the same process and poll
+    every ``poll_interval`` seconds for jobs submitted elsewhere. A running
+    job's lease is renewed while its handler runs; failures are retried with
+    jittered exponential backoff up to the job's ``max_attempts``.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, concurrency: Optional[int] = None,
+                 poll_interval: Optional[float] = None, lease_seconds: Optional[float] = None,
+                 job_timeout: Optional[float] = None, retry_base_delay: float = 2.0,
+                 retry_max_delay: float = 60.0, retention_seconds: Optional[float] = None):
+        self.store = store or JobStore()
+        self.concurrency = max(1, concurrency or int(os.getenv("JOB_WORKERS", 4)))
+        self.poll_interval = poll_interval or float(os.getenv("JOB_POLL_INTERVAL", 1.0))
+        self.lease_seconds = lease_seconds or float(os.getenv("JOB_LEASE_SECONDS", 60))
+        self.job_timeout = job_timeout or float(os.getenv("JOB_TIMEOUT", 120))
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.retention_seconds = retention_seconds or float(os.getenv("JOB_RETENTION_SECONDS", 7 * 24 * 3600))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._timeouts: Dict[str, float] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._watchers: Dict[str, asyncio.Event] = {}
+        self._stopping = False
+        self._running = 0
+        self._stats = {"submitted": 0, "succeeded": 0, "failed": 0, "retried": 0, "released": 0}
+
+    def register(self, kind: str, handler: JobHandler, timeout: Optional[float] = None) -> None:
+        """
+        Run ``handler(payload)`` for jobs of ``kind``; its return value becomes the job result.
+
+        ``timeout`` overrides the queue's ``job_timeout`` for long-running kinds.
+        """
+        self._handlers[kind] = handler
+        if timeout is not None:
+            self._timeouts[kind] = timeout
+
+    async def start(self) -> None:
+        """Start the worker pool; called from the lifespan hook."""
+        if self._workers:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self.store.prune, self.retention_seconds)
+        self._workers = [asyncio.ensure_future(self._worker(slot)) for slot in range(self.concurrency)]
+        logger.info(f"Job queue started with {self.concurrency} workers ({self.owner})")
+
+    async def stop(self, drain_timeout: Optional[float] = None) -> None:
+        """
+        Stop claiming jobs and wait for running ones to finish.
+
+        Jobs still running after ``drain_timeout`` seconds are interrupted and
+        returned to the queue for another process to pick up.
+        """
+        if not self._workers:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        timeout = drain_timeout if drain_timeout is not None else float(os.getenv("JOB_DRAIN_TIMEOUT", 20))
+        workers, self._workers = self._workers, []
+        _, pending = await asyncio.wait(workers, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info("Job queue stopped")
+
+    async def submit(self, kind: str, payload: Dict[str, Any], priority: str = "normal",
+                     max_attempts: int = 3) -> Dict[str, Any]:
+        """Persist a job and return its record; a worker picks it up shortly after."""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'")
+        job = await asyncio.to_thread(self.store.submit, kind, payload, priority, max_attempts)
+        self._stats["submitted"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet."""
+        cancelled = await asyncio.to_thread(self.store.cancel, job_id)
+        if cancelled:
+            self._notify(job_id)
+        return cancelled
+
+    async def watch(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the job's record each time its status, attempt count or progress changes.
+
+        Ends after the record in a terminal state (succeeded, failed, cancelled)
+        has been yielded; yields nothing for an unknown job.
+        """
+        last = None
+        changed = None
+        try:
+            while True:
+                changed = self._watchers.setdefault(job_id, asyncio.Event())
+                job = await self.get(job_id)
+                if job is None:
+                    return
+                if (job["status"], job["attempts"], job["progress"]) != last:
+                    last = job["status"], job["attempts"], job["progress"]
+                    yield job
+                if job["status"] in TERMINAL_STATUSES:
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Jobs finished by another process never notify this one
+            if changed is not None and self._watchers.get(job_id) is changed:
+                del self._watchers[job_id]
+
+    async def _set_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        try:
+            await asyncio.to_thread(self.store.set_progress, job_id, self.owner, progress)
+        except Exception as e:
+            logger.warning(f"Could not record progress for job {job_id}: {str(e)}")
+            return
+        self._notify(job_id)
+
+    def _notify(self, job_id: str) -> None:
+        changed = self._watchers.pop(job_id, None)
+        if changed is not None:
+            changed.set()
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _worker(self, slot: int) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self.store.claim, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Job worker {slot} could not claim a job: {str(e)}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._notify(job["id"])
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id, kind = job["id"], job["kind"]
+        self._running += 1
+        heartbeat = asyncio.ensure_future(self._heartbeat(job_id))
+        started = time.perf_counter()
+        outcome = "failed"
+        try:
+            handler = self._handlers.get(kind)
+            if handler is None:
+                raise PermanentJobError(f"No handler registered for job kind '{kind}'")
+            if job["attempts"] > job["max_attempts"]:
+                # Only reachable when workers holding the job kept dying before finishing it
+                raise PermanentJobError("Job was interrupted on every attempt")
+            _running_job.set((self, job_id))
+            timeout = self._timeouts.get(kind, self.job_timeout)
+            result = await asyncio.wait_for(handler(job["payload"]), timeout=timeout)
+            await asyncio.to_thread(self.store.succeed, job_id, self.owner, result)
+            self._stats["succeeded"] += 1
+            outcome = "succeeded"
+            logger.info(f"Job {job_id} ({kind}) succeeded in {time.perf_counter() - started:.2f}s")
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back rather than losing the attempt. The release runs
+            # in a thread, shielded, so it neither blocks the loop draining the other workers
+            # nor is abandoned if this task is cancelled again
+            try:
+                await asyncio.shield(asyncio.to_thread(self.store.release, job_id, self.owner))
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Could not requeue job {job_id}; it is retried once its lease expires: {str(e)}")
+            self._stats["released"] += 1
+            outcome = "released"
+            logger.warning(f"Job {job_id} ({kind}) interrupted by shutdown and requeued")
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            retry = not isinstance(e, PermanentJobError) and job["attempts"] < job["max_attempts"]
+            retry_at = time.time() + self._retry_delay(job["attempts"]) if retry else None
+            await asyncio.to_thread(self.store.fail, job_id, self.owner, error, retry_at)
+            if retry:
+                self._stats["retried"] += 1
+                outcome = "retried"
+                logger.warning(f"Job {job_id} ({kind}) attempt {job['attempts']} failed, retrying: {error}")
+            else:
+                self._stats["failed"] += 1
+                logger.error(f"Job {job_id} ({kind}) failed: {error}")
+        finally:
+            heartbeat.cancel()
+            JOBS.labels(kind, outcome).inc()
+            JOB_SECONDS.labels(kind).observe(time.perf_counter() - started)
+            self._running -= 1
+            self._notify(job_id)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Renew the job's lease while its handler runs."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.store.renew, job_id, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Could not renew lease for job {job_id}: {str(e)}")
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "workers": len(self._workers),
+            "running": self._running,
+            "jobs": await asyncio.to_thread(self.store.counts),
+        }
+
+
+async def report_progress(progress: Dict[str, Any]) -> None:
+    """
+    Record the progress of the job whose handler is calling, for status polls and watchers.
+
+    A no-op outside a job handler, so handlers can also be called directly.
+    """
+    running = _running_job.get()
+    if running is not None:
+        job_queue, job_id = running
+        await job_queue._set_progress(job_id, progress)
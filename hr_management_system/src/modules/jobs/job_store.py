@@ -0,0 +1,258 @@
+"""
+Job Store Module
+
+Durable SQLite state for background jobs: submission, atomic claiming with
+expiring leases, retries and terminal results, shared by every worker process.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "data",
+    "jobs.db",
+)
+
+# Lower values are claimed first
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+PRIORITY_NAMES = {value: name for name, value in PRIORITIES.items()}
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATUSES = frozenset({SUCCEEDED, FAILED, CANCELLED})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    progress TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, priority, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at);
+"""
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(value).isoformat() if value is not None else None
+
+
+class JobStore:
+    """
+    Job table shared by all processes of the application.
+
+    A job is claimed by atomically moving the best ready row (lowest priority
+    value, then oldest) to ``running`` under a lease. A worker that dies
+    without finishing leaves its lease to expire, after which the job is
+    claimable again, so jobs survive crashes and restarts. Each process opens
+    its own connection, shared across threads behind a lock; callers on the
+    event loop should use ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("JOB_STORE_PATH") or DEFAULT_JOB_STORE_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._owner_pid: Optional[int] = None
+        self._process_connection: Optional[sqlite3.Connection] = None
+        with self._lock:
+            self._connection.executescript(_SCHEMA)
+            columns = {row["name"] for row in self._connection.execute("PRAGMA table_info(jobs)")}
+            if "progress" not in columns:
+                # Stores created before jobs reported progress
+                with self._connection:
+                    self._connection.execute("ALTER TABLE jobs ADD COLUMN progress TEXT")
+        logger.info(f"Job store opened at {self.path}")
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """The connection for the current process; a forked worker opens its own."""
+        if self._owner_pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            if self.path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            self._process_connection = connection
+            self._owner_pid = os.getpid()
+        return self._process_connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owner_pid == os.getpid():
+                self._process_connection.close()
+                self._owner_pid = None
+
+    def _record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "priority": PRIORITY_NAMES.get(row["priority"], row["priority"]),
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+            "created_at": _timestamp(row["created_at"]),
+            "started_at": _timestamp(row["started_at"]),
+            "finished_at": _timestamp(row["finished_at"]),
+            "payload": json.loads(row["payload"]),
+            "progress": json.loads(row["progress"]) if row["progress"] is not None else None,
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"],
+        }
+
+    def submit(self, kind: str, payload: Dict[str, Any], priority: str = "normal",
+               max_attempts: int = 3) -> Dict[str, Any]:
+        """Queue a new job and return its record."""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO jobs (id, kind, priority, status, payload, max_attempts, "
+                "created_at, updated_at, available_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, PRIORITIES[priority], QUEUED, json.dumps(payload), max(1, max_attempts),
+                 now, now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._record(row) if row else None
+
+    def claim(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Move the next ready job to ``running`` for ``owner`` and return it, or None.
+
+        Jobs whose lease expired (their worker died) are returned to the queue first.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            expired = self._connection.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at < ?",
+                (QUEUED, now, RUNNING, now),
+            ).rowcount
+            if expired:
+                logger.warning(f"Requeued {expired} jobs whose worker lease expired")
+            # Step RETURNING to completion before the transaction commits
+            rows = self._connection.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires_at = ?, "
+                "started_at = ?, updated_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = ? AND available_at <= ? "
+                "            ORDER BY priority, available_at LIMIT 1) "
+                "RETURNING *",
+                (RUNNING, owner, now + lease_seconds, now, now, QUEUED, now),
+            ).fetchall()
+        return self._record(rows[0]) if rows else None
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend a running job's lease; False if the job is no longer held by ``owner``."""
+        now = time.time()
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, RUNNING, owner),
+            ).rowcount
+        return updated == 1
+
+    def set_progress(self, job_id: str, owner: str, progress: Dict[str, Any]) -> bool:
+        """Record a running job's progress; False if the job is no longer held by ``owner``."""
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (json.dumps(progress), time.time(), job_id, RUNNING, owner),
+            ).rowcount
+        return updated == 1
+
+    def succeed(self, job_id: str, owner: str, result: Dict[str, Any]) -> bool:
+        return self._finish(job_id, owner, SUCCEEDED, result=json.dumps(result))
+
+    def fail(self, job_id: str, owner: str, error: str, retry_at: Optional[float] = None) -> bool:
+        """Record a failed attempt, requeueing the job for ``retry_at`` when given."""
+        if retry_at is None:
+            return self._finish(job_id, owner, FAILED, error=error)
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL, "
+                "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (QUEUED, error, retry_at, time.time(), job_id, RUNNING, owner),
+            ).rowcount
+        return updated == 1
+
+    def release(self, job_id: str, owner: str) -> bool:
+        """Return a running job to the queue without counting the interrupted attempt."""
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+                "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (QUEUED, time.time(), job_id, RUNNING, owner),
+            ).rowcount
+        return updated == 1
+
+    def _finish(self, job_id: str, owner: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None) -> bool:
+        now = time.time()
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, updated_at = ?, "
+                "lease_owner = NULL, lease_expires_at = NULL WHERE id = ? AND status = ? AND lease_owner = ?",
+                (status, result, error, now, now, job_id, RUNNING, owner),
+            ).rowcount
+        return updated == 1
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started; running and finished jobs are left alone."""
+        now = time.time()
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, now, now, job_id, QUEUED),
+            ).rowcount
+        return updated == 1
+
+    def prune(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the retention period."""
+        with self._lock, self._connection:
+            deleted = self._connection.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - older_than_seconds,),
+            ).rowcount
+        if deleted:
+            logger.info(f"Pruned {deleted} finished jobs")
+        return deleted
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows: List[sqlite3.Row] = self._connection.execute(
+                "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["count"] for row in rows}
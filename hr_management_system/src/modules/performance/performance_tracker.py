@@ -0,0 +1,106 @@
+"""
+Performance Tracker Module
+
+Ingestion and querying of employee performance reviews. Reviews are stored
+in a memory-mapped columnar table shared by all worker processes, and team
+and department analytics are maintained incrementally on top of it.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.utils.metrics import REGISTRY, stage
+
+logger = logging.getLogger(__name__)
+
+REVIEWS_INGESTED = REGISTRY.counter("hr_performance_reviews_total", "Performance reviews ingested")
+
+DEFAULT_PERFORMANCE_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "data",
+    "performance",
+)
+
+# Names are stored one per line and teams are keyed by department and team with a tab
+_NAME_PATTERN = r"^[^\t\r\n]+$"
+
+
+class PerformanceReview(BaseModel):
+    """One employee's review for a review cycle."""
+    employee_id: str = Field(..., min_length=1, max_length=100, pattern=_NAME_PATTERN)
+    cycle: str = Field(..., min_length=1, max_length=40, pattern=_NAME_PATTERN,
+                       description="Review cycle label that sorts chronologically, e.g. 2024-H1")
+    department: str = Field(..., min_length=1, max_length=100, pattern=_NAME_PATTERN)
+    team: str = Field(..., min_length=1, max_length=100, pattern=_NAME_PATTERN)
+    score: float = Field(..., ge=0, le=100)
+    rating: float = Field(..., ge=1, le=5)
+    goals_met: int = Field(default=0, ge=0, le=1000)
+    goals_total: int = Field(default=0, ge=0, le=1000)
+    submitted_at: Optional[float] = None
+
+    @model_validator(mode="after")
+    def check_goals(self) -> "PerformanceReview":
+        if self.goals_met > self.goals_total:
+            raise ValueError("goals_met cannot exceed goals_total")
+        return self
+
+
+class PerformanceTracker:
+    """
+    Review ingestion and analytics for the performance pages.
+
+    The analytics engine (and numpy) is loaded on first use. Its methods are
+    blocking but take milliseconds; callers on the event loop should still use
+    ``asyncio.to_thread``, since the first query in a process aggregates every
+    stored review.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ingest_batch_size: Optional[int] = None):
+        self.directory = directory or os.getenv("PERFORMANCE_DATA_DIR") or DEFAULT_PERFORMANCE_DATA_DIR
+        self.ingest_batch_size = ingest_batch_size or int(os.getenv("PERFORMANCE_INGEST_BATCH", 5000))
+        self._analytics = None
+
+    @property
+    def analytics(self):
+        """The ``ReviewAnalytics`` over this tracker's store."""
+        if self._analytics is None:
+            from src.modules.performance.review_analytics import ReviewAnalytics
+            self._analytics = ReviewAnalytics.open(self.directory)
+            logger.info(f"Performance store opened at {self.directory}")
+        return self._analytics
+
+    async def ingest(self, reviews: AsyncIterator[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Store reviews from an async stream in batches.
+
+        Returns:
+            Counts of ``received`` reviews and ``stored`` rows in the table afterwards
+        """
+        received = 0
+        batch: List[Dict[str, Any]] = []
+
+        async def flush() -> None:
+            nonlocal received, batch
+            now = time.time()
+            for review in batch:
+                review["submitted_at"] = review.get("submitted_at") or now
+            with stage("performance_ingest"):
+                received += await asyncio.to_thread(self.analytics.add_reviews, batch)
+            REVIEWS_INGESTED.inc(len(batch))
+            batch = []
+
+        async for review in reviews:
+            batch.append(review)
+            if len(batch) >= self.ingest_batch_size:
+                await flush()
+        if batch:
+            await flush()
+        # Fold the new reviews in now rather than on the next query
+        with stage("performance_aggregate"):
+            snapshot = await asyncio.to_thread(self.analytics.catch_up)
+        return {"received": received, "stored": snapshot.rows}
@@ -0,0 +1,381 @@
+"""
+Review Analytics Module
+
+Vectorized team and department analytics over performance reviews kept in a
+columnar store. Running sums per (review cycle, group) cell are updated
+incrementally from newly appended reviews only, so summaries, rankings and
+trends are array lookups; distributions and percentiles are computed on
+demand with a masked pass over the memory-mapped columns.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.utils.columnar_store import ColumnarStore, TableSnapshot
+
+logger = logging.getLogger(__name__)
+
+REVIEW_COLUMNS = {"score": "f4", "rating": "f4", "goals_met": "i2", "goals_total": "i2", "submitted_at": "f8"}
+REVIEW_DICTIONARY_COLUMNS = ("employee", "cycle", "department", "team")
+GROUP_DIMENSIONS = ("department", "team")
+RATING_LEVELS = 5
+PERCENTILES = (10, 25, 50, 75, 90)
+# Team names are only unique within a department, so teams are keyed by both
+TEAM_SEPARATOR = "\t"
+# Reviews are applied in chunks of this many rows, bounding temporary memory
+CATCH_UP_CHUNK = 200_000
+_CYCLE_BITS = 16
+
+
+def team_key(department: str, team: str) -> str:
+    return f"{department}{TEAM_SEPARATOR}{team}"
+
+
+class _CellAggregates:
+    """Running sums per (cycle, group) cell, grown as new cycles and groups appear."""
+
+    SUMS = ("count", "score", "score_squares", "rating", "goals_met", "goals_total")
+
+    def __init__(self):
+        self.sums = {name: np.zeros((0, 0)) for name in self.SUMS}
+        self.ratings = np.zeros((0, 0, RATING_LEVELS))
+
+    @property
+    def shape(self):
+        return self.sums["count"].shape
+
+    def grow(self, cycles: int, groups: int) -> None:
+        old_cycles, old_groups = self.shape
+        if cycles <= old_cycles and groups <= old_groups:
+            return
+        cycles, groups = max(cycles, old_cycles), max(groups, old_groups)
+        for name, values in self.sums.items():
+            grown = np.zeros((cycles, groups))
+            grown[:old_cycles, :old_groups] = values
+            self.sums[name] = grown
+        grown = np.zeros((cycles, groups, RATING_LEVELS))
+        grown[:old_cycles, :old_groups] = self.ratings
+        self.ratings = grown
+
+    def add(self, cycles: np.ndarray, groups: np.ndarray, sign: float, values: Dict[str, np.ndarray]) -> None:
+        """Add (``sign`` 1) or retract (``sign`` -1) reviews, one bincount per sum."""
+        shape = self.shape
+        cells = cycles.astype(np.int64) * shape[1] + groups
+        size = shape[0] * shape[1]
+        weights = {
+            "count": None,
+            "score": values["score"],
+            "score_squares": np.square(values["score"], dtype=np.float64),
+            "rating": values["rating"],
+            "goals_met": values["goals_met"],
+            "goals_total": values["goals_total"],
+        }
+        for name, weight in weights.items():
+            self.sums[name] += sign * np.bincount(cells, weights=weight, minlength=size).reshape(shape)
+        levels = np.clip(np.rint(values["rating"]).astype(np.int64), 1, RATING_LEVELS) - 1
+        self.ratings += sign * np.bincount(
+            cells * RATING_LEVELS + levels, minlength=size * RATING_LEVELS
+        ).reshape(self.ratings.shape)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Element-wise ``scale * numerator / denominator``, NaN where the denominator is zero."""
+    result = np.full(np.shape(numerator), np.nan)
+    np.divide(numerator * scale, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def _number(value: float, digits: int = 2) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+class ReviewAnalytics:
+    """
+    Incrementally maintained performance analytics.
+
+    An employee has one review per cycle: a review submitted again for the
+    same employee and cycle supersedes the earlier one, which is retracted
+    from the running sums. Every query first applies the rows appended to the
+    store since the previous query, by this or any other process. Cycles are
+    ordered by label, so labels such as ``2024-H1`` or ``2024-Q3`` sort
+    chronologically. Instances are safe to share between threads.
+    """
+
+    def __init__(self, store: ColumnarStore):
+        self.store = store
+        self._lock = threading.RLock()
+        self._applied = 0
+        self._latest: Dict[int, int] = {}
+        self._active = np.zeros(0, dtype=bool)
+        self._cells = {dimension: _CellAggregates() for dimension in GROUP_DIMENSIONS}
+
+    @classmethod
+    def open(cls, directory: str) -> "ReviewAnalytics":
+        return cls(ColumnarStore(directory, REVIEW_COLUMNS, REVIEW_DICTIONARY_COLUMNS))
+
+    def add_reviews(self, reviews: Sequence[Dict[str, Any]]) -> int:
+        """Append validated reviews to the store; they are aggregated on the next query."""
+        if not reviews:
+            return 0
+        rows = self.store.append({
+            "employee": [review["employee_id"] for review in reviews],
+            "cycle": [review["cycle"] for review in reviews],
+            "department": [review["department"] for review in reviews],
+            "team": [team_key(review["department"], review["team"]) for review in reviews],
+            "score": [review["score"] for review in reviews],
+            "rating": [review["rating"] for review in reviews],
+            "goals_met": [review["goals_met"] for review in reviews],
+            "goals_total": [review["goals_total"] for review in reviews],
+            "submitted_at": [review["submitted_at"] for review in reviews],
+        })
+        return len(rows)
+
+    def catch_up(self) -> TableSnapshot:
+        """Fold reviews appended since the last call into the running sums."""
+        with self._lock:
+            snapshot = self.store.snapshot()
+            if snapshot.rows > self._applied:
+                cycles = len(snapshot.dictionaries["cycle"])
+                if cycles >= 1 << _CYCLE_BITS:
+                    raise ValueError("Too many review cycles")
+                for dimension, cells in self._cells.items():
+                    cells.grow(cycles, len(snapshot.dictionaries[dimension]))
+                active = np.zeros(snapshot.rows, dtype=bool)
+                active[:len(self._active)] = self._active
+                self._active = active
+                for start in range(self._applied, snapshot.rows, CATCH_UP_CHUNK):
+                    self._apply(snapshot, start, min(start + CATCH_UP_CHUNK, snapshot.rows))
+                logger.info(f"Applied {snapshot.rows - self._applied} performance reviews")
+                self._applied = snapshot.rows
+            return snapshot
+
+    def _apply(self, snapshot: TableSnapshot, start: int, end: int) -> None:
+        columns = snapshot.columns
+        rows = np.arange(start, end, dtype=np.int64)
+        keys = (columns["employee"][start:end].astype(np.int64) << _CYCLE_BITS) | columns["cycle"][start:end]
+        # The last review of an employee in a cycle wins, within the chunk and against earlier rows
+        unique_keys, last = np.unique(keys[::-1], return_index=True)
+        winners = rows[::-1][last]
+        key_list = unique_keys.tolist()
+        previous = np.fromiter((self._latest.get(key, -1) for key in key_list), dtype=np.int64, count=len(key_list))
+        self._latest.update(zip(key_list, winners.tolist()))
+        superseded = previous[previous >= 0]
+
+        self._active[winners] = True
+        self._active[superseded] = False
+        for selected, sign in ((winners, 1.0), (superseded, -1.0)):
+            if not len(selected):
+                continue
+            values = {name: columns[name][selected] for name in ("score", "rating", "goals_met", "goals_total")}
+            cycle_codes = columns["cycle"][selected]
+            for dimension, cells in self._cells.items():
+                cells.add(cycle_codes, columns[dimension][selected], sign, values)
+
+    def _cycle_order(self, snapshot: TableSnapshot) -> List[int]:
+        labels = snapshot.dictionaries["cycle"]
+        return sorted(range(len(labels)), key=labels.__getitem__)
+
+    def _resolve_cycle(self, snapshot: TableSnapshot, cycle: Optional[str]) -> Optional[int]:
+        """Code of a cycle by label, or of the latest cycle when none is given."""
+        if cycle is None:
+            order = self._cycle_order(snapshot)
+            return order[-1] if order else None
+        return snapshot.code("cycle", cycle)
+
+    def _previous_cycle(self, snapshot: TableSnapshot, code: int) -> Optional[int]:
+        order = self._cycle_order(snapshot)
+        position = order.index(code)
+        return order[position - 1] if position else None
+
+    def _describe(self, sums: Dict[str, np.ndarray], ratings: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-cell statistics from running sums (works on any matching array shapes)."""
+        count = sums["count"]
+        mean = _ratio(sums["score"], count)
+        variance = np.maximum(_ratio(sums["score_squares"], count) - np.square(mean), 0.0)
+        return {
+            "reviews": count,
+            "average_score": mean,
+            "score_std": np.sqrt(variance),
+            "average_rating": _ratio(sums["rating"], count),
+            "goal_attainment": _ratio(sums["goals_met"], sums["goals_total"], 100.0),
+            "ratings": ratings,
+        }
+
+    def _company_sums(self, cycle_codes) -> Dict[str, Any]:
+        cells = self._cells["department"]
+        sums = {name: values[cycle_codes].sum(axis=-1) for name, values in cells.sums.items()}
+        return self._describe(sums, cells.ratings[cycle_codes].sum(axis=-2))
+
+    @staticmethod
+    def _entry(stats: Dict[str, np.ndarray], index) -> Dict[str, Any]:
+        return {
+            "reviews": int(stats["reviews"][index]),
+            "average_score": _number(stats["average_score"][index]),
+            "score_std": _number(stats["score_std"][index]),
+            "average_rating": _number(stats["average_rating"][index]),
+            "goal_attainment": _number(stats["goal_attainment"][index], 1),
+            "rating_distribution": {
+                str(level + 1): int(count) for level, count in enumerate(stats["ratings"][index])
+            },
+        }
+
+    def summary(self, cycle: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Company-wide figures for a cycle (the latest by default) and the change from the previous one."""
+        with self._lock:
+            snapshot = self.catch_up()
+            code = self._resolve_cycle(snapshot, cycle)
+            if code is None:
+                return None
+            previous = self._previous_cycle(snapshot, code)
+            current = self._entry(self._company_sums(code), ())
+            result = {"cycle": snapshot.dictionaries["cycle"][code], **current, "previous_cycle": None, "change": None}
+            if previous is not None:
+                before = self._entry(self._company_sums(previous), ())
+                result["previous_cycle"] = snapshot.dictionaries["cycle"][previous]
+                result["change"] = {
+                    key: round(current[key] - before[key], 2)
+                    if current[key] is not None and before[key] is not None else None
+                    for key in ("average_score", "average_rating", "goal_attainment")
+                }
+            return result
+
+    def groups(self, dimension: str, cycle: Optional[str] = None,
+               department: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Every department or team reviewed in a cycle, best average score first.
+
+        Teams can be limited to one ``department``. Each group carries its
+        average score change from the previous cycle.
+        """
+        with self._lock:
+            snapshot = self.catch_up()
+            code = self._resolve_cycle(snapshot, cycle)
+            if code is None:
+                return None
+            cells = self._cells[dimension]
+            stats = self._describe(
+                {name: values[code] for name, values in cells.sums.items()}, cells.ratings[code]
+            )
+            previous = self._previous_cycle(snapshot, code)
+            change = np.full(cells.shape[1], np.nan)
+            if previous is not None:
+                before = _ratio(cells.sums["score"][previous], cells.sums["count"][previous])
+                change = stats["average_score"] - before
+
+            names = snapshot.dictionaries[dimension]
+            selected = np.flatnonzero(stats["reviews"] > 0)
+            if department is not None and dimension == "team":
+                prefix = team_key(department, "")
+                selected = np.array([index for index in selected if names[index].startswith(prefix)], dtype=np.int64)
+            selected = selected[np.argsort(-np.nan_to_num(stats["average_score"][selected], nan=-1.0), kind="stable")]
+
+            groups = []
+            for index in selected.tolist():
+                entry = {"department": names[index]} if dimension == "department" else dict(
+                    zip(("department", "team"), names[index].split(TEAM_SEPARATOR, 1))
+                )
+                entry.update(self._entry(stats, index))
+                entry["score_change"] = _number(change[index])
+                groups.append(entry)
+            return {"cycle": snapshot.dictionaries["cycle"][code], "by": dimension, "groups": groups}
+
+    def trend(self, dimension: Optional[str] = None, department: Optional[str] = None,
+              team: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Figures per cycle, in cycle order, for the company, a department or a team."""
+        with self._lock:
+            snapshot = self.catch_up()
+            order = self._cycle_order(snapshot)
+            if dimension is None:
+                stats = self._company_sums(order)
+            else:
+                name = department if dimension == "department" else team_key(department or "", team or "")
+                group = snapshot.code(dimension, name)
+                if group is None:
+                    return None
+                cells = self._cells[dimension]
+                stats = self._describe(
+                    {key: values[order, group] for key, values in cells.sums.items()}, cells.ratings[order, group]
+                )
+            labels = snapshot.dictionaries["cycle"]
+            points = [
+                {"cycle": labels[code], **self._entry(stats, position)}
+                for position, code in enumerate(order)
+                if stats["reviews"][position] > 0
+            ]
+            return {"department": department, "team": team, "points": points}
+
+    def distribution(self, cycle: Optional[str] = None, department: Optional[str] = None,
+                     team: Optional[str] = None, bins: int = 10) -> Optional[Dict[str, Any]]:
+        """Score histogram and percentiles for a cycle, optionally within a department or team."""
+        with self._lock:
+            snapshot = self.catch_up()
+            active = self._active
+        code = self._resolve_cycle(snapshot, cycle)
+        if code is None:
+            return None
+        columns = snapshot.columns
+        mask = active & (columns["cycle"] == code)
+        if team is not None:
+            group = snapshot.code("team", team_key(department or "", team))
+            if group is None:
+                return None
+            mask &= columns["team"] == group
+        elif department is not None:
+            group = snapshot.code("department", department)
+            if group is None:
+                return None
+            mask &= columns["department"] == group
+        scores = columns["score"][mask]
+        counts, edges = np.histogram(scores, bins=bins, range=(0.0, 100.0))
+        percentiles = np.percentile(scores, PERCENTILES) if len(scores) else [np.nan] * len(PERCENTILES)
+        return {
+            "cycle": snapshot.dictionaries["cycle"][code],
+            "department": department,
+            "team": team,
+            "reviews": int(len(scores)),
+            "histogram": [
+                {"from": round(float(low), 2), "to": round(float(high), 2), "count": int(count)}
+                for low, high, count in zip(edges[:-1], edges[1:], counts)
+            ],
+            "percentiles": {f"p{p}": _number(value) for p, value in zip(PERCENTILES, percentiles)},
+        }
+
+    def employee_history(self, employee_id: str) -> Optional[Dict[str, Any]]:
+        """An employee's current review in every cycle, in cycle order."""
+        with self._lock:
+            snapshot = self.catch_up()
+            active = self._active
+        code = snapshot.code("employee", employee_id)
+        if code is None:
+            return None
+        columns = snapshot.columns
+        rows = np.flatnonzero(active & (columns["employee"] == code))
+        labels = snapshot.dictionaries["cycle"]
+        reviews = [
+            {
+                "cycle": labels[columns["cycle"][row]],
+                "department": snapshot.dictionaries["department"][columns["department"][row]],
+                "team": snapshot.dictionaries["team"][columns["team"][row]].split(TEAM_SEPARATOR, 1)[-1],
+                "score": _number(columns["score"][row]),
+                "rating": _number(columns["rating"][row]),
+                "goals_met": int(columns["goals_met"][row]),
+                "goals_total": int(columns["goals_total"][row]),
+                "submitted_at": float(columns["submitted_at"][row]),
+            }
+            for row in rows.tolist()
+        ]
+        reviews.sort(key=lambda review: review["cycle"])
+        return {"employee_id": employee_id, "reviews": reviews}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = self.catch_up()
+            return {
+                **self.store.stats(),
+                "applied_rows": self._applied,
+                "current_reviews": int(self._active.sum()),
+                "cycles": sorted(snapshot.dictionaries["cycle"]),
+            }
@@ -0,0 +1,210 @@
+"""
+Request Canonicalization Module
+
+Reduces free-form job titles, departments and seniority levels to canonical
+forms (abbreviations expanded, compounds joined, tokens stemmed and ordered)
+so that differently worded requests for the same role compare equal.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9&+#]+")
+# Hyphens and slashes inside a word ("back-end", "dev/ops") join its parts
+_INTRA_WORD_JOINERS = re.compile(r"(?<=[a-z0-9])[-/](?=[a-z0-9])")
+
+# Title abbreviations, applied before stemming
+TITLE_ABBREVIATIONS: Dict[str, str] = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "jnr": "junior",
+    "eng": "engineer",
+    "engr": "engineer",
+    "engg": "engineer",
+    "dev": "developer",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "sre": "site reliability engineer",
+    "mgr": "manager",
+    "mgmt": "management",
+    "pm": "product manager",
+    "em": "engineering manager",
+    "vp": "vice president",
+    "svp": "senior vice president",
+    "dir": "director",
+    "assoc": "associate",
+    "asst": "assistant",
+    "exec": "executive",
+    "admin": "administrator",
+    "ops": "operations",
+    "qa": "quality assurance",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "ux": "user experience",
+    "ui": "user interface",
+    "hr": "human resources",
+    "mktg": "marketing",
+    "acct": "account",
+    "rep": "representative",
+    "spec": "specialist",
+    "coord": "coordinator",
+}
+
+# Department abbreviations differ from title ones ("eng" is a department, not a role)
+DEPARTMENT_ABBREVIATIONS: Dict[str, str] = {
+    **TITLE_ABBREVIATIONS,
+    "eng": "engineering",
+    "engr": "engineering",
+    "engg": "engineering",
+    "dev": "development",
+    "ops": "operations",
+    "cs": "customer support",
+    "cx": "customer experience",
+}
+
+# Two-word spellings of compounds that are also written as one word
+COMPOUNDS: Dict[Tuple[str, str], str] = {
+    ("back", "end"): "backend",
+    ("front", "end"): "frontend",
+    ("full", "stack"): "fullstack",
+    ("dev", "ops"): "devops",
+    ("data", "base"): "database",
+    ("on", "call"): "oncall",
+}
+
+# Words carrying no role information
+STOP_WORDS = frozenset({"a", "an", "and", "the", "of", "for", "in", "to", "with", "&", "team", "department", "dept"})
+
+# Title words implied by most technical roles ("Software Engineer" is an "Engineer")
+TITLE_FILLER_WORDS = frozenset({"software"})
+
+# Stemming suffixes, longest first; a suffix is only removed if at least three characters remain
+_SUFFIXES = (("ations", ""), ("ation", ""), ("ments", ""), ("ment", ""), ("ings", ""), ("ing", ""),
+             ("ers", ""), ("er", ""), ("ies", "y"), ("ss", "ss"), ("is", "is"), ("s", ""))
+
+
+@dataclass(frozen=True)
+class SeniorityLevel:
+    """Canonical seniority with the experience range used in prompts."""
+    name: str
+    experience: str
+    rank: int
+
+
+SENIORITY_LEVELS: Tuple[SeniorityLevel, ...] = (
+    SeniorityLevel("intern", "0-1 years", 0),
+    SeniorityLevel("junior", "1-3 years", 1),
+    SeniorityLevel("mid-level", "3-5 years", 2),
+    SeniorityLevel("senior", "5-8 years", 3),
+    SeniorityLevel("lead", "8+ years", 4),
+    SeniorityLevel("principal", "10+ years", 5),
+    SeniorityLevel("director", "12+ years", 6),
+)
+DEFAULT_SENIORITY = SENIORITY_LEVELS[2]
+
+# Words (after abbreviation expansion) naming each seniority level
+SENIORITY_ALIASES: Dict[str, str] = {
+    "intern": "intern", "internship": "intern", "trainee": "intern", "apprentice": "intern",
+    "junior": "junior", "entry": "junior", "graduate": "junior", "associate": "junior",
+    "mid": "mid-level", "midlevel": "mid-level", "intermediate": "mid-level",
+    "senior": "senior",
+    "lead": "lead", "staff": "lead",
+    "principal": "principal", "distinguished": "principal",
+    "director": "director", "head": "director", "vice": "director", "vp": "director",
+}
+_LEVELS_BY_NAME = {level.name: level for level in SENIORITY_LEVELS}
+
+# Seniority words that say nothing about the role itself; "lead", "staff", "head",
+# "principal", "associate" and "vice" often name a different role and stay in titles
+LEVEL_ONLY_WORDS = frozenset({"intern", "junior", "mid", "midlevel", "senior"})
+
+
+def _strip_suffix(token: str) -> str:
+    for suffix, replacement in _SUFFIXES:
+        if token.endswith(suffix):
+            if len(token) - len(suffix) >= 3:
+                return token[:-len(suffix)] + replacement
+            return token
+    return token
+
+
+def stem(token: str) -> str:
+    """Strip up to two common English suffixes ("engineering", "engineers" and "engineer" become "engin")."""
+    for _ in range(2):
+        stripped = _strip_suffix(token)
+        if stripped == token:
+            break
+        token = stripped
+    # "manage"/"managers" and "service"/"services" meet on the bare stem
+    if token.endswith("e") and len(token) > 4:
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str, abbreviations: Dict[str, str] = TITLE_ABBREVIATIONS) -> List[str]:
+    """Lowercase, join compounds and expand abbreviations; stop words are kept."""
+    text = _INTRA_WORD_JOINERS.sub("", text.lower().replace(".", " "))
+    raw = _TOKEN_PATTERN.findall(text)
+    tokens: List[str] = []
+    index = 0
+    while index < len(raw):
+        pair = tuple(raw[index:index + 2])
+        if pair in COMPOUNDS:
+            tokens.append(COMPOUNDS[pair])
+            index += 2
+            continue
+        tokens.extend(abbreviations.get(raw[index], raw[index]).split())
+        index += 1
+    return tokens
+
+
+def canonicalize_seniority(seniority: Optional[str]) -> SeniorityLevel:
+    """Map a free-form seniority ("Sr.", "Senior II", "mid level") to a canonical level."""
+    tokens = tokenize(seniority or "")
+    for first, second in zip(tokens, tokens[1:]):
+        if (first, second) == ("mid", "level"):
+            return _LEVELS_BY_NAME["mid-level"]
+    for token in tokens:
+        if token in SENIORITY_ALIASES:
+            return _LEVELS_BY_NAME[SENIORITY_ALIASES[token]]
+    return DEFAULT_SENIORITY
+
+
+def _title_tokens(title: str) -> List[str]:
+    return [
+        stem(token) for token in tokenize(title)
+        if token not in STOP_WORDS and token not in LEVEL_ONLY_WORDS and token not in TITLE_FILLER_WORDS
+    ]
+
+
+def canonicalize_title(title: str) -> str:
+    """
+    Canonical title: content words stemmed and sorted, pure level words removed.
+
+    Level words are dropped because the seniority field carries them, so
+    "Sr. Back-end Engineer" and "Senior Backend Software Engineer" both become
+    "backend engin". Words that can name a role ("Lead", "Staff", "Head of")
+    are kept, so "Lead Engineer" and "Staff Engineer" stay apart.
+    """
+    return " ".join(sorted(set(_title_tokens(title))))
+
+
+def normalize_title(title: str) -> str:
+    """
+    Title wording with spelling variants folded but word order kept.
+
+    Two requests whose normalized titles are equal ask for the same title, so
+    a description generated for one can be served to the other unchanged.
+    """
+    return " ".join(_title_tokens(title))
+
+
+def canonicalize_department(department: str) -> str:
+    """Canonical department text: abbreviations expanded, tokens stemmed and sorted."""
+    tokens = {
+        stem(token) for token in tokenize(department, DEPARTMENT_ABBREVIATIONS)
+        if token not in STOP_WORDS
+    }
+    return " ".join(sorted(tokens))
@@ -5,18 +5,85 @@ Leverages Gemini's generative capabilities to create comprehensive, tailored
 job descriptions with industry-specific terminology and structural consistency.
 """
 
+import os
+import asyncio
 import logging
 import json
+import hashlib
+from dataclasses import replace
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import AsyncIterator, Dict, List, Any, Literal, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
+from src.modules.gemini.backends import LLMBackendUnavailable
 from src.modules.gemini.client import GeminiService
+from src.modules.gemini.rate_limiter import RateLimitExceeded
+from src.modules.gemini.resilience import CircuitOpenError, DeadlineExceeded
+from src.modules.jobs.job_queue import PermanentJobError
 from src.utils.error_handling import handle_api_error
+from src.utils.cache import ResponseCache
+from src.utils.json_stream import JSONSectionStreamParser
+from src.modules.recruitment.knowledge_base import GENERIC_ENTRY, IndustryKnowledgeBase
+from src.modules.recruitment.job_description_store import JobDescriptionStore
+from src.modules.recruitment.canonicalization import (
+    canonicalize_department,
+    canonicalize_seniority,
+    canonicalize_title,
+    normalize_title,
+)
+from src.modules.recruitment.similar_requests import (
+    CanonicalRequest,
+    SimilarMatch,
+    SimilarRequestIndex,
+    details_fingerprint,
+)
+from src.modules.recruitment.section_pipeline import SectionPipeline
+from src.modules.recruitment.template_writer import TemplateJobDescriptionWriter, display_title
+from src.modules.recruitment.prompt_templates import (
+    PromptTemplateRegistry,
+    RenderedPrompt,
+    render_missing_sections_body,
+    render_refine_body,
+    render_seeded_body,
+)
+from src.utils.json_repair import SchemaGuidedJSONParser
+from src.utils.metrics import REGISTRY, CollectedMetric, stage, timed
 
 logger = logging.getLogger(__name__)
 
+# Job queue kind for queued generations
+GENERATION_JOB_KIND = "job_description.generate"
+
+# "parallel" writes section groups concurrently; "single" asks for the whole document in one call
+GENERATION_STRATEGIES = ("parallel", "single")
+
+# "llm" generates the whole description, "refine" has the LLM rewrite only REFINED_SECTIONS of a
+# template-built draft, "template" writes it from the phrase library without calling the LLM
+GENERATION_TIERS = ("llm", "refine", "template")
+# Higher is better; a stored description is only reused or used as a seed for tiers at or below its own
+TIER_QUALITY = {"template": 0, "refine": 1, "llm": 2}
+REFINED_SECTIONS = ("overview", "key_responsibilities")
+
+# Failures after which a stored or template-built description is served instead
+LLM_UNAVAILABLE_ERRORS = (CircuitOpenError, DeadlineExceeded, RateLimitExceeded, LLMBackendUnavailable)
+
+# Sections forwarded to streaming clients as soon as they are complete
+STREAMED_SECTIONS = (
+    "title",
+    "overview",
+    "key_responsibilities",
+    "required_qualifications",
+    "preferred_qualifications",
+    "benefits",
+)
+
+JD_FALLBACKS = REGISTRY.counter(
+    "hr_jd_fallbacks_total", "Job descriptions served from the store or templates while the LLM was unavailable",
+    ("reason", "source"),
+)
+JD_TIERS = REGISTRY.counter("hr_jd_tier_requests_total", "Job description generations by tier", ("tier",))
+
 class JobDescriptionRequest(BaseModel):
     """Structured request for job description generation."""
     title: str = Field(..., description="Job title")
@@ -28,6 +95,9 @@ class JobDescriptionRequest(BaseModel):
     company_description: Optional[str] = Field(default=None, description="Custom company description")
     custom_requirements: Optional[List[str]] = Field(default=None, description="Specific job requirements")
     tone: str = Field(default="professional", description="Tone of the job description")
+    tier: Optional[Literal["llm", "refine", "template"]] = Field(
+        default=None, description="Generation tier; defaults to JD_DEFAULT_TIER"
+    )
 
 class JobDescriptionResponse(BaseModel):
     """Structured response from job description generation."""
@@ -62,143 +132,552 @@ class JobDescriptionGenerator:
         if self._initialized:
             return
             
-        self.template_cache = {}
-        self.industry_knowledge_base = self._initialize_knowledge_base()
+        self.response_cache = ResponseCache(
+            max_entries=int(os.getenv("JD_CACHE_MAX_ENTRIES", 512)),
+            ttl_seconds=float(os.getenv("JD_CACHE_TTL_SECONDS", 6 * 3600)),
+            disk_dir=os.getenv("JD_CACHE_DIR") or None,
+            max_disk_entries=int(os.getenv("JD_CACHE_MAX_DISK_ENTRIES", 4096)),
+        )
+        self.knowledge_base = IndustryKnowledgeBase()
+        self.prompt_templates = PromptTemplateRegistry()
+        self.store = JobDescriptionStore()
+        self.similar_requests = SimilarRequestIndex(
+            reuse_threshold=float(os.getenv("JD_REUSE_THRESHOLD", 0.9)),
+            seed_threshold=float(os.getenv("JD_SEED_THRESHOLD", 0.75)),
+        )
+        self.generation_strategy = os.getenv("JD_GENERATION_STRATEGY", "parallel").lower()
+        if self.generation_strategy not in GENERATION_STRATEGIES:
+            logger.warning(f"Unknown JD_GENERATION_STRATEGY '{self.generation_strategy}', using 'parallel'")
+            self.generation_strategy = "parallel"
+        self.default_tier = os.getenv("JD_DEFAULT_TIER", "llm").lower()
+        if self.default_tier not in GENERATION_TIERS:
+            logger.warning(f"Unknown JD_DEFAULT_TIER '{self.default_tier}', using 'llm'")
+            self.default_tier = "llm"
+        self.template_fallback = os.getenv("JD_TEMPLATE_FALLBACK", "True").lower() in ("true", "1", "t")
+        self.template_writer = TemplateJobDescriptionWriter(self.knowledge_base)
+        self.section_pipeline = SectionPipeline(
+            lambda parameters, seed: self._build_prompt(JobDescriptionRequest(**parameters), seed=seed),
+            JobDescriptionResponse,
+        )
+        self._index_stored_requests()
+        REGISTRY.register_collector(self._collect_metrics)
         self._initialized = True
         logger.info("Job Description Generator initialized")
     
-    def _initialize_knowledge_base(self) -> Dict[str, Dict[str, Any]]:
-        """Initialize industry-specific terminology and requirements database."""
-        # In production, this would load from a database or knowledge graph
-        return {
-            "engineering": {
-                "skills": ["software development", "system design", "algorithms", "data structures"],
-                "certifications": ["AWS", "Azure", "Google Cloud", "Kubernetes"],
-                "frameworks": ["React", "Angular", "Vue", "Django", "Flask", "Spring"]
-            },
-            "design": {
-                "skills": ["user research", "wireframing", "prototyping", "usability testing"],
-                "tools": ["Figma", "Sketch", "Adobe XD", "InVision"],
-                "methodologies": ["Design Thinking", "Agile UX", "Lean UX"]
-            },
-            "marketing": {
-                "skills": ["campaign management", "market research", "content strategy", "analytics"],
-                "platforms": ["Google Analytics", "HubSpot", "Salesforce", "Marketo"],
-                "certifications": ["Google Ads", "HubSpot Marketing", "Facebook Blueprint"]
-            },
-            "customer_support": {
-                "skills": ["problem solving", "communication", "product knowledge", "empathy"],
-                "tools": ["Zendesk", "Intercom", "Freshdesk", "Salesforce Service Cloud"],
-                "certifications": ["ITIL", "HDI", "Customer Service Professional"]
-            }
-        }
-    
+    def _collect_metrics(self) -> List[CollectedMetric]:
+        """Response cache and near-duplicate reuse counters for ``/metrics``."""
+        cache = self.response_cache.stats()
+        similar = self.similar_requests.stats()
+        return [
+            CollectedMetric(
+                "hr_cache_requests_total", "counter", "Job description response cache lookups by result",
+                ("cache", "result"),
+                {("job_description", result): cache[key] for key, result in (
+                    ("hits", "hit"), ("disk_hits", "disk_hit"), ("misses", "miss"), ("coalesced", "coalesced"))},
+            ),
+            CollectedMetric("hr_cache_entries", "gauge", "Entries in the job description response cache",
+                            ("cache",), {("job_description",): cache["entries"]}),
+            CollectedMetric(
+                "hr_similar_requests_total", "counter", "Near-duplicate lookups and how they were served",
+                ("outcome",),
+                {("lookup",): similar["lookups"], ("reused",): similar["reused"], ("seeded",): similar["seeded"]},
+            ),
+        ]
+
+    @timed("industry_context")
     def _get_industry_context(self, department: str) -> Dict[str, Any]:
         """Retrieve industry-specific context for the given department."""
-        normalized_dept = department.lower().replace(" ", "_")
-        
-        # Find the closest matching department or fallback to generic
-        for key in self.industry_knowledge_base:
-            if key in normalized_dept or normalized_dept in key:
-                return self.industry_knowledge_base[key]
-        
-        # Return generic context if no match found
-        return {"skills": [], "tools": [], "methodologies": [], "certifications": []}
+        return self.knowledge_base.lookup(department).context
     
-    @handle_api_error(default_return_factory=lambda: {"error": "Failed to generate job description"})
+    def _canonicalize(self, request: JobDescriptionRequest) -> CanonicalRequest:
+        """Reduce a request to canonical title, department, seniority and a details fingerprint."""
+        industry = self.knowledge_base.lookup(request.department)
+        return CanonicalRequest(
+            title=canonicalize_title(request.title),
+            department=industry.key if industry is not GENERIC_ENTRY else canonicalize_department(request.department),
+            seniority=canonicalize_seniority(request.seniority).name,
+            details=details_fingerprint(request.model_dump()),
+            wording=normalize_title(request.title),
+        )
+
+    def _index_stored_requests(self) -> None:
+        """Load the requests behind every stored description into the similarity index."""
+        def entries():
+            for job_description_id, parameters in self.store.iter_parameters():
+                try:
+                    request = JobDescriptionRequest(**parameters)
+                    # Descriptions stored before tiers existed were all written by the LLM
+                    quality = TIER_QUALITY[request.tier or "llm"]
+                    yield job_description_id, self._canonicalize(request), quality
+                except ValueError as e:
+                    logger.warning(f"Skipping stored job description {job_description_id}: {str(e)}")
+        self.similar_requests.add_many(entries())
+
+    def _cache_key(self, request: JobDescriptionRequest) -> str:
+        """Build a stable cache key from the canonical request and knowledge base version."""
+        canonical = self._canonicalize(request)
+        payload = {
+            # The generated title follows the requested one, so titles that only
+            # canonicalize alike ("Staff Engineer", "Lead Engineer") get their own entries
+            "title": canonical.title,
+            "title_text": " ".join(request.title.split()).casefold(),
+            "department": canonical.department,
+            "seniority": canonical.seniority,
+            "details": canonical.details,
+            "knowledge_base": self.knowledge_base.version,
+        }
+        tier = self._tier(request)
+        if tier != "llm":
+            payload.update(tier=tier, phrase_library=self.template_writer.version)
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _tier(self, request: JobDescriptionRequest) -> str:
+        return request.tier or self.default_tier
+
+    @handle_api_error(default_return_factory=lambda: {"error": "Failed to generate job description"},
+                      passthrough=(CircuitOpenError, DeadlineExceeded))
     async def generate_job_description(self, request: JobDescriptionRequest) -> JobDescriptionResponse:
         """
         Generate a comprehensive job description with dynamic industry context.
         
+        Identical requests are served from the response cache, and concurrent
+        identical requests share a single in-flight generation. A stored
+        description for a near-duplicate request is returned without calling the
+        model, or used to seed the generation when only the title is close.
+        The ``template`` tier is written locally from the phrase library and the
+        ``refine`` tier only has the LLM rewrite part of such a draft. While the
+        LLM is unavailable, a stored or template-built description is served.
+        
         Args:
             request: Structured job description generation request
             
         Returns:
             Complete job description with structured sections
+
+        Raises:
+            CircuitOpenError: The LLM circuit is open and no fallback is available
+            DeadlineExceeded: The request's deadline passed and no fallback is available
         """
-        # Get industry-specific context
-        industry_context = self._get_industry_context(request.department)
-        
-        # Experience requirements mapping based on seniority
-        experience_map = {
-            "intern": "0-1 years",
-            "junior": "1-3 years",
-            "mid-level": "3-5 years",
-            "senior": "5-8 years",
-            "lead": "8+ years",
-            "principal": "10+ years",
-            "director": "12+ years"
-        }
+        return await self._generate_cached(request)
+
+    async def generate_batch(self, requests: List[JobDescriptionRequest],
+                             concurrency: int = 8) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate many job descriptions with bounded concurrency.
         
-        # Normalize seniority and get experience requirement
-        normalized_seniority = request.seniority.lower().replace("-", "").replace(" ", "")
-        experience_requirement = next((exp for key, exp in experience_map.items() 
-                                     if key in normalized_seniority), "3-5 years")
-        
-        # Build comprehensive prompt with all contextual elements
-        prompt = f"""
-        Generate a detailed, compelling job description for a {request.seniority} {request.title} position in the {request.department} department.
-
-        COMPANY CONTEXT:
-        {request.company_description or "A forward-thinking company leveraging technology to drive innovation and growth."}
-        
-        POSITION DETAILS:
-        - Title: {request.seniority} {request.title}
-        - Department: {request.department}
-        - Employment Type: {request.employment_type}
-        - Location: {request.location or "Flexible"}
-        - Experience Required: {experience_requirement}
-        - Salary Range: {request.salary_range or "Competitive, based on experience"}
-        
-        INDUSTRY-SPECIFIC CONTEXT:
-        - Relevant Skills: {', '.join(industry_context.get('skills', []))}
-        - Tools/Platforms: {', '.join(industry_context.get('tools', []) + industry_context.get('platforms', []))}
-        - Methodologies: {', '.join(industry_context.get('methodologies', []))}
-        - Relevant Certifications: {', '.join(industry_context.get('certifications', []))}
-        
-        CUSTOM REQUIREMENTS:
-        {request.custom_requirements and '- ' + '\\n- '.join(request.custom_requirements) or 'Generate appropriate requirements based on the role.'}
-        
-        TONE GUIDANCE:
-        Use a {request.tone} tone that reflects the company culture and appeals to qualified candidates.
-        
-        FORMAT THE JOB DESCRIPTION WITH THESE SECTIONS:
-        1. About the Role (compelling overview)
-        2. Key Responsibilities (7-10 bullet points)
-        3. Required Qualifications (5-7 bullet points)
-        4. Preferred Qualifications (3-5 bullet points)
-        5. Benefits & Perks (5 bullet points)
-        
-        Return the response in JSON format with these exact keys:
-        {
-            "title": "full job title",
-            "overview": "paragraph about the role",
-            "key_responsibilities": ["responsibility 1", "responsibility 2", ...],
-            "required_qualifications": ["qualification 1", "qualification 2", ...],
-            "preferred_qualifications": ["qualification 1", "qualification 2", ...],
-            "benefits": ["benefit 1", "benefit 2", ...]
-        }
+        Identical entries (same normalized request) are generated once and their
+        result is reported for every position they occupy. Results are yielded in
+        completion order; a failing entry yields an error result without affecting
+        the rest of the batch.
+        
+        Args:
+            requests: Job description requests in submission order
+            concurrency: Maximum number of generations running at once
+            
+        Yields:
+            Per-item results with ``index``, ``status`` and either
+            ``job_description`` or ``detail``
+        """
+        # Group submission indices by normalized request
+        groups: Dict[str, List[int]] = {}
+        for index, request in enumerate(requests):
+            groups.setdefault(self._cache_key(request), []).append(index)
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run(indices: List[int]) -> Tuple[List[int], Optional[JobDescriptionResponse], Optional[str]]:
+            async with semaphore:
+                try:
+                    return indices, await self._generate_cached(requests[indices[0]]), None
+                except Exception as e:
+                    logger.error(f"Batch item {indices[0]} failed: {str(e)}")
+                    return indices, None, str(e) or type(e).__name__
+        
+        tasks = [asyncio.ensure_future(run(indices)) for indices in groups.values()]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                indices, job_description, error = await completed
+                for index in indices:
+                    if error is None:
+                        yield {"index": index, "status": "ok", "job_description": job_description.model_dump()}
+                    else:
+                        yield {"index": index, "status": "error", "detail": error}
+        finally:
+            # Stop outstanding generations if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+
+    async def generate_for_job(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Job queue handler for queued generations.
+
+        Unlike ``generate_job_description`` failures propagate, so the queue can
+        retry the job; a payload that is not a valid request fails it for good.
+        """
+        try:
+            request = JobDescriptionRequest(**parameters)
+        except ValidationError as e:
+            raise PermanentJobError(f"Invalid job description request: {str(e)}") from e
+        job_description = await self._generate_cached(request)
+        return job_description.model_dump()
+
+    async def _generate_cached(self, request: JobDescriptionRequest) -> JobDescriptionResponse:
+        """Serve a request from the response cache, generating it on a miss."""
+        tier = self._tier(request)
+        JD_TIERS.labels(tier).inc()
+        if tier == "template":
+            # Cheaper to write again than to cache
+            return JobDescriptionResponse(**self._template_payload(request))
+        try:
+            job_description = await self.response_cache.get_or_compute(
+                self._cache_key(request),
+                lambda: self._generate_job_description_payload(request),
+            )
+            # Requests sharing a key may still differ in spelling or case
+            job_description = self._for_request(request, job_description)
+        except LLM_UNAVAILABLE_ERRORS as e:
+            job_description = await self._fallback_payload(request, e)
+            if job_description is None:
+                raise
+        with stage("validate"):
+            return JobDescriptionResponse(**job_description)
+
+    async def _fallback_payload(self, request: JobDescriptionRequest,
+                                error: Exception) -> Optional[Dict[str, Any]]:
+        """
+        A description to serve while the LLM is unavailable, or None.
+
+        The latest generation for the same request is preferred, then the
+        closest near-duplicate above the seed threshold, then a template-built
+        description (unless JD_TEMPLATE_FALLBACK is off). Fallbacks are not
+        cached, so the next request after recovery generates afresh.
+        """
+        if isinstance(error, CircuitOpenError):
+            reason = "circuit_open"
+        elif isinstance(error, DeadlineExceeded):
+            reason = "deadline"
+        elif isinstance(error, RateLimitExceeded):
+            reason = "quota"
+        else:
+            reason = "unavailable"
+        record = await asyncio.to_thread(self.store.latest_for_key, self._cache_key(request))
+        if record is not None:
+            payload = self._for_request(request, record["job_description"])
+            payload["metadata"]["id"] = record["id"]
+            source = "stored"
+        else:
+            # Any stored tier beats the template the request would otherwise get
+            match, _ = await self._find_similar(request, min_tier="template")
+            record = await asyncio.to_thread(self.store.get, match.job_description_id) if match else None
+            if record is not None:
+                payload = self._reuse_payload(request, match, record["job_description"])
+                source = "similar"
+            elif self.template_fallback:
+                payload = self._template_payload(request)
+                source = "template"
+            else:
+                return None
+        logger.warning(f"Serving {source} job description as fallback ({reason}: {str(error)})")
+        JD_FALLBACKS.labels(reason, source).inc()
+        payload["metadata"].update(fallback=source, fallback_reason=reason)
+        return payload
+
+    def _template_payload(self, request: JobDescriptionRequest) -> Dict[str, Any]:
+        """Write a description from the phrase library, without calling the LLM."""
+        with stage("template"):
+            payload = self._finalize_payload(request, self.template_writer.write(request.model_dump()))
+        payload["metadata"].update(tier="template", phrase_library=self.template_writer.version)
+        return payload
+
+    async def _refine_sections(self, request: JobDescriptionRequest) -> Dict[str, Any]:
         """
+        Write a template draft and have the LLM rewrite only its role-specific prose.
+
+        Qualifications and benefits are kept from the draft, so the call asks for
+        roughly half of a full description's output. A refined section that
+        comes back missing or cut off keeps its draft text.
+        """
+        draft = self.template_writer.write(request.model_dump())
+        prompt = self._build_prompt(request)
+        with stage("llm_refine"):
+            response_text = await GeminiService.generate_content(
+                render_refine_body(prompt.body, draft, list(REFINED_SECTIONS)),
+                temperature=0.7, max_tokens=700, prefix=prompt.prefix,
+            )
+        with stage("parse"):
+            parsed = SchemaGuidedJSONParser.parse_text(JobDescriptionResponse, response_text)
+        refined = {name: parsed.data[name] for name in REFINED_SECTIONS
+                   if parsed.data.get(name) and name not in parsed.truncated}
+        if len(refined) < len(REFINED_SECTIONS):
+            kept = [name for name in REFINED_SECTIONS if name not in refined]
+            logger.warning(f"Refinement returned no usable {', '.join(kept)}; keeping the draft text")
+        return {**draft, **refined}
+
+    @timed("similarity_lookup")
+    async def _find_similar(self, request: JobDescriptionRequest,
+                            min_tier: Optional[str] = None) -> Tuple[Optional[SimilarMatch], Optional[Dict[str, Any]]]:
+        """Look up a stored description for a near-duplicate request, from its own tier or a better one."""
+        min_quality = TIER_QUALITY[min_tier or self._tier(request)]
+        match = self.similar_requests.find(self._canonicalize(request), min_quality)
+        if match is None:
+            return None, None
+        record = await asyncio.to_thread(self.store.get, match.job_description_id)
+        if record is None:
+            return None, None
+        seed = {name: record["job_description"][name] for name in STREAMED_SECTIONS}
+        return match, seed
+
+    def _reuse_payload(self, request: JobDescriptionRequest, match: SimilarMatch,
+                       job_description: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Serve a stored description for a near-duplicate request.
+
+        Reusable matches were generated for the same title wording. Any other
+        match (only served as a fallback) gets the requested title, so a
+        description is never served under another role's title.
+        """
+        logger.info(f"Reusing stored job description {match.job_description_id} (similarity {match.score:.3f})")
+        job_description = dict(job_description)
+        if not match.reusable:
+            job_description["title"] = display_title(request.title, request.seniority)
+        payload = self._finalize_payload(request, job_description)
+        payload["metadata"].update(reused_from=match.job_description_id, similarity=round(match.score, 3))
+        return payload
+
+    async def _generate_job_description_payload(self, request: JobDescriptionRequest) -> Dict[str, Any]:
+        """Run the uncached LLM generation and return the validated response as a dict."""
+        match, similar = await self._find_similar(request)
+        if match is not None and match.reusable:
+            return self._reuse_payload(request, match, similar)
+        if self._tier(request) == "refine":
+            # The template draft takes the place of a similar description as the starting point
+            payload = self._finalize_payload(request, await self._refine_sections(request))
+            payload["metadata"].update(tier="refine", phrase_library=self.template_writer.version)
+            await self._persist(request, payload)
+            return payload
+        if self.generation_strategy == "parallel":
+            # Sections are written concurrently; a failed section is retried on its own
+            job_description = await self.section_pipeline.run(request.model_dump(), seed=similar)
+        else:
+            prompt = self._build_prompt(request, seed=similar)
+            
+            # Generate content using Gemini with appropriate temperature
+            # Higher temperature for more creative descriptions
+            with stage("llm"):
+                response_text = await GeminiService.generate_content(
+                    prompt.body, temperature=0.7, max_tokens=1500, prefix=prompt.prefix
+                )
+            
+            # Salvage what the model produced and fill in only what is missing
+            job_description = await self._parse_and_complete(prompt, response_text)
+        payload = self._finalize_payload(request, job_description)
+        if match is not None:
+            payload["metadata"]["seeded_from"] = match.job_description_id
+        await self._persist(request, payload)
+        return payload
+
+    @timed("persist")
+    async def _persist(self, request: JobDescriptionRequest, payload: Dict[str, Any]) -> None:
+        """Record a fresh generation in the store and tag the payload with its id."""
+        tier = self._tier(request)
+        try:
+            # The tier actually used is stored, so the index knows the entry's quality after JD_DEFAULT_TIER changes
+            job_description_id = await asyncio.to_thread(
+                self.store.save, self._cache_key(request), {**request.model_dump(), "tier": tier}, payload
+            )
+            payload["metadata"]["id"] = job_description_id
+            self.similar_requests.add(job_description_id, self._canonicalize(request), TIER_QUALITY[tier])
+        except Exception as e:
+            # The description is still served; only the archive entry is lost
+            logger.error(f"Failed to store job description: {str(e)}")
+
+    async def _parse_and_complete(self, prompt: RenderedPrompt, response_text: str) -> Dict[str, Any]:
+        """
+        Parse model output against the response schema, re-requesting missing sections.
+        
+        Fenced, truncated or slightly malformed JSON is repaired. Sections that could
+        not be recovered, or list sections that were cut off, are requested once in a
+        smaller follow-up call instead of regenerating the whole document.
+        
+        Raises:
+            ValueError: If required sections are still missing after the follow-up
+        """
+        with stage("parse"):
+            parsed = SchemaGuidedJSONParser.parse_text(JobDescriptionResponse, response_text)
+        if parsed.repairs:
+            logger.info(f"Repaired model output: {', '.join(parsed.repairs)}")
         
-        # Generate content using Gemini with appropriate temperature
-        # Higher temperature for more creative descriptions
-        response_text = await GeminiService.generate_content(prompt, temperature=0.7, max_tokens=1500)
+        sections = parsed.missing + [name for name in parsed.truncated if name not in parsed.missing]
+        if not sections:
+            return parsed.data
+        
+        logger.warning(f"Model output incomplete, requesting sections separately: {sections}")
+        written = {name: value for name, value in parsed.data.items() if name not in sections}
+        with stage("llm_followup"):
+            followup_text = await GeminiService.generate_content(
+                render_missing_sections_body(prompt.body, written, sections),
+                temperature=0.7,
+                max_tokens=min(1500, 400 * len(sections)),
+                prefix=prompt.prefix,
+            )
+        with stage("parse"):
+            followup = SchemaGuidedJSONParser.parse_text(JobDescriptionResponse, followup_text)
+        
+        # Follow-up sections replace truncated partial ones; partial lists remain the fallback
+        job_description = dict(parsed.data)
+        job_description.update({name: followup.data[name] for name in sections if name in followup.data})
+        
+        still_missing = [name for name in parsed.missing if name not in job_description]
+        if still_missing:
+            raise ValueError(f"Model output is missing sections: {', '.join(still_missing)}")
+        return job_description
+
+    async def stream_job_description(self, request: JobDescriptionRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a job description, yielding sections as soon as each one is complete.
         
-        # Parse the JSON response with fallback mechanisms
-        job_description = GeminiService.parse_json_response(response_text)
+        Emits ``field`` events for scalar sections (``title``, ``overview``), ``item``
+        events for each entry of the list sections, and finally either a
+        ``complete`` event carrying the validated job description or an ``error``
+        event. Cached descriptions are replayed immediately.
         
+        Args:
+            request: Structured job description generation request
+            
+        Yields:
+            Event dictionaries with a ``type`` key
+        """
+        if self._tier(request) != "llm":
+            # Template and refined descriptions are written in one piece, then replayed as events
+            try:
+                payload = (await self._generate_cached(request)).model_dump()
+            except Exception as e:
+                logger.error(f"Streaming job description generation failed: {str(e)}", exc_info=True)
+                yield {"type": "error", "detail": "Failed to generate job description"}
+                return
+            for event in JSONSectionStreamParser.events_for(payload, sections=STREAMED_SECTIONS):
+                yield event
+            yield {"type": "complete", "job_description": payload}
+            return
+
+        JD_TIERS.labels("llm").inc()
+        cache_key = self._cache_key(request)
+        cached = await self.response_cache.get(cache_key)
+        if cached is not None:
+            cached = self._for_request(request, cached)
+            for event in JSONSectionStreamParser.events_for(cached, sections=STREAMED_SECTIONS):
+                yield event
+            yield {"type": "complete", "job_description": cached}
+            return
+        
+        try:
+            match, similar = await self._find_similar(request)
+            if match is not None and match.reusable:
+                payload = self._reuse_payload(request, match, similar)
+                for event in JSONSectionStreamParser.events_for(payload, sections=STREAMED_SECTIONS):
+                    yield event
+                await self.response_cache.set(cache_key, payload)
+                yield {"type": "complete", "job_description": payload}
+                return
+
+            if self.generation_strategy == "parallel":
+                # Each section group is sent as soon as its branch finishes
+                async for node, values in self.section_pipeline.stream(request.model_dump(), seed=similar):
+                    if node == "merge":
+                        job_description = values
+                    else:
+                        for event in JSONSectionStreamParser.events_for(values, sections=STREAMED_SECTIONS):
+                            yield event
+            else:
+                prompt = self._build_prompt(request, seed=similar)
+                parser = JSONSectionStreamParser(sections=STREAMED_SECTIONS)
+                chunks = []
+                with stage("llm_stream"):
+                    async for chunk in GeminiService.generate_content_stream(
+                        prompt.body, temperature=0.7, max_tokens=1500, prefix=prompt.prefix
+                    ):
+                        chunks.append(chunk)
+                        for event in parser.feed(chunk):
+                            yield event
+                
+                # Validate the complete document exactly like the non-streaming path
+                job_description = await self._parse_and_complete(prompt, "".join(chunks))
+            payload = self._finalize_payload(request, job_description)
+            if match is not None:
+                payload["metadata"]["seeded_from"] = match.job_description_id
+            await self._persist(request, payload)
+        except LLM_UNAVAILABLE_ERRORS as e:
+            payload = await self._fallback_payload(request, e)
+            if payload is None:
+                logger.error(f"Streaming job description generation failed: {str(e)}")
+                yield {"type": "error", "detail": str(e)}
+                return
+            # Sections already sent are superseded by the complete event
+            yield {"type": "complete", "job_description": payload}
+            return
+        except Exception as e:
+            logger.error(f"Streaming job description generation failed: {str(e)}", exc_info=True)
+            yield {"type": "error", "detail": "Failed to generate job description"}
+            return
+        
+        await self.response_cache.set(cache_key, payload)
+        yield {"type": "complete", "job_description": payload}
+
+    @timed("prompt_build")
+    def _build_prompt(self, request: JobDescriptionRequest,
+                      seed: Optional[Dict[str, Any]] = None) -> RenderedPrompt:
+        """Build the generation prompt with industry, seniority and custom context."""
+        # Get industry-specific context with its prerendered prompt lines
+        with stage("industry_context"):
+            industry = self.knowledge_base.lookup(request.department)
+        
+        # Experience requirement for the canonical seniority level
+        experience_requirement = canonicalize_seniority(request.seniority).experience
+        
+        # Department context and tone are compiled into the template once per pair
+        template = self.prompt_templates.get(industry, request.tone, self.knowledge_base.version)
+        prompt = template.render(
+            title=request.title,
+            seniority=request.seniority,
+            department=request.department,
+            employment_type=request.employment_type,
+            location=request.location,
+            salary_range=request.salary_range,
+            experience=experience_requirement,
+            company_description=request.company_description,
+            custom_requirements=request.custom_requirements,
+        )
+        if seed is not None:
+            # A related stored description guides the generation instead of starting from scratch
+            prompt = replace(prompt, body=render_seeded_body(prompt.body, seed))
+        return prompt
+
+    @staticmethod
+    def _request_parameters(request: JobDescriptionRequest) -> Dict[str, Any]:
+        """Request fields recorded in the payload metadata."""
+        return {
+            "title": request.title,
+            "department": request.department,
+            "seniority": request.seniority,
+            "employment_type": request.employment_type,
+            "location": request.location,
+            "salary_range": request.salary_range
+        }
+
+    def _for_request(self, request: JobDescriptionRequest, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """A cached or stored payload with its metadata describing ``request`` rather than its first requester."""
+        payload = dict(payload)
+        payload["metadata"] = {**payload.get("metadata", {}), "parameters": self._request_parameters(request)}
+        return payload
+
+    def _finalize_payload(self, request: JobDescriptionRequest, job_description: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach generation metadata and validate the parsed model output."""
         # Add metadata for downstream processing
         job_description["metadata"] = {
             "generated_timestamp": datetime.now().isoformat(),
-            "parameters": {
-                "title": request.title,
-                "department": request.department,
-                "seniority": request.seniority,
-                "employment_type": request.employment_type,
-                "location": request.location,
-                "salary_range": request.salary_range
-            }
+            "parameters": self._request_parameters(request),
         }
         
-        # Create validated response object
-        return JobDescriptionResponse(**job_description)
\ No newline at end of file
+        # Validate before caching so malformed output is never stored
+        with stage("validate"):
+            return JobDescriptionResponse(**job_description).model_dump()
\ No newline at end of file
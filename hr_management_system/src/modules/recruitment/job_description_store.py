@@ -0,0 +1,316 @@
+"""
+Job Description Store Module
+
+SQLite persistence for generated job descriptions with an FTS5 full-text
+index over their content and keyset pagination for listing and search.
+"""
+
+import base64
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "data",
+    "job_descriptions.db",
+)
+
+# Column weights for ranking: a match in the title counts more than one in the body
+_RANK_WEIGHTS = (4.0, 1.0, 1.0, 1.0)
+_QUERY_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_descriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    department TEXT NOT NULL,
+    seniority TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_descriptions_request_key ON job_descriptions (request_key, id);
+CREATE INDEX IF NOT EXISTS idx_job_descriptions_department ON job_descriptions (department COLLATE NOCASE, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS job_descriptions_fts USING fts5 (
+    title, overview, responsibilities, qualifications,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_SUMMARY_COLUMNS = "j.id, j.title, j.department, j.seniority, j.created_at"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _encode_cursor(values: List[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor("Malformed pagination cursor") from e
+    if not isinstance(values, list):
+        raise InvalidCursor("Malformed pagination cursor")
+    return values
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query that matches every word.
+
+    Words are quoted so FTS5 operators in user input are taken literally, and the
+    last word matches as a prefix to support search-as-you-type.
+    """
+    tokens = _QUERY_TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return None
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class JobDescriptionStore:
+    """
+    Durable record of every generated job description.
+
+    Each row keeps the validated ``JobDescriptionResponse`` document, the request
+    parameters that produced it and the request's cache key. Listing pages by
+    descending id, so its paging cost stays constant however deep the client
+    goes. Search ranks by BM25 and pages by (rank, id); every page scores all
+    matches again, so its cost grows with the number of matches. Both return an
+    opaque ``next_cursor``. Each process opens its own connection (so the store can be created
+    before workers fork), shared across threads behind a lock; callers on the
+    event loop should use ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("JD_STORE_PATH") or DEFAULT_STORE_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._owner_pid: Optional[int] = None
+        self._process_connection: Optional[sqlite3.Connection] = None
+        with self._lock:
+            self._connection.executescript(_SCHEMA)
+        logger.info(f"Job description store opened at {self.path}")
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """The connection for the current process; a forked worker opens its own."""
+        if self._owner_pid != os.getpid():
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            if self.path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            self._process_connection = connection
+            self._owner_pid = os.getpid()
+        return self._process_connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owner_pid == os.getpid():
+                self._process_connection.close()
+                self._owner_pid = None
+
+    def save(self, request_key: str, parameters: Dict[str, Any], job_description: Dict[str, Any]) -> int:
+        """
+        Persist one generated job description.
+
+        Returns:
+            The id assigned to the stored description
+        """
+        metadata = job_description.get("metadata") or {}
+        created_at = metadata.get("generated_timestamp") or datetime.now().isoformat()
+        fts_row = (
+            job_description.get("title", ""),
+            job_description.get("overview", ""),
+            "\n".join(job_description.get("key_responsibilities", [])),
+            "\n".join(job_description.get("required_qualifications", [])
+                      + job_description.get("preferred_qualifications", [])),
+        )
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO job_descriptions "
+                "(request_key, title, department, seniority, created_at, parameters, document) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    request_key,
+                    job_description.get("title", ""),
+                    parameters.get("department", ""),
+                    parameters.get("seniority", ""),
+                    created_at,
+                    json.dumps(parameters),
+                    json.dumps(job_description),
+                ),
+            )
+            row_id = cursor.lastrowid
+            self._connection.execute(
+                "INSERT INTO job_descriptions_fts (rowid, title, overview, responsibilities, qualifications) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (row_id, *fts_row),
+            )
+        return row_id
+
+    def _record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "created_at": row["created_at"],
+            "parameters": json.loads(row["parameters"]),
+            "job_description": json.loads(row["document"]),
+        }
+
+    def get(self, job_description_id: int) -> Optional[Dict[str, Any]]:
+        """Return a stored description with its parameters, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, created_at, parameters, document FROM job_descriptions WHERE id = ?",
+                (job_description_id,),
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def exists(self, job_description_id: int) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM job_descriptions WHERE id = ?", (job_description_id,)
+            ).fetchone()
+        return row is not None
+
+    def latest_for_key(self, request_key: str) -> Optional[Dict[str, Any]]:
+        """Return the most recent description generated for a request cache key, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, created_at, parameters, document FROM job_descriptions "
+                "WHERE request_key = ? ORDER BY id DESC LIMIT 1",
+                (request_key,),
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def iter_parameters(self, batch_size: int = 1000) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (id, request parameters) for every stored description in id order."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT id, parameters FROM job_descriptions WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["id"], json.loads(row["parameters"])
+            last_id = rows[-1]["id"]
+
+    def counts_after(self, after_id: int = 0) -> Tuple[int, List[Tuple[str, str, int]]]:
+        """
+        Counts of descriptions stored after ``after_id``, by department and creation month (YYYY-MM).
+
+        Returns:
+            ``(last_id, [(department, month, count), ...])``; ``last_id`` is
+            ``after_id`` when nothing new was stored
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT department, substr(created_at, 1, 7) AS month, COUNT(*) AS count, MAX(id) AS last_id "
+                "FROM job_descriptions WHERE id > ? GROUP BY department, month",
+                (after_id,),
+            ).fetchall()
+        last_id = max([after_id] + [row["last_id"] for row in rows])
+        return last_id, [(row["department"], row["month"], row["count"]) for row in rows]
+
+    def list(self, limit: int = 20, cursor: Optional[str] = None,
+             department: Optional[str] = None) -> Dict[str, Any]:
+        """
+        List stored descriptions, newest first.
+
+        Raises:
+            InvalidCursor: If ``cursor`` was not produced by this method
+        """
+        clauses, params = [], []
+        if cursor:
+            values = _decode_cursor(cursor)
+            if len(values) != 1 or not isinstance(values[0], int):
+                raise InvalidCursor("Malformed pagination cursor")
+            clauses.append("j.id < ?")
+            params.append(values[0])
+        if department:
+            clauses.append("j.department = ? COLLATE NOCASE")
+            params.append(department)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM job_descriptions j {where} ORDER BY j.id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        items = [dict(row) for row in rows[:limit]]
+        next_cursor = _encode_cursor([items[-1]["id"]]) if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def search(self, query: str, limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Full-text search over title, overview, responsibilities and qualifications.
+
+        Results are ordered by relevance and carry a highlighted ``snippet``.
+        The first page fixes the newest id searched, so descriptions stored
+        while the client pages do not appear part way through. Search cursors
+        are still best-effort: BM25 scores depend on corpus statistics that
+        those new descriptions change, so a result near a page boundary may
+        be repeated or skipped.
+
+        Raises:
+            InvalidCursor: If ``cursor`` was not produced by this method
+        """
+        match = build_match_query(query)
+        if match is None:
+            return {"items": [], "next_cursor": None}
+
+        after: Tuple[Any, ...] = ()
+        page_clause = ""
+        if cursor:
+            values = _decode_cursor(cursor)
+            if (len(values) != 3 or not isinstance(values[0], (int, float))
+                    or not all(isinstance(value, int) for value in values[1:])):
+                raise InvalidCursor("Malformed pagination cursor")
+            page_clause = "WHERE (m.score > ? OR (m.score = ? AND m.id > ?))"
+            after = (values[0], values[0], values[1])
+            max_id = values[2]
+        else:
+            with self._lock:
+                max_id = self._connection.execute("SELECT COALESCE(MAX(id), 0) FROM job_descriptions").fetchone()[0]
+
+        weights = ", ".join(str(weight) for weight in _RANK_WEIGHTS)
+        sql = (
+            f"SELECT {_SUMMARY_COLUMNS}, m.score, m.snippet FROM ("
+            f"  SELECT rowid AS id, bm25(job_descriptions_fts, {weights}) AS score,"
+            f"         snippet(job_descriptions_fts, -1, '<mark>', '</mark>', '…', 16) AS snippet"
+            f"  FROM job_descriptions_fts WHERE job_descriptions_fts MATCH ? AND rowid <= ?"
+            f") m JOIN job_descriptions j ON j.id = m.id {page_clause} "
+            f"ORDER BY m.score, m.id LIMIT ?"
+        )
+        with self._lock:
+            rows = self._connection.execute(sql, (match, max_id, *after, limit + 1)).fetchall()
+        items = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = _encode_cursor([items[-1]["score"], items[-1]["id"], max_id])
+        return {"items": items, "next_cursor": next_cursor}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._connection.execute("SELECT COUNT(*) FROM job_descriptions").fetchone()[0]
+        return {"path": self.path, "job_descriptions": count}
@@ -0,0 +1,224 @@
+"""
+Industry Knowledge Base Module
+
+File- or SQLite-backed taxonomy of departments with their skills, tools and
+certifications, indexed by alias in a token trie for constant-time (in the
+size of the taxonomy) department resolution.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KNOWLEDGE_BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "industry_knowledge.json")
+
+# Context categories rendered into the prompt, with the label used for each
+PROMPT_CATEGORIES = (
+    ("Relevant Skills", ("skills",)),
+    ("Tools/Platforms", ("tools", "platforms")),
+    ("Methodologies", ("methodologies",)),
+    ("Relevant Certifications", ("certifications",)),
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class DepartmentEntry:
+    """Resolved knowledge for one department."""
+    key: str
+    context: Dict[str, List[str]]
+    prompt_fragment: str
+
+
+@dataclass
+class _TrieNode:
+    children: Dict[str, "_TrieNode"] = field(default_factory=dict)
+    department: Optional[str] = None
+
+
+def render_prompt_fragment(context: Dict[str, List[str]]) -> str:
+    """Render the INDUSTRY-SPECIFIC CONTEXT lines for a department's context."""
+    lines = []
+    for label, categories in PROMPT_CATEGORIES:
+        values = [value for category in categories for value in context.get(category, [])]
+        lines.append(f"- {label}: {', '.join(values)}")
+    return "\n".join(lines)
+
+
+GENERIC_ENTRY = DepartmentEntry(
+    key="generic",
+    context={"skills": [], "tools": [], "methodologies": [], "certifications": []},
+    prompt_fragment=render_prompt_fragment({}),
+)
+
+
+class _KnowledgeIndex:
+    """Immutable snapshot of the taxonomy: entries, synonym map and alias trie."""
+
+    def __init__(self, departments: Dict[str, Dict[str, Any]], synonyms: Dict[str, str]):
+        self.synonyms = {term.lower(): replacement.lower() for term, replacement in synonyms.items()}
+        self.entries: Dict[str, DepartmentEntry] = {}
+        self.root = _TrieNode()
+        self.max_alias_tokens = 1
+
+        for key, data in departments.items():
+            context = {name: list(values) for name, values in data.items() if name != "aliases"}
+            self.entries[key] = DepartmentEntry(key, context, render_prompt_fragment(context))
+            for alias in {key.replace("_", " "), *data.get("aliases", [])}:
+                self._insert(self.tokenize(alias), key)
+
+        digest = hashlib.sha256(json.dumps([departments, synonyms], sort_keys=True).encode("utf-8"))
+        self.version = digest.hexdigest()[:12]
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercase, split on non-alphanumerics and expand synonyms."""
+        tokens = []
+        for token in _TOKEN_PATTERN.findall(text.lower()):
+            tokens.extend(self.synonyms.get(token, token).split())
+        return tokens
+
+    def _insert(self, tokens: List[str], department: str) -> None:
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node.children.setdefault(token, _TrieNode())
+        if node.department is not None and node.department != department:
+            logger.warning(f"Alias '{' '.join(tokens)}' maps to both {node.department} and {department}")
+        node.department = department
+        self.max_alias_tokens = max(self.max_alias_tokens, len(tokens))
+
+    def resolve(self, department: str) -> Optional[str]:
+        """
+        Map a free-form department name to a taxonomy key.
+
+        An exact alias match wins. Otherwise the alias ending closest to the end of
+        the name is chosen (the head noun: "product design engineering" is an
+        engineering department), preferring the longer alias on ties. Cost is
+        bounded by the name length times the longest alias, independent of the
+        number of departments.
+        """
+        tokens = self.tokenize(department)
+        best: Optional[Tuple[int, int, str]] = None
+        for start in range(len(tokens)):
+            node = self.root
+            for end in range(start, min(len(tokens), start + self.max_alias_tokens)):
+                node = node.children.get(tokens[end])
+                if node is None:
+                    break
+                if node.department is not None:
+                    if start == 0 and end == len(tokens) - 1:
+                        return node.department
+                    candidate = (end, end - start, node.department)
+                    if best is None or candidate[:2] > best[:2]:
+                        best = candidate
+        return best[2] if best else None
+
+
+class IndustryKnowledgeBase:
+    """
+    Department knowledge with alias/synonym resolution and hot reload.
+
+    The source is a JSON document (``{"departments": {...}, "synonyms": {...}}``)
+    or a SQLite database with ``departments(key, data)``, ``aliases(alias,
+    department)`` and ``synonyms(term, replacement)`` tables. The source's
+    modification time is checked at most every ``reload_interval`` seconds, on a
+    background thread so lookups never wait on file I/O, and a changed source is
+    re-indexed and swapped in atomically, so running workers pick up taxonomy
+    edits without a restart.
+    """
+
+    def __init__(self, path: Optional[str] = None, reload_interval: float = 5.0):
+        self.path = path or os.getenv("JD_KNOWLEDGE_BASE_PATH") or DEFAULT_KNOWLEDGE_BASE_PATH
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        # Held only to start a reload thread, never while reading the source
+        self._schedule_lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._reload_thread: Optional[threading.Thread] = None
+        self._index = self._load()
+
+    @property
+    def version(self) -> str:
+        """Content hash of the loaded taxonomy, changing whenever it is reloaded with edits."""
+        return self._index.version
+
+    @property
+    def departments(self) -> List[str]:
+        return list(self._index.entries)
+
+    def _load(self) -> _KnowledgeIndex:
+        self._mtime = os.path.getmtime(self.path)
+        if self.path.endswith((".db", ".sqlite", ".sqlite3")):
+            departments, synonyms = self._read_sqlite()
+        else:
+            departments, synonyms = self._read_json()
+        index = _KnowledgeIndex(departments, synonyms)
+        logger.info(f"Loaded {len(index.entries)} departments from {self.path} (version {index.version})")
+        return index
+
+    def _read_json(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        return document.get("departments", {}), document.get("synonyms", {})
+
+    def _read_sqlite(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            departments = {key: json.loads(data) for key, data in connection.execute("SELECT key, data FROM departments")}
+            for alias, department in connection.execute("SELECT alias, department FROM aliases"):
+                if department in departments:
+                    departments[department].setdefault("aliases", []).append(alias)
+            synonyms = dict(connection.execute("SELECT term, replacement FROM synonyms"))
+        finally:
+            connection.close()
+        return departments, synonyms
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-index the source if it changed (or unconditionally with ``force``).
+
+        Returns:
+            True if a new index was swapped in
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                if not force and os.path.getmtime(self.path) == self._mtime:
+                    return False
+                self._index = self._load()
+                return True
+            except (OSError, ValueError, sqlite3.Error) as e:
+                # Keep serving the previous snapshot if the new source is unreadable
+                logger.error(f"Knowledge base reload failed, keeping version {self.version}: {str(e)}")
+                return False
+
+    def _maybe_reload(self) -> None:
+        """Start a background check of the source when one is due; lookups keep the current index meanwhile."""
+        if self.reload_interval <= 0 or time.monotonic() - self._checked_at < self.reload_interval:
+            return
+        with self._schedule_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return
+            # Claim the slot now so later lookups do not start another check
+            self._checked_at = time.monotonic()
+            self._reload_thread = threading.Thread(target=self.reload, name="knowledge-base-reload", daemon=True)
+            self._reload_thread.start()
+
+    def lookup(self, department: str) -> DepartmentEntry:
+        """Return the knowledge entry for a department name, or the generic entry."""
+        self._maybe_reload()
+        index = self._index
+        key = index.resolve(department)
+        return index.entries[key] if key else GENERIC_ENTRY
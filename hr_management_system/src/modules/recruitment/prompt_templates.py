@@ -0,0 +1,215 @@
+"""
+Prompt Template Module
+
+Compiles job description prompts once per (department, tone) pair and splits
+them into a stable instruction prefix shared by every call and a small
+per-request body, so the prefix can be cached by the model provider.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.modules.gemini.backends import estimate_tokens
+from src.modules.recruitment.knowledge_base import DepartmentEntry
+
+logger = logging.getLogger(__name__)
+
+# Invariant instructions: identical for every job description request
+JOB_DESCRIPTION_PREFIX = """You are an expert recruiter and copywriter who writes detailed, compelling job descriptions.
+
+FORMAT THE JOB DESCRIPTION WITH THESE SECTIONS:
+1. About the Role (compelling overview)
+2. Key Responsibilities (7-10 bullet points)
+3. Required Qualifications (5-7 bullet points)
+4. Preferred Qualifications (3-5 bullet points)
+5. Benefits & Perks (5 bullet points)
+
+Return the response in JSON format with these exact keys:
+{
+    "title": "full job title",
+    "overview": "paragraph about the role",
+    "key_responsibilities": ["responsibility 1", "responsibility 2", ...],
+    "required_qualifications": ["qualification 1", "qualification 2", ...],
+    "preferred_qualifications": ["qualification 1", "qualification 2", ...],
+    "benefits": ["benefit 1", "benefit 2", ...]
+}
+Return only the JSON object."""
+
+# Per-request body; ${industry_context} and ${tone} are bound at compile time
+JOB_DESCRIPTION_BODY = """Generate a detailed, compelling job description for a ${seniority} ${title} position in the ${department} department.
+
+COMPANY CONTEXT:
+${company_description}
+
+POSITION DETAILS:
+- Title: ${seniority} ${title}
+- Department: ${department}
+- Employment Type: ${employment_type}
+- Location: ${location}
+- Experience Required: ${experience}
+- Salary Range: ${salary_range}
+
+INDUSTRY-SPECIFIC CONTEXT:
+${industry_context}
+
+CUSTOM REQUIREMENTS:
+${custom_requirements}
+
+TONE GUIDANCE:
+Use a ${tone} tone that reflects the company culture and appeals to qualified candidates."""
+
+DEFAULT_COMPANY_DESCRIPTION = "A forward-thinking company leveraging technology to drive innovation and growth."
+DEFAULT_CUSTOM_REQUIREMENTS = "Generate appropriate requirements based on the role."
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """A prompt split into its cacheable prefix and per-request body."""
+    prefix: str
+    body: str
+    template_key: Tuple[str, str]
+
+    @property
+    def text(self) -> str:
+        """The full prompt as a single string, for backends without prefix support."""
+        return f"{self.prefix}\n\n{self.body}"
+
+
+def render_missing_sections_body(body: str, partial: Dict[str, Any], missing: List[str]) -> str:
+    """Follow-up body asking only for the sections a previous response failed to deliver."""
+    keys = ", ".join(f'"{name}"' for name in missing)
+    return (
+        f"{body}\n\n"
+        "A previous draft of this job description was incomplete. These sections are already written:\n"
+        f"{json.dumps(partial, indent=2)}\n\n"
+        f"Write the remaining sections so they are consistent with the draft. "
+        f"Return a JSON object containing ONLY these keys: {keys}."
+    )
+
+
+def render_section_body(body: str, sections: List[str], guidance: str) -> str:
+    """Body asking for a subset of the sections, for pipelines that write sections in parallel."""
+    keys = ", ".join(f'"{name}"' for name in sections)
+    return (
+        f"{body}\n\n"
+        f"Write only this part of the job description: {guidance}. Other sections are written separately, "
+        f"so do not repeat their content. Return a JSON object containing ONLY these keys: {keys}."
+    )
+
+
+def render_seeded_body(body: str, seed: Dict[str, Any]) -> str:
+    """Body that asks the model to adapt an existing description of a closely related role."""
+    return (
+        f"{body}\n\n"
+        "A job description for a closely related role already exists:\n"
+        f"{json.dumps(seed, indent=2)}\n\n"
+        "Use it as a starting point: keep what applies, and adapt the title, wording and "
+        "requirements to the position details above."
+    )
+
+
+def render_refine_body(body: str, draft: Dict[str, Any], sections: List[str]) -> str:
+    """Body asking the model to rewrite only some sections of a template-built draft."""
+    keys = ", ".join(f'"{name}"' for name in sections)
+    return (
+        f"{body}\n\n"
+        "A draft of this job description was assembled from standard phrases:\n"
+        f"{json.dumps(draft, indent=2)}\n\n"
+        "The qualifications and benefits are final. Rewrite the remaining sections so they are specific to "
+        "this position and read naturally in the requested tone, keeping what is accurate. "
+        f"Return a JSON object containing ONLY these keys: {keys}."
+    )
+
+
+class CompiledPromptTemplate:
+    """Body template with department context and tone already substituted."""
+
+    def __init__(self, key: Tuple[str, str], prefix: str, department: DepartmentEntry, tone: str):
+        self.key = key
+        self.prefix = prefix
+        self._template = Template(Template(JOB_DESCRIPTION_BODY).safe_substitute(
+            industry_context=department.prompt_fragment.replace("$", "$$"),
+            tone=tone.replace("$", "$$"),
+        ))
+        self.prefix_tokens = estimate_tokens(prefix)
+        self.static_tokens = estimate_tokens(self._template.safe_substitute())
+        self.renders = 0
+        self.rendered_tokens = 0
+
+    def render(self, *, title: str, seniority: str, department: str, employment_type: str,
+               location: Optional[str], salary_range: Optional[str], experience: str,
+               company_description: Optional[str], custom_requirements: Optional[List[str]]) -> RenderedPrompt:
+        """Fill the per-request fields."""
+        body = self._template.substitute(
+            title=title,
+            seniority=seniority,
+            department=department,
+            employment_type=employment_type,
+            location=location or "Flexible",
+            salary_range=salary_range or "Competitive, based on experience",
+            experience=experience,
+            company_description=company_description or DEFAULT_COMPANY_DESCRIPTION,
+            custom_requirements=(
+                "- " + "\n- ".join(custom_requirements) if custom_requirements else DEFAULT_CUSTOM_REQUIREMENTS
+            ),
+        )
+        self.renders += 1
+        self.rendered_tokens += estimate_tokens(body)
+        return RenderedPrompt(self.prefix, body, self.key)
+
+    def stats(self) -> Dict[str, Any]:
+        avg_body_tokens = self.rendered_tokens / self.renders if self.renders else float(self.static_tokens)
+        return {
+            "department": self.key[0],
+            "tone": self.key[1],
+            "renders": self.renders,
+            "prefix_tokens": self.prefix_tokens,
+            "template_tokens": self.static_tokens,
+            "avg_body_tokens": round(avg_body_tokens, 1),
+            "prefix_share": round(self.prefix_tokens / (self.prefix_tokens + avg_body_tokens), 3),
+        }
+
+
+class PromptTemplateRegistry:
+    """
+    LRU registry of compiled templates keyed by (department, tone).
+
+    Compilation happens on first use of a pair; the knowledge base version is
+    part of the registry key so a taxonomy reload recompiles lazily.
+    """
+
+    def __init__(self, prefix: str = JOB_DESCRIPTION_PREFIX, max_templates: int = 256):
+        self.prefix = prefix
+        self.prefix_hash = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:12]
+        self.max_templates = max_templates
+        self._templates: "OrderedDict[Tuple[str, str, str], CompiledPromptTemplate]" = OrderedDict()
+        self._compilations = 0
+
+    def get(self, department: DepartmentEntry, tone: str, version: str = "") -> CompiledPromptTemplate:
+        """Return the compiled template for a department entry and tone, compiling it if needed."""
+        tone = " ".join(tone.split()).lower() or "professional"
+        registry_key = (department.key, tone, version)
+        template = self._templates.get(registry_key)
+        if template is None:
+            template = CompiledPromptTemplate((department.key, tone), self.prefix, department, tone)
+            self._templates[registry_key] = template
+            self._compilations += 1
+            if len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        else:
+            self._templates.move_to_end(registry_key)
+        return template
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-template token counts plus the size of the shared prefix."""
+        return {
+            "prefix_hash": self.prefix_hash,
+            "prefix_tokens": estimate_tokens(self.prefix),
+            "compilations": self._compilations,
+            "templates": [template.stats() for template in self._templates.values()],
+        }
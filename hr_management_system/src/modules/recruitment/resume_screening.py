@@ -0,0 +1,302 @@
+"""
+Resume Screening Module
+
+Ranks every applicant to a job description locally with BM25 over their
+resumes, then asks the LLM for a detailed assessment of the top candidates
+only, so screening thousands of resumes costs a handful of model calls.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from src.modules.gemini.client import GeminiService
+from src.modules.recruitment.canonicalization import STOP_WORDS, stem
+from src.modules.recruitment.job_description_store import JobDescriptionStore
+from src.modules.recruitment.resume_store import ResumeStore
+from src.utils.json_repair import SchemaGuidedJSONParser
+from src.utils.metrics import REGISTRY, stage
+
+logger = logging.getLogger(__name__)
+
+SCREENED_CANDIDATES = REGISTRY.counter(
+    "hr_screening_candidates_total", "Candidates ranked locally and assessed by the LLM", ("phase",)
+)
+
+# Words too common in resumes and job descriptions to tell candidates apart
+RESUME_STOP_WORDS = STOP_WORDS | frozenset({
+    "or", "on", "at", "by", "as", "is", "are", "be", "was", "were", "this", "that", "from", "our", "your",
+    "we", "you", "i", "my", "will", "can", "able", "ability", "experience", "years", "year", "work", "role",
+})
+_RESUME_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Query weight of each job description section
+QUERY_SECTION_WEIGHTS = (
+    ("required_qualifications", 2.0),
+    ("preferred_qualifications", 1.0),
+    ("title", 1.0),
+    ("key_responsibilities", 0.5),
+)
+
+# Invariant instructions, sent as the cached prefix of every assessment
+SCREENING_PREFIX = """You are an experienced technical recruiter screening applicants against a job description.
+
+Assess how well the resume meets the qualifications. Judge only from the resume text; do not assume skills that are not evidenced.
+
+Return the response in JSON format with these exact keys:
+{
+    "fit_score": integer from 0 (no fit) to 100 (exceptional fit),
+    "strengths": ["qualification the candidate clearly meets", ...],
+    "gaps": ["qualification the candidate does not evidence", ...],
+    "recommendation": "advance" | "consider" | "reject",
+    "summary": "two sentences on the candidate's fit"
+}
+Return only the JSON object."""
+
+
+class ResumeSubmission(BaseModel):
+    """One resume in a bulk upload."""
+    candidate_id: str = Field(..., min_length=1, max_length=200)
+    text: str = Field(..., min_length=1)
+    name: Optional[str] = Field(default=None, max_length=200)
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class CandidateAssessment(BaseModel):
+    """LLM assessment of a shortlisted candidate."""
+    fit_score: int = Field(..., ge=0, le=100)
+    strengths: List[str]
+    gaps: List[str]
+    recommendation: str
+    summary: str = ""
+
+
+class ResumeAnalyzer:
+    """Resume and query analysis: lowercase, tokenize, drop stop words and stem."""
+
+    token_pattern = _RESUME_TOKEN_PATTERN.pattern
+
+    def __init__(self, stop_words: frozenset = RESUME_STOP_WORDS):
+        self.stop_words = stop_words
+
+    def normalize(self, word: str) -> Optional[str]:
+        """Index term for a lowercased word, or None if the word is not indexed."""
+        if word in self.stop_words or len(word) < 2:
+            return None
+        return stem(word)
+
+    def __call__(self, text: str) -> List[str]:
+        terms = map(self.normalize, _RESUME_TOKEN_PATTERN.findall(text.lower()))
+        return [term for term in terms if term is not None]
+
+
+@dataclass
+class _RequisitionIndex:
+    """BM25 index over one job description's resumes, with the store row of each document."""
+    index: Any
+    row_ids: List[int] = field(default_factory=list)
+    last_row_id: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ResumeScreener:
+    """
+    Resume ingestion and two-phase screening per job description.
+
+    Resumes are written to a ``ResumeStore``; each process keeps a BM25 index
+    for each of the ``max_indexes`` most recently used job descriptions and
+    catches up on rows ingested anywhere (including by other workers) before
+    ranking. An evicted index is rebuilt from the store when next needed. Ranking is local and covers every
+    applicant; only the ``top_k`` best are sent to the LLM, concurrently and
+    bounded by ``assess_concurrency``.
+    """
+
+    def __init__(self, store: Optional[ResumeStore] = None,
+                 job_descriptions: Optional[JobDescriptionStore] = None,
+                 ingest_batch_size: Optional[int] = None, assess_concurrency: Optional[int] = None,
+                 max_resume_chars: Optional[int] = None, max_indexes: Optional[int] = None):
+        self.store = store or ResumeStore()
+        self.job_descriptions = job_descriptions or JobDescriptionStore()
+        self.ingest_batch_size = ingest_batch_size or int(os.getenv("SCREENING_INGEST_BATCH", 1000))
+        self.assess_concurrency = assess_concurrency or int(os.getenv("SCREENING_LLM_CONCURRENCY", 8))
+        self.max_resume_chars = max_resume_chars or int(os.getenv("SCREENING_RESUME_CHARS", 6000))
+        self.max_indexes = max(1, max_indexes or int(os.getenv("SCREENING_MAX_INDEXES", 64)))
+        self.analyzer = ResumeAnalyzer()
+        self._indexes: "OrderedDict[int, _RequisitionIndex]" = OrderedDict()
+        self._indexes_lock = threading.Lock()
+        self._stats = {"index_builds": 0, "index_evictions": 0}
+
+    def _requisition(self, job_description_id: int) -> _RequisitionIndex:
+        with self._indexes_lock:
+            requisition = self._indexes.get(job_description_id)
+            if requisition is not None:
+                self._indexes.move_to_end(job_description_id)
+                return requisition
+            # numpy is loaded with the first index rather than on module import
+            from src.utils.bm25_index import BM25Index
+            index = BM25Index(normalize=self.analyzer.normalize, token_pattern=self.analyzer.token_pattern)
+            requisition = self._indexes[job_description_id] = _RequisitionIndex(index)
+            self._stats["index_builds"] += 1
+            while len(self._indexes) > self.max_indexes:
+                # A screen still using the evicted index keeps its own reference
+                self._indexes.popitem(last=False)
+                self._stats["index_evictions"] += 1
+            return requisition
+
+    def catch_up(self, job_description_id: int) -> _RequisitionIndex:
+        """Index resumes stored since this process last looked (blocking; run in a thread)."""
+        requisition = self._requisition(job_description_id)
+        with requisition.lock:
+            added = 0
+            for batch in self.store.iter_texts(job_description_id, after_id=requisition.last_row_id):
+                requisition.index.add_texts([text for _, text in batch])
+                requisition.row_ids.extend(row_id for row_id, _ in batch)
+                requisition.last_row_id = batch[-1][0]
+                added += len(batch)
+            if added > self.ingest_batch_size:
+                # A bulk load leaves many small segments behind
+                requisition.index.optimize()
+        return requisition
+
+    async def ingest(self, job_description_id: int,
+                     resumes: AsyncIterator[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Store resumes from an async stream in batches and index them.
+
+        Returns:
+            Counts of ``received`` and ``inserted`` resumes (the difference being
+            candidates already on file) and the ``indexed`` total afterwards
+        """
+        received = inserted = 0
+        batch: List[Dict[str, Any]] = []
+        async for resume in resumes:
+            batch.append(resume)
+            if len(batch) >= self.ingest_batch_size:
+                received += len(batch)
+                inserted += await asyncio.to_thread(self.store.add_many, job_description_id, batch)
+                batch = []
+        if batch:
+            received += len(batch)
+            inserted += await asyncio.to_thread(self.store.add_many, job_description_id, batch)
+        with stage("screening_index"):
+            requisition = await asyncio.to_thread(self.catch_up, job_description_id)
+        return {"received": received, "inserted": inserted, "indexed": len(requisition.index)}
+
+    def build_query(self, job_description: Dict[str, Any]) -> Dict[str, float]:
+        """Weighted query terms from a job description's title, qualifications and responsibilities."""
+        query: Dict[str, float] = {}
+        for section, weight in QUERY_SECTION_WEIGHTS:
+            value = job_description.get(section) or []
+            text = value if isinstance(value, str) else " ".join(value)
+            for term in self.analyzer(text):
+                query[term] = query.get(term, 0.0) + weight
+        return query
+
+    def rank(self, job_description_id: int, query: Dict[str, float], top_k: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """Score every applicant and return ``(candidates_scored, shortlist)`` (blocking)."""
+        requisition = self.catch_up(job_description_id)
+        ranked = requisition.index.top_k(query, top_k)
+        shortlist = [
+            {
+                "row_id": requisition.row_ids[doc],
+                "bm25_score": round(score, 4),
+                "matched_terms": requisition.index.matched_terms(query, doc),
+            }
+            for doc, score in ranked
+        ]
+        return len(requisition.index), shortlist
+
+    async def screen(self, job_description_id: int, top_k: int = 20,
+                     assess: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Rank all applicants to a stored job description and assess the best ``top_k``.
+
+        Returns:
+            The shortlist in rank order, or None if the job description does not exist
+        """
+        record = await asyncio.to_thread(self.job_descriptions.get, job_description_id)
+        if record is None:
+            return None
+        job_description = record["job_description"]
+        query = self.build_query(job_description)
+
+        started = time.perf_counter()
+        with stage("screening_rank"):
+            scored, shortlist = await asyncio.to_thread(self.rank, job_description_id, query, top_k)
+        resumes = await asyncio.to_thread(self.store.get_many, [entry["row_id"] for entry in shortlist])
+        rank_ms = (time.perf_counter() - started) * 1000
+        SCREENED_CANDIDATES.labels("ranked").inc(scored)
+
+        candidates = []
+        for position, entry in enumerate(shortlist, start=1):
+            resume = resumes[entry.pop("row_id")]
+            candidates.append({
+                "rank": position,
+                "candidate_id": resume["candidate_id"],
+                "name": resume["name"],
+                "metadata": resume["metadata"],
+                **entry,
+                "_text": resume["text"],
+            })
+
+        started = time.perf_counter()
+        if assess and candidates:
+            semaphore = asyncio.Semaphore(max(1, self.assess_concurrency))
+
+            async def assess_candidate(candidate: Dict[str, Any]) -> None:
+                async with semaphore:
+                    candidate["assessment"] = await self._assess(job_description, candidate["_text"])
+
+            with stage("screening_assess"):
+                await asyncio.gather(*(assess_candidate(candidate) for candidate in candidates))
+            SCREENED_CANDIDATES.labels("assessed").inc(len(candidates))
+        for candidate in candidates:
+            del candidate["_text"]
+
+        return {
+            "job_description_id": job_description_id,
+            "candidates_scored": scored,
+            "query_terms": len(query),
+            "timings_ms": {"rank": round(rank_ms, 1), "assess": round((time.perf_counter() - started) * 1000, 1)},
+            "candidates": candidates,
+        }
+
+    async def _assess(self, job_description: Dict[str, Any], resume_text: str) -> Dict[str, Any]:
+        """One LLM assessment; failures are reported per candidate instead of failing the screen."""
+        def bullets(items: List[str]) -> str:
+            return "\n".join(f"- {item}" for item in items) or "- (none listed)"
+
+        prompt = (
+            f"JOB TITLE: {job_description.get('title', '')}\n\n"
+            f"REQUIRED QUALIFICATIONS:\n{bullets(job_description.get('required_qualifications', []))}\n\n"
+            f"PREFERRED QUALIFICATIONS:\n{bullets(job_description.get('preferred_qualifications', []))}\n\n"
+            f"RESUME:\n{resume_text[:self.max_resume_chars]}"
+        )
+        try:
+            response_text = await GeminiService.generate_content(
+                prompt, temperature=0.2, max_tokens=600, prefix=SCREENING_PREFIX
+            )
+            parsed = SchemaGuidedJSONParser.parse_text(CandidateAssessment, response_text)
+            if parsed.missing:
+                raise ValueError(f"Assessment is missing {', '.join(parsed.missing)}")
+            return CandidateAssessment(**parsed.data).model_dump()
+        except Exception as e:
+            logger.warning(f"Candidate assessment failed: {str(e)}")
+            return {"error": "Assessment unavailable"}
+
+    def stats(self, job_description_id: int) -> Optional[Dict[str, Any]]:
+        """Index size for a job description (blocking), or None if it does not exist."""
+        if not self.job_descriptions.exists(job_description_id):
+            return None
+        requisition = self.catch_up(job_description_id)
+        with self._indexes_lock:
+            indexes = {"indexes": len(self._indexes), "max_indexes": self.max_indexes, **self._stats}
+        return {"job_description_id": job_description_id, **requisition.index.stats(), "worker": indexes}
@@ -0,0 +1,171 @@
+"""
+Resume Store Module
+
+SQLite persistence for applicant resumes, grouped by the job description they
+applied to. Row IDs increase monotonically, which lets each process's search
+index catch up on resumes ingested anywhere by reading only the new rows.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESUME_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "data",
+    "resumes.db",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_description_id INTEGER NOT NULL,
+    candidate_id TEXT NOT NULL,
+    name TEXT,
+    text TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE (job_description_id, candidate_id)
+);
+CREATE INDEX IF NOT EXISTS idx_resumes_job_description ON resumes (job_description_id, id);
+"""
+
+
+class ResumeStore:
+    """
+    Resume table shared by all processes of the application.
+
+    A candidate applies to a job description once: re-submitting the same
+    ``candidate_id`` is ignored. Each process opens its own connection, shared
+    across threads behind a lock; callers on the event loop should use
+    ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("RESUME_STORE_PATH") or DEFAULT_RESUME_STORE_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._owner_pid: Optional[int] = None
+        self._process_connection: Optional[sqlite3.Connection] = None
+        with self._lock:
+            self._connection.executescript(_SCHEMA)
+        logger.info(f"Resume store opened at {self.path}")
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """The connection for the current process; a forked worker opens its own."""
+        if self._owner_pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            if self.path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            self._process_connection = connection
+            self._owner_pid = os.getpid()
+        return self._process_connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owner_pid == os.getpid():
+                self._process_connection.close()
+                self._owner_pid = None
+
+    def add_many(self, job_description_id: int, resumes: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert resumes (``candidate_id``, ``text``, optional ``name`` and ``metadata``) in one transaction.
+
+        Returns:
+            Number of resumes inserted; duplicates of stored candidates are skipped
+        """
+        now = time.time()
+        rows = [
+            (job_description_id, resume["candidate_id"], resume.get("name"), resume["text"],
+             json.dumps(resume.get("metadata") or {}), now)
+            for resume in resumes
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            connection = self._connection
+            before = connection.total_changes
+            with connection:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO resumes (job_description_id, candidate_id, name, text, metadata, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            return connection.total_changes - before
+
+    def iter_texts(self, job_description_id: int, after_id: int = 0,
+                   batch_size: int = 2000) -> Iterator[List[Tuple[int, str]]]:
+        """Yield ``(row_id, text)`` batches for resumes stored after ``after_id``, in ID order."""
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT id, text FROM resumes WHERE job_description_id = ? AND id > ? ORDER BY id LIMIT ?",
+                    (job_description_id, after_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield [(row["id"], row["text"]) for row in rows]
+            after_id = rows[-1]["id"]
+
+    def get_many(self, row_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Resumes by row ID."""
+        if not row_ids:
+            return {}
+        placeholders = ",".join("?" * len(row_ids))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id, candidate_id, name, text, metadata FROM resumes WHERE id IN ({placeholders})",
+                row_ids,
+            ).fetchall()
+        return {
+            row["id"]: {
+                "candidate_id": row["candidate_id"],
+                "name": row["name"],
+                "text": row["text"],
+                "metadata": json.loads(row["metadata"]),
+            }
+            for row in rows
+        }
+
+    def counts_after(self, after_id: int = 0) -> Tuple[int, List[Tuple[int, str, int]]]:
+        """
+        Counts of resumes stored after ``after_id``, by job description and month (YYYY-MM, local time).
+
+        Returns:
+            ``(last_id, [(job_description_id, month, count), ...])``
+        """
+        with self._lock:
+            # The unary + keeps SQLite on the rowid range instead of scanning the job description index
+            rows = self._connection.execute(
+                "SELECT +job_description_id AS job_description_id, "
+                "strftime('%Y-%m', created_at, 'unixepoch', 'localtime') AS month, COUNT(*) AS count, "
+                "MAX(id) AS last_id FROM resumes WHERE id > ? GROUP BY 1, 2",
+                (after_id,),
+            ).fetchall()
+        last_id = max([after_id] + [row["last_id"] for row in rows])
+        return last_id, [(row["job_description_id"], row["month"], row["count"]) for row in rows]
+
+    def latest_id(self, job_description_id: int) -> int:
+        """Highest row ID for a job description, 0 when it has no resumes."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(id) FROM resumes WHERE job_description_id = ?", (job_description_id,)
+            ).fetchone()
+        return row[0] or 0
+
+    def count(self, job_description_id: int) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM resumes WHERE job_description_id = ?", (job_description_id,)
+            ).fetchone()
+        return row[0]
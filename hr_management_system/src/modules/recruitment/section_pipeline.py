@@ -0,0 +1,208 @@
+"""
+Section Pipeline Module
+
+LangGraph pipeline that writes a job description as concurrent per-section
+calls: a context node renders the shared prompt once, one branch per section
+group generates its sections in parallel, and a merge node assembles and
+checks the document. Wall-clock time tracks the slowest section rather than
+the length of the whole document.
+"""
+
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Annotated, Any, AsyncIterator, Callable, Dict, Optional, Tuple, Type, TypedDict
+
+from pydantic import BaseModel
+
+from src.modules.gemini.client import GeminiService
+from src.modules.gemini.resilience import CircuitOpenError, DeadlineExceeded
+from src.modules.recruitment.prompt_templates import RenderedPrompt, render_section_body
+from src.utils.json_repair import SchemaGuidedJSONParser
+from src.utils.metrics import REGISTRY, stage
+
+logger = logging.getLogger(__name__)
+
+SECTION_BRANCH_RUNS = REGISTRY.counter(
+    "hr_section_branch_runs_total", "Section pipeline branch executions by outcome", ("branch", "outcome")
+)
+
+PromptBuilder = Callable[[Dict[str, Any], Optional[Dict[str, Any]]], RenderedPrompt]
+
+
+@dataclass(frozen=True)
+class SectionBranch:
+    """One parallel generation: the sections it writes and its output budget."""
+    name: str
+    sections: Tuple[str, ...]
+    guidance: str
+    max_tokens: int
+
+
+SECTION_BRANCHES = (
+    SectionBranch("overview", ("title", "overview"),
+                  "the full job title and the About the Role overview paragraph", 400),
+    SectionBranch("responsibilities", ("key_responsibilities",),
+                  "the Key Responsibilities (7-10 bullet points)", 500),
+    SectionBranch("qualifications", ("required_qualifications", "preferred_qualifications"),
+                  "the Required Qualifications (5-7 bullet points) and Preferred Qualifications (3-5 bullet points)", 600),
+    SectionBranch("benefits", ("benefits",),
+                  "the Benefits & Perks (5 bullet points)", 300),
+)
+
+
+def _merge_sections(current: Optional[Dict[str, Any]], update: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """State reducer: branches running in the same step each contribute their own keys."""
+    return {**(current or {}), **(update or {})}
+
+
+class SectionState(TypedDict, total=False):
+    request: Dict[str, Any]
+    seed: Optional[Dict[str, Any]]
+    prefix: str
+    body: str
+    sections: Annotated[Dict[str, Any], _merge_sections]
+    job_description: Dict[str, Any]
+
+
+class SectionPipeline:
+    """
+    Parallel section generation with checkpointed retries.
+
+    Every run gets its own checkpoint thread. When a branch fails, the sections
+    already written by its siblings stay in the checkpoint and the run resumes
+    from there, so only the failed branch is regenerated, up to ``max_resumes``
+    times. LangGraph is imported when the graph is first compiled.
+    """
+
+    def __init__(self, build_prompt: PromptBuilder, response_model: Type[BaseModel],
+                 branches: Tuple[SectionBranch, ...] = SECTION_BRANCHES,
+                 max_resumes: Optional[int] = None, temperature: float = 0.7):
+        self.build_prompt = build_prompt
+        self.response_model = response_model
+        self.branches = branches
+        self.max_resumes = max_resumes if max_resumes is not None else int(os.getenv("JD_SECTION_RETRIES", 2))
+        self.temperature = temperature
+        self._graph = None
+        self._checkpointer = None
+        self._stats = {"runs": 0, "failed_runs": 0, "resumes": 0}
+
+    def _compile(self):
+        """Build the graph: context -> one node per branch -> merge."""
+        from langgraph.checkpoint.memory import MemorySaver
+        from langgraph.graph import END, START, StateGraph
+
+        graph = StateGraph(SectionState)
+        graph.add_node("context", self._context_node)
+        graph.add_edge(START, "context")
+        for branch in self.branches:
+            graph.add_node(branch.name, self._branch_node(branch))
+            graph.add_edge("context", branch.name)
+        graph.add_node("merge", self._merge_node)
+        graph.add_edge([branch.name for branch in self.branches], "merge")
+        graph.add_edge("merge", END)
+
+        self._checkpointer = MemorySaver()
+        return graph.compile(checkpointer=self._checkpointer)
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            self._graph = self._compile()
+        return self._graph
+
+    def _context_node(self, state: SectionState) -> Dict[str, Any]:
+        """Render the prompt every branch shares."""
+        prompt = self.build_prompt(state["request"], state.get("seed"))
+        return {"prefix": prompt.prefix, "body": prompt.body}
+
+    def _branch_node(self, branch: SectionBranch):
+        async def generate_sections(state: SectionState) -> Dict[str, Any]:
+            try:
+                with stage(f"llm_section_{branch.name}"):
+                    response_text = await GeminiService.generate_content(
+                        render_section_body(state["body"], list(branch.sections), branch.guidance),
+                        temperature=self.temperature,
+                        max_tokens=branch.max_tokens,
+                        prefix=state["prefix"],
+                    )
+                with stage("parse"):
+                    parsed = SchemaGuidedJSONParser.parse_text(self.response_model, response_text)
+                missing = [name for name in branch.sections if name not in parsed.data]
+                if missing:
+                    raise ValueError(f"Section branch '{branch.name}' returned no {', '.join(missing)}")
+            except Exception:
+                SECTION_BRANCH_RUNS.labels(branch.name, "error").inc()
+                raise
+            SECTION_BRANCH_RUNS.labels(branch.name, "ok").inc()
+            return {"sections": {name: parsed.data[name] for name in branch.sections}}
+
+        generate_sections.__name__ = f"generate_{branch.name}"
+        return generate_sections
+
+    def _merge_node(self, state: SectionState) -> Dict[str, Any]:
+        """Assemble the document in schema order, failing if any section is absent."""
+        sections = state.get("sections") or {}
+        names = [name for branch in self.branches for name in branch.sections]
+        missing = [name for name in names if name not in sections]
+        if missing:
+            raise ValueError(f"Section pipeline is missing sections: {', '.join(missing)}")
+        return {"job_description": {name: sections[name] for name in names}}
+
+    async def stream(self, request: Dict[str, Any],
+                     seed: Optional[Dict[str, Any]] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the pipeline, yielding ``(branch, sections)`` as each branch finishes.
+
+        The final item is ``("merge", job_description)``. A branch that is
+        regenerated after a failure is yielded once, when it finally succeeds.
+
+        Raises:
+            Exception: The last branch error once ``max_resumes`` is exhausted
+        """
+        graph = self.graph
+        config = {"configurable": {"thread_id": uuid.uuid4().hex}}
+        branch_names = {branch.name for branch in self.branches}
+        state: Optional[Dict[str, Any]] = {"request": request, "seed": seed}
+        self._stats["runs"] += 1
+        try:
+            for attempt in range(self.max_resumes + 1):
+                try:
+                    async for update in graph.astream(state, config, stream_mode="updates"):
+                        for node, values in update.items():
+                            if node in branch_names:
+                                yield node, values["sections"]
+                            elif node == "merge":
+                                yield node, values["job_description"]
+                    return
+                except (CircuitOpenError, DeadlineExceeded):
+                    # Resuming cannot help while the LLM is unavailable or the deadline has passed
+                    raise
+                except Exception as e:
+                    if attempt == self.max_resumes:
+                        raise
+                    logger.warning(f"Section pipeline step failed, resuming from checkpoint: {str(e)}")
+                    self._stats["resumes"] += 1
+                    # None resumes the thread: only nodes without a saved result run again
+                    state = None
+        except Exception:
+            self._stats["failed_runs"] += 1
+            raise
+        finally:
+            await self._checkpointer.adelete_thread(config["configurable"]["thread_id"])
+
+    async def run(self, request: Dict[str, Any], seed: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run the pipeline and return the merged sections."""
+        job_description: Dict[str, Any] = {}
+        async for node, values in self.stream(request, seed):
+            if node == "merge":
+                job_description = values
+        return job_description
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "branches": {branch.name: list(branch.sections) for branch in self.branches},
+            "compiled": self._graph is not None,
+        }
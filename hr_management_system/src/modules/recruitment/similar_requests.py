@@ -0,0 +1,134 @@
+"""
+Similar Request Index Module
+
+Finds previously generated job descriptions for requests that differ from a
+new one only in wording, using canonicalized fields and hashed n-gram
+embeddings of the canonical title.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CanonicalRequest:
+    """Canonical form of a job description request."""
+    title: str
+    department: str
+    seniority: str
+    details: str
+    # Normalized requested title; a stored description is only served as is for the same wording
+    wording: str = ""
+
+    @property
+    def partition(self) -> Tuple[str, str]:
+        """Only requests for the same department and seniority are ever compared."""
+        return self.department, self.seniority
+
+
+@dataclass(frozen=True)
+class SimilarMatch:
+    """A stored description close to a new request."""
+    job_description_id: int
+    score: float
+    reusable: bool
+
+
+def details_fingerprint(parameters: Dict[str, Any]) -> str:
+    """
+    Hash of the request fields that must match exactly for a description to be reused.
+
+    Location, salary, company description, custom requirements, employment type
+    and tone all change the generated text, so a near-duplicate title with
+    different details is only good enough to seed a new generation.
+    """
+    def normalize(value: Optional[str]) -> Optional[str]:
+        return " ".join(value.split()).casefold() if value else None
+
+    details = {
+        "employment_type": normalize(parameters.get("employment_type")),
+        "location": normalize(parameters.get("location")),
+        "salary_range": normalize(parameters.get("salary_range")),
+        "company_description": normalize(parameters.get("company_description")),
+        "custom_requirements": sorted(filter(None, map(normalize, parameters.get("custom_requirements") or []))),
+        "tone": normalize(parameters.get("tone")) or "professional",
+    }
+    return hashlib.sha256(json.dumps(details, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class SimilarRequestIndex:
+    """
+    In-memory similarity index over past requests.
+
+    A match scoring at least ``reuse_threshold`` whose details fingerprint and
+    title wording equal the new request's is reusable as is (its generated
+    title was written for the same requested title); a match scoring at least
+    ``seed_threshold`` can seed a new generation. A threshold above 1 disables
+    that tier.
+
+    Each entry carries the quality of the generation behind it (higher is
+    better). Lookups name the lowest quality they accept, so a cheaper
+    generation is never served or built on in place of a better one.
+    """
+
+    def __init__(self, reuse_threshold: float = 0.9, seed_threshold: float = 0.75, dimensions: int = 512):
+        # numpy is loaded with the first index rather than on module import
+        from src.utils.vector_index import HashedNgramEmbedder, VectorIndex
+
+        self.reuse_threshold = reuse_threshold
+        self.seed_threshold = seed_threshold
+        self.embedder = HashedNgramEmbedder(dimensions)
+        self.index = VectorIndex(dimensions)
+        self._details: Dict[int, Tuple[str, str]] = {}
+        self._qualities: Set[int] = set()
+        self._stats = {"lookups": 0, "reused": 0, "seeded": 0}
+
+    def add(self, job_description_id: int, canonical: CanonicalRequest, quality: int = 0) -> None:
+        # Partitioned by quality too, so a lookup only scores the entries it may use
+        self.index.add((*canonical.partition, quality), job_description_id, self.embedder.embed(canonical.title))
+        self._details[job_description_id] = (canonical.details, canonical.wording)
+        self._qualities.add(quality)
+
+    def add_many(self, entries: Iterable[Tuple[int, CanonicalRequest, int]]) -> None:
+        count = 0
+        for job_description_id, canonical, quality in entries:
+            self.add(job_description_id, canonical, quality)
+            count += 1
+        logger.info(f"Indexed {count} stored job description requests")
+
+    def find(self, canonical: CanonicalRequest, min_quality: int = 0) -> Optional[SimilarMatch]:
+        """Return the best usable match of at least ``min_quality``, preferring reusable ones, or None."""
+        self._stats["lookups"] += 1
+        threshold = min(self.reuse_threshold, self.seed_threshold)
+        if threshold > 1:
+            return None
+        vector = self.embedder.embed(canonical.title)
+        candidates: List[Tuple[Any, float]] = []
+        for quality in sorted(self._qualities, reverse=True):
+            if quality >= min_quality:
+                candidates += self.index.nearest((*canonical.partition, quality), vector, k=8, min_score=threshold)
+        # Stable, so equally close entries stay in order of quality
+        candidates.sort(key=lambda candidate: -candidate[1])
+        for job_description_id, score in candidates:
+            if (score >= self.reuse_threshold
+                    and self._details.get(job_description_id) == (canonical.details, canonical.wording)):
+                self._stats["reused"] += 1
+                return SimilarMatch(job_description_id, score, reusable=True)
+        for job_description_id, score in candidates:
+            if score >= self.seed_threshold:
+                self._stats["seeded"] += 1
+                return SimilarMatch(job_description_id, score, reusable=False)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            **self.index.stats(),
+            "reuse_threshold": self.reuse_threshold,
+            "seed_threshold": self.seed_threshold,
+        }
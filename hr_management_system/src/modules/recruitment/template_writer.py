@@ -0,0 +1,238 @@
+"""
+Template Job Description Writer
+
+Rule-based job descriptions assembled from a curated phrase library, the
+industry knowledge base and the seniority table, without calling the LLM.
+Output is deterministic for a given request and library, complete against
+the response schema, and fast enough (well under a millisecond) to serve as
+a no-LLM tier, as the fallback when the LLM is unavailable and as the
+skeleton an LLM refinement starts from.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+from string import Template
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.modules.recruitment.canonicalization import SENIORITY_ALIASES, canonicalize_seniority, tokenize
+from src.modules.recruitment.knowledge_base import IndustryKnowledgeBase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PHRASE_LIBRARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "phrase_library.json")
+
+# Section sizes, matching what the LLM prompt asks for
+RESPONSIBILITIES = (7, 10)
+REQUIRED_QUALIFICATIONS = (5, 7)
+PREFERRED_QUALIFICATIONS = (3, 5)
+BENEFITS = 5
+
+# Knowledge base categories behind each phrase placeholder
+CONTEXT_PLACEHOLDERS = {
+    "skills": ("skills",),
+    "tools": ("tools", "platforms", "frameworks"),
+    "methodologies": ("methodologies",),
+    "certifications": ("certifications",),
+}
+
+_PLACEHOLDER = re.compile(r"\$(?:(\w+)|\{(\w+)\})")
+
+
+class _Phrase:
+    """A library phrase with the placeholders it needs, compiled once."""
+
+    def __init__(self, text: str):
+        self.template = Template(text)
+        self.placeholders = {named or braced for named, braced in _PLACEHOLDER.findall(text)}
+
+    def render(self, values: Dict[str, str]) -> Optional[str]:
+        """The phrase with ``values`` filled in, or None if a placeholder has no value."""
+        if any(not values.get(name) for name in self.placeholders):
+            return None
+        return self.template.substitute(values)
+
+
+def _phrases(texts: Sequence[str]) -> List[_Phrase]:
+    return [_Phrase(text) for text in texts]
+
+
+def _join(values: Sequence[str], conjunction: str = "and", limit: int = 4) -> str:
+    """Natural-language list: "a", "a and b", "a, b and c"."""
+    values = list(values)[:limit]
+    if len(values) < 2:
+        return "".join(values)
+    return f"{', '.join(values[:-1])} {conjunction} {values[-1]}"
+
+
+def _with_article(title: str) -> str:
+    """The title with its indefinite article ("an Office Manager", "a UX Designer", "an SRE")."""
+    first = title.split()[0] if title.split() else ""
+    if first.isupper() and len(first) > 1:
+        vowel_sound = first[0] in "AEFHILMNORSX"
+    else:
+        vowel_sound = first[:1].lower() in "aeiou" and not first.lower().startswith(("uni", "use", "eu"))
+    return f"{'an' if vowel_sound else 'a'} {title}"
+
+
+def display_title(title: str, seniority: Optional[str]) -> str:
+    """The title with the seniority in front, unless the title already names one (or it is mid-level)."""
+    title = " ".join(title.split())
+    level_name = canonicalize_seniority(seniority).name
+    if level_name == "mid-level" or not seniority or any(token in SENIORITY_ALIASES for token in tokenize(title)):
+        return title
+    return f"{' '.join(seniority.split())} {title}"
+
+
+def _render_all(phrases: List[_Phrase], values: Dict[str, str]) -> List[str]:
+    return [text for text in (phrase.render(values) for phrase in phrases) if text]
+
+
+class TemplateJobDescriptionWriter:
+    """
+    Job descriptions written from the phrase library.
+
+    The library (``JD_PHRASE_LIBRARY_PATH``, JSON) holds per-tone openers and
+    closers, per-seniority scope, responsibilities and qualifications,
+    per-department section phrases and benefits by employment type. Phrases
+    use ``$placeholders`` for request fields and knowledge base context; a
+    phrase whose context is missing for a department is left out. Choices
+    between alternative phrases are seeded by the request, so the same request
+    always gets the same description.
+    """
+
+    def __init__(self, knowledge_base: IndustryKnowledgeBase, path: Optional[str] = None):
+        self.knowledge_base = knowledge_base
+        self.path = path or os.getenv("JD_PHRASE_LIBRARY_PATH") or DEFAULT_PHRASE_LIBRARY_PATH
+        with open(self.path, "r", encoding="utf-8") as f:
+            library = json.load(f)
+        self.version = hashlib.sha256(json.dumps(library, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+        self._tones: Dict[str, Dict[str, List[_Phrase]]] = {}
+        self._tone_aliases: Dict[str, str] = {}
+        for name, tone in library["tones"].items():
+            self._tones[name] = {"openers": _phrases(tone["openers"]), "closers": _phrases(tone["closers"])}
+            for alias in (name, *tone.get("aliases", [])):
+                self._tone_aliases[alias] = name
+        self._seniority = {
+            name: {
+                "scope": _Phrase(level["scope"]),
+                **{section: _phrases(level[section]) for section in ("responsibilities", "required", "preferred")},
+            }
+            for name, level in library["seniority"].items()
+        }
+        self._departments = {
+            name: {
+                "summary": _Phrase(department["summary"]),
+                **{section: _phrases(department[section]) for section in ("responsibilities", "required", "preferred")},
+            }
+            for name, department in library["departments"].items()
+        }
+        benefits = library["benefits"]
+        self._benefits = {name: _phrases(texts) for name, texts in benefits.items() if isinstance(texts, list)}
+        self._remote_benefit = _Phrase(benefits["remote"])
+        self._salary_benefit = _Phrase(benefits["salary"])
+        self._stats = {"written": 0}
+        logger.info(f"Loaded job description phrase library from {self.path} (version {self.version})")
+
+    def _tone(self, tone: Optional[str]) -> Dict[str, List[_Phrase]]:
+        words = " ".join((tone or "").split()).lower()
+        for word in [words, *words.split()]:
+            if word in self._tone_aliases:
+                return self._tones[self._tone_aliases[word]]
+        return self._tones["professional"]
+
+    def _benefit_pool(self, employment_type: Optional[str], seniority: str) -> List[_Phrase]:
+        kind = (employment_type or "").lower()
+        if seniority == "intern" or "intern" in kind:
+            return self._benefits["internship"]
+        if "part" in kind:
+            return self._benefits["part-time"]
+        if any(word in kind for word in ("contract", "freelance", "temporary", "fixed")):
+            return self._benefits["contract"]
+        return self._benefits["default"]
+
+    def write(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write the job description sections for a request.
+
+        Args:
+            parameters: Job description request fields (``title``, ``department``,
+                ``seniority`` and the optional ones)
+
+        Returns:
+            ``title``, ``overview`` and the list sections, without metadata
+        """
+        level = canonicalize_seniority(parameters.get("seniority"))
+        entry = self.knowledge_base.lookup(parameters["department"])
+        department = self._departments.get(entry.key, self._departments["generic"])
+        seniority = self._seniority[level.name]
+        title = display_title(parameters["title"], parameters.get("seniority"))
+
+        context = entry.context
+        values = {
+            "display_title": title,
+            "a_display_title": _with_article(title),
+            "title": parameters["title"],
+            "department": " ".join(parameters["department"].split()),
+            "experience": level.experience,
+            "salary_range": parameters.get("salary_range") or "",
+            "skill": (context.get("skills") or [""])[0],
+        }
+        for placeholder, categories in CONTEXT_PLACEHOLDERS.items():
+            items = [item for category in categories for item in context.get(category, [])]
+            values[placeholder] = _join(items, "or" if placeholder in ("tools", "certifications") else "and")
+
+        # Alternatives are picked by a generator seeded with the request, never globally
+        seed_fields = [parameters.get(name) for name in ("title", "department", "seniority", "tone")]
+        rng = random.Random(json.dumps(seed_fields))
+
+        tone = self._tone(parameters.get("tone"))
+        overview = [rng.choice(tone["openers"]).render(values), department["summary"].render(values),
+                    seniority["scope"].render(values)]
+        if parameters.get("company_description"):
+            overview.append(" ".join(parameters["company_description"].split()))
+        overview.append(rng.choice(tone["closers"]).render(values))
+
+        # Role-specific duties first, then what the level adds
+        level_duties = _render_all(seniority["responsibilities"], values)
+        duties = _render_all(department["responsibilities"], values)
+        responsibilities = duties[:RESPONSIBILITIES[1] - len(level_duties)] + level_duties
+
+        # Experience, then the caller's own requirements (never dropped), then the department's
+        level_required = _render_all(seniority["required"], values)
+        custom = [" ".join(item.split()) for item in parameters.get("custom_requirements") or [] if item.strip()]
+        required = level_required[:1] + custom + _render_all(department["required"], values) + level_required[1:]
+        required = required[:max(REQUIRED_QUALIFICATIONS[1], len(custom) + 1)]
+
+        preferred = _render_all(department["preferred"], values) + _render_all(seniority["preferred"], values)
+        preferred = preferred[:PREFERRED_QUALIFICATIONS[1]]
+
+        benefits = []
+        if "remote" in (parameters.get("location") or "").lower():
+            benefits.append(self._remote_benefit.render(values))
+        if values["salary_range"]:
+            benefits.append(self._salary_benefit.render(values))
+        pool = _render_all(self._benefit_pool(parameters.get("employment_type"), level.name), values)
+        benefits += rng.sample(pool, min(len(pool), BENEFITS - len(benefits)))
+
+        self._stats["written"] += 1
+        return {
+            "title": title,
+            "overview": " ".join(sentence for sentence in overview if sentence),
+            "key_responsibilities": responsibilities,
+            "required_qualifications": required,
+            "preferred_qualifications": preferred,
+            "benefits": benefits,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "version": self.version,
+            "tones": sorted(self._tones),
+            "departments": sorted(self._departments),
+        }
@@ -0,0 +1,303 @@
+"""
+Application Server Entry Point
+
+Runs the HR Management System under uvicorn with a development or production
+profile. The production profile preloads read-only state in a master process,
+forks one worker per core so that state is shared copy-on-write, uses uvloop
+and httptools when installed, and drains in-flight requests on SIGTERM.
+
+    hr-serve                       # profile from SERVE_PROFILE / DEBUG (production by default)
+    hr-serve --profile dev         # single process with auto-reload
+    hr-serve --workers 4 --port 8080
+"""
+
+import argparse
+import gc
+import importlib.util
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+UI_PAGES = (
+    ("dashboard", "Dashboard"),
+    ("recruitment", "Recruitment"),
+    ("performance", "Performance"),
+    ("feedback", "Feedback"),
+)
+
+
+def _env_flag(name: str, default: str = "False") -> bool:
+    return os.getenv(name, default).lower() in ("true", "1", "t")
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects affinity masks and container cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+@dataclass
+class ServeSettings:
+    """Server options for one profile."""
+    profile: str
+    host: str
+    port: int
+    workers: int
+    loop: str
+    http: str
+    backlog: int
+    timeout_keep_alive: int
+    timeout_graceful_shutdown: int
+    limit_concurrency: Optional[int]
+    reload: bool
+    access_log: bool
+
+    @classmethod
+    def for_profile(cls, profile: str) -> "ServeSettings":
+        """Defaults for ``dev`` or ``prod``, overridable through the environment."""
+        production = profile == "prod"
+        limit = os.getenv("SERVE_LIMIT_CONCURRENCY")
+        return cls(
+            profile=profile,
+            host=os.getenv("HOST", "0.0.0.0" if production else "127.0.0.1"),
+            port=int(os.getenv("PORT", 8000)),
+            workers=int(os.getenv("WEB_CONCURRENCY", available_cores() if production else 1)),
+            loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+            http="httptools" if importlib.util.find_spec("httptools") else "h11",
+            backlog=int(os.getenv("SERVE_BACKLOG", 4096 if production else 2048)),
+            # Longer than a load balancer's idle timeout so the proxy closes idle connections first
+            timeout_keep_alive=int(os.getenv("SERVE_KEEPALIVE", 75 if production else 5)),
+            timeout_graceful_shutdown=int(os.getenv("SERVE_GRACEFUL_TIMEOUT", 30)),
+            limit_concurrency=int(limit) if limit else None,
+            reload=not production,
+            access_log=_env_flag("SERVE_ACCESS_LOG", "False" if production else "True"),
+        )
+
+
+def preload(app) -> None:
+    """
+    Build read-only state before workers fork.
+
+    Loads the knowledge base and similarity index, compiles the prompt template
+    for every department and the section pipeline graph, fingerprints static
+    assets and renders the UI pages.
+    Connections and the LLM backend are deliberately not created here; each
+    worker opens its own in the lifespan hook.
+    """
+    from src.modules.recruitment.job_description_generator import JobDescriptionGenerator
+    from src.modules.recruitment.knowledge_base import GENERIC_ENTRY
+    from src.ui.render_cache import brotli
+
+    started = time.perf_counter()
+    generator = JobDescriptionGenerator()
+    knowledge_base = generator.knowledge_base
+    for department in knowledge_base.departments:
+        generator.prompt_templates.get(knowledge_base.lookup(department), "professional", knowledge_base.version)
+    generator.prompt_templates.get(GENERIC_ENTRY, "professional", knowledge_base.version)
+    if generator.generation_strategy == "parallel":
+        # Imports LangGraph and compiles the section graph once for all workers
+        generator.section_pipeline.graph
+
+    app.state.asset_manifest.refresh(wait=True)
+    for active_page, page_title in UI_PAGES:
+        page = app.state.page_cache.render("base.html", {"active_page": active_page, "page_title": page_title})
+        page.variant("gzip")
+        if brotli is not None:
+            page.variant("br")
+    logger.info(f"Preloaded application state in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+def prepare_metrics_dir() -> str:
+    """
+    Directory where workers publish metrics snapshots for ``/metrics``.
+
+    Uses METRICS_MULTIPROC_DIR when set (clearing snapshots left by a previous
+    run) and a fresh temporary directory otherwise.
+    """
+    path = os.getenv("METRICS_MULTIPROC_DIR") or tempfile.mkdtemp(prefix="hr-metrics-")
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.startswith("metrics-"):
+            os.remove(os.path.join(path, name))
+    return path
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Create the listening socket shared by all workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _uvicorn_config(app, settings: ServeSettings):
+    import uvicorn
+
+    return uvicorn.Config(
+        app,
+        loop=settings.loop,
+        http=settings.http,
+        lifespan="on",
+        backlog=settings.backlog,
+        timeout_keep_alive=settings.timeout_keep_alive,
+        timeout_graceful_shutdown=settings.timeout_graceful_shutdown,
+        limit_concurrency=settings.limit_concurrency,
+        access_log=settings.access_log,
+        log_level="info",
+    )
+
+
+def run_worker(app, settings: ServeSettings, sock: socket.socket) -> None:
+    """Serve on an already bound socket until SIGTERM/SIGINT, then drain."""
+    import uvicorn
+
+    server = uvicorn.Server(_uvicorn_config(app, settings))
+    server.run(sockets=[sock])
+
+
+class Supervisor:
+    """
+    Prefork master: forks workers, replaces workers that die, and on SIGTERM or
+    SIGINT asks every worker to drain and waits for them to exit.
+    """
+
+    def __init__(self, app, settings: ServeSettings, sock: socket.socket):
+        self.app = app
+        self.settings = settings
+        self.sock = sock
+        self.workers: Dict[int, int] = {}  # pid -> worker slot
+        self.stopping = False
+
+    def spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            # Worker: restore default signal handling; uvicorn installs its own
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            # Start from zero rather than reporting the master's preload activity once per worker
+            REGISTRY.reset()
+            exit_code = 0
+            try:
+                run_worker(self.app, self.settings, self.sock)
+            except BaseException:
+                logger.exception(f"Worker {os.getpid()} crashed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.workers[pid] = slot
+        logger.info(f"Started worker {slot} (pid {pid})")
+
+    def _request_stop(self, signum, frame) -> None:
+        if not self.stopping:
+            logger.info(f"Received {signal.Signals(signum).name}, draining {len(self.workers)} workers")
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        for slot in range(self.settings.workers):
+            self.spawn(slot)
+
+        deadline: Optional[float] = None
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                if self.stopping:
+                    deadline = deadline or time.monotonic() + self.settings.timeout_graceful_shutdown + 5
+                    if time.monotonic() > deadline:
+                        logger.warning("Workers did not drain in time, killing them")
+                        for worker_pid in list(self.workers):
+                            os.kill(worker_pid, signal.SIGKILL)
+                time.sleep(0.2)
+                continue
+            slot = self.workers.pop(pid, None)
+            if slot is not None and not self.stopping:
+                logger.warning(f"Worker {slot} (pid {pid}) exited with status {status}, restarting")
+                self.spawn(slot)
+        self.sock.close()
+        logger.info("All workers stopped")
+        return 0
+
+
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the HR Management System server")
+    parser.add_argument("--profile", choices=["dev", "prod"],
+                        default=os.getenv("SERVE_PROFILE") or ("dev" if _env_flag("DEBUG") else "prod"))
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--workers", type=int, help="Worker processes (production profile)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.main import configure_logging
+
+    configure_logging()
+    args = parse_args(argv)
+    settings = ServeSettings.for_profile(args.profile)
+    settings.host = args.host or settings.host
+    settings.port = args.port or settings.port
+    settings.workers = max(1, args.workers or settings.workers)
+    logger.info(
+        f"Server configuration: profile={settings.profile}, host={settings.host}, port={settings.port}, "
+        f"workers={settings.workers}, loop={settings.loop}, http={settings.http}"
+    )
+
+    if settings.reload:
+        import uvicorn
+
+        uvicorn.run("src.main:app", host=settings.host, port=settings.port, reload=True,
+                    reload_dirs=[os.path.join(ROOT_DIR, "src")], log_level="info")
+        return 0
+
+    from src.main import create_app
+
+    multiprocess = settings.workers > 1 and hasattr(os, "fork")
+    if multiprocess:
+        REGISTRY.multiprocess_dir = prepare_metrics_dir()
+    app = create_app()
+    preload(app)
+    sock = bind_socket(settings.host, settings.port, settings.backlog)
+    if not multiprocess:
+        run_worker(app, settings, sock)
+        return 0
+
+    # Keep preloaded objects out of the collector so workers do not dirty the shared pages
+    gc.collect()
+    gc.freeze()
+    try:
+        return Supervisor(app, settings, sock).run()
+    finally:
+        if not os.getenv("METRICS_MULTIPROC_DIR"):
+            shutil.rmtree(REGISTRY.multiprocess_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
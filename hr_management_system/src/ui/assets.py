@@ -0,0 +1,285 @@
+"""
+Static Asset Pipeline
+
+Content-hashes the files under ``ui/static`` into a build directory with
+precompressed gzip/brotli variants and a manifest, resolves logical asset
+names to their fingerprinted URLs, and serves the build with year-long
+immutable caching.
+
+Build ahead of deployment with ``python -m src.ui.assets``; the manifest is
+also loaded at startup and rebuilt in the background when sources change.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from src.ui.render_cache import brotli, negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+UI_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STATIC_DIR = os.path.join(UI_DIR, "static")
+DEFAULT_BUILD_DIR = os.path.join(UI_DIR, "build")
+MANIFEST_NAME = "manifest.json"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPRESSIBLE_EXTENSIONS = frozenset({".css", ".js", ".mjs", ".svg", ".json", ".txt", ".html", ".map", ".xml"})
+# Python package markers live in the static tree but are not assets
+IGNORED_FILES = frozenset({"__init__.py"})
+_ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def _fingerprinted_name(relative_path: str, digest: str) -> str:
+    stem, extension = os.path.splitext(relative_path)
+    return f"{stem}.{digest}{extension}"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def iter_sources(static_dir: str) -> List[Tuple[str, str]]:
+    """Return (relative path, absolute path) for every asset under ``static_dir``, sorted."""
+    sources = []
+    for directory, _, files in os.walk(static_dir):
+        for name in files:
+            if name in IGNORED_FILES or name.endswith((".pyc", ".tmp")):
+                continue
+            path = os.path.join(directory, name)
+            sources.append((os.path.relpath(path, static_dir).replace(os.sep, "/"), path))
+    return sorted(sources)
+
+
+def build_assets(static_dir: str = DEFAULT_STATIC_DIR, build_dir: str = DEFAULT_BUILD_DIR) -> Dict[str, str]:
+    """
+    Fingerprint every source asset into ``build_dir`` and write the manifest.
+
+    Compressible files also get ``.gz`` and, when brotli is installed, ``.br``
+    siblings (only when smaller than the original). Files from the previous
+    build are kept so pages already rendered with old URLs keep working; older
+    generations are removed.
+
+    Returns:
+        Mapping of logical path (``css/main.css``) to fingerprinted path
+    """
+    manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+    previous = _read_manifest(manifest_path) or {}
+    assets: Dict[str, str] = {}
+    for relative_path, path in iter_sources(static_dir):
+        with open(path, "rb") as f:
+            data = f.read()
+        fingerprinted = _fingerprinted_name(relative_path, hashlib.sha256(data).hexdigest()[:12])
+        assets[relative_path] = fingerprinted
+        target = os.path.join(build_dir, fingerprinted)
+        if os.path.exists(target):
+            continue
+        _write_atomic(target, data)
+        if os.path.splitext(relative_path)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants[".br"] = brotli.compress(data, quality=11)
+            for suffix, encoded in variants.items():
+                if len(encoded) < len(data):
+                    _write_atomic(target + suffix, encoded)
+
+    _prune(build_dir, set(assets.values()) | set(previous.get("assets", {}).values()))
+    version = hashlib.sha256(json.dumps(assets, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    _write_atomic(manifest_path, json.dumps({"version": version, "assets": assets}, indent=2).encode("utf-8"))
+    logger.info(f"Built {len(assets)} static assets into {build_dir} (version {version})")
+    return assets
+
+
+def _read_manifest(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _prune(build_dir: str, keep: set) -> None:
+    """Remove fingerprinted files (and their variants) that are not in ``keep``."""
+    for relative_path, path in iter_sources(build_dir):
+        if relative_path == MANIFEST_NAME:
+            continue
+        base = relative_path
+        for suffix in _ENCODING_SUFFIXES.values():
+            if base.endswith(suffix) and base[:-len(suffix)] in keep:
+                base = base[:-len(suffix)]
+        if base not in keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class AssetManifest:
+    """
+    Maps logical asset paths to fingerprinted URLs.
+
+    Source modification times are checked at most every ``check_interval``
+    seconds and a stale or missing manifest is rebuilt, so editing a stylesheet
+    during development yields a new URL without a restart. Lookups run while
+    templates render on the event loop, so after startup the check and rebuild
+    happen in a background thread and the previous manifest is served until the
+    rebuild finishes. Unknown assets fall back to their plain ``/static`` URL.
+    """
+
+    def __init__(self, static_dir: str = DEFAULT_STATIC_DIR, build_dir: Optional[str] = None,
+                 build_url: str = "/assets", static_url: str = "/static", check_interval: float = 2.0):
+        self.static_dir = static_dir
+        self.build_dir = build_dir or os.getenv("ASSET_BUILD_DIR") or DEFAULT_BUILD_DIR
+        self.build_url = build_url.rstrip("/")
+        self.static_url = static_url.rstrip("/")
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._rebuilding = False
+        self._assets: Dict[str, str] = {}
+        self._version = ""
+        self._signature: Optional[Tuple] = None
+        self._checked_at = float("-inf")
+
+    def _source_signature(self) -> Tuple:
+        signature = []
+        for relative_path, path in iter_sources(self.static_dir):
+            stat = os.stat(path)
+            signature.append((relative_path, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def refresh(self, wait: bool = False) -> None:
+        """
+        Load the manifest, rebuilding it if sources changed since the last check.
+
+        Args:
+            wait: Rebuild in the calling thread and return once the manifest is
+                current (startup and preload); otherwise start a background
+                rebuild and keep serving the previous manifest meanwhile
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            if not wait:
+                if not self._rebuilding:
+                    self._rebuilding = True
+                    threading.Thread(target=self._rebuild_in_background, name="asset-manifest", daemon=True).start()
+                return
+        self._rebuild()
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            self._rebuild()
+        except Exception as e:
+            logger.error(f"Static asset rebuild failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def _rebuild(self) -> None:
+        with self._build_lock:
+            try:
+                signature = self._source_signature()
+                if signature == self._signature:
+                    return
+                manifest = _read_manifest(os.path.join(self.build_dir, MANIFEST_NAME))
+                current = manifest is not None and self._is_current(manifest)
+                assets = manifest["assets"] if current else build_assets(self.static_dir, self.build_dir)
+                self._assets = assets
+                self._version = hashlib.sha256(json.dumps(assets, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+                self._signature = signature
+            except OSError as e:
+                # Serve unfingerprinted URLs rather than failing page renders
+                logger.error(f"Static asset build failed: {str(e)}")
+
+    def _is_current(self, manifest: Dict) -> bool:
+        """True when the manifest lists exactly the current sources and every build file exists."""
+        assets = manifest.get("assets", {})
+        sources = iter_sources(self.static_dir)
+        if sorted(assets) != [relative_path for relative_path, _ in sources]:
+            return False
+        for relative_path, path in sources:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:12]
+            if assets[relative_path] != _fingerprinted_name(relative_path, digest):
+                return False
+            if not os.path.exists(os.path.join(self.build_dir, assets[relative_path])):
+                return False
+        return True
+
+    def version(self) -> str:
+        """Hash of the current manifest; changes whenever any asset changes."""
+        self.refresh()
+        return self._version
+
+    def url(self, path: str) -> str:
+        """Return the fingerprinted URL for a logical asset path such as ``css/main.css``."""
+        self.refresh()
+        path = path.lstrip("/")
+        fingerprinted = self._assets.get(path)
+        if fingerprinted is None:
+            return f"{self.static_url}/{path}"
+        return f"{self.build_url}/{fingerprinted}"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    Static file handler for fingerprinted builds.
+
+    Serves the ``.br`` or ``.gz`` sibling of a file when the client accepts that
+    coding, and marks every response immutable for a year since a changed file
+    always gets a new name.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        response: Optional[Response] = None
+        if encoding != "identity":
+            try:
+                response = await super().get_response(path + _ENCODING_SUFFIXES[encoding], scope)
+                response.headers["Content-Encoding"] = encoding
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                if media_type.startswith("text/") or media_type in ("application/javascript", "image/svg+xml"):
+                    media_type += "; charset=utf-8"
+                response.headers["Content-Type"] = media_type
+            except StarletteHTTPException:
+                response = None
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    build_dir = os.getenv("ASSET_BUILD_DIR") or DEFAULT_BUILD_DIR
+    assets = build_assets(DEFAULT_STATIC_DIR, build_dir)
+    for relative_path, fingerprinted in assets.items():
+        print(f"{relative_path} -> {fingerprinted}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
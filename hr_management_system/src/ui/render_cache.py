@@ -0,0 +1,172 @@
+"""
+Page Render Cache
+
+Renders each (template, context) page variant once per template version and
+serves it with a strong ETag, conditional-request handling and precompressed
+gzip/brotli bodies.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.templating import Jinja2Templates
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPage:
+    """A rendered page with lazily built compressed variants."""
+    body: bytes
+    digest: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def variant(self, encoding: str) -> bytes:
+        """Return the body for a content coding, compressing it on first use."""
+        if encoding == "identity":
+            return self.body
+        if encoding not in self.encoded:
+            if encoding == "br":
+                self.encoded[encoding] = brotli.compress(self.body, quality=11)
+            else:
+                self.encoded[encoding] = gzip.compress(self.body, compresslevel=9, mtime=0)
+        return self.encoded[encoding]
+
+    def etag(self, encoding: str) -> str:
+        # Each coding is a different representation, so it gets its own strong validator
+        return f'"{self.digest}"' if encoding == "identity" else f'"{self.digest}-{encoding}"'
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """Pick br, gzip or identity from an Accept-Encoding header, honouring q=0."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    def allowed(coding: str) -> bool:
+        return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return "identity"
+
+
+def etag_matches(if_none_match: str, etags: List[str]) -> bool:
+    """Weak comparison of an If-None-Match header against the current validators."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    candidates |= {tag[2:] for tag in candidates if tag.startswith("W/")}
+    return any(tag in candidates for tag in etags)
+
+
+class PageRenderCache:
+    """
+    Cache of fully rendered template pages.
+
+    The template version is a hash of the path, size and modification time of
+    every file under ``templates_dir`` (plus any ``extra_version`` sources such as
+    the asset manifest), recomputed at most every ``check_interval`` seconds; a
+    changed version drops all cached pages. Responses carry ``Cache-Control:
+    no-cache`` so browsers revalidate each navigation and get a 304 when nothing
+    changed.
+    """
+
+    def __init__(self, templates: Jinja2Templates, templates_dir: str, check_interval: float = 1.0,
+                 extra_version: Optional[Callable[[], str]] = None):
+        self.templates = templates
+        self.templates_dir = templates_dir
+        self.check_interval = check_interval
+        self.extra_version = extra_version
+        self._lock = threading.Lock()
+        self._pages: Dict[Tuple[str, Hashable], CachedPage] = {}
+        self._version = ""
+        self._checked_at = float("-inf")
+        self._stats = {"renders": 0, "hits": 0, "not_modified": 0, "invalidations": 0}
+
+    def _scan_version(self) -> str:
+        digest = hashlib.sha256()
+        for directory, _, files in sorted(os.walk(self.templates_dir)):
+            for name in sorted(files):
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+        if self.extra_version is not None:
+            digest.update(self.extra_version().encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def refresh(self) -> str:
+        """Return the current template version, rescanning and invalidating when due."""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            version = self._scan_version()
+            if version != self._version:
+                with self._lock:
+                    if self._pages:
+                        self._stats["invalidations"] += 1
+                        logger.info(f"Templates or assets changed, dropping {len(self._pages)} cached pages")
+                    self._pages = {}
+                    self._version = version
+        return self._version
+
+    def render(self, name: str, context: Dict[str, Any]) -> CachedPage:
+        """Return the cached rendering of a template for a context of hashable values."""
+        self.refresh()
+        key = (name, tuple(sorted(context.items())))
+        page = self._pages.get(key)
+        if page is not None:
+            self._stats["hits"] += 1
+            return page
+
+        body = self.templates.get_template(name).render(context).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        page = CachedPage(body=body, digest=digest)
+        with self._lock:
+            self._pages[key] = page
+        self._stats["renders"] += 1
+        return page
+
+    def response(self, request: Request, name: str, context: Dict[str, Any]) -> Response:
+        """Serve a cached page, answering 304 when the client's copy is current."""
+        page = self.render(name, context)
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        etag = page.etag(encoding)
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, [etag]):
+            self._stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=page.variant(encoding), media_type="text/html", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pages": len(self._pages), "version": self._version, "brotli": brotli is not None}
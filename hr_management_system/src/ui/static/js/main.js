@@ -1,6 +1,106 @@
-
 // Core JavaScript functionality
 document.addEventListener('DOMContentLoaded', function() {
     console.log('HR Management System initialized');
+
+    const dashboardMetrics = document.getElementById('dashboard-metrics');
+    if (dashboardMetrics) {
+        loadDashboardMetrics(dashboardMetrics);
+    }
+
+    const performanceOverview = document.getElementById('performance-overview');
+    if (performanceOverview) {
+        loadPerformanceOverview(performanceOverview);
+    }
 });
-        
\ No newline at end of file
+
+// Metric cards on the dashboard, from the materialized /api/dashboard snapshot
+async function loadDashboardMetrics(container) {
+    const signed = (value) => `${value > 0 ? '+' : ''}${value}`;
+    const setCard = (field, value, change, direction = null) => {
+        container.querySelector(`[data-field="${field}"]`).textContent = value;
+        const changeElement = container.querySelector(`[data-field="${field}_change"]`);
+        changeElement.textContent = change;
+        if (direction !== null) {
+            changeElement.classList.add(direction >= 0 ? 'positive' : 'negative');
+        }
+    };
+    try {
+        const response = await fetch('/api/dashboard');
+        if (!response.ok) {
+            return;
+        }
+        const dashboard = await response.json();
+
+        const recruitment = dashboard.recruitment;
+        setCard('active_recruitments', recruitment.active_recruitments,
+            `${recruitment.applicants_this_month} applicants this month`,
+            recruitment.applicants_this_month - recruitment.applicants_last_month);
+        setCard('job_descriptions', recruitment.job_descriptions,
+            `+${recruitment.job_descriptions_this_month} this month`);
+
+        const performance = dashboard.performance;
+        if (performance && performance.average_score !== null) {
+            const change = performance.change ? performance.change.average_score : null;
+            setCard('team_performance', performance.average_score,
+                change !== null
+                    ? `${signed(change)} from ${performance.previous_cycle}`
+                    : `${performance.cycle} (${performance.reviews} reviews)`,
+                change);
+        } else {
+            setCard('team_performance', '–', 'No reviews yet');
+        }
+
+        const feedback = dashboard.feedback;
+        if (feedback.net_sentiment !== null) {
+            setCard('feedback_sentiment', signed(feedback.net_sentiment),
+                `Net sentiment of ${feedback.comments} comments`, feedback.net_sentiment);
+        } else {
+            setCard('feedback_sentiment', '–', 'No feedback analyzed yet');
+        }
+        container.hidden = false;
+    } catch (error) {
+        console.error('Failed to load dashboard metrics', error);
+    }
+}
+
+// Latest review cycle figures for the performance page
+async function loadPerformanceOverview(container) {
+    const format = (value, suffix = '') => value === null ? '–' : `${value}${suffix}`;
+    const signed = (value) => value === null ? '–' : `${value > 0 ? '+' : ''}${value}`;
+    try {
+        const [summaryResponse, departmentsResponse] = await Promise.all([
+            fetch('/api/performance/summary'),
+            fetch('/api/performance/departments'),
+        ]);
+        if (!summaryResponse.ok || !departmentsResponse.ok) {
+            return;  // No reviews yet
+        }
+        const summary = await summaryResponse.json();
+        const departments = await departmentsResponse.json();
+
+        container.querySelector('[data-field="average_score"]').textContent = format(summary.average_score);
+        container.querySelector('[data-field="cycle"]').textContent =
+            `Average review score, ${summary.cycle} (${summary.reviews} reviews)`;
+        const change = container.querySelector('[data-field="change"]');
+        if (summary.change && summary.change.average_score !== null) {
+            change.classList.add(summary.change.average_score >= 0 ? 'positive' : 'negative');
+            change.textContent = `${signed(summary.change.average_score)} from ${summary.previous_cycle}`;
+        }
+
+        const rows = container.querySelector('tbody');
+        for (const group of departments.groups) {
+            const row = rows.insertRow();
+            [
+                group.department,
+                group.reviews,
+                format(group.average_score),
+                format(group.average_rating),
+                format(group.goal_attainment, '%'),
+                signed(group.score_change),
+            ].forEach((value) => { row.insertCell().textContent = value; });
+        }
+        container.hidden = false;
+    } catch (error) {
+        console.error('Failed to load performance overview', error);
+    }
+}
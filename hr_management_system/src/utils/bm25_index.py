@@ -0,0 +1,227 @@
+"""
+BM25 Index Utilities
+
+In-memory inverted index with vectorized Okapi BM25 scoring. Documents are
+added in batches, each becoming an immutable segment of term-sorted postings
+in numpy arrays; queries score every document with a few array operations per
+query term, and segments are merged once enough of them accumulate.
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class _Segment:
+    """Postings of a batch of documents in CSR form: term ``t`` owns ``docs[offsets[t]:offsets[t + 1]]``."""
+    offsets: np.ndarray  # int64, one more entry than the vocabulary size when the segment was built
+    docs: np.ndarray  # int32 global document numbers
+    tfs: np.ndarray  # float32 term frequencies
+
+    def postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        if term_id + 1 >= len(self.offsets):
+            return self.docs[:0], self.tfs[:0]
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.docs[start:end], self.tfs[start:end]
+
+    def document_frequency(self, term_id: int) -> int:
+        if term_id + 1 >= len(self.offsets):
+            return 0
+        return int(self.offsets[term_id + 1] - self.offsets[term_id])
+
+
+def _build_segment(terms: np.ndarray, docs: np.ndarray, tfs: np.ndarray, vocabulary_size: int) -> _Segment:
+    """Sort postings by term (documents stay in ascending order within a term) and compute offsets."""
+    order = np.argsort(terms, kind="stable")
+    offsets = np.zeros(vocabulary_size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(terms, minlength=vocabulary_size), out=offsets[1:])
+    return _Segment(offsets, docs[order], tfs[order])
+
+
+class _TermEncoder(dict):
+    """Word -> term ID, analyzing each distinct word once; words without a term map to -1."""
+
+    def __init__(self, vocabulary: Dict[str, int], normalize: Callable[[str], Optional[str]]):
+        super().__init__()
+        self.vocabulary = vocabulary
+        self.normalize = normalize
+
+    def __missing__(self, word: str) -> int:
+        term = self.normalize(word)
+        term_id = -1 if term is None else self.vocabulary.setdefault(term, len(self.vocabulary))
+        self[word] = term_id
+        return term_id
+
+
+class BM25Index:
+    """
+    Okapi BM25 over text documents.
+
+    Text is lowercased and split with ``token_pattern``; ``normalize`` maps each
+    word to its index term (a stem, say) or None for stop words, and runs once
+    per distinct word, so tokenizing a batch is a C-level dictionary lookup
+    per word. Documents are numbered densely from 0 in insertion order. Adding
+    a batch costs one ``np.unique`` over its postings; a query costs, per
+    query term and segment, a slice of the postings and a vectorized update of
+    a dense score array, so it is independent of the vocabulary size.
+    Instances are safe to share between threads.
+    """
+
+    def __init__(self, normalize: Optional[Callable[[str], Optional[str]]] = None, token_pattern: str = r"\w+",
+                 k1: float = 1.2, b: float = 0.75, max_segments: int = 8):
+        self.k1 = k1
+        self.b = b
+        self.max_segments = max(1, max_segments)
+        self.token_pattern = re.compile(token_pattern)
+        self.vocabulary: Dict[str, int] = {}
+        self._encoder = _TermEncoder(self.vocabulary, normalize or (lambda word: word))
+        self._segments: List[_Segment] = []
+        self._lengths: List[np.ndarray] = []
+        self._doc_count = 0
+        self._token_count = 0
+        self._norms: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._doc_count
+
+    def add_texts(self, texts: Sequence[str]) -> int:
+        """
+        Index a batch of documents.
+
+        Returns:
+            The number assigned to the first document of the batch
+        """
+        with self._lock:
+            first = self._doc_count
+            if not texts:
+                return first
+            encode = self._encoder.__getitem__
+            findall = self.token_pattern.findall
+            encoded: List[int] = []
+            word_counts = np.empty(len(texts), dtype=np.int64)
+            for position, text in enumerate(texts):
+                before = len(encoded)
+                encoded.extend(map(encode, findall(text.lower())))
+                word_counts[position] = len(encoded) - before
+
+            vocabulary_size = max(1, len(self.vocabulary))
+            terms = np.array(encoded, dtype=np.int64)
+            docs = np.repeat(np.arange(len(texts), dtype=np.int64), word_counts)
+            kept = terms >= 0
+            terms, docs = terms[kept], docs[kept]
+            lengths = np.bincount(docs, minlength=len(texts)).astype(np.int32)
+            # One key per (document, term) pair; counting keys gives the term frequencies
+            keys, counts = np.unique(docs * vocabulary_size + terms, return_counts=True)
+            self._segments.append(_build_segment(
+                (keys % vocabulary_size).astype(np.int32),
+                (keys // vocabulary_size + first).astype(np.int32),
+                counts.astype(np.float32),
+                vocabulary_size,
+            ))
+            self._lengths.append(lengths)
+            self._doc_count += len(texts)
+            self._token_count += int(lengths.sum())
+            self._norms = None
+            return first
+
+    def _merge_segments(self) -> None:
+        """Combine all segments into one (called with the lock held)."""
+        vocabulary_size = len(self.vocabulary)
+        terms = np.concatenate([
+            np.repeat(np.arange(len(segment.offsets) - 1, dtype=np.int32), np.diff(segment.offsets))
+            for segment in self._segments
+        ])
+        docs = np.concatenate([segment.docs for segment in self._segments])
+        tfs = np.concatenate([segment.tfs for segment in self._segments])
+        self._segments = [_build_segment(terms, docs, tfs, vocabulary_size)]
+
+    def optimize(self) -> None:
+        """Merge all segments, e.g. after a bulk load, so queries touch one postings array per term."""
+        with self._lock:
+            if len(self._segments) > 1:
+                self._merge_segments()
+
+    def _document_norms(self) -> np.ndarray:
+        """``k1 * (1 - b + b * length / avg_length)`` per document, cached until the next batch."""
+        if self._norms is None:
+            lengths = np.concatenate(self._lengths).astype(np.float32)
+            average = self._token_count / self._doc_count if self._doc_count else 1.0
+            self._norms = self.k1 * (1 - self.b + self.b * lengths / max(average, 1e-9))
+        return self._norms
+
+    def score(self, query: Dict[str, float]) -> np.ndarray:
+        """
+        BM25 score of every document for a query.
+
+        Args:
+            query: Query terms mapped to their weights (1.0 for a plain query)
+
+        Returns:
+            float32 array of one score per document; unknown terms contribute nothing
+        """
+        with self._lock:
+            if len(self._segments) > self.max_segments:
+                self._merge_segments()
+            segments = list(self._segments)
+            doc_count = self._doc_count
+            scores = np.zeros(doc_count, dtype=np.float32)
+            if not doc_count:
+                return scores
+            norms = self._document_norms()
+            term_ids = {self.vocabulary[term]: weight for term, weight in query.items() if term in self.vocabulary}
+
+        for term_id, weight in term_ids.items():
+            frequency = sum(segment.document_frequency(term_id) for segment in segments)
+            if not frequency:
+                continue
+            idf = math.log(1 + (doc_count - frequency + 0.5) / (frequency + 0.5))
+            factor = np.float32(weight * idf * (self.k1 + 1))
+            for segment in segments:
+                docs, tfs = segment.postings(term_id)
+                if len(docs):
+                    # A term occurs once per document in a segment, so fancy-index += is safe
+                    scores[docs] += factor * tfs / (tfs + norms[docs])
+        return scores
+
+    def top_k(self, query: Dict[str, float], k: int) -> List[Tuple[int, float]]:
+        """The ``k`` best-scoring documents with a positive score, best first."""
+        scores = self.score(query)
+        if not len(scores) or k <= 0:
+            return []
+        if k < len(scores):
+            candidates = np.argpartition(scores, -k)[-k:]
+        else:
+            candidates = np.arange(len(scores))
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(doc), float(scores[doc])) for doc in ranked if scores[doc] > 0]
+
+    def matched_terms(self, query: Dict[str, float], doc: int) -> List[str]:
+        """Query terms that occur in document ``doc``, for explaining a ranking."""
+        with self._lock:
+            segments = list(self._segments)
+            term_ids = [(term, self.vocabulary[term]) for term in query if term in self.vocabulary]
+        matched = []
+        for term, term_id in term_ids:
+            for segment in segments:
+                docs, _ = segment.postings(term_id)
+                position = np.searchsorted(docs, doc)
+                if position < len(docs) and docs[position] == doc:
+                    matched.append(term)
+                    break
+        return matched
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "documents": self._doc_count,
+                "terms": len(self.vocabulary),
+                "postings": int(sum(len(segment.docs) for segment in self._segments)),
+                "segments": len(self._segments),
+                "avg_document_length": round(self._token_count / self._doc_count, 1) if self._doc_count else 0.0,
+            }
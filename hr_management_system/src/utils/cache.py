@@ -0,0 +1,236 @@
+"""
+Response Caching Utilities
+
+Size-bounded LRU cache with per-entry TTL, an optional on-disk tier and
+coalescing of concurrent computations for the same key.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from src.utils.deadline import detached_context, wait_within_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Two-tier cache for JSON-serializable values.
+
+    The memory tier is an LRU bounded by ``max_entries``; the optional disk tier
+    stores one JSON file per key under ``disk_dir``, survives restarts and is an
+    LRU bounded by ``max_disk_entries`` (tracked per process). Disk reads and writes run in worker
+    threads, and a file that cannot be read or parsed counts as a miss. Entries
+    in both tiers expire ``ttl_seconds`` after they were stored. Concurrent
+    ``get_or_compute`` calls for a key that is not cached share a single
+    in-flight computation.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 6 * 3600,
+                 disk_dir: Optional[str] = None, max_disk_entries: int = 4096):
+        self.max_entries = max(1, max_entries)
+        self.max_disk_entries = max(1, max_disk_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._disk_keys: "OrderedDict[str, None]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._disk_writes: Set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "evictions": 0,
+                       "disk_evictions": 0}
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            # Oldest first, so files left by a previous run are evicted before new ones
+            names = [name for name in os.listdir(self.disk_dir) if name.endswith(".json")]
+            for name in sorted(names, key=lambda name: self._mtime(os.path.join(self.disk_dir, name))):
+                self._disk_keys[name[:-len(".json")]] = None
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return self.ttl_seconds <= 0 or (time.time() - stored_at) < self.ttl_seconds
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Load an entry from the disk tier, discarding expired or unreadable files."""
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache file {path}: {str(e)}")
+            self._remove_disk(key)
+            return None
+
+        try:
+            stored_at, value = float(record["stored_at"]), record["value"]
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Discarding malformed cache file {path}")
+            self._remove_disk(key)
+            return None
+        if not self._is_fresh(stored_at):
+            self._remove_disk(key)
+            return None
+        return stored_at, value
+
+    def _write_disk(self, key: str, stored_at: float, value: Any, evicted: List[str]) -> None:
+        """Atomically persist an entry to the disk tier and remove the entries it displaced."""
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": stored_at, "value": value}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to write cache file {path}: {str(e)}")
+        for evicted_key in evicted:
+            self._remove_disk(evicted_key)
+
+    def _remove_disk(self, key: str) -> None:
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
+
+    def _store_memory(self, key: str, stored_at: float, value: Any) -> None:
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _schedule_disk_write(self, key: str, stored_at: float, value: Any) -> asyncio.Task:
+        """Write an entry to disk in a worker thread, evicting the least recently used files over the cap."""
+        self._disk_keys[key] = None
+        self._disk_keys.move_to_end(key)
+        evicted = []
+        while len(self._disk_keys) > self.max_disk_entries:
+            evicted.append(self._disk_keys.popitem(last=False)[0])
+            self._stats["disk_evictions"] += 1
+        task = asyncio.ensure_future(asyncio.to_thread(self._write_disk, key, stored_at, value, evicted))
+        # Keep a reference until the write finishes
+        self._disk_writes.add(task)
+        task.add_done_callback(self._disk_writes.discard)
+        return task
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value for ``key``, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._is_fresh(entry[0]):
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return copy.deepcopy(entry[1])
+            del self._entries[key]
+
+        if self.disk_dir:
+            # Not gated on _disk_keys: other workers may share the directory
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                self._store_memory(key, *entry)
+                self._disk_keys[key] = None
+                self._disk_keys.move_to_end(key)
+                self._stats["disk_hits"] += 1
+                return copy.deepcopy(entry[1])
+            self._disk_keys.pop(key, None)
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store ``value`` in every configured tier."""
+        stored_at = time.time()
+        value = copy.deepcopy(value)
+        self._store_memory(key, stored_at, value)
+        if self.disk_dir:
+            await self._schedule_disk_write(key, stored_at, value)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop ``key`` from every tier."""
+        self._entries.pop(key, None)
+        if self.disk_dir:
+            self._disk_keys.pop(key, None)
+            await asyncio.to_thread(self._remove_disk, key)
+
+    async def clear(self) -> None:
+        """Drop all entries from every tier."""
+        self._entries.clear()
+        if self.disk_dir:
+            keys = list(self._disk_keys)
+            self._disk_keys.clear()
+            await asyncio.to_thread(lambda: [self._remove_disk(key) for key in keys])
+
+    async def get_or_compute(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for ``key`` or compute and cache it.
+
+        The computation runs as a task shared by every caller waiting on the same
+        key, so cancelling one caller does not abort it for the others. It runs
+        without any caller's request deadline; each caller instead stops
+        waiting at its own. Failures are propagated to all waiters and are
+        never cached.
+
+        Args:
+            key: Cache key
+            factory: Zero-argument coroutine function producing the value
+
+        Returns:
+            Cached or freshly computed value
+
+        Raises:
+            DeadlineExceeded: If this caller's request deadline passes first
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            # The task copies the context it is created in; start it from one without a deadline
+            task = detached_context().run(asyncio.ensure_future, factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_computed(key, t))
+        else:
+            self._stats["coalesced"] += 1
+
+        return copy.deepcopy(await wait_within_deadline(task))
+
+    def _on_computed(self, key: str, task: asyncio.Task) -> None:
+        """Populate the cache once a shared computation finishes; waiters do not wait for the disk write."""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        stored_at = time.time()
+        value = copy.deepcopy(task.result())
+        self._store_memory(key, stored_at, value)
+        if self.disk_dir:
+            self._schedule_disk_write(key, stored_at, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "disk_entries": len(self._disk_keys),
+            "inflight": len(self._inflight),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_enabled": bool(self.disk_dir),
+        }
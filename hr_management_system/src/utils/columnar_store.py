@@ -0,0 +1,234 @@
+"""
+Columnar Store Utilities
+
+Append-only table kept as one raw, fixed-width file per column and read
+through numpy memory maps, in the spirit of Arrow's IPC files. String
+columns are dictionary-encoded: the file holds int32 codes and the distinct
+values live in an append-only text file. A small metadata file records how
+many rows and dictionary entries are committed, so any process can open the
+table, map only the committed rows and pick up later appends cheaply.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms fall back to the in-process lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DICTIONARY_DTYPE = np.dtype("<i4")
+
+
+@dataclass
+class TableSnapshot:
+    """Committed rows of a columnar table at one point in time."""
+    rows: int
+    columns: Dict[str, np.ndarray]
+    dictionaries: Dict[str, List[str]]
+    _codes: Dict[str, Dict[str, int]]
+
+    def code(self, column: str, value: str) -> Optional[int]:
+        """Dictionary code of a value, or None if no row of the snapshot can hold it."""
+        code = self._codes[column].get(value)
+        return code if code is not None and code < len(self.dictionaries[column]) else None
+
+
+class ColumnarStore:
+    """
+    Append-only, memory-mapped columnar table.
+
+    ``columns`` maps each numeric column to a numpy dtype string;
+    ``dictionary_columns`` name the string columns. Appends from any process
+    are serialized by a file lock and become visible when the metadata file
+    is replaced, so readers never map a partially written row. Bytes left
+    past the committed length by an interrupted append are truncated by the
+    next writer.
+    """
+
+    def __init__(self, directory: str, columns: Dict[str, str], dictionary_columns: Sequence[str] = ()):
+        self.directory = directory
+        self.dtypes = {name: np.dtype(dtype).newbyteorder("<") for name, dtype in columns.items()}
+        self.dtypes.update({name: DICTIONARY_DTYPE for name in dictionary_columns})
+        self.dictionary_columns = tuple(dictionary_columns)
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._write_thread_lock = threading.Lock()
+        self._meta_signature = None
+        self._rows = 0
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dictionaries: Dict[str, List[str]] = {name: [] for name in self.dictionary_columns}
+        self._dictionary_codes: Dict[str, Dict[str, int]] = {name: {} for name in self.dictionary_columns}
+        self._dictionary_bytes: Dict[str, int] = {name: 0 for name in self.dictionary_columns}
+        self.refresh()
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.col")
+
+    def _dictionary_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.dict")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"rows": 0, "dictionaries": {}}
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        tmp_path = f"{self._meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._meta_path)
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Exclusive across threads and, where supported, processes."""
+        with self._write_thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load(self, meta: Dict[str, Any]) -> None:
+        """Map the committed rows and read new dictionary entries (called with the lock held)."""
+        rows = meta["rows"]
+        for name, dtype in self.dtypes.items():
+            path = self._column_path(name)
+            if rows and os.path.exists(path):
+                self._columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+            else:
+                self._columns[name] = np.empty(0, dtype=dtype)
+        for name in self.dictionary_columns:
+            committed = meta["dictionaries"].get(name, {"count": 0, "bytes": 0})
+            known = self._dictionary_bytes[name]
+            if committed["bytes"] > known:
+                with open(self._dictionary_path(name), "rb") as f:
+                    f.seek(known)
+                    added = f.read(committed["bytes"] - known).decode("utf-8").split("\n")[:-1]
+                values = self._dictionaries[name]
+                codes = self._dictionary_codes[name]
+                for value in added:
+                    codes[value] = len(values)
+                    values.append(value)
+                self._dictionary_bytes[name] = committed["bytes"]
+        self._rows = rows
+
+    def refresh(self) -> int:
+        """Pick up rows committed by any process since the last call; returns the row count."""
+        try:
+            stat = os.stat(self._meta_path)
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except FileNotFoundError:
+            signature = None
+        with self._lock:
+            if signature != self._meta_signature or not self._columns:
+                self._load(self._read_meta())
+                self._meta_signature = signature
+            return self._rows
+
+    def snapshot(self) -> TableSnapshot:
+        """The committed rows after a refresh; arrays are read-only memory maps."""
+        self.refresh()
+        with self._lock:
+            return TableSnapshot(
+                self._rows,
+                dict(self._columns),
+                {name: values[:] for name, values in self._dictionaries.items()},
+                self._dictionary_codes,
+            )
+
+    def append(self, data: Dict[str, Sequence[Any]]) -> range:
+        """
+        Append rows given as one sequence per column (strings for dictionary columns).
+
+        Returns:
+            The row numbers assigned to the new rows
+        """
+        count = len(next(iter(data.values()))) if data else 0
+        if any(len(values) != count for values in data.values()):
+            raise ValueError("All columns must have the same number of rows")
+        missing = set(self.dtypes) - set(data)
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+
+        with self._write_lock():
+            meta = self._read_meta()
+            with self._lock:
+                self._load(meta)
+            first = meta["rows"]
+            if not count:
+                return range(first, first)
+
+            encoded: Dict[str, np.ndarray] = {}
+            new_values: Dict[str, List[str]] = {}
+            for name in self.dictionary_columns:
+                codes = dict(self._dictionary_codes[name])
+                added: List[str] = []
+                for value in data[name]:
+                    if value not in codes:
+                        if "\n" in value:
+                            raise ValueError(f"Values of {name} must not contain line breaks")
+                        codes[value] = len(self._dictionaries[name]) + len(added)
+                        added.append(value)
+                encoded[name] = np.fromiter((codes[value] for value in data[name]), DICTIONARY_DTYPE, count)
+                new_values[name] = added
+            for name, dtype in self.dtypes.items():
+                if name not in encoded:
+                    encoded[name] = np.asarray(data[name], dtype=dtype)
+
+            # Drop anything an interrupted writer left beyond the committed length, then append
+            for name, dtype in self.dtypes.items():
+                with open(self._column_path(name), "ab") as f:
+                    f.truncate(first * dtype.itemsize)
+                    f.write(encoded[name].tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            dictionaries = {}
+            for name in self.dictionary_columns:
+                committed_bytes = self._dictionary_bytes[name]
+                payload = "".join(f"{value}\n" for value in new_values[name]).encode("utf-8")
+                with open(self._dictionary_path(name), "ab") as f:
+                    f.truncate(committed_bytes)
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                dictionaries[name] = {
+                    "count": len(self._dictionaries[name]) + len(new_values[name]),
+                    "bytes": committed_bytes + len(payload),
+                }
+
+            meta = {"rows": first + count, "dictionaries": dictionaries}
+            self._write_meta(meta)
+            with self._lock:
+                self._load(meta)
+                self._meta_signature = None
+            return range(first, first + count)
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self.refresh()
+        return {
+            "rows": rows,
+            "bytes": int(sum(rows * dtype.itemsize for dtype in self.dtypes.values())),
+            "dictionaries": {name: len(values) for name, values in self._dictionaries.items()},
+        }
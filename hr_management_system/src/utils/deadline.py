@@ -0,0 +1,71 @@
+"""
+Request Deadline Utilities
+
+The current request's deadline, carried in a context variable so every
+await below the request handler can see how much time is left, plus a
+detached context for work shared between requests that must not inherit
+any one caller's deadline.
+"""
+
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Absolute time.monotonic() by which the current request must be answered
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when work cannot finish within the request's deadline."""
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Bound work in this context to ``seconds`` from now (never extending an enclosing deadline)."""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    enclosing = _deadline.get()
+    token = _deadline.set(deadline if enclosing is None else min(enclosing, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def detached_context() -> contextvars.Context:
+    """A copy of the current context without a deadline, for tasks shared by several callers."""
+    context = contextvars.copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+async def wait_within_deadline(awaitable: "asyncio.Future") -> object:
+    """
+    Await a shared task or future, giving up at the current request's deadline.
+
+    The awaited work is shielded, so a caller running out of time leaves it
+    running for the others.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes first
+    """
+    shielded = asyncio.shield(awaitable)
+    remaining = remaining_time()
+    if remaining is None:
+        return await shielded
+    try:
+        return await asyncio.wait_for(shielded, timeout=max(0.0, remaining))
+    except asyncio.TimeoutError:
+        if awaitable.done():
+            raise  # The shared work itself timed out
+        raise DeadlineExceeded("Request deadline passed while waiting for a shared computation") from None
@@ -0,0 +1,58 @@
+"""
+Error Handling Utilities
+
+Decorators that convert unexpected failures in service calls into logged,
+predictable fallback values so API handlers degrade gracefully.
+"""
+
+import asyncio
+import functools
+import logging
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def handle_api_error(default_return_factory: Optional[Callable[[], Any]] = None,
+                     passthrough: Tuple[type, ...] = ()):
+    """
+    Wrap a sync or async callable so exceptions are logged and replaced by a fallback.
+
+    Args:
+        default_return_factory: Builds the value returned on failure. When omitted,
+            the exception is logged and re-raised.
+        passthrough: Exception types re-raised as is, without logging, so callers
+            can handle them (e.g. an open circuit breaker)
+
+    Returns:
+        Decorator preserving the wrapped callable's signature
+    """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except passthrough:
+                    raise
+                except Exception as e:
+                    logger.error(f"{func.__qualname__} failed: {str(e)}", exc_info=True)
+                    if default_return_factory is None:
+                        raise
+                    return default_return_factory()
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except passthrough:
+                raise
+            except Exception as e:
+                logger.error(f"{func.__qualname__} failed: {str(e)}", exc_info=True)
+                if default_return_factory is None:
+                    raise
+                return default_return_factory()
+        return sync_wrapper
+
+    return decorator
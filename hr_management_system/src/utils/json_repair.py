@@ -0,0 +1,360 @@
+"""
+JSON Repair Utilities
+
+Tolerant parsing of JSON produced by language models: extraction from
+surrounding prose or markdown fences, repair of common damage (trailing or
+missing commas, single quotes, Python literals, raw newlines in strings,
+truncation) and schema-guided salvage of the fields that survived.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+_FENCE_PATTERN = re.compile(r"```[a-zA-Z]*\s*")
+_NUMBER_PATTERN = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_\-]*")
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+_MISSING = object()
+
+
+def extract_json_text(text: str) -> Optional[str]:
+    """
+    Return the text starting at the first JSON object, or None if there is none.
+
+    Content inside a markdown code fence is preferred; a fence that was never
+    closed (truncated output) extends to the end of the text.
+    """
+    fence = _FENCE_PATTERN.search(text)
+    if fence:
+        inner = text[fence.end():]
+        closing = inner.find("```")
+        candidate = inner if closing == -1 else inner[:closing]
+        if "{" in candidate:
+            text = candidate
+    start = text.find("{")
+    return text[start:] if start != -1 else None
+
+
+class _TolerantJSONParser:
+    """Recursive-descent parser that repairs instead of failing and reports truncated values."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.repairs: List[str] = []
+        self.truncated_keys: Set[str] = set()
+
+    def _skip(self) -> None:
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            if char in " \t\r\n":
+                self.pos += 1
+            elif self.text.startswith("//", self.pos):
+                end = self.text.find("\n", self.pos)
+                self.pos = len(self.text) if end == -1 else end
+                self._repair("removed comment")
+            else:
+                break
+
+    def _repair(self, description: str) -> None:
+        if description not in self.repairs:
+            self.repairs.append(description)
+
+    def parse(self) -> Tuple[Any, bool]:
+        """
+        Parse one value; returns it with a flag telling whether it was complete.
+
+        A value that is absent before a ``,`` ``]`` or ``}`` comes back as
+        ``(_MISSING, True)`` with the delimiter left for the container.
+        """
+        self._skip()
+        # Skip characters that cannot start a value (a loop, so long runs of junk cannot exhaust the stack)
+        while self.pos < len(self.text) and not self._starts_value(self.text[self.pos]):
+            if self.text[self.pos] in ",]}":
+                return _MISSING, True
+            self._repair(f"skipped unexpected character {self.text[self.pos]!r}")
+            self.pos += 1
+            self._skip()
+        if self.pos >= len(self.text):
+            return _MISSING, False
+        char = self.text[self.pos]
+        if char == "{":
+            return self._parse_object(top_level=False)
+        if char == "[":
+            return self._parse_array()
+        if char in "\"'":
+            return self._parse_string(char)
+        number = _NUMBER_PATTERN.match(self.text, self.pos)
+        if number:
+            self.pos = number.end()
+            raw = number.group(0)
+            value = float(raw) if any(c in raw for c in ".eE") else int(raw)
+            return value, self.pos < len(self.text)
+        identifier = _IDENTIFIER_PATTERN.match(self.text, self.pos)
+        if identifier:
+            self.pos = identifier.end()
+            word = identifier.group(0)
+            if word in _LITERALS:
+                if word not in ("true", "false", "null"):
+                    self._repair("converted Python literal")
+                return _LITERALS[word], self.pos < len(self.text)
+            self._repair("quoted bare word")
+            return word, self.pos < len(self.text)
+        return _MISSING, False
+
+    def _starts_value(self, char: str) -> bool:
+        return (char in "{[\"'" or _NUMBER_PATTERN.match(self.text, self.pos) is not None
+                or _IDENTIFIER_PATTERN.match(self.text, self.pos) is not None)
+
+    def _parse_string(self, quote: str) -> Tuple[str, bool]:
+        start = self.pos + 1
+        index = start
+        while index < len(self.text):
+            char = self.text[index]
+            if char == "\\":
+                index += 2
+                continue
+            if char == quote:
+                self.pos = index + 1
+                return self._decode_string(self.text[start:index], quote), True
+            index += 1
+        self.pos = len(self.text)
+        self._repair("closed truncated string")
+        return self._decode_string(self.text[start:].rstrip("\\"), quote), False
+
+    def _decode_string(self, raw: str, quote: str) -> str:
+        if quote == "'":
+            self._repair("converted single-quoted string")
+            raw = raw.replace("\\'", "'").replace('"', '\\"')
+        try:
+            return json.loads(f'"{raw}"')
+        except ValueError:
+            self._repair("escaped control characters in string")
+            escaped = raw.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+            try:
+                return json.loads(f'"{escaped}"')
+            except ValueError:
+                return raw
+
+    def _parse_array(self) -> Tuple[List[Any], bool]:
+        self.pos += 1
+        items: List[Any] = []
+        expecting_value = True
+        while True:
+            self._skip()
+            if self.pos >= len(self.text):
+                self._repair("closed truncated array")
+                return items, False
+            char = self.text[self.pos]
+            if char == "]":
+                if items and expecting_value:
+                    self._repair("removed trailing comma")
+                self.pos += 1
+                return items, True
+            if char == ",":
+                self.pos += 1
+                expecting_value = True
+                continue
+            if char == "}":
+                self._repair("closed array at object end")
+                return items, True
+            if not expecting_value:
+                self._repair("inserted missing comma")
+            value, complete = self.parse()
+            if value is _MISSING and complete:
+                continue
+            if not complete:
+                # Drop the partially generated element, keep the complete ones
+                if value is not _MISSING and isinstance(value, (list, dict)) and value:
+                    items.append(value)
+                return items, False
+            items.append(value)
+            expecting_value = False
+
+    def _parse_object(self, top_level: bool) -> Tuple[Dict[str, Any], bool]:
+        self.pos += 1
+        result: Dict[str, Any] = {}
+        expecting_key = True
+        while True:
+            self._skip()
+            if self.pos >= len(self.text):
+                self._repair("closed truncated object")
+                return result, False
+            char = self.text[self.pos]
+            if char == "}":
+                if result and expecting_key:
+                    self._repair("removed trailing comma")
+                self.pos += 1
+                return result, True
+            if char == ",":
+                self.pos += 1
+                expecting_key = True
+                continue
+            if not expecting_key:
+                self._repair("inserted missing comma")
+
+            if char in "\"'":
+                key, complete = self._parse_string(char)
+                if not complete:
+                    return result, False
+            else:
+                identifier = _IDENTIFIER_PATTERN.match(self.text, self.pos)
+                if not identifier:
+                    self.pos += 1
+                    self._repair(f"skipped unexpected character {char!r}")
+                    continue
+                self.pos = identifier.end()
+                key = identifier.group(0)
+                self._repair("quoted bare key")
+
+            self._skip()
+            if self.pos < len(self.text) and self.text[self.pos] == ":":
+                self.pos += 1
+            elif self.pos < len(self.text):
+                self._repair("inserted missing colon")
+
+            value, complete = self.parse()
+            if value is _MISSING and complete:
+                self._repair("removed empty value")
+                expecting_key = False
+                continue
+            if value is not _MISSING:
+                result[key] = value
+            if not complete:
+                if top_level:
+                    self.truncated_keys.add(key)
+                return result, False
+            expecting_key = False
+
+    def parse_document(self) -> Tuple[Dict[str, Any], bool]:
+        """Parse the top-level object, recording which member was cut off."""
+        self._skip()
+        return self._parse_object(top_level=True)
+
+
+def repair_json(text: str) -> Tuple[Dict[str, Any], List[str], Set[str], bool]:
+    """
+    Parse the first JSON object in ``text``, repairing damage where possible.
+
+    Returns:
+        Tuple of (object, repairs applied, truncated top-level keys, whether the
+        object was closed)
+
+    Raises:
+        ValueError: If the text contains no JSON object at all
+    """
+    candidate = extract_json_text(text)
+    if candidate is None:
+        raise ValueError("No JSON object found in model response")
+    try:
+        return json.loads(candidate), [], set(), True
+    except ValueError:
+        pass
+    try:
+        value, end = json.JSONDecoder().raw_decode(candidate)
+        return value, ["ignored trailing text"], set(), True
+    except ValueError:
+        pass
+    parser = _TolerantJSONParser(candidate)
+    value, complete = parser.parse_document()
+    return value, parser.repairs, parser.truncated_keys, complete
+
+
+@dataclass
+class JSONParseResult:
+    """Outcome of a schema-guided parse."""
+    data: Dict[str, Any]
+    missing: List[str]
+    truncated: List[str] = field(default_factory=list)
+    invalid: List[str] = field(default_factory=list)
+    repairs: List[str] = field(default_factory=list)
+    closed: bool = False
+
+    @property
+    def complete(self) -> bool:
+        """True when every required field was recovered."""
+        return not self.missing
+
+
+class SchemaGuidedJSONParser:
+    """
+    Schema-aware parser for model output.
+
+    Text may be fed in chunks; ``result`` returns every field that validates
+    against its annotation on ``model`` plus the list of required fields that
+    are absent, invalid or were cut off. Truncated list fields keep their
+    complete items; a truncated string field counts as missing. ``result``
+    re-parses the whole buffer, so call it once the text is complete rather
+    than after every chunk (``JSONSectionStreamParser`` handles streamed output).
+    """
+
+    def __init__(self, model: Type[BaseModel], exclude: Tuple[str, ...] = ("metadata",)):
+        self.model = model
+        self.fields = {name: info for name, info in model.model_fields.items() if name not in exclude}
+        self._adapters = {name: TypeAdapter(info.annotation) for name, info in self.fields.items()}
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> None:
+        """Append a chunk of model output."""
+        self._buffer += chunk
+
+    @classmethod
+    def parse_text(cls, model: Type[BaseModel], text: str) -> JSONParseResult:
+        """Parse a complete response in one call."""
+        parser = cls(model)
+        parser.feed(text)
+        return parser.result()
+
+    def _coerce(self, name: str, value: Any, repairs: List[str]) -> Any:
+        """Adapt near-miss shapes (string for a list, list for a string) before validation."""
+        annotation = self.fields[name].annotation
+        expects_list = getattr(annotation, "__origin__", None) is list
+        if expects_list and isinstance(value, str):
+            repairs.append(f"split {name} into list")
+            return [line.strip(" -*\u2022\t") for line in value.splitlines() if line.strip(" -*\u2022\t")]
+        if annotation is str and isinstance(value, list):
+            repairs.append(f"joined {name} into text")
+            return " ".join(str(item) for item in value)
+        return value
+
+    def result(self) -> JSONParseResult:
+        """Return the fields recovered so far."""
+        try:
+            document, repairs, truncated_keys, closed = repair_json(self._buffer)
+        except ValueError:
+            return JSONParseResult(data={}, missing=self._required(set()), closed=False)
+        if not isinstance(document, dict):
+            return JSONParseResult(data={}, missing=self._required(set()), repairs=repairs, closed=False)
+
+        repairs = list(repairs)
+        data: Dict[str, Any] = {}
+        truncated: List[str] = []
+        invalid: List[str] = []
+        for name in self.fields:
+            if name not in document:
+                continue
+            value = document[name]
+            if name in truncated_keys:
+                truncated.append(name)
+                if isinstance(value, str) or not value:
+                    continue
+            try:
+                data[name] = self._adapters[name].validate_python(self._coerce(name, value, repairs))
+            except ValidationError:
+                invalid.append(name)
+
+        return JSONParseResult(
+            data=data,
+            missing=self._required(set(data)),
+            truncated=truncated,
+            invalid=invalid,
+            repairs=repairs,
+            closed=closed,
+        )
+
+    def _required(self, present: Set[str]) -> List[str]:
+        return [name for name, info in self.fields.items() if info.is_required() and name not in present]
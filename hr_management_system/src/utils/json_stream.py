@@ -0,0 +1,155 @@
+"""
+Incremental JSON Section Parsing
+
+Parses a top-level JSON object while it is still being generated and reports
+each member (and each element of array members) as soon as it is complete.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+class JSONSectionStreamParser:
+    """
+    Push parser for a streamed JSON object.
+
+    Text is appended with ``feed``; every call returns the events that became
+    available. Scalar members produce ``field`` events and array members produce
+    one ``item`` event per element. Leading prose or markdown fences before the
+    opening brace are ignored. The parser never raises on malformed input: it
+    simply stops emitting events, leaving final validation to the caller.
+    """
+
+    def __init__(self, sections: Optional[Iterable[str]] = None):
+        self.sections = set(sections) if sections is not None else None
+        self._buffer = ""
+        self._pos = 0
+        self._state = "seek_object"
+        self._key: Optional[str] = None
+        self._index = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Append ``chunk`` and return newly completed events."""
+        self._buffer += chunk
+        events: List[Dict[str, Any]] = []
+        while self._step(events):
+            pass
+        return events
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the top-level object has been seen."""
+        return self._state == "done"
+
+    @classmethod
+    def events_for(cls, payload: Dict[str, Any], sections: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Return the events a parser would emit for an already complete ``payload``."""
+        parser = cls(sections=sections)
+        return [
+            event
+            for key, value in payload.items()
+            if parser._wanted(key)
+            for event in parser._events_for_member(key, value)
+        ]
+
+    def _wanted(self, key: Optional[str]) -> bool:
+        return self.sections is None or key in self.sections
+
+    @staticmethod
+    def _events_for_member(key: str, value: Any) -> List[Dict[str, Any]]:
+        if isinstance(value, list):
+            return [{"type": "item", "name": key, "index": i, "value": item} for i, item in enumerate(value)]
+        return [{"type": "field", "name": key, "value": value}]
+
+    def _skip(self, chars: str) -> None:
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in chars:
+            self._pos += 1
+
+    def _decode(self) -> Optional[tuple]:
+        """
+        Decode one JSON value at the current position.
+
+        Returns a one-element tuple holding the value, or None while the value is
+        still incomplete. Bare scalars (numbers, literals) are only accepted once a
+        following delimiter has arrived, since a number at the end of the buffer
+        may still be growing.
+        """
+        try:
+            value, end = _decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return None
+        if self._buffer[self._pos] not in '"{[' and end >= len(self._buffer):
+            return None
+        self._pos = end
+        return (value,)
+
+    def _step(self, events: List[Dict[str, Any]]) -> bool:
+        """Advance the state machine by one token; return False when more input is needed."""
+        if self._state == "seek_object":
+            start = self._buffer.find("{", self._pos)
+            if start == -1:
+                self._pos = len(self._buffer)
+                return False
+            self._pos = start + 1
+            self._state = "key"
+            return True
+
+        if self._state == "done":
+            return False
+
+        self._skip(_WHITESPACE + ",")
+        if self._pos >= len(self._buffer):
+            return False
+        char = self._buffer[self._pos]
+
+        if self._state == "key":
+            if char == "}":
+                self._pos += 1
+                self._state = "done"
+                return True
+            decoded = self._decode()
+            if decoded is None:
+                return False
+            self._key = str(decoded[0])
+            self._state = "colon"
+            return True
+
+        if self._state == "colon":
+            if char != ":":
+                self._state = "done"
+                return False
+            self._pos += 1
+            self._state = "value"
+            return True
+
+        if self._state == "value":
+            if char == "[":
+                self._pos += 1
+                self._index = 0
+                self._state = "array"
+                return True
+            decoded = self._decode()
+            if decoded is None:
+                return False
+            if self._wanted(self._key):
+                events.append({"type": "field", "name": self._key, "value": decoded[0]})
+            self._state = "key"
+            return True
+
+        if self._state == "array":
+            if char == "]":
+                self._pos += 1
+                self._state = "key"
+                return True
+            decoded = self._decode()
+            if decoded is None:
+                return False
+            if self._wanted(self._key):
+                events.append({"type": "item", "name": self._key, "index": self._index, "value": decoded[0]})
+            self._index += 1
+            return True
+
+        return False
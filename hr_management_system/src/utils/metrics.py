@@ -0,0 +1,501 @@
+"""
+Metrics Utilities
+
+Counters, gauges and histograms with Prometheus text exposition, stage timers
+for the generation pipeline and ASGI middleware timing every request. When
+the server runs several worker processes, each one periodically writes a
+snapshot to METRICS_MULTIPROC_DIR and ``/metrics`` serves their sum.
+"""
+
+import asyncio
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# Route label for work done outside a request (job workers, startup)
+BACKGROUND_ROUTE = "background"
+
+# (request scope, application root path) of the request being served
+_request_scope: contextvars.ContextVar[Optional[Tuple[Dict[str, Any], str]]] = contextvars.ContextVar(
+    "metrics_request_scope", default=None
+)
+
+LabelValues = Tuple[str, ...]
+
+
+@dataclass
+class CollectedMetric:
+    """One metric family's current samples; histogram values are (bucket counts, sum, count)."""
+    name: str
+    kind: str
+    documentation: str
+    labelnames: Tuple[str, ...] = ()
+    samples: Dict[LabelValues, Any] = field(default_factory=dict)
+    buckets: Tuple[float, ...] = ()
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def sample(self) -> float:
+        return self.value
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def sample(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, *values: Any):
+        """Return the child for these label values (in ``labelnames`` order)."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def collect(self) -> CollectedMetric:
+        return CollectedMetric(self.name, self.kind, self.documentation, self.labelnames,
+                               {key: child.sample() for key, child in list(self._children.items())})
+
+
+class Counter(_Family):
+    """Monotonically increasing count; names end in ``_total``."""
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Family):
+    """Value that can go up and down."""
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(_Family):
+    """Distribution of observations over fixed buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def collect(self) -> CollectedMetric:
+        collected = super().collect()
+        collected.buckets = self.buckets
+        return collected
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsRegistry:
+    """
+    Process-wide set of metric families plus collectors.
+
+    Collectors are callables returning ``CollectedMetric`` objects, evaluated at
+    scrape time; they export statistics that components already keep (cache
+    hits, similarity reuse) without instrumenting their hot paths. With a
+    ``multiprocess_dir`` every process writes its samples to
+    ``<dir>/metrics-<pid>.json`` and rendering sums all of them. Counters and
+    histograms of exited processes are kept so totals never go backwards;
+    their gauges are dropped.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None):
+        self.multiprocess_dir = multiprocess_dir
+        self._families: Dict[str, _Family] = {}
+        self._collectors: List[Callable[[], Iterable[CollectedMetric]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Tuple[str, ...], **kwargs):
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = cls(name, documentation, tuple(labelnames), **kwargs)
+            elif not isinstance(family, cls) or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def reset(self) -> None:
+        """Zero every sample; a forked worker calls this so it does not report its parent's counts."""
+        for family in list(self._families.values()):
+            with family._lock:
+                family._children.clear()
+
+    def register_collector(self, collector: Callable[[], Iterable[CollectedMetric]]) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> List[CollectedMetric]:
+        metrics = [family.collect() for family in list(self._families.values())]
+        for collector in self._collectors:
+            try:
+                metrics.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector {getattr(collector, '__qualname__', collector)} failed: {str(e)}")
+        return metrics
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.multiprocess_dir, f"metrics-{pid}.json")
+
+    def flush(self, metrics: Optional[List[CollectedMetric]] = None) -> None:
+        """Write this process's samples for the other workers to merge."""
+        if not self.multiprocess_dir:
+            return
+        metrics = metrics if metrics is not None else self.collect()
+        snapshot = [
+            {
+                "name": metric.name,
+                "kind": metric.kind,
+                "documentation": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": list(metric.buckets),
+                "samples": [[list(key), value] for key, value in metric.samples.items()],
+            }
+            for metric in metrics
+        ]
+        path = self._snapshot_path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write metrics snapshot {path}: {str(e)}")
+
+    async def run_flusher(self, interval: float = 1.0) -> None:
+        """Flush periodically until cancelled; started from the lifespan hook."""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.flush()
+        finally:
+            self.flush()
+
+    def _merged(self, own: List[CollectedMetric]) -> List[CollectedMetric]:
+        merged: Dict[str, CollectedMetric] = {}
+
+        def add(metric: CollectedMetric, alive: bool) -> None:
+            if metric.kind == "gauge" and not alive:
+                return
+            target = merged.get(metric.name)
+            if target is None:
+                target = merged[metric.name] = CollectedMetric(
+                    metric.name, metric.kind, metric.documentation, metric.labelnames, {}, metric.buckets
+                )
+            for key, value in metric.samples.items():
+                current = target.samples.get(key)
+                if current is None:
+                    target.samples[key] = value
+                elif metric.kind == "histogram":
+                    if len(current[0]) == len(value[0]):
+                        target.samples[key] = ([a + b for a, b in zip(current[0], value[0])],
+                                               current[1] + value[1], current[2] + value[2])
+                else:
+                    target.samples[key] = current + value
+
+        for metric in own:
+            add(metric, True)
+        own_path = self._snapshot_path(os.getpid())
+        for name in os.listdir(self.multiprocess_dir):
+            if not (name.startswith("metrics-") and name.endswith(".json")):
+                continue
+            path = os.path.join(self.multiprocess_dir, name)
+            if path == own_path:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                pid = int(name[len("metrics-"):-len(".json")])
+            except (OSError, ValueError):
+                continue
+            alive = _pid_alive(pid)
+            for entry in snapshot:
+                add(CollectedMetric(
+                    entry["name"], entry["kind"], entry["documentation"], tuple(entry["labelnames"]),
+                    {tuple(key): value for key, value in entry["samples"]}, tuple(entry["buckets"]),
+                ), alive)
+        return list(merged.values())
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric (summed over workers when multi-process)."""
+        metrics = self.collect()
+        if self.multiprocess_dir:
+            self.flush(metrics)
+            metrics = self._merged(metrics)
+        lines: List[str] = []
+        for metric in sorted(metrics, key=lambda m: m.name):
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, value in sorted(metric.samples.items()):
+                labels = list(zip(metric.labelnames, key))
+                if metric.kind == "histogram":
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(metric.buckets) + [float("inf")], counts):
+                        cumulative += bucket_count
+                        lines.append(f"{metric.name}_bucket{_labels(labels + [('le', _number(bound))])} {cumulative}")
+                    lines.append(f"{metric.name}_sum{_labels(labels)} {_number(total)}")
+                    lines.append(f"{metric.name}_count{_labels(labels)} {count}")
+                else:
+                    lines.append(f"{metric.name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(str(value))}"' for name, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return f"{value:.1f}"
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry(os.getenv("METRICS_MULTIPROC_DIR") or None)
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "hr_http_requests_total", "HTTP requests by method, route template and status", ("method", "route", "status")
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "hr_http_request_duration_seconds", "Time to serve an HTTP request, including streamed bodies", ("method", "route")
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("hr_http_requests_in_flight", "HTTP requests currently being served")
+STAGE_SECONDS = REGISTRY.histogram(
+    "hr_stage_duration_seconds", "Time spent in each processing stage, by originating route", ("route", "stage")
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "hr_stage_errors_total", "Processing stages that raised, by originating route", ("route", "stage")
+)
+
+
+def route_label(scope: Optional[Dict[str, Any]], root_path: str = "") -> str:
+    """
+    Route template (``/api/jobs/{job_id}``) for a request scope; bounded cardinality by design.
+
+    Rebuilt from the request path and its matched path parameters, which holds
+    for routes inside included routers too. Requests routed into a mount (whose
+    ``root_path`` grew beyond the application's) are labelled ``<mount>/{path}``.
+    """
+    if scope is None:
+        return BACKGROUND_ROUTE
+    if "endpoint" not in scope:
+        return "unmatched"
+    mount_path = scope.get("root_path", "")
+    if mount_path != root_path:
+        return f"{mount_path[len(root_path):]}/{{path}}"
+    path = scope.get("path", "")
+    params = scope.get("path_params") or {}
+    for name, value in sorted(params.items(), key=lambda item: -len(str(item[1]))):
+        value = str(value)
+        if value:
+            path = re.sub(f"/{re.escape(value)}(?=/|$)", f"/{{{name}}}", path, count=1)
+    return path
+
+
+def current_route() -> str:
+    current = _request_scope.get()
+    return route_label(*current) if current is not None else BACKGROUND_ROUTE
+
+
+class StageTimer:
+    """Context manager (sync or async) recording one stage's duration."""
+    __slots__ = ("name", "_started")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._started = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        route = current_route()
+        STAGE_SECONDS.labels(route, self.name).observe(time.perf_counter() - self._started)
+        # Cancellation and closed generators are not failures of the stage
+        if exc_type is not None and issubclass(exc_type, Exception):
+            STAGE_ERRORS.labels(route, self.name).inc()
+        return False
+
+    async def __aenter__(self) -> "StageTimer":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+def stage(name: str) -> StageTimer:
+    """Time a block: ``with stage("parse"): ...``."""
+    return StageTimer(name)
+
+
+def timed(name: str):
+    """Decorator timing every call of a sync or async function as stage ``name``."""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with StageTimer(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with StageTimer(name):
+                return func(*args, **kwargs)
+        return sync_wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and concurrency.
+
+    Requests are labelled by route template rather than raw path so that IDs in
+    URLs do not create new series. The request scope is made available to
+    stage timers further down the stack.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            # WebSocket handlers still attribute their stages to the route
+            token = _request_scope.set((scope, scope.get("root_path", ""))) if scope["type"] == "websocket" else None
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if token is not None:
+                    _request_scope.reset(token)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        root_path = scope.get("root_path", "")
+        token = _request_scope.set((scope, root_path))
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _request_scope.reset(token)
+            route = route_label(scope, root_path)
+            HTTP_SECONDS.labels(scope["method"], route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(scope["method"], route, status).inc()
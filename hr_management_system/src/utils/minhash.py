@@ -0,0 +1,139 @@
+"""
+MinHash Utilities
+
+MinHash signatures of token sets and locality-sensitive hashing on top of
+them: grouping documents whose token sets overlap strongly around leader
+documents, and finding the most similar document of a reference set.
+Signatures and band hashes are vectorized over batches of documents with
+numpy.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_EMPTY = np.uint32(_MERSENNE_PRIME)
+
+
+class MinHasher:
+    """
+    ``num_perm`` universal hash functions over integer token IDs (below 2**31).
+
+    The fraction of equal positions in two signatures estimates the Jaccard
+    similarity of the token sets. An empty set gets a signature of sentinels,
+    equal to that of every other empty set; ``leader_clusters`` and
+    ``nearest_neighbors`` never match such signatures (see ``is_empty``).
+    """
+
+    def __init__(self, num_perm: int = 32, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, token_sets: Sequence[Sequence[int]]) -> np.ndarray:
+        """uint32 array of shape ``(len(token_sets), num_perm)``."""
+        signatures = np.full((len(token_sets), self.num_perm), _EMPTY, dtype=np.uint32)
+        lengths = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.int64, count=len(token_sets))
+        filled = np.flatnonzero(lengths)
+        if not len(filled):
+            return signatures
+        tokens = np.fromiter(
+            (token for index in filled.tolist() for token in token_sets[index]), dtype=np.uint64,
+            count=int(lengths.sum()),
+        )
+        starts = np.concatenate(([0], np.cumsum(lengths[filled])[:-1]))
+        # (a * x + b) mod p stays below 2**63 for x < 2**31
+        hashes = (tokens[:, None] * self._a + self._b) % _MERSENNE_PRIME
+        signatures[filled] = np.minimum.reduceat(hashes, starts, axis=0)
+        return signatures
+
+
+def is_empty(signatures: np.ndarray) -> np.ndarray:
+    """Boolean mask of the signatures of empty token sets, which say nothing about similarity."""
+    return (signatures == _EMPTY).all(axis=1)
+
+
+def band_keys(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """One uint64 hash per band of ``num_perm // bands`` signature rows: shape ``(documents, bands)``."""
+    documents, num_perm = signatures.shape
+    rows = num_perm // bands
+    if rows < 1:
+        raise ValueError("More bands than signature rows")
+    banded = signatures[:, :bands * rows].astype(np.uint64).reshape(documents, bands, rows)
+    multipliers = np.array(
+        [(0x9E3779B97F4A7C15 ^ (index * 0xBF58476D1CE4E5B9)) & 0xFFFFFFFFFFFFFFFF | 1 for index in range(rows)],
+        dtype=np.uint64,
+    )
+    with np.errstate(over="ignore"):
+        keys = (banded * multipliers).sum(axis=2, dtype=np.uint64)
+    # Different bands never share a bucket
+    return keys ^ np.arange(bands, dtype=np.uint64)
+
+
+def leader_clusters(signatures: np.ndarray, bands: int, min_similarity: float,
+                    order: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Greedy single-pass clustering: label each document with the index of its cluster's leader.
+
+    Documents are visited in ``order`` (index order by default). A document
+    joins the most similar leader it shares an LSH bucket with, if their
+    estimated Jaccard similarity reaches ``min_similarity``, and otherwise
+    becomes a leader itself. Only leaders are entered in the buckets, so
+    every member is similar to its leader and clusters cannot chain
+    unrelated documents together through intermediate ones. A document with
+    an empty token set always forms its own cluster.
+    """
+    documents = len(signatures)
+    labels = np.arange(documents, dtype=np.int64)
+    if not documents:
+        return labels
+    keys = band_keys(signatures, bands).tolist()
+    empty = is_empty(signatures).tolist()
+    leaders: Dict[int, int] = {}
+    for document in (range(documents) if order is None else order.tolist()):
+        if empty[document]:
+            continue
+        candidates = {leaders[key] for key in keys[document] if key in leaders}
+        best, best_similarity = -1, min_similarity
+        for candidate in candidates:
+            similarity = np.count_nonzero(signatures[document] == signatures[candidate]) / signatures.shape[1]
+            if similarity >= best_similarity and (best < 0 or similarity > best_similarity):
+                best, best_similarity = candidate, similarity
+        if best >= 0:
+            labels[document] = best
+        else:
+            for key in keys[document]:
+                leaders.setdefault(key, document)
+    return labels
+
+
+def nearest_neighbors(queries: np.ndarray, references: np.ndarray, bands: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each query signature, the reference sharing an LSH bucket with the highest estimated Jaccard.
+
+    Returns:
+        ``(indexes, similarities)``; the index is -1 and the similarity 0 where
+        no reference shares a bucket, and for queries with an empty token set
+    """
+    best = np.full(len(queries), -1, dtype=np.int64)
+    similarity = np.zeros(len(queries))
+    references_used = np.flatnonzero(~is_empty(references)) if len(references) else np.zeros(0, np.int64)
+    if not len(queries) or not len(references_used):
+        return best, similarity
+    query_empty = is_empty(queries)
+    query_keys = band_keys(queries, bands)
+    reference_keys = band_keys(references[references_used], bands)
+    for band in range(bands):
+        local_order = np.argsort(reference_keys[:, band], kind="stable")
+        sorted_keys = reference_keys[local_order, band]
+        order = references_used[local_order]
+        positions = np.minimum(np.searchsorted(sorted_keys, query_keys[:, band]), len(sorted_keys) - 1)
+        matched = np.flatnonzero((sorted_keys[positions] == query_keys[:, band]) & ~query_empty)
+        candidates = order[positions[matched]]
+        scores = (queries[matched] == references[candidates]).mean(axis=1)
+        better = scores > similarity[matched]
+        best[matched[better]] = candidates[better]
+        similarity[matched[better]] = scores[better]
+    return best, similarity
@@ -0,0 +1,137 @@
+"""
+Sampling Profiler
+
+Statistical profiler that can be switched on and off in a running process. A
+background thread captures the stack of the event loop thread (or every
+thread) at a fixed interval and aggregates the samples into folded stacks,
+the input format of flame graph tools such as speedscope and flamegraph.pl.
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Deepest stack kept per sample; deeper frames are folded into the root
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Runtime-toggleable stack sampler.
+
+    Costs nothing while stopped. While running, one daemon thread wakes every
+    ``interval`` seconds and reads ``sys._current_frames()``; at the default
+    10ms this adds roughly a percent of CPU. A ``duration`` stops sampling
+    automatically so a forgotten session does not run indefinitely.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._interval = 0.01
+        self._target_thread: Optional[int] = None
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = 0.01, duration: Optional[float] = None,
+              thread_id: Optional[int] = None) -> None:
+        """
+        Start sampling, discarding previous samples.
+
+        Args:
+            interval: Seconds between samples
+            duration: Stop automatically after this many seconds
+            thread_id: Only sample this thread (``threading.get_ident()``); all threads when None
+        """
+        with self._lock:
+            if self.running:
+                raise RuntimeError("Profiler is already running")
+            self._stacks = Counter()
+            self._samples = 0
+            self._interval = max(0.001, interval)
+            self._target_thread = thread_id
+            self._started_at = time.time()
+            self._stopped_at = None
+            self._stop.clear()
+            deadline = time.monotonic() + duration if duration else None
+            self._thread = threading.Thread(target=self._run, args=(deadline,), name="sampling-profiler", daemon=True)
+            self._thread.start()
+        logger.info(f"Sampling profiler started (interval {self._interval * 1000:.1f}ms)")
+
+    def stop(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+        logger.info(f"Sampling profiler stopped after {self._samples} samples")
+
+    def _run(self, deadline: Optional[float]) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self._interval):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == own_id or (self._target_thread is not None and thread_id != self._target_thread):
+                    continue
+                stack: List[str] = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                with self._lock:
+                    self._stacks[";".join(reversed(stack))] += 1
+            self._samples += 1
+        self._stopped_at = time.time()
+
+    def folded(self) -> str:
+        """Samples as folded stacks (``root;...;leaf count`` per line)."""
+        with self._lock:
+            stacks = self._stacks.copy()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def summary(self, top: int = 30) -> Dict[str, Any]:
+        """Session status with the functions seen most often on top of the stack (self) and anywhere (total)."""
+        with self._lock:
+            stacks = self._stacks.copy()
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                total_counts[label] += count
+        observed = sum(stacks.values()) or 1
+        return {
+            "running": self.running,
+            "samples": self._samples,
+            "interval_ms": self._interval * 1000,
+            "started_at": self._started_at,
+            "stopped_at": self._stopped_at,
+            "top_self": [{"function": label, "share": round(count / observed, 4)}
+                         for label, count in self_counts.most_common(top)],
+            "top_total": [{"function": label, "share": round(count / observed, 4)}
+                          for label, count in total_counts.most_common(top)],
+        }
+
+
+# One profiler per process
+PROFILER = SamplingProfiler()
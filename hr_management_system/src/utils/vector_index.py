@@ -0,0 +1,97 @@
+"""
+Vector Index Utilities
+
+CPU-only text embeddings built from hashed character n-grams and words, and a
+small in-memory cosine-similarity index over them.
+"""
+
+import threading
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+class HashedNgramEmbedder:
+    """
+    Embed text with the hashing trick.
+
+    Character n-grams of each word (with boundary markers) and whole words are
+    hashed into ``dimensions`` buckets with a hashed sign, then L2-normalized, so
+    cosine similarity is a dot product. No vocabulary or training is needed and
+    the same text always maps to the same vector.
+    """
+
+    def __init__(self, dimensions: int = 512, ngram_sizes: Tuple[int, ...] = (3, 4), word_weight: float = 2.0):
+        self.dimensions = dimensions
+        self.ngram_sizes = ngram_sizes
+        self.word_weight = word_weight
+
+    def _features(self, text: str) -> List[Tuple[str, float]]:
+        features = []
+        for word in text.split():
+            features.append((f"w:{word}", self.word_weight))
+            marked = f"<{word}>"
+            for size in self.ngram_sizes:
+                for start in range(max(1, len(marked) - size + 1)):
+                    features.append((marked[start:start + size], 1.0))
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        """Return the unit-length embedding of ``text`` (all zeros for empty text)."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, weight in self._features(text):
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dimensions] += sign * weight
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """
+    Exact nearest-neighbour search over unit vectors, partitioned by key.
+
+    Vectors are only compared within their partition (for example the same
+    department and seniority), which keeps every query to a single matrix-vector
+    product over a small matrix. Storage grows by doubling.
+    """
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self._partitions: Dict[Hashable, Tuple[np.ndarray, List[Hashable]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(ids) for _, ids in self._partitions.values())
+
+    def add(self, partition: Hashable, item_id: Hashable, vector: np.ndarray) -> None:
+        with self._lock:
+            matrix, ids = self._partitions.get(partition, (np.empty((0, self.dimensions), np.float32), []))
+            if len(ids) == matrix.shape[0]:
+                grown = np.zeros((max(8, 2 * len(ids)), self.dimensions), dtype=np.float32)
+                grown[:len(ids)] = matrix
+                matrix = grown
+            matrix[len(ids)] = vector
+            ids.append(item_id)
+            self._partitions[partition] = (matrix, ids)
+
+    def nearest(self, partition: Hashable, vector: np.ndarray, k: int = 1,
+                min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Return up to ``k`` (id, cosine similarity) pairs scoring at least ``min_score``, best first."""
+        entry: Optional[Tuple[np.ndarray, List[Hashable]]] = self._partitions.get(partition)
+        if entry is None:
+            return []
+        matrix, ids = entry
+        # A concurrent add may have appended an id whose row lives in a newer matrix
+        count = min(len(ids), matrix.shape[0])
+        if not count:
+            return []
+        scores = matrix[:count] @ vector
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k] if k < count else np.arange(count)
+        ranked = sorted(top, key=lambda index: (-scores[index], index))
+        return [(ids[index], float(scores[index])) for index in ranked if scores[index] >= min_score]
+
+    def stats(self) -> Dict[str, int]:
+        return {"vectors": len(self), "partitions": len(self._partitions)}
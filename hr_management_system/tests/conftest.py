@@ -0,0 +1,38 @@
+"""
+Shared pytest fixtures.
+
+Tests run from the hr_management_system directory against the fake LLM
+backend, with every store and data directory under pytest's tmp_path.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture
+def app_client(tmp_path, monkeypatch):
+    """A TestClient for a fresh app using the fake backend and temporary storage."""
+    from fastapi.testclient import TestClient
+
+    from src.main import create_app
+    from src.modules.recruitment.job_description_generator import JobDescriptionGenerator
+
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setenv("JD_STORE_PATH", str(tmp_path / "job_descriptions.db"))
+    monkeypatch.setenv("JOB_STORE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setenv("RESUME_STORE_PATH", str(tmp_path / "resumes.db"))
+    monkeypatch.setenv("PERFORMANCE_DATA_DIR", str(tmp_path / "performance"))
+    monkeypatch.setenv("ASSISTANT_SESSION_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setenv("FEEDBACK_DATA_DIR", str(tmp_path / "feedback"))
+    monkeypatch.delenv("JD_CACHE_DIR", raising=False)
+    # The generator is a process-wide singleton; give each test its own
+    monkeypatch.setattr(JobDescriptionGenerator, "_instance", None)
+    with TestClient(create_app()) as client:
+        yield client
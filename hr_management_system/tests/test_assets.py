@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+
+from src.ui import assets
+from src.ui.assets import AssetManifest
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "background rebuild did not finish"
+        time.sleep(0.01)
+
+
+def test_startup_refresh_builds_synchronously(tmp_path):
+    static_dir = str(tmp_path / "static")
+    _write(os.path.join(static_dir, "css", "main.css"), "body { color: red; }")
+    manifest = AssetManifest(static_dir, build_dir=str(tmp_path / "build"))
+
+    manifest.refresh(wait=True)
+
+    url = manifest.url("css/main.css")
+    assert url.startswith("/assets/css/main.") and url.endswith(".css")
+
+
+def test_lookups_serve_previous_manifest_while_rebuilding(tmp_path, monkeypatch):
+    static_dir = str(tmp_path / "static")
+    source = os.path.join(static_dir, "css", "main.css")
+    _write(source, "body { color: red; }")
+    manifest = AssetManifest(static_dir, build_dir=str(tmp_path / "build"))
+    manifest.refresh(wait=True)
+    old_url = manifest.url("css/main.css")
+    manifest.check_interval = 0
+
+    started, release = threading.Event(), threading.Event()
+    real_build = assets.build_assets
+
+    def slow_build(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return real_build(*args, **kwargs)
+
+    monkeypatch.setattr(assets, "build_assets", slow_build)
+    _write(source, "body { color: blue; }")
+    os.utime(source, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    assert manifest.url("css/main.css") == old_url
+    assert started.wait(5)
+    # The rebuild is blocked, yet lookups return at once with the old URL
+    assert manifest.url("css/main.css") == old_url
+
+    release.set()
+    _wait_until(lambda: manifest.url("css/main.css") != old_url)
+    assert manifest.url("css/main.css").startswith("/assets/css/main.")
+
+
+def test_unbuilt_manifest_falls_back_to_static_urls(tmp_path, monkeypatch):
+    static_dir = str(tmp_path / "static")
+    _write(os.path.join(static_dir, "js", "app.js"), "console.log(1);")
+    manifest = AssetManifest(static_dir, build_dir=str(tmp_path / "build"), check_interval=0)
+    release = threading.Event()
+    real_build = assets.build_assets
+
+    def slow_build(*args, **kwargs):
+        release.wait(5)
+        return real_build(*args, **kwargs)
+
+    monkeypatch.setattr(assets, "build_assets", slow_build)
+
+    assert manifest.url("js/app.js") == "/static/js/app.js"
+    release.set()
+    _wait_until(lambda: manifest.url("js/app.js").startswith("/assets/"))
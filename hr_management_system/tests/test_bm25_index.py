@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.bm25_index import BM25Index
+
+DOCUMENTS = [
+    "python data pipelines with spark",
+    "java backend services",
+    "python python scripting and automation",
+    "spark streaming and kafka data",
+    "",
+]
+
+
+def reference_scores(documents, query, k1=1.2, b=0.75):
+    """Textbook Okapi BM25 with the Lucene idf, computed term by term."""
+    tokenized = [document.lower().split() for document in documents]
+    average = sum(map(len, tokenized)) / len(tokenized)
+    scores = []
+    for tokens in tokenized:
+        score = 0.0
+        for term, weight in query.items():
+            frequency = sum(term in other for other in tokenized)
+            tf = tokens.count(term)
+            if not frequency or not tf:
+                continue
+            idf = math.log(1 + (len(tokenized) - frequency + 0.5) / (frequency + 0.5))
+            score += weight * idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / average))
+        scores.append(score)
+    return scores
+
+
+@pytest.mark.parametrize("batches", [[DOCUMENTS], [DOCUMENTS[:2], DOCUMENTS[2:3], DOCUMENTS[3:]]])
+def test_scores_match_reference_bm25_across_segments(batches):
+    index = BM25Index()
+    for batch in batches:
+        index.add_texts(batch)
+    query = {"python": 1.0, "spark": 1.0, "data": 0.5, "unknown": 1.0}
+
+    np.testing.assert_allclose(index.score(query), reference_scores(DOCUMENTS, query), rtol=1e-5)
+    index.optimize()
+    assert index.stats()["segments"] == 1
+    np.testing.assert_allclose(index.score(query), reference_scores(DOCUMENTS, query), rtol=1e-5)
+
+
+def test_segments_merge_once_over_the_limit():
+    index = BM25Index(max_segments=2)
+    for document in DOCUMENTS:
+        index.add_texts([document])
+    assert index.stats()["segments"] == len(DOCUMENTS)
+    index.score({"python": 1.0})
+    assert index.stats()["segments"] == 1
+
+
+def test_top_k_returns_positive_scores_best_first():
+    index = BM25Index()
+    assert index.add_texts(DOCUMENTS) == 0
+    assert index.add_texts(["kafka"]) == len(DOCUMENTS)
+
+    top = index.top_k({"spark": 1.0, "kafka": 1.0}, k=10)
+    # Document 3 holds both terms; the one-word document 5 outranks the longer document 0
+    assert [doc for doc, _ in top] == [3, 5, 0]
+    assert all(first[1] >= second[1] for first, second in zip(top, top[1:]))
+    assert index.top_k({"spark": 1.0}, k=1)[0][0] in (0, 3)
+    assert index.top_k({"spark": 1.0}, k=0) == []
+
+
+def test_normalize_maps_words_to_terms_and_drops_stop_words():
+    index = BM25Index(normalize=lambda word: None if word == "and" else word.rstrip("s"))
+    index.add_texts(["Pipelines and services", "pipeline"])
+
+    assert "and" not in index.vocabulary
+    assert index.matched_terms({"pipeline": 1.0, "service": 1.0}, 0) == ["pipeline", "service"]
+    assert index.matched_terms({"pipeline": 1.0, "service": 1.0}, 1) == ["pipeline"]
+    assert index.stats()["avg_document_length"] == 1.5
+
+
+def test_empty_index_scores_nothing():
+    index = BM25Index()
+    assert len(index.score({"python": 1.0})) == 0
+    assert index.top_k({"python": 1.0}, k=3) == []
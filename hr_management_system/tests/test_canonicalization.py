@@ -0,0 +1,17 @@
+from src.modules.recruitment.canonicalization import canonicalize_title, normalize_title
+
+
+def test_level_words_are_dropped_from_titles():
+    assert canonicalize_title("Sr. Back-end Engineer") == canonicalize_title("Senior Backend Software Engineer")
+    assert canonicalize_title("Junior Data Analyst") == canonicalize_title("Data Analyst")
+
+
+def test_role_bearing_words_are_kept_in_titles():
+    assert canonicalize_title("Lead Engineer") != canonicalize_title("Staff Engineer")
+    assert canonicalize_title("Head of Marketing") != canonicalize_title("Marketing")
+    assert canonicalize_title("Principal Engineer") != canonicalize_title("Engineer")
+
+
+def test_normalize_title_folds_spelling_but_keeps_order():
+    assert normalize_title("Sr. Back-end Engineer") == normalize_title("senior  backend engineers")
+    assert normalize_title("Lead Engineer") != normalize_title("Staff Engineer")
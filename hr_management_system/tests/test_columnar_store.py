@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.utils.columnar_store import ColumnarStore
+
+COLUMNS = {"employee_id": "int64", "score": "float32"}
+
+
+def open_store(directory):
+    return ColumnarStore(str(directory), COLUMNS, dictionary_columns=("department",))
+
+
+def test_appends_round_trip_through_memory_maps(tmp_path):
+    store = open_store(tmp_path)
+    assert store.append({"employee_id": [1, 2], "score": [3.5, 4.0], "department": ["Sales", "Engineering"]}) \
+        == range(0, 2)
+    assert store.append({"employee_id": [3], "score": [2.0], "department": ["Sales"]}) == range(2, 3)
+
+    snapshot = store.snapshot()
+    assert snapshot.rows == 3
+    np.testing.assert_array_equal(snapshot.columns["employee_id"], [1, 2, 3])
+    np.testing.assert_allclose(snapshot.columns["score"], [3.5, 4.0, 2.0])
+    assert snapshot.dictionaries["department"] == ["Sales", "Engineering"]
+    np.testing.assert_array_equal(snapshot.columns["department"], [0, 1, 0])
+    assert snapshot.code("department", "Engineering") == 1
+    assert snapshot.code("department", "Legal") is None
+
+
+def test_other_instances_pick_up_committed_appends(tmp_path):
+    writer, reader = open_store(tmp_path), open_store(tmp_path)
+    before = reader.snapshot()
+    writer.append({"employee_id": [1], "score": [1.0], "department": ["Sales"]})
+    writer.append({"employee_id": [2], "score": [2.0], "department": ["Legal"]})
+
+    assert before.rows == 0
+    after = reader.snapshot()
+    assert after.rows == 2
+    assert after.dictionaries["department"] == ["Sales", "Legal"]
+    # A snapshot taken earlier cannot resolve values added after it
+    assert before.code("department", "Legal") is None
+
+
+def test_uncommitted_bytes_are_truncated_by_the_next_append(tmp_path):
+    store = open_store(tmp_path)
+    store.append({"employee_id": [1], "score": [1.0], "department": ["Sales"]})
+    # Simulate a writer that died after writing column and dictionary bytes but before the metadata
+    with open(tmp_path / "employee_id.col", "ab") as f:
+        f.write(np.array([99], dtype="<i8").tobytes())
+    with open(tmp_path / "department.dict", "ab") as f:
+        f.write(b"Ghost\n")
+
+    assert open_store(tmp_path).snapshot().rows == 1
+    store.append({"employee_id": [2], "score": [2.0], "department": ["Legal"]})
+
+    snapshot = open_store(tmp_path).snapshot()
+    np.testing.assert_array_equal(snapshot.columns["employee_id"], [1, 2])
+    assert snapshot.dictionaries["department"] == ["Sales", "Legal"]
+
+
+def test_invalid_appends_are_rejected(tmp_path):
+    store = open_store(tmp_path)
+    with pytest.raises(ValueError):
+        store.append({"employee_id": [1, 2], "score": [1.0], "department": ["Sales"]})
+    with pytest.raises(ValueError):
+        store.append({"employee_id": [1], "score": [1.0]})
+    with pytest.raises(ValueError):
+        store.append({"employee_id": [1], "score": [1.0], "department": ["Two\nlines"]})
+    assert store.stats()["rows"] == 0
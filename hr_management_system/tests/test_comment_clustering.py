@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.modules.feedback.comment_clustering import CommentClusterer, spread_labels
+from src.modules.feedback.comment_reader import FeedbackComment
+
+
+def cluster(texts):
+    clusterer = CommentClusterer()
+    clusterer.add(FeedbackComment(row, str(row), text) for row, text in enumerate(texts))
+    return clusterer.finish()
+
+
+def same_cluster(clusters, first, second):
+    return clusters.comment_cluster[first] == clusters.comment_cluster[second]
+
+
+def test_exact_and_near_duplicates_cluster_together():
+    clusters = cluster(["Great team and supportive manager", "great team and  supportive manager!",
+                        "Great team, very supportive manager", "The office is too cold"])
+
+    assert same_cluster(clusters, 0, 1) and same_cluster(clusters, 0, 2)
+    assert not same_cluster(clusters, 0, 3)
+    assert clusters.unique_texts == 4
+
+
+def test_negated_comments_do_not_cluster_with_their_opposites():
+    clusters = cluster(["I am happy with my manager", "I am not happy with my manager",
+                        "Great team", "Not a great team", "I don't like the new tools", "I like the new tools"])
+
+    assert not same_cluster(clusters, 0, 1)
+    assert not same_cluster(clusters, 2, 3)
+    assert not same_cluster(clusters, 4, 5)
+
+
+def test_texts_without_content_words_are_their_own_clusters():
+    clusters = cluster(["I like it", "Not at all", "n/a", "n/a"])
+
+    assert len(set(clusters.comment_cluster[:3].tolist())) == 3
+    assert same_cluster(clusters, 2, 3)
+
+
+def test_empty_clusters_do_not_inherit_labels():
+    clusters = cluster(["n/a", "n/a", "I like it"])
+    labels = spread_labels(clusters, {0: ("neutral", "No comment")}, ("positive", "neutral", "negative"))
+
+    assert labels.sentiment.tolist() == [1, -1]
+    assert np.all(labels.source[1:] == 0)
+
+
+def test_deduplication_keys_are_128_bit_digests():
+    clusterer = CommentClusterer()
+    clusterer.add([FeedbackComment(0, "0", "The office is too cold"), FeedbackComment(1, "1", "the office  is too COLD")])
+
+    assert [len(key) for key in clusterer._text_ids] == [16]
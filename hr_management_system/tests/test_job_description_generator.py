@@ -0,0 +1,30 @@
+GENERATE = "/api/generate-job-description"
+
+
+def test_lead_engineer_is_not_served_the_staff_engineer_description(app_client):
+    staff = app_client.post(GENERATE, json={"title": "Staff Engineer", "department": "Engineering",
+                                            "seniority": "Senior"}).json()
+    lead = app_client.post(GENERATE, json={"title": "Lead Engineer", "department": "Engineering",
+                                           "seniority": "Senior"}).json()
+
+    assert "Staff" in staff["title"]
+    assert "Lead" in lead["title"] and "Staff" not in lead["title"]
+    assert lead["metadata"].get("reused_from") is None
+
+
+def test_head_of_marketing_is_not_served_for_marketing_director(app_client):
+    app_client.post(GENERATE, json={"title": "Head of Marketing", "department": "Marketing",
+                                    "seniority": "Director"})
+    director = app_client.post(GENERATE, json={"title": "Marketing", "department": "Marketing",
+                                               "seniority": "Director"}).json()
+
+    assert "Head" not in director["title"]
+
+
+def test_same_title_in_other_wording_reuses_the_stored_description(app_client):
+    first = app_client.post(GENERATE, json={"title": "Sr. Back-end Engineer", "department": "Engineering",
+                                            "seniority": "Senior"}).json()
+    second = app_client.post(GENERATE, json={"title": "Senior Backend Engineer", "department": "Engineering",
+                                             "seniority": "Senior"}).json()
+
+    assert second["metadata"]["reused_from"] == first["metadata"]["id"]
@@ -0,0 +1,90 @@
+import pytest
+
+from src.modules.recruitment.job_description_store import InvalidCursor, JobDescriptionStore, build_match_query
+
+
+def description(title, overview="", responsibilities=()):
+    return {
+        "title": title,
+        "overview": overview,
+        "key_responsibilities": list(responsibilities),
+        "required_qualifications": [],
+        "preferred_qualifications": [],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobDescriptionStore(str(tmp_path / "job_descriptions.db"))
+    yield store
+    store.close()
+
+
+def collect(page_fn):
+    """Follow next_cursor to the end and return every item id in order."""
+    ids, cursor = [], None
+    while True:
+        page = page_fn(cursor)
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_list_pages_newest_first_without_gaps_or_repeats(store):
+    saved = [store.save(f"key-{n}", {"department": "Engineering" if n % 2 else "Sales"}, description(f"Role {n}"))
+             for n in range(7)]
+
+    assert collect(lambda cursor: store.list(limit=3, cursor=cursor)) == saved[::-1]
+    engineering = collect(lambda cursor: store.list(limit=2, cursor=cursor, department="engineering"))
+    assert engineering == [row_id for n, row_id in enumerate(saved) if n % 2][::-1]
+
+
+def test_list_cursor_is_stable_across_new_inserts(store):
+    saved = [store.save(f"key-{n}", {}, description(f"Role {n}")) for n in range(4)]
+    first = store.list(limit=2)
+    store.save("late", {}, description("Late role"))
+
+    second = store.list(limit=2, cursor=first["next_cursor"])
+    assert [item["id"] for item in second["items"]] == [saved[1], saved[0]]
+    assert second["next_cursor"] is None
+
+
+def test_search_pages_through_every_match_by_rank(store):
+    matches = [store.save(f"key-{n}", {}, description(f"Data Engineer {n}", overview="Builds data pipelines"))
+               for n in range(5)]
+    store.save("other", {}, description("Sales Manager", overview="Owns accounts"))
+
+    first = store.search("data pipe", limit=2)
+    assert all("<mark>" in item["snippet"] for item in first["items"])
+    assert collect(lambda cursor: store.search("data pipe", limit=2, cursor=cursor)) == matches
+
+
+def test_search_cursor_excludes_descriptions_stored_after_the_first_page(store):
+    for n in range(3):
+        store.save(f"key-{n}", {}, description(f"Data Engineer {n}"))
+    first = store.search("engineer", limit=1)
+    late = store.save("late", {}, description("Data Engineer late"))
+
+    ids, cursor = [item["id"] for item in first["items"]], first["next_cursor"]
+    while cursor:
+        page = store.search("engineer", limit=1, cursor=cursor)
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+    assert late not in ids
+    assert len(ids) == len(set(ids))
+
+
+def test_invalid_cursors_are_rejected(store):
+    store.save("key-1", {}, description("Role"))
+    store.save("key-2", {}, description("Role"))
+    with pytest.raises(InvalidCursor):
+        store.list(cursor="not-a-cursor!")
+    with pytest.raises(InvalidCursor):
+        # A list cursor carries one value; search cursors carry three
+        store.search("role", cursor=store.list(limit=1)["next_cursor"])
+
+
+def test_match_query_quotes_words_and_prefixes_the_last():
+    assert build_match_query('senior "eng" OR') == '"senior" "eng" "or"*'
+    assert build_match_query("  !! ") is None
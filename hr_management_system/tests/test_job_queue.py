@@ -0,0 +1,86 @@
+import asyncio
+
+from src.modules.jobs.job_queue import JobQueue, PermanentJobError
+from src.modules.jobs.job_store import JobStore
+
+
+def make_queue(tmp_path, **options):
+    return JobQueue(JobStore(str(tmp_path / "jobs.db")), concurrency=1, poll_interval=0.01, **options)
+
+
+async def wait_for_status(queue, job_id, statuses, timeout=5.0):
+    async def poll():
+        while (await queue.get(job_id))["status"] not in statuses:
+            await asyncio.sleep(0.01)
+        return await queue.get(job_id)
+    return await asyncio.wait_for(poll(), timeout)
+
+
+def test_failed_attempts_are_retried_until_success(tmp_path):
+    async def scenario():
+        queue = make_queue(tmp_path, retry_base_delay=0.01, retry_max_delay=0.01)
+        calls = []
+
+        async def flaky(payload):
+            calls.append(payload)
+            if len(calls) < 3:
+                raise RuntimeError("temporary")
+            return {"ok": True}
+
+        queue.register("flaky", flaky)
+        await queue.start()
+        job = await queue.submit("flaky", {"n": 1}, max_attempts=3)
+        finished = await wait_for_status(queue, job["id"], {"succeeded", "failed"})
+        await queue.stop()
+        return finished, len(calls)
+
+    finished, calls = asyncio.run(scenario())
+    assert finished["status"] == "succeeded" and finished["attempts"] == 3 and calls == 3
+
+
+def test_permanent_errors_are_not_retried(tmp_path):
+    async def scenario():
+        queue = make_queue(tmp_path)
+
+        async def broken(payload):
+            raise PermanentJobError("bad payload")
+
+        queue.register("broken", broken)
+        await queue.start()
+        job = await queue.submit("broken", {}, max_attempts=3)
+        finished = await wait_for_status(queue, job["id"], {"succeeded", "failed"})
+        await queue.stop()
+        return finished
+
+    finished = asyncio.run(scenario())
+    assert finished["status"] == "failed" and finished["attempts"] == 1
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job = store.submit("kind", {}, "normal", 3)
+
+    assert store.claim("dead-worker", lease_seconds=-1)["id"] == job["id"]
+    reclaimed = store.claim("live-worker", lease_seconds=60)
+
+    assert reclaimed["id"] == job["id"] and reclaimed["attempts"] == 2
+
+
+def test_shutdown_requeues_the_running_job_without_counting_the_attempt(tmp_path):
+    async def scenario():
+        queue = make_queue(tmp_path)
+        started = asyncio.Event()
+
+        async def slow(payload):
+            started.set()
+            await asyncio.sleep(60)
+
+        queue.register("slow", slow)
+        await queue.start()
+        job = await queue.submit("slow", {})
+        await asyncio.wait_for(started.wait(), 5)
+        await queue.stop(drain_timeout=0.05)
+        return await queue.get(job["id"]), queue._stats["released"]
+
+    requeued, released = asyncio.run(scenario())
+    assert requeued["status"] == "queued" and requeued["attempts"] == 0 and released == 1
@@ -0,0 +1,57 @@
+from src.modules.recruitment.job_description_generator import JobDescriptionResponse
+from src.utils.json_repair import SchemaGuidedJSONParser, repair_json
+
+
+def test_valid_json_needs_no_repair():
+    assert repair_json('Here you go: {"a": [1, 2]} thanks') == ({"a": [1, 2]}, ["ignored trailing text"], set(), True)
+
+
+def test_empty_member_value_is_dropped_without_losing_the_rest():
+    value, repairs, truncated, closed = repair_json('{"title": "x", "overview": , "benefits": ["a"]}')
+
+    assert value == {"title": "x", "benefits": ["a"]}
+    assert "removed empty value" in repairs
+    assert truncated == set() and closed
+
+
+def test_empty_value_before_closing_brace():
+    value, repairs, _, closed = repair_json('{"title": "x", "overview": }')
+
+    assert value == {"title": "x"} and closed
+
+
+def test_empty_array_elements_are_skipped():
+    value, _, _, closed = repair_json('{"a": [1, , 2, @, 3]}')
+
+    assert value == {"a": [1, 2, 3]} and closed
+
+
+def test_missing_commas_and_trailing_commas():
+    value, repairs, _, closed = repair_json('{"a": 1 "b": [1 2,], c: True,}')
+
+    assert value == {"a": 1, "b": [1, 2], "c": True}
+    assert {"inserted missing comma", "removed trailing comma", "quoted bare key"} <= set(repairs)
+    assert closed
+
+
+def test_truncated_output_keeps_complete_members():
+    value, _, truncated, closed = repair_json('```json\n{"title": "x", "benefits": ["a", "b", "partial')
+
+    assert value == {"title": "x", "benefits": ["a", "b"]}
+    assert truncated == {"benefits"} and not closed
+
+
+def test_long_runs_of_junk_do_not_recurse():
+    value, _, _, _ = repair_json('{"a": ' + ")" * 5000 + "1}")
+
+    assert value == {"a": 1}
+
+
+def test_schema_guided_parse_does_not_accept_a_key_as_a_value():
+    parsed = SchemaGuidedJSONParser.parse_text(
+        JobDescriptionResponse, '{"title": "x", "overview": , "key_responsibilities": ["a"]}'
+    )
+
+    assert "overview" not in parsed.data
+    assert parsed.data["key_responsibilities"] == ["a"]
+    assert "overview" in parsed.missing
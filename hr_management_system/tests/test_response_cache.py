@@ -0,0 +1,118 @@
+import asyncio
+import types
+
+import pytest
+
+from src.utils import cache as cache_module
+from src.utils.cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's wall clock with one the test advances by hand."""
+    fake = types.SimpleNamespace(now=1_000_000.0)
+    fake.time = lambda: fake.now
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+def test_concurrent_computations_for_a_key_are_coalesced():
+    async def scenario():
+        cache = ResponseCache()
+        calls = 0
+        release = asyncio.Event()
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"title": "Engineer"}
+
+        waiters = [asyncio.ensure_future(cache.get_or_compute("k", compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*waiters), calls, cache.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert results == [{"title": "Engineer"}] * 5
+    # Each waiter gets its own copy
+    assert len({id(result) for result in results}) == 5
+    assert stats["coalesced"] == 4 and stats["inflight"] == 0
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        cache = ResponseCache()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("backend down")
+
+        outcomes = await asyncio.gather(*(cache.get_or_compute("k", fail) for _ in range(3)), return_exceptions=True)
+        return outcomes, await cache.get("k")
+
+    outcomes, cached = asyncio.run(scenario())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert cached is None
+
+
+def test_entries_expire_after_ttl(clock):
+    async def scenario():
+        cache = ResponseCache(ttl_seconds=60)
+        await cache.set("k", {"v": 1})
+        clock.now += 59
+        fresh = await cache.get("k")
+        clock.now += 2
+        return fresh, await cache.get("k")
+
+    fresh, expired = asyncio.run(scenario())
+    assert fresh == {"v": 1}
+    assert expired is None
+
+
+def test_memory_tier_is_an_lru():
+    async def scenario():
+        cache = ResponseCache(max_entries=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+        return [await cache.get(key) for key in ("a", "b", "c")], cache.stats()["evictions"]
+
+    values, evictions = asyncio.run(scenario())
+    assert values == [1, None, 3]
+    assert evictions == 1
+
+
+def test_disk_tier_survives_a_new_instance_and_honours_ttl(tmp_path, clock):
+    async def scenario():
+        await ResponseCache(disk_dir=str(tmp_path), ttl_seconds=60).set("k", {"v": 1})
+        restarted = await ResponseCache(disk_dir=str(tmp_path), ttl_seconds=60).get("k")
+        clock.now += 61
+        expired_cache = ResponseCache(disk_dir=str(tmp_path), ttl_seconds=60)
+        return restarted, await expired_cache.get("k")
+
+    restarted, expired = asyncio.run(scenario())
+    assert restarted == {"v": 1}
+    assert expired is None
+    assert not (tmp_path / "k.json").exists()
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    async def scenario():
+        cache = ResponseCache(max_entries=1, disk_dir=str(tmp_path), max_disk_entries=2)
+        for key in ("a", "b", "c"):
+            await cache.set(key, key)
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == ["b.json", "c.json"]
+    assert stats["disk_evictions"] == 1
+
+
+def test_unreadable_disk_entries_are_misses(tmp_path):
+    (tmp_path / "k.json").write_text("{not json", encoding="utf-8")
+    value = asyncio.run(ResponseCache(disk_dir=str(tmp_path)).get("k"))
+    assert value is None
+    assert not (tmp_path / "k.json").exists()
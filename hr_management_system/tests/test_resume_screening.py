@@ -0,0 +1,47 @@
+import pytest
+
+from src.modules.recruitment.job_description_store import JobDescriptionStore
+from src.modules.recruitment.resume_screening import ResumeScreener
+from src.modules.recruitment.resume_store import ResumeStore
+
+JOB_DESCRIPTION = {
+    "title": "Data Engineer", "overview": "Build pipelines",
+    "key_responsibilities": ["Build data pipelines"], "required_qualifications": ["Python and Spark"],
+    "preferred_qualifications": ["Kafka"], "benefits": [],
+}
+
+
+@pytest.fixture
+def screener(tmp_path):
+    job_descriptions = JobDescriptionStore(str(tmp_path / "jd.db"))
+    for _ in range(3):
+        job_descriptions.save("key", {"department": "Engineering", "seniority": "Senior"}, JOB_DESCRIPTION)
+    return ResumeScreener(ResumeStore(str(tmp_path / "resumes.db")), job_descriptions, max_indexes=2)
+
+
+def test_ranking_prefers_matching_resumes(screener):
+    screener.store.add_many(1, [
+        {"candidate_id": "a", "text": "Barista with latte art skills"},
+        {"candidate_id": "b", "text": "Python and Spark data pipelines, Kafka streaming"},
+        {"candidate_id": "c", "text": "Python scripting"},
+    ])
+    scored, shortlist = screener.rank(1, screener.build_query(JOB_DESCRIPTION), top_k=2)
+    candidates = screener.store.get_many([entry["row_id"] for entry in shortlist])
+
+    assert scored == 3
+    assert [candidates[entry["row_id"]]["candidate_id"] for entry in shortlist] == ["b", "c"]
+
+
+def test_stats_for_unknown_job_description_creates_no_index(screener):
+    assert screener.stats(999) is None
+    assert 999 not in screener._indexes
+
+
+def test_indexes_are_bounded_and_rebuilt_after_eviction(screener):
+    for job_description_id in (1, 2, 3):
+        screener.store.add_many(job_description_id, [{"candidate_id": "a", "text": "Python developer"}])
+        screener.catch_up(job_description_id)
+
+    assert list(screener._indexes) == [2, 3]
+    assert screener.stats(1)["documents"] == 1
+    assert list(screener._indexes) == [3, 1]
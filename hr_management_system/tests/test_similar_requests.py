@@ -0,0 +1,22 @@
+from src.modules.recruitment.similar_requests import CanonicalRequest, SimilarRequestIndex
+
+
+def canonical(title, wording=None, details="d", department="engin", seniority="senior"):
+    return CanonicalRequest(title, department, seniority, details, wording or title)
+
+
+def test_reuse_requires_same_wording_and_details():
+    index = SimilarRequestIndex(reuse_threshold=0.9, seed_threshold=0.75)
+    index.add(1, canonical("data engin", wording="data engin"))
+
+    assert index.find(canonical("data engin", wording="data engin")).reusable
+    assert not index.find(canonical("data engin", wording="engin data")).reusable
+    assert not index.find(canonical("data engin", wording="data engin", details="other")).reusable
+
+
+def test_lower_quality_entries_are_not_used():
+    index = SimilarRequestIndex()
+    index.add(1, canonical("data engin"), quality=1)
+
+    assert index.find(canonical("data engin"), min_quality=2) is None
+    assert index.find(canonical("data engin"), min_quality=1).job_description_id == 1